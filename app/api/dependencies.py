@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from dataclasses import dataclass
+
+from fastapi import Request
+
+from app.application.services.catalog_refresh_service import (
+    CatalogHandle,
+    CatalogSnapshot,
+    VersionedCache,
+)
+from app.application.services.feedback_service import FeedbackService
+from app.application.services.user_affinity_service import UserAffinityService
+
+
+@dataclass(frozen=True)
+class ApiResources:
+    """State built once at startup and shared by every request."""
+
+    catalog_handle: CatalogHandle
+    scoring_executor: Executor
+    perfume_page_cache: VersionedCache
+    affinity_service: UserAffinityService | None = None
+    feedback_service: FeedbackService | None = None
+
+
+def get_resources(request: Request) -> ApiResources:
+    return request.app.state.resources
+
+
+def get_snapshot(request: Request) -> CatalogSnapshot:
+    """The catalog version this request runs on, pinned even if a reload swaps it mid-request."""
+    return get_resources(request).catalog_handle.current()
+
+
+def get_scoring_executor(request: Request) -> Executor:
+    return get_resources(request).scoring_executor
+
+
+def get_perfume_page_cache(request: Request) -> VersionedCache:
+    return get_resources(request).perfume_page_cache
+
+
+def get_affinity_service(request: Request) -> UserAffinityService | None:
+    return get_resources(request).affinity_service
+
+
+def get_feedback_service(request: Request) -> FeedbackService | None:
+    return get_resources(request).feedback_service
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
+
+from app.api.dependencies import get_feedback_service
+from app.api.schemas.feedback import FeedbackAcceptedResponse, FeedbackRequest
+from app.application.services.feedback_service import FeedbackService
+
+router = APIRouter(tags=["feedback"])
+
+
+@router.post("/feedback", status_code=202, response_model=FeedbackAcceptedResponse)
+def record_feedback(
+    payload: FeedbackRequest,
+    feedback_service: FeedbackService | None = Depends(get_feedback_service),
+) -> ORJSONResponse:
+    if feedback_service is None:
+        raise HTTPException(status_code=503, detail="feedback is not enabled for this catalog")
+    try:
+        # Only buffers; the service's flusher writes the batch and folds it into user affinities.
+        event = feedback_service.record(
+            payload.user_id,
+            payload.perfume_id,
+            payload.event_type,
+            occasion=payload.occasion,
+            moods=tuple(payload.moods),
+            strength_preference=payload.strength_preference,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return ORJSONResponse(
+        {
+            "user_id": event.user_id,
+            "perfume_id": event.perfume_id,
+            "event_type": event.event_type,
+            "occurred_at": event.occurred_at.isoformat(),
+        },
+        status_code=202,
+    )
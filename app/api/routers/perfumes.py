@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+
+from app.api.dependencies import get_perfume_page_cache, get_snapshot
+from app.api.schemas.perfumes import PerfumeListResponse, perfume_payload
+from app.application.services.catalog_refresh_service import CatalogSnapshot, VersionedCache
+from app.config.settings import API_MAX_PAGE_SIZE
+
+router = APIRouter(tags=["perfumes"])
+
+
+@router.get("/perfumes", response_model=PerfumeListResponse)
+def list_perfumes(
+    limit: int = Query(50, ge=1, le=API_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    snapshot: CatalogSnapshot = Depends(get_snapshot),
+    cache: VersionedCache = Depends(get_perfume_page_cache),
+) -> ORJSONResponse:
+    payload = cache.get(snapshot.version, (limit, offset))
+    if payload is None:
+        catalog = snapshot.catalog
+        stop = min(offset + limit, len(catalog))
+        payload = {
+            "items": [perfume_payload(catalog.perfume_at(index)) for index in range(offset, stop)],
+            "total": len(catalog),
+            "limit": limit,
+            "offset": offset,
+            "catalog_version": snapshot.version,
+        }
+        cache.put(snapshot.version, (limit, offset), payload)
+    return ORJSONResponse(payload)
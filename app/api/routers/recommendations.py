@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor
+import uuid
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import ORJSONResponse
+
+from app.api.dependencies import get_affinity_service, get_scoring_executor, get_snapshot
+from app.api.schemas.recommendations import (
+    RecommendationRequest,
+    RecommendationResponse,
+    recommendation_payload,
+)
+from app.application.services.catalog_refresh_service import CatalogSnapshot
+from app.application.services.recommendation_service import RecommendationResult
+from app.application.services.user_affinity_service import UserAffinityService
+
+router = APIRouter(tags=["recommendations"])
+
+
+@router.post("/recommendations", response_model=RecommendationResponse)
+async def create_recommendations(
+    payload: RecommendationRequest,
+    x_request_id: str | None = Header(default=None),
+    snapshot: CatalogSnapshot = Depends(get_snapshot),
+    executor: Executor = Depends(get_scoring_executor),
+    affinity_service: UserAffinityService | None = Depends(get_affinity_service),
+) -> ORJSONResponse:
+    request_id = x_request_id or uuid.uuid4().hex
+    try:
+        profile = payload.to_profile()
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    # Scoring is CPU-bound; keep it off the event loop. The pinned snapshot keeps this
+    # request on one catalog version even if a reload swaps the handle meanwhile.
+    service = snapshot.recommendation_service
+
+    def recommend() -> RecommendationResult:
+        scored_profile = profile
+        if affinity_service is not None and payload.user_id:
+            # Learned affinities may need a SQLite read on a cache miss; that also stays off the loop.
+            scored_profile = affinity_service.personalize(profile, payload.user_id)
+        return service.recommend(
+            scored_profile, top_n=payload.top_n, request_id=request_id, diversity=payload.diversity
+        )
+
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(executor, recommend)
+    return ORJSONResponse(
+        recommendation_payload(result, request_id, snapshot.version),
+        headers={"X-Request-ID": request_id},
+    )
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class FeedbackRequest(BaseModel):
+    user_id: str
+    perfume_id: str
+    event_type: Literal["click", "like", "dislike", "purchase"]
+    occasion: str | None = None
+    moods: list[str] = []
+    strength_preference: Literal["subtle", "medium", "strong"] | None = None
+
+
+class FeedbackAcceptedResponse(BaseModel):
+    user_id: str
+    perfume_id: str
+    event_type: str
+    occurred_at: str
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from app.domain.models.perfume import Perfume
+
+
+class PerfumeOut(BaseModel):
+    perfume_id: str
+    name: str
+    url: str
+    price_min: float | None = None
+    price_max: float | None = None
+    gender_tags: list[str] = []
+    scent_families: list[str] = []
+    notes_top: list[str] = []
+    notes_middle: list[str] = []
+    notes_base: list[str] = []
+    image_urls: list[str] = []
+
+
+class PerfumeListResponse(BaseModel):
+    items: list[PerfumeOut]
+    total: int
+    limit: int
+    offset: int
+    catalog_version: str
+
+
+def perfume_payload(perfume: Perfume) -> dict[str, object]:
+    """Plain-dict form of `PerfumeOut`, serialized directly by ORJSONResponse."""
+    return {
+        "perfume_id": perfume.perfume_id,
+        "name": perfume.name,
+        "url": perfume.url,
+        "price_min": perfume.price_min,
+        "price_max": perfume.price_max,
+        "gender_tags": perfume.gender_tags,
+        "scent_families": perfume.scent_families,
+        "notes_top": perfume.notes_top,
+        "notes_middle": perfume.notes_middle,
+        "notes_base": perfume.notes_base,
+        "image_urls": perfume.image_urls,
+    }
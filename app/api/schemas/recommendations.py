@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from app.application.services.recommendation_service import RecommendationResult
+from app.config.settings import API_MAX_TOP_N, DEFAULT_TOP_N
+from app.domain.models.user_profile import UserProfile, UserProfileConstraints
+
+
+class ConstraintsIn(BaseModel):
+    exclude_notes: list[str] = []
+    exclude_families: list[str] = []
+
+
+class RecommendationRequest(BaseModel):
+    user_id: str | None = None
+    owned_perfume_ids: list[str] = []
+    liked_notes: list[str] = []
+    disliked_notes: list[str] = []
+    preferred_families: list[str] = []
+    occasion: str | None = None
+    moods: list[str] = []
+    strength_preference: Literal["subtle", "medium", "strong"] | None = None
+    constraints: ConstraintsIn = ConstraintsIn()
+    top_n: int = Field(DEFAULT_TOP_N, ge=1, le=API_MAX_TOP_N)
+    diversity: float | None = Field(None, ge=0.0, le=1.0)
+
+    def to_profile(self) -> UserProfile:
+        return UserProfile(
+            owned_perfume_ids=tuple(self.owned_perfume_ids),
+            liked_notes=tuple(self.liked_notes),
+            disliked_notes=tuple(self.disliked_notes),
+            preferred_families=tuple(self.preferred_families),
+            occasion=self.occasion,
+            moods=tuple(self.moods),
+            strength_preference=self.strength_preference,
+            constraints=UserProfileConstraints(
+                exclude_notes=tuple(self.constraints.exclude_notes),
+                exclude_families=tuple(self.constraints.exclude_families),
+            ),
+        )
+
+
+class RecommendationItemOut(BaseModel):
+    perfume_id: str
+    name: str
+    url: str
+    score: float
+    matched_notes: list[str]
+    matched_families: list[str]
+    similar_to_owned: str | None = None
+
+
+class RecommendationResponse(BaseModel):
+    request_id: str
+    catalog_version: str
+    mode: Literal["full", "skip_owned", "candidates_only", "cached"]
+    candidate_count: int
+    elapsed_ms: float
+    items: list[RecommendationItemOut]
+
+
+def recommendation_payload(
+    result: RecommendationResult, request_id: str, catalog_version: str
+) -> dict[str, object]:
+    """Plain-dict form of `RecommendationResponse`, serialized directly by ORJSONResponse."""
+    return {
+        "request_id": request_id,
+        "catalog_version": catalog_version,
+        "mode": result.mode,
+        "candidate_count": result.candidate_count,
+        "elapsed_ms": result.elapsed_ms,
+        "items": [
+            {
+                "perfume_id": item.perfume_id,
+                "name": item.name,
+                "url": item.url,
+                "score": item.score,
+                "matched_notes": item.matched_notes,
+                "matched_families": item.matched_families,
+                "similar_to_owned": item.similar_to_owned,
+            }
+            for item in result.items
+        ],
+    }
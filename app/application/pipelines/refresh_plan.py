@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from app.infrastructure.persistence.sqlite.perfume_repo_sqlite import PerfumeScrapeState
+from app.infrastructure.scraping.parsers.listing_parser import ListingProduct
+
+_NEVER = datetime.min.replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class RefreshPolicy:
+    max_age: timedelta = timedelta(days=7)
+    max_stale_fetches: int | None = None
+    price_tolerance: float = 0.005
+
+
+@dataclass(frozen=True)
+class RefreshPlan:
+    new_urls: tuple[str, ...]
+    changed_urls: tuple[str, ...]
+    stale_urls: tuple[str, ...]
+    fresh_urls: tuple[str, ...]
+    vanished_perfume_ids: tuple[str, ...]
+    reappeared_perfume_ids: tuple[str, ...]
+
+    @property
+    def urls_to_fetch(self) -> tuple[str, ...]:
+        return self.new_urls + self.changed_urls + self.stale_urls
+
+
+def plan_refresh(
+    discovered_products: dict[str, ListingProduct],
+    stored_states: Iterable[PerfumeScrapeState],
+    now: datetime,
+    policy: RefreshPolicy,
+    listing_complete: bool = True,
+) -> RefreshPlan:
+    """Decide which discovered products need a product-page fetch.
+
+    New (or reappeared) URLs and products whose listing name or price moved are
+    always fetched. Others are fetched once `last_scraped_at` is older than
+    `policy.max_age`, oldest first and capped at `policy.max_stale_fetches`.
+    Stored products missing from the listings are reported as vanished, but
+    only when the listing crawl finished (`listing_complete`). Naive
+    timestamps (older rows, callers without a tzinfo) are taken as UTC.
+    """
+    now = _as_utc(now)
+    stored_by_url = {state.url: state for state in stored_states}
+    new_urls: list[str] = []
+    changed_urls: list[str] = []
+    stale: list[tuple[datetime, str]] = []
+    fresh_urls: list[str] = []
+    reappeared_ids: list[str] = []
+
+    for url, summary in discovered_products.items():
+        state = stored_by_url.get(url)
+        if state is None:
+            new_urls.append(url)
+            continue
+        if state.vanished_at is not None:
+            reappeared_ids.append(state.perfume_id)
+            new_urls.append(url)
+        elif _listing_changed(summary, state, policy.price_tolerance):
+            changed_urls.append(url)
+        elif state.last_scraped_at is None or now - _as_utc(state.last_scraped_at) >= policy.max_age:
+            last_scraped_at = _as_utc(state.last_scraped_at) if state.last_scraped_at else _NEVER
+            stale.append((last_scraped_at, url))
+        else:
+            fresh_urls.append(url)
+
+    stale.sort()
+    budget = len(stale) if policy.max_stale_fetches is None else policy.max_stale_fetches
+    stale_urls = [url for _, url in stale[:budget]]
+    fresh_urls.extend(url for _, url in stale[budget:])
+
+    vanished_ids: list[str] = []
+    if listing_complete:
+        vanished_ids = [
+            state.perfume_id
+            for url, state in stored_by_url.items()
+            if url not in discovered_products and state.vanished_at is None
+        ]
+
+    return RefreshPlan(
+        new_urls=tuple(new_urls),
+        changed_urls=tuple(changed_urls),
+        stale_urls=tuple(stale_urls),
+        fresh_urls=tuple(fresh_urls),
+        vanished_perfume_ids=tuple(vanished_ids),
+        reappeared_perfume_ids=tuple(reappeared_ids),
+    )
+
+
+def _listing_changed(summary: ListingProduct, state: PerfumeScrapeState, price_tolerance: float) -> bool:
+    if summary.name != state.name:
+        return True
+    return _price_changed(summary.price_min, state.price_min, price_tolerance) or _price_changed(
+        summary.price_max, state.price_max, price_tolerance
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _price_changed(listed: float | None, stored: float | None, tolerance: float) -> bool:
+    if listed is None or stored is None:
+        return listed is not stored
+    return abs(listed - stored) > tolerance * max(abs(stored), 1.0)
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable, Iterable, Iterator
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, replace
+import gzip
+import logging
+import os
+from pathlib import Path
+import sqlite3
+import sys
+import time
+
+from app.application.pipelines.scrape_pipeline import perfume_id_from_url
+from app.config.logging import (
+    REPARSE_RUN_END,
+    REPARSE_RUN_START,
+    SCRAPE_PARSE_FAILED,
+    get_logger,
+    log_event,
+)
+from app.domain.models.perfume import Perfume
+from app.infrastructure.persistence.sqlite.html_snapshot_store import HtmlSnapshotStore
+from app.infrastructure.persistence.sqlite.perfume_repo_sqlite import PerfumeRepositorySqlite
+from app.infrastructure.scraping.parsers.product_parser import (
+    ProductPageData,
+    parse_product_page,
+)
+
+_PARSED_FIELDS = (
+    "description",
+    "notes_top",
+    "notes_middle",
+    "notes_base",
+    "gender_tags",
+    "scent_families",
+    "molecule_tags",
+    "image_urls",
+)
+
+
+@dataclass(frozen=True)
+class PerfumeChange:
+    perfume_id: str
+    changed_fields: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ReparseResult:
+    parsed_count: int
+    changes: tuple[PerfumeChange, ...]
+    unchanged_count: int
+    skipped_perfume_ids: tuple[str, ...]
+    failed_perfume_ids: tuple[str, ...]
+    elapsed_seconds: float
+    pages_per_second: float
+
+
+class ReparsePipeline:
+    """Re-parse saved product pages in parallel and upsert what changed.
+
+    Pages are parsed in chunks on a process pool; only perfumes that already
+    exist in the repository are updated (listing data such as name and price
+    is not part of a product page). At most `2 * max_workers` chunks are in
+    flight, so pages are read only a little ahead of the parsers.
+    """
+
+    def __init__(
+        self,
+        perfume_repository,
+        base_url: str,
+        max_workers: int | None = None,
+        chunk_size: int = 64,
+        executor_factory: Callable[[int | None], Executor] = ProcessPoolExecutor,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.perfume_repository = perfume_repository
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.executor_factory = executor_factory
+        self.logger = logger or get_logger("app.application.pipelines.reparse_pipeline")
+
+    def run_directory(self, source_dir: str | Path) -> ReparseResult:
+        return self.run(_iter_directory_pages(Path(source_dir)))
+
+    def run_archive(self, snapshot_store: HtmlSnapshotStore) -> ReparseResult:
+        return self.run(_iter_archive_pages(snapshot_store))
+
+    def run(self, pages: Iterable[tuple[str, str]]) -> ReparseResult:
+        """Parse `(perfume_id, html)` pages and write back changed perfumes."""
+        log_event(self.logger, REPARSE_RUN_START, base_url=self.base_url, max_workers=self.max_workers)
+        started_at = time.perf_counter()
+        changes: list[PerfumeChange] = []
+        skipped: list[str] = []
+        failed: list[str] = []
+        parsed_count = 0
+        unchanged_count = 0
+
+        for parsed_chunk in self._parse_chunks(_chunked(pages, self.chunk_size)):
+            existing = self.perfume_repository.get_perfumes(
+                tuple(perfume_id for perfume_id, _ in parsed_chunk)
+            )
+            updated: list[Perfume] = []
+
+            for perfume_id, product_data in parsed_chunk:
+                if product_data is None:
+                    failed.append(perfume_id)
+                    log_event(
+                        self.logger,
+                        SCRAPE_PARSE_FAILED,
+                        level=logging.WARNING,
+                        stage="reparse",
+                        perfume_id=perfume_id,
+                    )
+                    continue
+
+                parsed_count += 1
+                current = existing.get(perfume_id)
+                if current is None:
+                    skipped.append(perfume_id)
+                    continue
+
+                merged = _merge_product_data(current, product_data)
+                changed_fields = _changed_fields(current, merged)
+                if not changed_fields:
+                    unchanged_count += 1
+                    continue
+
+                updated.append(merged)
+                changes.append(PerfumeChange(perfume_id=perfume_id, changed_fields=changed_fields))
+
+            if updated:
+                self.perfume_repository.upsert_perfumes(tuple(updated))
+
+        elapsed = time.perf_counter() - started_at
+        pages_per_second = round(parsed_count / elapsed, 2) if elapsed > 0 else 0.0
+        log_event(
+            self.logger,
+            REPARSE_RUN_END,
+            parsed_count=parsed_count,
+            changed_count=len(changes),
+            skipped_count=len(skipped),
+            failed_count=len(failed),
+            pages_per_second=pages_per_second,
+        )
+
+        return ReparseResult(
+            parsed_count=parsed_count,
+            changes=tuple(changes),
+            unchanged_count=unchanged_count,
+            skipped_perfume_ids=tuple(skipped),
+            failed_perfume_ids=tuple(failed),
+            elapsed_seconds=round(elapsed, 4),
+            pages_per_second=pages_per_second,
+        )
+
+    def _parse_chunks(
+        self, chunks: Iterator[list[tuple[str, str]]]
+    ) -> Iterator[list[tuple[str, ProductPageData | None]]]:
+        if self.max_workers == 1:
+            for chunk in chunks:
+                yield _parse_chunk(self.base_url, chunk)
+            return
+
+        window = 2 * (self.max_workers or os.cpu_count() or 1)
+        with self.executor_factory(self.max_workers) as executor:
+            in_flight: deque[Future] = deque()
+            for chunk in chunks:
+                in_flight.append(executor.submit(_parse_chunk, self.base_url, chunk))
+                if len(in_flight) >= window:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+
+def _parse_chunk(
+    base_url: str, pages: list[tuple[str, str]]
+) -> list[tuple[str, ProductPageData | None]]:
+    parsed: list[tuple[str, ProductPageData | None]] = []
+    for perfume_id, html in pages:
+        try:
+            parsed.append((perfume_id, parse_product_page(html, base_url)))
+        except Exception:
+            parsed.append((perfume_id, None))
+    return parsed
+
+
+def _changed_fields(before: Perfume, after: Perfume) -> tuple[str, ...]:
+    return tuple(
+        field_name
+        for field_name in _PARSED_FIELDS
+        if getattr(before, field_name) != getattr(after, field_name)
+    )
+
+
+def _merge_product_data(perfume: Perfume, product_data: ProductPageData) -> Perfume:
+    return replace(
+        perfume,
+        **{field_name: getattr(product_data, field_name) for field_name in _PARSED_FIELDS},
+    )
+
+
+def _iter_directory_pages(source_dir: Path) -> Iterator[tuple[str, str]]:
+    for path in sorted(source_dir.iterdir()):
+        if path.name.endswith(".html.gz"):
+            yield path.name[: -len(".html.gz")], gzip.decompress(path.read_bytes()).decode("utf-8")
+        elif path.suffix == ".html":
+            yield path.stem, path.read_text(encoding="utf-8")
+
+
+def _iter_archive_pages(snapshot_store: HtmlSnapshotStore) -> Iterator[tuple[str, str]]:
+    for snapshot in snapshot_store.iter_latest():
+        if "/products/" not in snapshot.url:
+            continue
+        yield perfume_id_from_url(snapshot.url), snapshot_store.load(snapshot.content_hash)
+
+
+def _chunked(pages: Iterable[tuple[str, str]], chunk_size: int) -> Iterator[list[tuple[str, str]]]:
+    chunk: list[tuple[str, str]] = []
+    for page in pages:
+        chunk.append(page)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-parse saved product HTML into the catalog.")
+    parser.add_argument("--db", required=True, help="SQLite catalog database path")
+    parser.add_argument("--base-url", required=True)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--html-dir", help="directory of <perfume_id>.html[.gz] files")
+    source.add_argument("--archive-dir", help="HtmlSnapshotStore blob directory (index in --db)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    connection = sqlite3.connect(args.db)
+    try:
+        pipeline = ReparsePipeline(
+            perfume_repository=PerfumeRepositorySqlite(connection),
+            base_url=args.base_url,
+            max_workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+        if args.html_dir:
+            result = pipeline.run_directory(args.html_dir)
+        else:
+            result = pipeline.run_archive(HtmlSnapshotStore(connection, args.archive_dir))
+    finally:
+        connection.close()
+
+    print(f"parsed {result.parsed_count} pages in {result.elapsed_seconds}s ({result.pages_per_second} pages/s)")
+    print(f"changed {len(result.changes)}, unchanged {result.unchanged_count}, "
+          f"skipped {len(result.skipped_perfume_ids)}, failed {len(result.failed_perfume_ids)}")
+    for change in result.changes:
+        print(f"  {change.perfume_id}: {', '.join(change.changed_fields)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,49 @@
 from __future__ import annotations
 
+from collections import deque
 import logging
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import time
+from typing import Callable
+from urllib import error
 from urllib.parse import urljoin, urlparse
 
+from app.application.pipelines.refresh_plan import RefreshPlan, RefreshPolicy, plan_refresh
 from app.config.logging import (
     SCRAPE_PARSE_FAILED,
+    SCRAPE_REFRESH_PLANNED,
     SCRAPE_RUN_END,
     SCRAPE_RUN_START,
     SCRAPE_URL_FAILED,
     SCRAPE_URL_FETCHED,
+    SCRAPE_URL_RETRY_SCHEDULED,
+    LazyField,
     get_logger,
     log_event,
 )
+from app.config.metrics import (
+    COUNTER_PAGES_FETCHED,
+    GAUGE_PAGES_PER_SECOND,
+    STAGE_FETCH,
+    STAGE_PARSE,
+    STAGE_UPSERT,
+    MetricsCollector,
+    MetricsSummary,
+)
 from app.domain.models.perfume import Perfume
+from app.infrastructure.persistence.sqlite.crawl_frontier_sqlite import CrawlFrontierSqlite, FrontierEntry
+from app.infrastructure.persistence.sqlite.html_snapshot_store import HtmlSnapshotStore
 from app.infrastructure.scraping.parsers.listing_parser import (
+    ListingProduct,
     parse_listing_products,
     parse_pagination_urls,
 )
-from app.infrastructure.scraping.parsers.product_parser import parse_product_page
+from app.infrastructure.scraping.client import is_retryable_error, retry_after_seconds
+from app.infrastructure.scraping.parsers.product_parser import ProductPageData, parse_product_page
+from app.infrastructure.scraping.retry_scheduler import RetryScheduler
+
+_THROTTLE_STATUSES = {429, 503}
 
 
 @dataclass(frozen=True)
@@ -28,9 +52,41 @@ class ScrapePipelineResult:
     scraped_count: int
     failed_listing_urls: tuple[str, ...]
     failed_product_urls: tuple[str, ...]
+    retried_count: int = 0
+    permanently_failed_count: int = 0
+    skipped_fresh_count: int = 0
+    vanished_perfume_ids: tuple[str, ...] = ()
+    metrics: MetricsSummary | None = None
+
+
+@dataclass
+class _CrawlState:
+    listing_queue: deque[str]
+    visited_listing_urls: set[str] = field(default_factory=set)
+    products: dict[str, ListingProduct] = field(default_factory=dict)
+    pending_product_urls: list[str] | None = None
+    failed_listing_urls: list[str] = field(default_factory=list)
+    failed_product_urls: list[str] = field(default_factory=list)
+    scraped_count: int = 0
 
 
 class ScrapePipeline:
+    """Crawl listing pages, then fetch, parse and upsert every discovered product.
+
+    With a `retry_scheduler`, product fetches that fail transiently (429/5xx,
+    network errors, timeouts) are re-queued with backoff while other URLs keep
+    going; those fetches ask the HTTP client not to retry inline, so a failure
+    is never both slept on and rescheduled. Listing fetches keep inline retries.
+
+    With a `frontier` (see `CrawlFrontierSqlite`), crawl progress is
+    checkpointed as it goes and an interrupted crawl can continue via `resume()`.
+    Offline reparses read the frontier (`resume(offline=True)`) but never
+    write it, so they cannot wipe or advance an online crawl's checkpoint.
+
+    `catalog_publisher` is called once a run has changed the catalog, e.g.
+    `publish_catalog_version` so running API servers reload it.
+    """
+
     def __init__(
         self,
         http_client,
@@ -39,6 +95,12 @@ class ScrapePipeline:
         base_url: str,
         max_listing_pages: int = 50,
         logger: logging.Logger | None = None,
+        snapshot_store: HtmlSnapshotStore | None = None,
+        retry_scheduler: RetryScheduler | None = None,
+        sleep_func: Callable[[float], None] = time.sleep,
+        frontier: CrawlFrontierSqlite | None = None,
+        metrics: MetricsCollector | None = None,
+        catalog_publisher: Callable[[], object] | None = None,
     ) -> None:
         self.http_client = http_client
         self.access_guard = access_guard
@@ -46,17 +108,92 @@ class ScrapePipeline:
         self.base_url = base_url
         self.max_listing_pages = max_listing_pages
         self.logger = logger or get_logger("app.application.pipelines.scrape_pipeline")
+        self.snapshot_store = snapshot_store
+        self.retry_scheduler = retry_scheduler
+        self.sleep_func = sleep_func
+        self.frontier = frontier
+        self.metrics = metrics or MetricsCollector()
+        self.catalog_publisher = catalog_publisher
+
+    def run(
+        self, seed_listing_urls: tuple[str, ...], offline: bool = False
+    ) -> ScrapePipelineResult:
+        """Crawl listings and products; with `offline=True` re-parse archived HTML only."""
+        if offline and self.snapshot_store is None:
+            raise ValueError("offline reparse requires a snapshot_store")
 
-    def run(self, seed_listing_urls: tuple[str, ...]) -> ScrapePipelineResult:
+        seeds = [urljoin(self.base_url, url) for url in seed_listing_urls]
+        if self.frontier is not None and not offline:
+            self.frontier.reset(seeds)
         log_event(
             self.logger,
             SCRAPE_RUN_START,
             seed_listing_count=len(seed_listing_urls),
             base_url=self.base_url,
+            offline=offline,
         )
-        discovered, failed_listing = self._collect_listing_products(seed_listing_urls)
-        scraped_count, failed_products = self._scrape_products(discovered)
-        success_rate = _compute_success_rate(scraped_count, len(discovered))
+        return self._crawl(_CrawlState(listing_queue=deque(seeds)), offline)
+
+    def refresh(
+        self, seed_listing_urls: tuple[str, ...], policy: RefreshPolicy | None = None
+    ) -> ScrapePipelineResult:
+        """Crawl listings, but fetch only new, changed or stale products (see `plan_refresh`)."""
+        seeds = [urljoin(self.base_url, url) for url in seed_listing_urls]
+        if self.frontier is not None:
+            self.frontier.reset(seeds)
+        log_event(
+            self.logger,
+            SCRAPE_RUN_START,
+            seed_listing_count=len(seed_listing_urls),
+            base_url=self.base_url,
+            offline=False,
+            refresh=True,
+        )
+        return self._crawl(
+            _CrawlState(listing_queue=deque(seeds)), False, refresh_policy=policy or RefreshPolicy()
+        )
+
+    def resume(self, offline: bool = False) -> ScrapePipelineResult:
+        """Continue the crawl recorded in `frontier` from its last checkpoint."""
+        if self.frontier is None:
+            raise ValueError("resume requires a frontier")
+        if offline and self.snapshot_store is None:
+            raise ValueError("offline reparse requires a snapshot_store")
+
+        state = self._state_from_frontier(offline)
+        log_event(
+            self.logger,
+            SCRAPE_RUN_START,
+            seed_listing_count=len(state.listing_queue),
+            base_url=self.base_url,
+            offline=offline,
+            resumed=True,
+            resumed_product_count=len(state.products),
+        )
+        return self._crawl(state, offline)
+
+    def _crawl(
+        self, state: _CrawlState, offline: bool, refresh_policy: RefreshPolicy | None = None
+    ) -> ScrapePipelineResult:
+        started_at = time.perf_counter()
+        pages_before = self.metrics.counter(COUNTER_PAGES_FETCHED)
+        self._collect_listing_products(state, offline)
+        plan = self._plan_refresh(state, refresh_policy) if refresh_policy is not None else None
+        scraped_count, failed_products, retried_count, permanently_failed_count = (
+            self._scrape_products(state.products, offline, state.pending_product_urls)
+        )
+        scraped_count += state.scraped_count
+        failed_products = state.failed_product_urls + failed_products
+        if self.frontier is not None and not offline:
+            self.frontier.checkpoint()
+        if self.snapshot_store is not None and not offline:
+            self.snapshot_store.flush()
+        discovered = state.products
+        failed_listing = state.failed_listing_urls
+        skipped_fresh_count = len(plan.fresh_urls) if plan is not None else 0
+        success_rate = _compute_success_rate(scraped_count, len(discovered) - skipped_fresh_count)
+        pages_per_second = self._record_throughput(started_at, pages_before)
+        self._publish_catalog(scraped_count, plan.vanished_perfume_ids if plan is not None else ())
 
         log_event(
             self.logger,
@@ -65,7 +202,9 @@ class ScrapePipeline:
             scraped_count=scraped_count,
             failed_listing_count=len(failed_listing),
             failed_product_count=len(failed_products),
+            retried_count=retried_count,
             success_rate=success_rate,
+            pages_per_second=pages_per_second,
         )
 
         return ScrapePipelineResult(
@@ -73,28 +212,100 @@ class ScrapePipeline:
             scraped_count=scraped_count,
             failed_listing_urls=tuple(failed_listing),
             failed_product_urls=tuple(failed_products),
+            retried_count=retried_count,
+            permanently_failed_count=permanently_failed_count,
+            skipped_fresh_count=skipped_fresh_count,
+            vanished_perfume_ids=plan.vanished_perfume_ids if plan is not None else (),
+            metrics=self.metrics.summary(),
         )
 
-    def _collect_listing_products(
-        self, seed_listing_urls: tuple[str, ...]
-    ) -> tuple[dict[str, object], list[str]]:
-        queue = [urljoin(self.base_url, url) for url in seed_listing_urls]
-        visited: set[str] = set()
-        products: dict[str, object] = {}
-        failed: list[str] = []
+    def _publish_catalog(self, scraped_count: int, vanished_perfume_ids: tuple[str, ...]) -> None:
+        if self.catalog_publisher is not None and (scraped_count or vanished_perfume_ids):
+            self.catalog_publisher()
+
+    def _record_throughput(self, started_at: float, pages_before: float) -> float:
+        elapsed = time.perf_counter() - started_at
+        pages = self.metrics.counter(COUNTER_PAGES_FETCHED) - pages_before
+        pages_per_second = round(pages / elapsed, 2) if elapsed > 0 else 0.0
+        self.metrics.set_gauge(GAUGE_PAGES_PER_SECOND, pages_per_second)
+        return pages_per_second
+
+    def _plan_refresh(self, state: _CrawlState, policy: RefreshPolicy) -> RefreshPlan:
+        now = datetime.now(tz=timezone.utc)
+        plan = plan_refresh(
+            state.products,
+            self.perfume_repository.list_scrape_states(),
+            now,
+            policy,
+            listing_complete=not state.failed_listing_urls and not state.listing_queue,
+        )
+        state.pending_product_urls = list(plan.urls_to_fetch)
+        for url in plan.fresh_urls:
+            self._record_frontier("mark_done", url)
+        if plan.vanished_perfume_ids:
+            self.perfume_repository.mark_vanished(plan.vanished_perfume_ids, now)
+        if plan.reappeared_perfume_ids:
+            self.perfume_repository.clear_vanished(plan.reappeared_perfume_ids)
+
+        log_event(
+            self.logger,
+            SCRAPE_REFRESH_PLANNED,
+            new_count=len(plan.new_urls),
+            changed_count=len(plan.changed_urls),
+            stale_count=len(plan.stale_urls),
+            fresh_count=len(plan.fresh_urls),
+            vanished_count=len(plan.vanished_perfume_ids),
+        )
+        return plan
+
+    def _state_from_frontier(self, offline: bool) -> _CrawlState:
+        state = _CrawlState(listing_queue=deque(), pending_product_urls=[])
+        for entry in self.frontier.entries():
+            if entry.stage == "listing":
+                if entry.status == "pending":
+                    state.listing_queue.append(entry.url)
+                    continue
+                state.visited_listing_urls.add(entry.url)
+                if entry.status == "failed":
+                    state.failed_listing_urls.append(entry.url)
+                continue
+
+            state.products[entry.url] = ListingProduct(**entry.payload)
+            if entry.status == "done":
+                state.scraped_count += 1
+            elif entry.status == "failed":
+                state.failed_product_urls.append(entry.url)
+            elif not self._defer_until(entry, offline):
+                state.pending_product_urls.append(entry.url)
+        return state
+
+    def _defer_until(self, entry: FrontierEntry, offline: bool) -> bool:
+        """Hand a product back to the retry scheduler if its retry was not due yet."""
+        if offline or self.retry_scheduler is None or entry.next_attempt_at is None:
+            return False
+        remaining = (entry.next_attempt_at - datetime.now(tz=timezone.utc)).total_seconds()
+        if remaining <= 0:
+            return False
+        return self.retry_scheduler.schedule(entry.url, remaining) is not None
+
+    def _collect_listing_products(self, state: _CrawlState, offline: bool = False) -> None:
+        queue = state.listing_queue
+        visited = state.visited_listing_urls
 
         while queue and len(visited) < self.max_listing_pages:
-            listing_url = queue.pop(0)
+            listing_url = queue.popleft()
             if listing_url in visited:
                 continue
             visited.add(listing_url)
 
             try:
-                listing_html = self._fetch_html(listing_url)
-                listing_products = parse_listing_products(listing_html, self.base_url)
-                pagination_urls = parse_pagination_urls(listing_html, self.base_url)
+                listing_html = self._fetch_html(listing_url, offline)
+                with self.metrics.timer(STAGE_PARSE):
+                    listing_products = parse_listing_products(listing_html, self.base_url)
+                    pagination_urls = parse_pagination_urls(listing_html, self.base_url)
             except Exception as exc:
-                failed.append(listing_url)
+                state.failed_listing_urls.append(listing_url)
+                self._record_frontier("mark_failed", listing_url, offline=offline)
                 log_event(
                     self.logger,
                     SCRAPE_PARSE_FAILED,
@@ -106,29 +317,62 @@ class ScrapePipeline:
                 continue
 
             for product in listing_products:
-                products.setdefault(product.url, product)
+                if product.url not in state.products:
+                    state.products[product.url] = product
+                    if state.pending_product_urls is not None:
+                        state.pending_product_urls.append(product.url)
+                    self._record_frontier(
+                        "add", product.url, "product", _summary_payload(product), offline=offline
+                    )
 
             for page_url in pagination_urls:
                 if page_url not in visited:
                     queue.append(page_url)
-
-        return products, failed
+                    self._record_frontier("add", page_url, "listing", offline=offline)
+            self._record_frontier("mark_done", listing_url, offline=offline)
 
     def _scrape_products(
-        self, discovered_products: dict[str, object]
-    ) -> tuple[int, list[str]]:
+        self,
+        discovered_products: dict[str, ListingProduct],
+        offline: bool = False,
+        pending_urls: list[str] | None = None,
+    ) -> tuple[int, list[str], int, int]:
+        scheduler = None if offline else self.retry_scheduler
+        pending = deque(discovered_products if pending_urls is None else pending_urls)
         failed: list[str] = []
         scraped_count = 0
+        retried_count = 0
+        permanently_failed_count = 0
+
+        while pending or (scheduler is not None and len(scheduler)):
+            product_url = _next_product_url(pending, scheduler)
+            if product_url is None:
+                self.sleep_func(scheduler.next_ready_in())
+                continue
 
-        for product_url, product_summary in discovered_products.items():
             try:
-                product_html = self._fetch_html(product_url)
-                product_data = parse_product_page(product_html, self.base_url)
-                perfume = _build_perfume(product_summary, product_data)
-                self.perfume_repository.upsert_perfume(perfume)
+                if offline:
+                    # A reparse is as fresh as the snapshot it reads, so refresh() still refetches it when due.
+                    product_html, scraped_at = self._load_archived_page(product_url)
+                else:
+                    product_html = self._fetch_html(product_url, inline_retry=scheduler is None)
+                    scraped_at = datetime.now(tz=timezone.utc)
+                with self.metrics.timer(STAGE_PARSE):
+                    product_data = parse_product_page(product_html, self.base_url)
+                perfume = _build_perfume(discovered_products[product_url], product_data, scraped_at)
+                with self.metrics.timer(STAGE_UPSERT):
+                    self.perfume_repository.upsert_perfume(perfume)
                 scraped_count += 1
+                self._record_frontier("mark_done", product_url, offline=offline)
             except Exception as exc:
+                if scheduler is not None and is_retryable_error(exc):
+                    if self._schedule_retry(scheduler, product_url, exc):
+                        retried_count += 1
+                        continue
+                    permanently_failed_count += 1
+
                 failed.append(product_url)
+                self._record_frontier("mark_failed", product_url, offline=offline)
                 log_event(
                     self.logger,
                     SCRAPE_PARSE_FAILED,
@@ -138,13 +382,37 @@ class ScrapePipeline:
                     error_type=type(exc).__name__,
                 )
 
-        return scraped_count, failed
+        return scraped_count, failed, retried_count, permanently_failed_count
+
+    def _schedule_retry(self, scheduler: RetryScheduler, url: str, exc: Exception) -> bool:
+        retry = scheduler.schedule(url, retry_after_seconds(exc))
+        if retry is None:
+            return False
+        delay = max(retry.ready_at - scheduler.time_func(), 0.0)
+        self._record_frontier("mark_retry", url, datetime.now(tz=timezone.utc) + timedelta(seconds=delay))
+        log_event(
+            self.logger,
+            SCRAPE_URL_RETRY_SCHEDULED,
+            url=url,
+            attempt=retry.attempt,
+            error_type=type(exc).__name__,
+        )
+        return True
+
+    def _record_frontier(self, method: str, *args: object, offline: bool = False) -> None:
+        if self.frontier is not None and not offline:
+            getattr(self.frontier, method)(*args)
+
+    def _fetch_html(self, url: str, offline: bool = False, inline_retry: bool = True) -> str:
+        if offline:
+            return self._load_archived_page(url)[0]
 
-    def _fetch_html(self, url: str) -> str:
         try:
             self.access_guard.enforce(url)
-            response = self.http_client.fetch(url)
+            with self.metrics.timer(STAGE_FETCH):
+                response = self.http_client.fetch(url, retry=inline_retry)
         except Exception as exc:
+            self._report_throttling(url, exc)
             log_event(
                 self.logger,
                 SCRAPE_URL_FAILED,
@@ -159,16 +427,75 @@ class ScrapePipeline:
             SCRAPE_URL_FETCHED,
             url=url,
             status_code=response.status_code,
-            content_length=len(response.text),
+            content_length=LazyField(lambda: len(response.text)),
         )
+        self.metrics.increment(COUNTER_PAGES_FETCHED)
+        self._archive_html(url, response.text)
         return response.text
 
+    def _archive_html(self, url: str, html: str) -> None:
+        if self.snapshot_store is not None:
+            self.snapshot_store.save(url, html)
+
+    def _report_throttling(self, url: str, exc: Exception) -> None:
+        if not isinstance(exc, error.HTTPError) or exc.code not in _THROTTLE_STATUSES:
+            return
+        report_throttled = getattr(self.access_guard, "report_throttled", None)
+        if report_throttled is None:
+            return
+        report_throttled(url, retry_after_seconds(exc))
+
+    def _load_archived_page(self, url: str) -> tuple[str, datetime]:
+        snapshot = self.snapshot_store.latest(url)
+        if snapshot is None:
+            log_event(
+                self.logger,
+                SCRAPE_URL_FAILED,
+                level=logging.WARNING,
+                url=url,
+                error_type="SnapshotMissing",
+                source="archive",
+            )
+            raise LookupError(f"no archived snapshot for url: {url}")
+
+        html = self.snapshot_store.load(snapshot.content_hash)
+        log_event(
+            self.logger,
+            SCRAPE_URL_FETCHED,
+            url=url,
+            content_length=LazyField(lambda: len(html)),
+            source="archive",
+        )
+        self.metrics.increment(COUNTER_PAGES_FETCHED)
+        return html, snapshot.fetched_at
+
+
+def _next_product_url(pending: deque[str], scheduler: RetryScheduler | None) -> str | None:
+    if scheduler is not None:
+        retry = scheduler.pop_ready()
+        if retry is not None:
+            return retry.url
+    if pending:
+        return pending.popleft()
+    return None
+
+
+def _summary_payload(product_summary: ListingProduct) -> dict[str, object]:
+    return {
+        "name": product_summary.name,
+        "url": product_summary.url,
+        "price_min": product_summary.price_min,
+        "price_max": product_summary.price_max,
+    }
+
 
-def _build_perfume(product_summary, product_data) -> Perfume:
+def _build_perfume(
+    product_summary: ListingProduct, product_data: ProductPageData, scraped_at: datetime
+) -> Perfume:
     perfume_url = product_summary.url
 
     return Perfume(
-        perfume_id=_perfume_id_from_url(perfume_url),
+        perfume_id=perfume_id_from_url(perfume_url),
         name=product_summary.name,
         url=perfume_url,
         price_min=product_summary.price_min,
@@ -181,11 +508,12 @@ def _build_perfume(product_summary, product_data) -> Perfume:
         notes_base=product_data.notes_base,
         description=product_data.description,
         image_urls=product_data.image_urls,
-        last_scraped_at=datetime.now(tz=timezone.utc),
+        last_scraped_at=scraped_at,
     )
 
 
-def _perfume_id_from_url(url: str) -> str:
+def perfume_id_from_url(url: str) -> str:
+    """The product slug of a product URL (the path segment after `/products/`, else the last one)."""
     parts = [part for part in urlparse(url).path.split("/") if part]
     if "products" in parts:
         index = parts.index("products")
@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import logging
+import queue
+import threading
+import time
+from typing import Callable
+from urllib.parse import urljoin
+
+from app.application.pipelines.scrape_pipeline import (
+    ScrapePipeline,
+    ScrapePipelineResult,
+    _build_perfume,
+    _compute_success_rate,
+)
+from app.config.logging import (
+    SCRAPE_PARSE_FAILED,
+    SCRAPE_RUN_END,
+    SCRAPE_RUN_START,
+    log_event,
+)
+from app.config.metrics import COUNTER_PAGES_FETCHED, STAGE_PARSE, STAGE_UPSERT, MetricsCollector
+from app.domain.models.perfume import Perfume
+from app.infrastructure.persistence.sqlite.html_snapshot_store import HtmlSnapshotStore
+from app.infrastructure.scraping.parsers.listing_parser import (
+    ListingProduct,
+    parse_listing_products,
+    parse_pagination_urls,
+)
+from app.infrastructure.scraping.parsers.product_parser import ProductPageData, parse_product_page
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+@dataclass(frozen=True)
+class _FetchedProduct:
+    url: str
+    summary: ListingProduct
+    product_data: ProductPageData | Future | None
+    scraped_at: datetime | None = None
+    error_type: str | None = None
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    url: str
+    html: str
+
+
+@dataclass
+class _RobotsLookup:
+    url: str
+    done: threading.Event = field(default_factory=threading.Event)
+    error: Exception | None = None
+
+
+class StagedScrapePipeline(ScrapePipeline):
+    """ScrapePipeline whose listing, fetch, parse and write stages overlap.
+
+    A listing thread feeds discovered products into a bounded queue as soon
+    as each listing page is parsed; `fetch_workers` threads fetch them (and
+    hand parsing to `parse_executor`, e.g. a process pool, when given); the
+    caller's thread batches upserts and snapshot writes, which keeps every
+    SQLite call on the connection's own thread. That includes the robots.txt
+    cache: a worker meeting an origin whose rules are not loaded yet hands
+    the lookup to the caller's thread and waits for it. Full queues block the
+    stage upstream, so memory stays bounded by `queue_size`.
+
+    Only online `run` is staged; `refresh`, `resume` and offline runs fall
+    back to the sequential implementation.
+    """
+
+    def __init__(
+        self,
+        http_client,
+        access_guard,
+        perfume_repository,
+        base_url: str,
+        max_listing_pages: int = 50,
+        logger: logging.Logger | None = None,
+        snapshot_store: HtmlSnapshotStore | None = None,
+        fetch_workers: int = 4,
+        queue_size: int = 64,
+        write_batch_size: int = 50,
+        parse_executor: Executor | None = None,
+        metrics: MetricsCollector | None = None,
+        catalog_publisher: Callable[[], object] | None = None,
+    ) -> None:
+        super().__init__(
+            http_client,
+            access_guard,
+            perfume_repository,
+            base_url,
+            max_listing_pages=max_listing_pages,
+            logger=logger,
+            snapshot_store=snapshot_store,
+            metrics=metrics,
+            catalog_publisher=catalog_publisher,
+        )
+        self.fetch_workers = fetch_workers
+        self.queue_size = queue_size
+        self.write_batch_size = write_batch_size
+        self.parse_executor = parse_executor
+        self._write_queue: queue.Queue | None = None
+        self._stop: threading.Event | None = None
+
+    def run(
+        self, seed_listing_urls: tuple[str, ...], offline: bool = False
+    ) -> ScrapePipelineResult:
+        if offline:
+            return super().run(seed_listing_urls, offline=True)
+
+        log_event(
+            self.logger,
+            SCRAPE_RUN_START,
+            seed_listing_count=len(seed_listing_urls),
+            base_url=self.base_url,
+            offline=False,
+            fetch_workers=self.fetch_workers,
+        )
+        started_at = time.perf_counter()
+        pages_before = self.metrics.counter(COUNTER_PAGES_FETCHED)
+        seeds = [urljoin(self.base_url, url) for url in seed_listing_urls]
+        product_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        write_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        discovered: dict[str, ListingProduct] = {}
+        failed_listing: list[str] = []
+
+        for url in [self.base_url, *seeds]:
+            self._resolve_robots(url)
+        self._write_queue = write_queue
+        self._stop = stop
+        threads = [
+            threading.Thread(
+                target=self._discover_listings,
+                args=(seeds, product_queue, discovered, failed_listing, stop),
+                name="scrape-listings",
+                daemon=True,
+            )
+        ]
+        threads.extend(
+            threading.Thread(
+                target=self._fetch_products,
+                args=(product_queue, write_queue, stop),
+                name=f"scrape-fetch-{index}",
+                daemon=True,
+            )
+            for index in range(self.fetch_workers)
+        )
+        for thread in threads:
+            thread.start()
+        try:
+            scraped_count, failed_products = self._write_results(write_queue, threads[1:])
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            self._write_queue = None
+            self._stop = None
+
+        if self.snapshot_store is not None:
+            self.snapshot_store.flush()
+        success_rate = _compute_success_rate(scraped_count, len(discovered))
+        pages_per_second = self._record_throughput(started_at, pages_before)
+        self._publish_catalog(scraped_count, ())
+        log_event(
+            self.logger,
+            SCRAPE_RUN_END,
+            discovered_product_count=len(discovered),
+            scraped_count=scraped_count,
+            failed_listing_count=len(failed_listing),
+            failed_product_count=len(failed_products),
+            success_rate=success_rate,
+            pages_per_second=pages_per_second,
+        )
+
+        return ScrapePipelineResult(
+            discovered_product_urls=tuple(discovered.keys()),
+            scraped_count=scraped_count,
+            failed_listing_urls=tuple(failed_listing),
+            failed_product_urls=tuple(failed_products),
+            metrics=self.metrics.summary(),
+        )
+
+    def _fetch_html(self, url: str, offline: bool = False, inline_retry: bool = True) -> str:
+        if self._write_queue is not None and not offline and not self._robots_resolved(url):
+            lookup = _RobotsLookup(url)
+            if not _put(self._write_queue, lookup, self._stop) or not _wait(lookup.done, self._stop):
+                raise InterruptedError(f"scrape run stopped before robots.txt was checked: {url}")
+            if lookup.error is not None:
+                raise lookup.error
+        return super()._fetch_html(url, offline, inline_retry)
+
+    def _robots_resolved(self, url: str) -> bool:
+        policy = getattr(self.access_guard, "robots_policy", None)
+        return policy is None or not hasattr(policy, "is_resolved") or policy.is_resolved(url)
+
+    def _resolve_robots(self, url: str) -> None:
+        if not self._robots_resolved(url):
+            self.access_guard.robots_policy.resolve(url)
+
+    def _archive_html(self, url: str, html: str) -> None:
+        if self._write_queue is None:
+            super()._archive_html(url, html)
+        elif self.snapshot_store is not None:
+            _put(self._write_queue, _Snapshot(url=url, html=html), self._stop)
+
+    def _discover_listings(
+        self,
+        seeds: list[str],
+        product_queue: queue.Queue,
+        discovered: dict[str, ListingProduct],
+        failed: list[str],
+        stop: threading.Event,
+    ) -> None:
+        listing_queue = deque(seeds)
+        visited: set[str] = set()
+        try:
+            while listing_queue and len(visited) < self.max_listing_pages and not stop.is_set():
+                listing_url = listing_queue.popleft()
+                if listing_url in visited:
+                    continue
+                visited.add(listing_url)
+
+                try:
+                    listing_html = self._fetch_html(listing_url)
+                    with self.metrics.timer(STAGE_PARSE):
+                        listing_products = parse_listing_products(listing_html, self.base_url)
+                        pagination_urls = parse_pagination_urls(listing_html, self.base_url)
+                except Exception as exc:
+                    failed.append(listing_url)
+                    log_event(
+                        self.logger,
+                        SCRAPE_PARSE_FAILED,
+                        level=logging.WARNING,
+                        stage="listing",
+                        url=listing_url,
+                        error_type=type(exc).__name__,
+                    )
+                    continue
+
+                for product in listing_products:
+                    if product.url not in discovered:
+                        discovered[product.url] = product
+                        _put(product_queue, product, stop)
+
+                listing_queue.extend(url for url in pagination_urls if url not in visited)
+        finally:
+            for _ in range(self.fetch_workers):
+                _put(product_queue, _DONE, stop)
+
+    def _fetch_products(
+        self, product_queue: queue.Queue, write_queue: queue.Queue, stop: threading.Event
+    ) -> None:
+        try:
+            while True:
+                product = _get(product_queue, stop)
+                if product is _DONE:
+                    return
+                _put(write_queue, self._fetch_product(product), stop)
+        finally:
+            _put(write_queue, _DONE, stop)
+
+    def _fetch_product(self, product: ListingProduct) -> _FetchedProduct:
+        try:
+            product_html = self._fetch_html(product.url)
+            scraped_at = datetime.now(tz=timezone.utc)
+            if self.parse_executor is not None:
+                product_data = self.parse_executor.submit(parse_product_page, product_html, self.base_url)
+            else:
+                with self.metrics.timer(STAGE_PARSE):
+                    product_data = parse_product_page(product_html, self.base_url)
+        except Exception as exc:
+            return _FetchedProduct(product.url, product, None, error_type=type(exc).__name__)
+        return _FetchedProduct(product.url, product, product_data, scraped_at)
+
+    def _write_results(
+        self, write_queue: queue.Queue, fetchers: list[threading.Thread]
+    ) -> tuple[int, list[str]]:
+        failed: list[str] = []
+        batch: list[Perfume] = []
+        scraped_count = 0
+        running_fetchers = self.fetch_workers
+
+        while running_fetchers:
+            try:
+                item = write_queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                # Fetchers always send _DONE on exit; only stop waiting if every one of them is gone.
+                if not any(thread.is_alive() for thread in fetchers) and write_queue.empty():
+                    break
+                continue
+            if item is _DONE:
+                running_fetchers -= 1
+                continue
+            if isinstance(item, _RobotsLookup):
+                try:
+                    self._resolve_robots(item.url)
+                except Exception as exc:
+                    item.error = exc
+                finally:
+                    item.done.set()
+                continue
+            if isinstance(item, _Snapshot):
+                self.snapshot_store.save(item.url, item.html)
+                continue
+
+            perfume, error_type = _resolve_perfume(item)
+            if perfume is None:
+                failed.append(item.url)
+                log_event(
+                    self.logger,
+                    SCRAPE_PARSE_FAILED,
+                    level=logging.WARNING,
+                    stage="product",
+                    url=item.url,
+                    error_type=error_type,
+                )
+                continue
+
+            batch.append(perfume)
+            if len(batch) >= self.write_batch_size:
+                scraped_count += self._write_batch(batch)
+
+        scraped_count += self._write_batch(batch)
+        return scraped_count, failed
+
+    def _write_batch(self, batch: list[Perfume]) -> int:
+        if not batch:
+            return 0
+        with self.metrics.timer(STAGE_UPSERT):
+            self.perfume_repository.upsert_perfumes(tuple(batch))
+        written = len(batch)
+        batch.clear()
+        return written
+
+
+def _resolve_perfume(item: _FetchedProduct) -> tuple[Perfume | None, str | None]:
+    if item.error_type is not None:
+        return None, item.error_type
+    try:
+        product_data = item.product_data
+        if isinstance(product_data, Future):
+            product_data = product_data.result()
+        return _build_perfume(item.summary, product_data, item.scraped_at), None
+    except Exception as exc:
+        return None, type(exc).__name__
+
+
+def _put(target: queue.Queue, item: object, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _wait(event: threading.Event, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        if event.wait(_POLL_SECONDS):
+            return True
+    return event.is_set()
+
+
+def _get(source: queue.Queue, stop: threading.Event) -> object:
+    while not stop.is_set():
+        try:
+            return source.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            continue
+    return _DONE
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+import heapq
+import json
+from pathlib import Path
+import sqlite3
+import sys
+from typing import Any
+
+from app.application.services.catalog_refresh_service import load_catalog_vocabulary
+from app.application.services.recommendation_service import RecommendedPerfume, recommended_perfume
+from app.config.settings import DEFAULT_TOP_N
+from app.domain.models.perfume import Perfume
+from app.domain.models.user_profile import UserProfile, UserProfileConstraints
+from app.domain.models.vocabulary import TokenVocabulary
+from app.infrastructure.persistence.sqlite.perfume_repo_sqlite import PerfumeRepositorySqlite
+from app.infrastructure.recommendation.features.context_rules import score_context_rules
+from app.infrastructure.recommendation.scoring.hybrid_scorer import HybridScorer
+from app.infrastructure.recommendation.scoring.score_weights import DEFAULT_SCORE_WEIGHTS, ScoreWeights
+
+
+@dataclass(frozen=True)
+class BatchRecommendation:
+    profile_index: int
+    items: tuple[RecommendedPerfume, ...]
+
+
+class BatchRecommender:
+    """Scores many profiles against one catalog prepared once.
+
+    Notes and families become integer bitsets over a shared vocabulary, so
+    each profile x catalog overlap is an AND plus a popcount. Context scores
+    depend only on occasion, moods and strength, and are computed once per
+    distinct context rather than once per profile. Pass the stored `vocabulary`
+    to share token ids with the catalog. Learned affinities (see
+    `UserAffinityService.personalize`) are summed over the same bitsets.
+    Totals match a `HybridScorer` without embeddings or item priors, which
+    batch scoring leaves out; the top-N per profile are re-scored with it for
+    their traces.
+    """
+
+    def __init__(
+        self,
+        perfumes: Iterable[Perfume],
+        weights: ScoreWeights = DEFAULT_SCORE_WEIGHTS,
+        vocabulary: TokenVocabulary | None = None,
+    ) -> None:
+        self.perfumes = tuple(perfumes)
+        self.weights = weights
+        self.scorer = HybridScorer(weights)
+        self._vocabulary = vocabulary or TokenVocabulary()
+        self._note_bits = [self._bits("note", perfume.note_keys, grow=True) for perfume in self.perfumes]
+        self._family_bits = [self._bits("family", perfume.family_keys, grow=True) for perfume in self.perfumes]
+        self._by_id = {perfume.perfume_id.casefold(): index for index, perfume in enumerate(self.perfumes)}
+        self._context_scores: dict[tuple, list[float]] = {}
+
+    def recommend(self, profiles: Sequence[UserProfile], top_n: int = DEFAULT_TOP_N) -> tuple[BatchRecommendation, ...]:
+        groups: dict[tuple, list[int]] = {}
+        for profile_index, profile in enumerate(profiles):
+            groups.setdefault(_context_key(profile), []).append(profile_index)
+
+        results: dict[int, BatchRecommendation] = {}
+        for context_key, profile_indices in groups.items():
+            context_scores = self._context_scores_for(context_key, profiles[profile_indices[0]])
+            for profile_index in profile_indices:
+                items = self._recommend_one(profiles[profile_index], context_scores, top_n)
+                results[profile_index] = BatchRecommendation(profile_index=profile_index, items=items)
+        return tuple(results[index] for index in range(len(profiles)))
+
+    def _recommend_one(
+        self, profile: UserProfile, context_scores: list[float], top_n: int
+    ) -> tuple[RecommendedPerfume, ...]:
+        weights = self.weights
+        liked_bits = self._bits("note", {note.casefold() for note in profile.liked_notes})
+        liked_count = len(profile.liked_notes)
+        preferred_bits = self._bits("family", {family.casefold() for family in profile.preferred_families})
+        preferred_count = len(profile.preferred_families)
+        excluded_notes = self._bits("note", {note.casefold() for note in profile.constraints.exclude_notes})
+        excluded_families = self._bits(
+            "family", {family.casefold() for family in profile.constraints.exclude_families}
+        )
+        owned_indices = [
+            self._by_id[perfume_id.casefold()]
+            for perfume_id in profile.owned_perfume_ids
+            if perfume_id.casefold() in self._by_id
+        ]
+        owned_keys = {perfume_id.casefold() for perfume_id in profile.owned_perfume_ids}
+        owned_bits = [(self._note_bits[index], self._family_bits[index]) for index in owned_indices]
+        score_affinity = bool(profile.learned_notes or profile.learned_families) and weights.affinity > 0
+        learned_notes = self._weighted_bits("note", profile.learned_notes)
+        learned_families = self._weighted_bits("family", profile.learned_families)
+
+        ranked: list[tuple[float, str, int]] = []
+        for index, perfume in enumerate(self.perfumes):
+            note_bits = self._note_bits[index]
+            family_bits = self._family_bits[index]
+            if note_bits & excluded_notes or family_bits & excluded_families:
+                continue
+
+            note_score = _overlap_score(liked_bits, liked_count, note_bits, len(perfume.note_keys))
+            family_score = _overlap_score(preferred_bits, preferred_count, family_bits, len(perfume.family_keys))
+            owned_score = _best_owned_similarity(note_bits, family_bits, owned_bits)
+            penalty = round(weights.owned_penalty, 6) if perfume.perfume_id.casefold() in owned_keys else 0.0
+            total = (
+                _contribution(note_score, weights.note_similarity)
+                + _contribution(family_score, weights.family_match)
+                + _contribution(owned_score, weights.owned_similarity)
+                + _contribution(context_scores[index], weights.context)
+            ) - penalty
+            if score_affinity:
+                # Mirrors learned_affinity: 0.7 * signed note share + 0.3 * signed family share.
+                affinity = round(
+                    0.7 * _learned_share(learned_notes, note_bits) + 0.3 * _learned_share(learned_families, family_bits),
+                    6,
+                )
+                total += _contribution(affinity, weights.affinity)
+            ranked.append((-round(total, 6), perfume.perfume_id, index))
+
+        owned_perfumes = tuple(self.perfumes[index] for index in owned_indices)
+        return tuple(
+            recommended_perfume(self.perfumes[index], self.scorer.score(self.perfumes[index], profile, owned_perfumes))
+            for _, _, index in heapq.nsmallest(top_n, ranked)
+        )
+
+    def _context_scores_for(self, context_key: tuple, profile: UserProfile) -> list[float]:
+        scores = self._context_scores.get(context_key)
+        if scores is None:
+            context_profile = UserProfile(
+                occasion=profile.occasion,
+                moods=profile.moods,
+                strength_preference=profile.strength_preference,
+            )
+            scores = [score_context_rules(perfume, context_profile).score for perfume in self.perfumes]
+            self._context_scores[context_key] = scores
+        return scores
+
+    def _weighted_bits(
+        self, kind: str, weighted_keys: Iterable[tuple[str, float]]
+    ) -> list[tuple[int, float]]:
+        return [(self._bits(kind, (key,)), weight) for key, weight in weighted_keys]
+
+    def _bits(self, kind: str, keys: Iterable[str], grow: bool = False) -> int:
+        bits = 0
+        for key in keys:
+            token_id = self._vocabulary.add(kind, key) if grow else self._vocabulary.id_of(kind, key)
+            if token_id is not None:
+                bits |= 1 << token_id
+        return bits
+
+
+def recommend_batch(
+    perfumes: Iterable[Perfume],
+    profiles: Sequence[UserProfile],
+    top_n: int = DEFAULT_TOP_N,
+    weights: ScoreWeights = DEFAULT_SCORE_WEIGHTS,
+) -> tuple[BatchRecommendation, ...]:
+    return BatchRecommender(perfumes, weights).recommend(profiles, top_n)
+
+
+def profile_from_dict(data: dict[str, Any]) -> UserProfile:
+    constraints = data.get("constraints") or {}
+    return UserProfile(
+        owned_perfume_ids=tuple(data.get("owned_perfume_ids", ())),
+        liked_notes=tuple(data.get("liked_notes", ())),
+        disliked_notes=tuple(data.get("disliked_notes", ())),
+        preferred_families=tuple(data.get("preferred_families", ())),
+        occasion=data.get("occasion"),
+        moods=tuple(data.get("moods", ())),
+        strength_preference=data.get("strength_preference"),
+        constraints=UserProfileConstraints(
+            exclude_notes=tuple(constraints.get("exclude_notes", ())),
+            exclude_families=tuple(constraints.get("exclude_families", ())),
+        ),
+    )
+
+
+def _context_key(profile: UserProfile) -> tuple:
+    return (
+        (profile.occasion or "").casefold(),
+        tuple(sorted(mood.casefold() for mood in profile.moods)),
+        profile.strength_preference,
+    )
+
+
+def _overlap_score(query_bits: int, query_count: int, candidate_bits: int, candidate_count: int) -> float:
+    # Mirrors note_similarity / family_match: 0.7 * coverage + 0.3 * precision.
+    if not query_count or not candidate_count:
+        return 0.0
+    overlap = (query_bits & candidate_bits).bit_count()
+    return round(0.7 * (overlap / query_count) + 0.3 * (overlap / candidate_count), 6)
+
+
+def _learned_share(weighted_bits: list[tuple[int, float]], candidate_bits: int) -> float:
+    total = sum(abs(weight) for _, weight in weighted_bits)
+    if not total:
+        return 0.0
+    matched = sum(weight for bits, weight in weighted_bits if bits & candidate_bits)
+    return matched / total
+
+
+def _best_owned_similarity(note_bits: int, family_bits: int, owned_bits: list[tuple[int, int]]) -> float:
+    # Mirrors owned_similarity: 0.7 * note Jaccard + 0.3 * family Jaccard, best owned perfume.
+    best = 0.0
+    for owned_notes, owned_families in owned_bits:
+        similarity = 0.7 * _jaccard(note_bits, owned_notes) + 0.3 * _jaccard(family_bits, owned_families)
+        best = max(best, similarity)
+    return round(best, 6)
+
+
+def _jaccard(left: int, right: int) -> float:
+    union = (left | right).bit_count()
+    if not union:
+        return 0.0
+    return (left & right).bit_count() / union
+
+
+def _contribution(value: float, weight: float) -> float:
+    return round(value * weight, 6)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Write top-N recommendations for many profiles as JSONL.")
+    parser.add_argument("--db", required=True, help="SQLite catalog database path")
+    parser.add_argument("--profiles", required=True, help='JSONL of {"user_id": ..., "profile": {...}}')
+    parser.add_argument("--output", required=True, help="JSONL output path")
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N)
+    args = parser.parse_args(argv)
+
+    user_ids: list[object] = []
+    profiles: list[UserProfile] = []
+    with open(args.profiles, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            user_ids.append(record.get("user_id"))
+            profiles.append(profile_from_dict(record.get("profile") or {}))
+
+    connection = sqlite3.connect(args.db)
+    try:
+        repository = PerfumeRepositorySqlite(connection)
+        recommender = BatchRecommender(
+            repository.iter_perfumes(), vocabulary=load_catalog_vocabulary(repository)
+        )
+    finally:
+        connection.close()
+    results = recommender.recommend(profiles, top_n=args.top_n)
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", encoding="utf-8") as handle:
+        for user_id, result in zip(user_ids, results):
+            record = {
+                "user_id": user_id,
+                "recommendations": [
+                    {
+                        "perfume_id": item.perfume_id,
+                        "score": item.score,
+                        "matched_notes": list(item.matched_notes),
+                        "matched_families": list(item.matched_families),
+                        "similar_to_owned": item.similar_to_owned,
+                    }
+                    for item in result.items
+                ],
+            }
+            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    print(f"wrote recommendations for {len(results)} profiles over {len(recommender.perfumes)} perfumes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
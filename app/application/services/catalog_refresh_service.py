@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
+import logging
+import os
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+from app.application.services.recommendation_service import RecommendationService
+from app.config.logging import (
+    CATALOG_REFRESH_FAILED,
+    CATALOG_SNAPSHOT_LOADED,
+    CATALOG_SNAPSHOT_SWAPPED,
+    CATALOG_VOCABULARY_MISSING,
+    get_logger,
+    log_event,
+)
+from app.config.settings import RECOMMENDATION_CACHE_SIZE, RECOMMENDATION_DIVERSITY, SERVER_RELOAD_POLL_SECONDS
+from app.domain.models.item_priors import ItemPriors
+from app.domain.models.perfume import Perfume
+from app.domain.models.perfume_catalog import PerfumeCatalog
+from app.domain.models.vocabulary import TokenVocabulary
+from app.infrastructure.persistence.sqlite.item_prior_repo_sqlite import ItemPriorRepositorySqlite
+from app.infrastructure.persistence.sqlite.perfume_repo_sqlite import PerfumeRepositorySqlite
+from app.infrastructure.recommendation.scoring.hybrid_scorer import HybridScorer
+from app.infrastructure.recommendation.scoring.score_weights import ScoreWeights
+
+logger = get_logger("app.application.services.catalog_refresh_service")
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """One immutable, fully indexed version of the catalog served by the API."""
+
+    version: str
+    catalog: PerfumeCatalog
+    recommendation_service: RecommendationService
+
+
+class CatalogHandle:
+    """Versioned, atomically swappable reference to the live `CatalogSnapshot`.
+
+    Readers call `current()` once per request and keep using that snapshot, so
+    in-flight requests finish on the version they started with (RCU-style).
+    `refresh()` builds the next snapshot entirely off to the side and then
+    swaps a single reference; the old one is freed when its last reader ends.
+    """
+
+    def __init__(
+        self,
+        snapshot: CatalogSnapshot,
+        loader: Callable[[], CatalogSnapshot] | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.loader = loader
+        self.logger = logger or get_logger("app.application.services.catalog_refresh_service")
+        self._snapshot = snapshot
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+
+    @property
+    def version(self) -> str:
+        return self._snapshot.version
+
+    def current(self) -> CatalogSnapshot:
+        return self._snapshot
+
+    def swap(self, snapshot: CatalogSnapshot) -> CatalogSnapshot:
+        previous, self._snapshot = self._snapshot, snapshot
+        log_event(
+            self.logger,
+            CATALOG_SNAPSHOT_SWAPPED,
+            previous_version=previous.version,
+            version=snapshot.version,
+            perfume_count=len(snapshot.catalog),
+        )
+        return previous
+
+    def refresh(self) -> CatalogSnapshot:
+        """Build a new snapshot with `loader` and swap it in; one refresh runs at a time."""
+        if self.loader is None:
+            raise ValueError("refresh requires a loader")
+        with self._refresh_lock:
+            self.swap(self.loader())
+        return self._snapshot
+
+    def refresh_if_published(self, marker_path: str | Path) -> bool:
+        version = read_catalog_version(marker_path)
+        if version is None or version == self.version:
+            return False
+        try:
+            self.refresh()
+        except Exception as exc:
+            # Keep serving the current snapshot; the next poll retries.
+            log_event(
+                self.logger,
+                CATALOG_REFRESH_FAILED,
+                level=logging.ERROR,
+                version=version,
+                error_type=type(exc).__name__,
+            )
+            return False
+        return True
+
+    def start_watching(
+        self, marker_path: str | Path, poll_seconds: float = SERVER_RELOAD_POLL_SECONDS
+    ) -> threading.Thread:
+        """Poll the version marker in a daemon thread and refresh when it changes."""
+        if self._watcher is not None:
+            return self._watcher
+        self._stop.clear()
+
+        def watch() -> None:
+            while not self._stop.wait(poll_seconds):
+                self.refresh_if_published(marker_path)
+
+        self._watcher = threading.Thread(target=watch, name="catalog-watcher", daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+
+class VersionedCache:
+    """LRU cache bound to the live catalog version; entries vanish when it changes.
+
+    Callers pass the version of the snapshot they are serving. Lookups and
+    writes from requests still running on an older snapshot bypass the cache,
+    so they neither read nor store results for the wrong catalog.
+    """
+
+    def __init__(self, current_version: Callable[[], str], max_size: int = RECOMMENDATION_CACHE_SIZE) -> None:
+        self.current_version = current_version
+        self.max_size = max_size
+        self._version: str | None = None
+        self._entries: OrderedDict[Hashable, object] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, version: str, key: Hashable) -> object | None:
+        with self._lock:
+            if not self._is_live(version):
+                return None
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, version: str, key: Hashable, value: object) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if not self._is_live(version):
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _is_live(self, version: str) -> bool:
+        live_version = self.current_version()
+        if live_version != self._version:
+            self._version = live_version
+            self._entries.clear()
+        return version == live_version
+
+
+def build_catalog_snapshot(
+    perfumes: Iterable[Perfume],
+    version: str = "",
+    priors: ItemPriors | None = None,
+    vocabulary: TokenVocabulary | None = None,
+) -> CatalogSnapshot:
+    started_at = time.perf_counter()
+    loaded = tuple(perfumes)
+    catalog = PerfumeCatalog.from_perfumes(loaded, vocabulary)
+    snapshot = CatalogSnapshot(
+        version=version,
+        catalog=catalog,
+        recommendation_service=RecommendationService(
+            loaded,
+            scorer=HybridScorer(ScoreWeights(diversity=RECOMMENDATION_DIVERSITY), priors=priors),
+            catalog=catalog,
+        ),
+    )
+    log_event(
+        logger,
+        CATALOG_SNAPSHOT_LOADED,
+        version=version,
+        perfume_count=len(loaded),
+        elapsed_ms=round((time.perf_counter() - started_at) * 1000.0, 3),
+    )
+    return snapshot
+
+
+def load_catalog_snapshot(db_path: str, marker_path: str | None = None) -> CatalogSnapshot:
+    version = (read_catalog_version(marker_path) if marker_path else None) or ""
+    connection = sqlite3.connect(db_path)
+    try:
+        repository = PerfumeRepositorySqlite(connection)
+        perfumes = tuple(repository.iter_perfumes())
+        priors = _load_item_priors(connection)
+        vocabulary = load_catalog_vocabulary(repository)
+    finally:
+        connection.close()
+    return build_catalog_snapshot(perfumes, version, priors, vocabulary)
+
+
+def load_catalog_vocabulary(repository: PerfumeRepositorySqlite) -> TokenVocabulary | None:
+    """The stored token vocabulary, read-only; upserts store the tokens, so every build shares their ids."""
+    try:
+        return repository.load_vocabulary()
+    except sqlite3.OperationalError as exc:
+        if "no such table" not in str(exc):
+            raise
+        # A catalog database created before the vocabulary table existed; ids are process-local.
+        log_event(logger, CATALOG_VOCABULARY_MISSING, level=logging.WARNING, error=str(exc))
+        return None
+
+
+def _load_item_priors(connection: sqlite3.Connection) -> ItemPriors | None:
+    try:
+        priors = ItemPriorRepositorySqlite(connection).load()
+    except sqlite3.OperationalError:
+        # A catalog database created before the prior tables existed.
+        return None
+    return priors if priors.popularity or priors.neighbors else None
+
+
+def publish_catalog_version(marker_path: str | Path, version: str | None = None) -> str:
+    """Atomically record that a new catalog is ready; servers watching the marker reload."""
+    target = Path(marker_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    published = version or str(time.time_ns())
+    temp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    temp_path.write_text(published, encoding="utf-8")
+    os.replace(temp_path, target)
+    return published
+
+
+def read_catalog_version(marker_path: str | Path) -> str | None:
+    try:
+        return Path(marker_path).read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
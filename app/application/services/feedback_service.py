@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+import threading
+import time
+from typing import Callable
+
+from app.config.logging import (
+    FEEDBACK_EVENT_RECORDED,
+    FEEDBACK_EVENTS_FLUSHED,
+    FEEDBACK_FLUSH_FAILED,
+    FEEDBACK_LISTENER_FAILED,
+    get_logger,
+    log_event,
+)
+from app.config.settings import FEEDBACK_FLUSH_INTERVAL_SECONDS
+from app.domain.models.feedback_event import FeedbackEvent, FeedbackEventType
+from app.infrastructure.persistence.sqlite.feedback_repo_sqlite import (
+    FeedbackListenerError,
+    FeedbackRepositorySqlite,
+    FeedbackStat,
+)
+
+
+class FeedbackService:
+    """Records click/like/dislike/purchase events and flushes them in batches.
+
+    `record` only appends to the repository's in-memory buffer; a background
+    thread (see `start`) flushes it every `flush_interval_seconds`, and the
+    repository also flushes whenever its buffer reaches its batch size.
+    """
+
+    def __init__(
+        self,
+        repository: FeedbackRepositorySqlite,
+        flush_interval_seconds: float = FEEDBACK_FLUSH_INTERVAL_SECONDS,
+        now_func: Callable[[], datetime] = lambda: datetime.now(tz=timezone.utc),
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.repository = repository
+        self.flush_interval_seconds = flush_interval_seconds
+        self.now_func = now_func
+        self.logger = logger or get_logger("app.application.services.feedback_service")
+        self._stop = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def record(
+        self,
+        user_id: str,
+        perfume_id: str,
+        event_type: FeedbackEventType,
+        occurred_at: datetime | None = None,
+        occasion: str | None = None,
+        moods: tuple[str, ...] = (),
+        strength_preference: str | None = None,
+    ) -> FeedbackEvent:
+        event = FeedbackEvent(
+            user_id=user_id,
+            perfume_id=perfume_id,
+            event_type=event_type,
+            occurred_at=occurred_at or self.now_func(),
+            occasion=occasion,
+            moods=moods,
+            strength_preference=strength_preference,
+        )
+        try:
+            self.repository.append(event)
+        except FeedbackListenerError as exc:
+            self._log_listener_failure(exc)
+        except Exception as exc:
+            # The size-triggered flush failed; the repository keeps the batch buffered for the next one.
+            self._log_flush_failure(exc)
+        log_event(
+            self.logger,
+            FEEDBACK_EVENT_RECORDED,
+            level=logging.DEBUG,
+            perfume_id=event.perfume_id,
+            event_type=event.event_type,
+        )
+        return event
+
+    def flush(self) -> int:
+        started_at = time.perf_counter()
+        try:
+            flushed = self.repository.flush()
+        except FeedbackListenerError as exc:
+            # The events are committed; only the derived state (e.g. affinities) missed this batch.
+            self._log_listener_failure(exc)
+            flushed = exc.flushed_count
+        except Exception as exc:
+            self._log_flush_failure(exc)
+            return 0
+        if flushed:
+            log_event(
+                self.logger,
+                FEEDBACK_EVENTS_FLUSHED,
+                event_count=flushed,
+                elapsed_ms=round((time.perf_counter() - started_at) * 1000.0, 3),
+            )
+        return flushed
+
+    def user_stats(self, user_id: str) -> tuple[FeedbackStat, ...]:
+        return self.repository.user_stats(user_id)
+
+    def perfume_stats(self, perfume_id: str) -> tuple[FeedbackStat, ...]:
+        return self.repository.perfume_stats(perfume_id)
+
+    def start(self) -> None:
+        if self._flusher is not None:
+            return
+        self._stop.clear()
+
+        def flush_periodically() -> None:
+            while not self._stop.wait(self.flush_interval_seconds):
+                self.flush()
+
+        self._flusher = threading.Thread(target=flush_periodically, name="feedback-flusher", daemon=True)
+        self._flusher.start()
+
+    def stop(self) -> None:
+        """Stop the background flusher and write whatever is still buffered."""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def _log_flush_failure(self, exc: Exception) -> None:
+        log_event(
+            self.logger,
+            FEEDBACK_FLUSH_FAILED,
+            level=logging.ERROR,
+            pending_count=self.repository.pending_count(),
+            error_type=type(exc).__name__,
+        )
+
+    def _log_listener_failure(self, exc: FeedbackListenerError) -> None:
+        cause = exc.__cause__ or exc
+        log_event(
+            self.logger,
+            FEEDBACK_LISTENER_FAILED,
+            level=logging.ERROR,
+            event_count=exc.flushed_count,
+            error_type=type(cause).__name__,
+        )
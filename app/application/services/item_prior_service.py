@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+import logging
+import sqlite3
+import sys
+import time
+
+from app.application.services.catalog_refresh_service import publish_catalog_version
+from app.config.logging import ITEM_PRIORS_UPDATED, get_logger, log_event
+from app.config.settings import (
+    CATALOG_DB_PATH,
+    FEEDBACK_EVENT_WEIGHTS,
+    ITEM_PRIOR_NEIGHBORS,
+    ITEM_PRIOR_POSITIVE_EVENTS,
+)
+from app.domain.models.item_priors import ItemPriors
+from app.infrastructure.persistence.sqlite.feedback_repo_sqlite import FeedbackRepositorySqlite
+from app.infrastructure.persistence.sqlite.item_prior_repo_sqlite import ItemPriorRepositorySqlite
+
+
+@dataclass(frozen=True)
+class ItemPriorUpdate:
+    event_count: int
+    perfume_count: int
+    elapsed_ms: float
+
+
+class ItemPriorService:
+    """Offline job keeping popularity and co-occurrence priors current.
+
+    Each `update()` reads only the feedback events past the stored rowid
+    watermarks and folds them into the prior tables in one transaction, so a
+    run costs O(new events), never a history scan, and an interrupted run is
+    simply repeated. The API picks new priors up with the next catalog
+    snapshot (see `load_catalog_snapshot`).
+    """
+
+    def __init__(
+        self,
+        feedback_repository: FeedbackRepositorySqlite,
+        prior_repository: ItemPriorRepositorySqlite,
+        event_weights: Mapping[str, float] = FEEDBACK_EVENT_WEIGHTS,
+        positive_events: Iterable[str] = ITEM_PRIOR_POSITIVE_EVENTS,
+        top_k: int = ITEM_PRIOR_NEIGHBORS,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.feedback_repository = feedback_repository
+        self.prior_repository = prior_repository
+        self.event_weights = event_weights
+        self.positive_events = tuple(positive_events)
+        self.top_k = top_k
+        self.logger = logger or get_logger("app.application.services.item_prior_service")
+
+    def update(self) -> ItemPriorUpdate:
+        started_at = time.perf_counter()
+        events, watermarks = self.feedback_repository.events_since(self.prior_repository.watermarks())
+        changed = ()
+        if events:
+            changed = self.prior_repository.apply_events(
+                events, watermarks, self.event_weights, self.positive_events, self.top_k
+            )
+        update = ItemPriorUpdate(
+            event_count=len(events),
+            perfume_count=len(changed),
+            elapsed_ms=round((time.perf_counter() - started_at) * 1000.0, 3),
+        )
+        log_event(
+            self.logger,
+            ITEM_PRIORS_UPDATED,
+            event_count=update.event_count,
+            perfume_count=update.perfume_count,
+            elapsed_ms=update.elapsed_ms,
+        )
+        return update
+
+    def load(self) -> ItemPriors:
+        return self.prior_repository.load()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Fold new feedback events into popularity/co-occurrence priors.")
+    parser.add_argument("--db", default=CATALOG_DB_PATH, help="SQLite database holding feedback and priors")
+    parser.add_argument("--top-k", type=int, default=ITEM_PRIOR_NEIGHBORS, help="neighbors kept per perfume")
+    parser.add_argument("--marker", help="catalog version marker to publish so servers reload the priors")
+    args = parser.parse_args(argv)
+
+    connection = sqlite3.connect(args.db)
+    try:
+        prior_repository = ItemPriorRepositorySqlite(connection)
+        prior_repository.initialize_schema()
+        update = ItemPriorService(FeedbackRepositorySqlite(connection), prior_repository, top_k=args.top_k).update()
+    finally:
+        connection.close()
+
+    if args.marker and update.perfume_count:
+        publish_catalog_version(args.marker)
+    print(f"folded {update.event_count} events into priors for {update.perfume_count} perfumes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
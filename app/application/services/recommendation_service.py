@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+from array import array
+from collections import Counter, OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+import heapq
+import logging
+import threading
+import time
+from typing import Callable, Literal
+
+from app.config.logging import (
+    RECOMMENDATION_FALLBACK,
+    RECOMMENDATION_SERVED,
+    LazyField,
+    get_logger,
+    log_event,
+)
+from app.config.settings import (
+    DEFAULT_TOP_N,
+    DIVERSITY_POOL_SIZE,
+    RECOMMENDATION_CACHE_SIZE,
+    RECOMMENDATION_TIME_BUDGET_MS,
+)
+from app.domain.models.perfume import Perfume
+from app.domain.models.user_profile import UserProfile
+from app.domain.models.perfume_catalog import PerfumeCatalog
+from app.infrastructure.recommendation.scoring.diversity_reranker import DiversityReranker
+from app.infrastructure.recommendation.scoring.hybrid_scorer import HybridScorer
+from app.infrastructure.recommendation.scoring.score_trace import ScoreTrace
+
+RecommendationMode = Literal["full", "skip_owned", "candidates_only", "cached"]
+
+_SCORING_MODES: tuple[RecommendationMode, ...] = ("full", "skip_owned")
+_DEADLINE_CHECK_EVERY = 32
+_COST_SMOOTHING = 0.2
+
+
+@dataclass(frozen=True)
+class RecommendedPerfume:
+    perfume_id: str
+    name: str
+    url: str
+    score: float
+    matched_notes: tuple[str, ...]
+    matched_families: tuple[str, ...]
+    similar_to_owned: str | None = None
+    trace: ScoreTrace | None = None
+
+
+@dataclass(frozen=True)
+class RecommendationResult:
+    items: tuple[RecommendedPerfume, ...]
+    mode: RecommendationMode
+    candidate_count: int
+    elapsed_ms: float
+
+
+class RecommendationService:
+    """Retrieve, score and rank perfumes for a profile within a time budget.
+
+    Modes, cheapest last:
+      - `full`: every hybrid feature, including similarity to owned perfumes.
+      - `skip_owned`: same, without owned similarity (the owned penalty stays).
+      - `cached`: the last scored ranking served for an identical request.
+      - `candidates_only`: inverted-index overlap with liked notes/families.
+
+    A scoring mode is skipped when its measured per-candidate cost says it
+    cannot finish in the remaining budget, and abandoned when the deadline
+    passes mid-way, which also skips the modes after it; the overlap ranking
+    still applies the scorer's owned penalty. Every fallback is logged and the result reports the mode
+    that actually served the request. With a non-zero `diversity` (the
+    scorer's `ScoreWeights.diversity`, off by default, or per request),
+    scoring modes re-rank the best `diversity_pool_size` candidates with MMR
+    so the top N are not all near-copies of one perfume. Pass the snapshot's
+    `catalog` so the re-ranker reads its token ids instead of building one.
+    """
+
+    def __init__(
+        self,
+        perfumes: Iterable[Perfume],
+        scorer: HybridScorer | None = None,
+        time_budget_ms: float = RECOMMENDATION_TIME_BUDGET_MS,
+        cache_size: int = RECOMMENDATION_CACHE_SIZE,
+        diversity_pool_size: int = DIVERSITY_POOL_SIZE,
+        clock: Callable[[], float] = time.perf_counter,
+        logger: logging.Logger | None = None,
+        catalog: PerfumeCatalog | None = None,
+    ) -> None:
+        self.perfumes = tuple(perfumes)
+        self.scorer = scorer or HybridScorer()
+        self.time_budget_ms = time_budget_ms
+        self.cache_size = cache_size
+        self.diversity_pool_size = diversity_pool_size
+        self.clock = clock
+        self.logger = logger or get_logger("app.application.services.recommendation_service")
+        self._by_id = {perfume.perfume_id.casefold(): perfume for perfume in self.perfumes}
+        self._note_postings = _build_postings(perfume.note_keys for perfume in self.perfumes)
+        self._family_postings = _build_postings(perfume.family_keys for perfume in self.perfumes)
+        self._reranker = DiversityReranker(
+            catalog if catalog is not None else PerfumeCatalog.from_perfumes(self.perfumes),
+            self.scorer.weights.diversity,
+        )
+        self._cache: OrderedDict[tuple[UserProfile, int, float], tuple[RecommendedPerfume, ...]] = OrderedDict()
+        self._cost_per_candidate: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def recommend(
+        self,
+        profile: UserProfile,
+        top_n: int = DEFAULT_TOP_N,
+        time_budget_ms: float | None = None,
+        request_id: str | None = None,
+        diversity: float | None = None,
+    ) -> RecommendationResult:
+        started_at = self.clock()
+        if diversity is None:
+            diversity = self.scorer.weights.diversity
+        budget_ms = self.time_budget_ms if time_budget_ms is None else time_budget_ms
+        deadline = started_at + budget_ms / 1000.0
+
+        candidates, overlaps, query_size = self._retrieve(profile)
+        owned_perfumes = self._owned_perfumes(profile)
+        items: tuple[RecommendedPerfume, ...] | None = None
+        mode: RecommendationMode = "candidates_only"
+
+        for scoring_mode in _SCORING_MODES:
+            if self.clock() > deadline:
+                # A mode that just ran out of time leaves nothing for the cheaper one to spend.
+                self._log_fallback(scoring_mode, "deadline_exceeded", len(candidates), request_id)
+                break
+            if not self._affordable(scoring_mode, len(candidates), deadline):
+                self._log_fallback(scoring_mode, "estimated_over_budget", len(candidates), request_id)
+                continue
+            items = self._score(candidates, profile, owned_perfumes, top_n, diversity, scoring_mode, deadline)
+            if items is not None:
+                mode = scoring_mode
+                break
+            self._log_fallback(scoring_mode, "deadline_exceeded", len(candidates), request_id)
+
+        cache_key = (profile, top_n, diversity)
+        if items is not None:
+            self._cache_put(cache_key, items)
+        else:
+            items = self._cache_get(cache_key)
+            if items is not None:
+                mode = "cached"
+            else:
+                items = _rank_by_overlap(
+                    candidates, overlaps, query_size, profile, top_n, self.scorer.weights.owned_penalty
+                )
+
+        elapsed_ms = round((self.clock() - started_at) * 1000.0, 3)
+        log_event(
+            self.logger,
+            RECOMMENDATION_SERVED,
+            request_id=request_id,
+            mode=mode,
+            candidate_count=len(candidates),
+            elapsed_ms=elapsed_ms,
+            top=LazyField(lambda: [(item.perfume_id, item.score) for item in items]),
+            components=LazyField(lambda: _component_summary(items)),
+        )
+        return RecommendationResult(
+            items=items,
+            mode=mode,
+            candidate_count=len(candidates),
+            elapsed_ms=elapsed_ms,
+        )
+
+    def _retrieve(self, profile: UserProfile) -> tuple[list[Perfume], Counter, int]:
+        query_keys = {note.casefold() for note in profile.liked_notes}
+        query_keys |= {family.casefold() for family in profile.preferred_families}
+        query_size = len(query_keys)
+        query_keys |= {key for key, weight in profile.learned_notes + profile.learned_families if weight > 0}
+        for owned in self._owned_perfumes(profile):
+            query_keys |= owned.note_keys | owned.family_keys
+
+        # Retrieval and filtering only read the postings arrays; the `Perfume` objects of
+        # the perfumes it rules out are never touched (see `PreforkServer`).
+        matched = _posted_indices(self._note_postings, query_keys) | _posted_indices(self._family_postings, query_keys)
+        if matched:
+            indices = sorted(matched)
+        else:
+            # Cold start (or nothing in the index matches): every perfume is a candidate.
+            indices = range(len(self.perfumes))
+
+        excluded = _posted_indices(
+            self._note_postings, {note.casefold() for note in profile.constraints.exclude_notes}
+        ) | _posted_indices(
+            self._family_postings, {family.casefold() for family in profile.constraints.exclude_families}
+        )
+        candidates = [self.perfumes[index] for index in indices if index not in excluded]
+        candidate_overlaps: Counter = Counter()
+        if query_size:
+            hits: Counter = Counter()
+            for note in {note.casefold() for note in profile.liked_notes}:
+                hits.update(self._note_postings.get(note, ()))
+            for family in {family.casefold() for family in profile.preferred_families}:
+                hits.update(self._family_postings.get(family, ()))
+            candidate_overlaps.update(
+                {self.perfumes[index].perfume_id: count for index, count in hits.items() if index not in excluded}
+            )
+        return candidates, candidate_overlaps, query_size
+
+    def _owned_perfumes(self, profile: UserProfile) -> tuple[Perfume, ...]:
+        return tuple(
+            self._by_id[perfume_id.casefold()]
+            for perfume_id in profile.owned_perfume_ids
+            if perfume_id.casefold() in self._by_id
+        )
+
+    def _affordable(self, mode: str, candidate_count: int, deadline: float) -> bool:
+        with self._lock:
+            cost = self._cost_per_candidate.get(mode)
+        if cost is None:
+            return True
+        return self.clock() + cost * candidate_count <= deadline
+
+    def _score(
+        self,
+        candidates: list[Perfume],
+        profile: UserProfile,
+        owned_perfumes: tuple[Perfume, ...],
+        top_n: int,
+        diversity: float,
+        mode: str,
+        deadline: float,
+    ) -> tuple[RecommendedPerfume, ...] | None:
+        skip_owned = mode == "skip_owned"
+        started_at = self.clock()
+        traces: list[tuple[ScoreTrace, Perfume]] = []
+
+        for position, candidate in enumerate(candidates, start=1):
+            trace = self.scorer.score(candidate, profile, owned_perfumes, skip_owned_similarity=skip_owned)
+            traces.append((trace, candidate))
+            if position % _DEADLINE_CHECK_EVERY == 0 and self.clock() > deadline:
+                self._record_cost(mode, started_at, position)
+                return None
+
+        self._record_cost(mode, started_at, len(candidates))
+        pool = heapq.nsmallest(
+            max(top_n, self.diversity_pool_size) if diversity > 0 else top_n,
+            traces,
+            key=lambda pair: (-pair[0].total, pair[0].perfume_id),
+        )
+        top = self._reranker.rerank(
+            [(pair, pair[0].perfume_id, pair[0].total) for pair in pool], top_n, diversity
+        )
+        return tuple(recommended_perfume(perfume, trace) for trace, perfume in top)
+
+    def _record_cost(self, mode: str, started_at: float, scored_count: int) -> None:
+        if scored_count == 0:
+            return
+        cost = (self.clock() - started_at) / scored_count
+        with self._lock:
+            previous = self._cost_per_candidate.get(mode)
+            self._cost_per_candidate[mode] = (
+                cost if previous is None else previous + _COST_SMOOTHING * (cost - previous)
+            )
+
+    def _cache_get(self, key: tuple[UserProfile, int, float]) -> tuple[RecommendedPerfume, ...] | None:
+        with self._lock:
+            items = self._cache.get(key)
+            if items is not None:
+                self._cache.move_to_end(key)
+            return items
+
+    def _cache_put(self, key: tuple[UserProfile, int, float], items: tuple[RecommendedPerfume, ...]) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = items
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _log_fallback(self, mode: str, reason: str, candidate_count: int, request_id: str | None) -> None:
+        log_event(
+            self.logger,
+            RECOMMENDATION_FALLBACK,
+            level=logging.WARNING,
+            request_id=request_id,
+            skipped_mode=mode,
+            reason=reason,
+            candidate_count=candidate_count,
+        )
+
+
+def _build_postings(keys_per_perfume: Iterable[frozenset[str]]) -> dict[str, array]:
+    # Flat arrays rather than tuples of ints: reading them writes no reference counts.
+    postings: dict[str, array] = {}
+    for index, keys in enumerate(keys_per_perfume):
+        for key in keys:
+            postings.setdefault(key, array("I")).append(index)
+    return postings
+
+
+def _posted_indices(postings: dict[str, array], keys: Iterable[str]) -> set[int]:
+    indices: set[int] = set()
+    for key in keys:
+        indices.update(postings.get(key, ()))
+    return indices
+
+
+def _rank_by_overlap(
+    candidates: list[Perfume],
+    overlaps: Counter,
+    query_size: int,
+    profile: UserProfile,
+    top_n: int,
+    owned_penalty: float,
+) -> tuple[RecommendedPerfume, ...]:
+    owned_ids = {perfume_id.casefold() for perfume_id in profile.owned_perfume_ids}
+    liked = {note.casefold() for note in profile.liked_notes}
+    preferred = {family.casefold() for family in profile.preferred_families}
+
+    def overlap_score(perfume: Perfume) -> float:
+        score = overlaps[perfume.perfume_id] / query_size if query_size else 0.0
+        return score - owned_penalty if perfume.perfume_id.casefold() in owned_ids else score
+
+    top = heapq.nsmallest(top_n, candidates, key=lambda perfume: (-overlap_score(perfume), perfume.perfume_id))
+    return tuple(
+        RecommendedPerfume(
+            perfume_id=perfume.perfume_id,
+            name=perfume.name,
+            url=perfume.url,
+            score=round(overlap_score(perfume), 6),
+            matched_notes=tuple(perfume.note_map[key] for key in sorted(perfume.note_keys & liked)),
+            matched_families=tuple(perfume.family_map[key] for key in sorted(perfume.family_keys & preferred)),
+        )
+        for perfume in top
+    )
+
+
+def _component_summary(items: tuple[RecommendedPerfume, ...]) -> dict[str, float]:
+    totals: dict[str, float] = {}
+    traced = [item.trace for item in items if item.trace is not None]
+    for trace in traced:
+        for component in trace.components:
+            totals[component.name] = totals.get(component.name, 0.0) + component.contribution
+        totals["owned_penalty"] = totals.get("owned_penalty", 0.0) - trace.owned_penalty
+    return {name: round(total / len(traced), 6) for name, total in totals.items()}
+
+
+def recommended_perfume(perfume: Perfume, trace: ScoreTrace) -> RecommendedPerfume:
+    """The served form of a scored perfume, keeping its trace."""
+    return RecommendedPerfume(
+        perfume_id=perfume.perfume_id,
+        name=perfume.name,
+        url=perfume.url,
+        score=trace.total,
+        matched_notes=trace.matched_notes,
+        matched_families=trace.matched_families,
+        similar_to_owned=trace.similar_to_owned,
+        trace=trace,
+    )
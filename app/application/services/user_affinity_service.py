@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import replace
+from datetime import datetime, timezone
+import logging
+import threading
+import time
+from typing import Callable
+
+from app.config.logging import AFFINITY_UPDATED, get_logger, log_event
+from app.config.settings import (
+    AFFINITY_CACHE_SIZE,
+    AFFINITY_CACHE_TTL_SECONDS,
+    AFFINITY_HALF_LIFE_DAYS,
+    AFFINITY_MAX_TOKENS,
+    AFFINITY_MIN_SCORE,
+    AFFINITY_PROFILE_FAMILIES,
+    AFFINITY_PROFILE_NOTES,
+    FEEDBACK_EVENT_WEIGHTS,
+)
+from app.domain.models.feedback_event import FeedbackEvent
+from app.domain.models.perfume import Perfume
+from app.domain.models.user_affinity import UserAffinity
+from app.domain.models.user_profile import UserProfile
+from app.infrastructure.persistence.sqlite.user_affinity_repo_sqlite import UserAffinityRepositorySqlite
+
+
+class UserAffinityService:
+    """Keeps per-user note/family affinities current as feedback arrives.
+
+    `apply_events` folds each flushed batch into the stored affinities (one
+    read-modify-write per user inside a single write transaction, never a
+    history scan), so overlapping flushes, even from different pre-forked
+    workers, cannot lose updates. Reads go through an LRU cache whose entries
+    expire after `cache_ttl_seconds`, which bounds how long another worker's
+    updates stay invisible, and decay lazily to the request time.
+    `personalize` hands the strongest learned tokens to the scorer as their
+    own weighted component, next to the user's explicit choices.
+    """
+
+    def __init__(
+        self,
+        repository: UserAffinityRepositorySqlite,
+        perfume_lookup: Callable[[str], Perfume | None],
+        event_weights: Mapping[str, float] = FEEDBACK_EVENT_WEIGHTS,
+        half_life_days: float = AFFINITY_HALF_LIFE_DAYS,
+        max_tokens: int = AFFINITY_MAX_TOKENS,
+        cache_size: int = AFFINITY_CACHE_SIZE,
+        cache_ttl_seconds: float = AFFINITY_CACHE_TTL_SECONDS,
+        now_func: Callable[[], datetime] = lambda: datetime.now(tz=timezone.utc),
+        clock: Callable[[], float] = time.monotonic,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.repository = repository
+        self.perfume_lookup = perfume_lookup
+        self.event_weights = event_weights
+        self.half_life_days = half_life_days
+        self.max_tokens = max_tokens
+        self.cache_size = cache_size
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.now_func = now_func
+        self.clock = clock
+        self.logger = logger or get_logger("app.application.services.user_affinity_service")
+        self._cache: OrderedDict[str, tuple[UserAffinity | None, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def apply_events(self, events: Iterable[FeedbackEvent]) -> int:
+        by_user: dict[str, list[FeedbackEvent]] = {}
+        for event in events:
+            by_user.setdefault(event.user_id, []).append(event)
+        skipped_count = 0
+
+        def fold(user_id: str, stored: UserAffinity | None) -> UserAffinity:
+            nonlocal skipped_count
+            user_events = by_user[user_id]
+            affinity = stored or UserAffinity(user_id=user_id, as_of=user_events[0].occurred_at)
+            for event in sorted(user_events, key=lambda item: item.occurred_at):
+                perfume = self.perfume_lookup(event.perfume_id)
+                weight = self.event_weights.get(event.event_type, 0.0)
+                if perfume is None or not weight:
+                    skipped_count += 1
+                    continue
+                affinity = affinity.with_event(
+                    event.occurred_at,
+                    weight,
+                    perfume.note_keys,
+                    perfume.family_keys,
+                    self.half_life_days,
+                    self.max_tokens,
+                )
+            return affinity
+
+        updated: tuple[UserAffinity, ...] = ()
+        if by_user:
+            updated = self.repository.update_many(by_user, fold)
+            with self._lock:
+                for affinity in updated:
+                    self._cache_put(affinity.user_id, affinity)
+        log_event(
+            self.logger,
+            AFFINITY_UPDATED,
+            user_count=len(updated),
+            event_count=sum(len(user_events) for user_events in by_user.values()),
+            skipped_count=skipped_count,
+        )
+        return len(updated)
+
+    def affinity(self, user_id: str, now: datetime | None = None) -> UserAffinity | None:
+        stored = self._stored(user_id)
+        if stored is None:
+            return None
+        return stored.decayed(now or self.now_func(), self.half_life_days)
+
+    def personalize(self, profile: UserProfile, user_id: str | None, now: datetime | None = None) -> UserProfile:
+        if not user_id:
+            return profile
+        affinity = self.affinity(user_id, now)
+        if affinity is None:
+            return profile
+
+        taken_notes = {note.casefold() for note in profile.liked_notes + profile.disliked_notes} | {
+            note.casefold() for note in profile.constraints.exclude_notes
+        }
+        taken_families = {family.casefold() for family in profile.preferred_families} | {
+            family.casefold() for family in profile.constraints.exclude_families
+        }
+        learned_notes = _learned(
+            affinity.note_scores,
+            affinity.top_notes(AFFINITY_PROFILE_NOTES) + affinity.top_notes(AFFINITY_PROFILE_NOTES, positive=False),
+            taken_notes,
+        )
+        learned_families = _learned(
+            affinity.family_scores,
+            affinity.top_families(AFFINITY_PROFILE_FAMILIES)
+            + affinity.top_families(AFFINITY_PROFILE_FAMILIES, positive=False),
+            taken_families,
+        )
+        if not (learned_notes or learned_families):
+            return profile
+        return replace(profile, learned_notes=learned_notes, learned_families=learned_families)
+
+    def _stored(self, user_id: str) -> UserAffinity | None:
+        with self._lock:
+            cached = self._cache.get(user_id)
+            if cached is not None and cached[1] > self.clock():
+                self._cache.move_to_end(user_id)
+                return cached[0]
+        affinity = self.repository.get(user_id)
+        with self._lock:
+            self._cache_put(user_id, affinity)
+        return affinity
+
+    def _cache_put(self, user_id: str, affinity: UserAffinity | None) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[user_id] = (affinity, self.clock() + self.cache_ttl_seconds)
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def _learned(
+    scores: Mapping[str, float], keys: tuple[str, ...], taken: set[str]
+) -> tuple[tuple[str, float], ...]:
+    # Explicit profile choices always win over learned ones; weights are relative to the strongest token.
+    strong = [(key, scores[key]) for key in keys if abs(scores[key]) >= AFFINITY_MIN_SCORE and key not in taken]
+    if not strong:
+        return ()
+    scale = max(abs(score) for _, score in strong)
+    return tuple((key, round(score / scale, 3)) for key, score in strong)
@@ -1,14 +1,53 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
+import copy
+from datetime import datetime, timezone
+import json
 import logging
-from typing import Any
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import random
+from typing import Any, Callable
 
 
 SCRAPE_RUN_START = "scrape_run_start"
 SCRAPE_RUN_END = "scrape_run_end"
 SCRAPE_URL_FETCHED = "scrape_url_fetched"
 SCRAPE_URL_FAILED = "scrape_url_failed"
+SCRAPE_URL_RETRY_SCHEDULED = "scrape_url_retry_scheduled"
 SCRAPE_PARSE_FAILED = "scrape_parse_failed"
+SCRAPE_REFRESH_PLANNED = "scrape_refresh_planned"
+REPARSE_RUN_START = "reparse_run_start"
+REPARSE_RUN_END = "reparse_run_end"
+RECOMMENDATION_SERVED = "recommendation_served"
+RECOMMENDATION_FALLBACK = "recommendation_fallback"
+CATALOG_SNAPSHOT_LOADED = "catalog_snapshot_loaded"
+CATALOG_SNAPSHOT_SWAPPED = "catalog_snapshot_swapped"
+CATALOG_REFRESH_FAILED = "catalog_refresh_failed"
+CATALOG_VOCABULARY_MISSING = "catalog_vocabulary_missing"
+FEEDBACK_EVENT_RECORDED = "feedback_event_recorded"
+FEEDBACK_EVENTS_FLUSHED = "feedback_events_flushed"
+FEEDBACK_FLUSH_FAILED = "feedback_flush_failed"
+FEEDBACK_LISTENER_FAILED = "feedback_listener_failed"
+AFFINITY_UPDATED = "affinity_updated"
+ITEM_PRIORS_UPDATED = "item_priors_updated"
+SERVER_WORKER_STARTED = "server_worker_started"
+SERVER_WORKER_EXITED = "server_worker_exited"
+SERVER_RELOAD = "server_reload"
+
+
+_STANDARD_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+class LazyField:
+    """Log field computed only if the event is actually emitted."""
+
+    __slots__ = ("func",)
+
+    def __init__(self, func: Callable[[], Any]) -> None:
+        self.func = func
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -22,4 +61,127 @@ def log_event(
     level: int = logging.INFO,
     **fields: Any,
 ) -> None:
+    if not logger.isEnabledFor(level):
+        return
+
+    for name, value in fields.items():
+        if isinstance(value, LazyField):
+            fields[name] = value.func()
     logger.log(level, event, extra={"event": event, **fields})
+
+
+class EventSampler(logging.Filter):
+    """Handler filter passing only a `rate` fraction of INFO/DEBUG records per event.
+
+    Rates belong to the handler the sampler is attached to, so other handlers
+    (and other loggers) still see every record. Kept records carry their
+    `sample_rate`; warnings and errors are never sampled.
+    """
+
+    def __init__(self, rates: Mapping[str, float] | None = None) -> None:
+        super().__init__()
+        self._rates: dict[str, float] = {}
+        for event, rate in (rates or {}).items():
+            self.set_rate(event, rate)
+
+    def set_rate(self, event: str, rate: float) -> None:
+        """Keep a `rate` fraction of `event` records (1.0 = all)."""
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("sample rate must be between 0 and 1")
+        if rate >= 1.0:
+            self._rates.pop(event, None)
+        else:
+            self._rates[event] = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self._rates.get(getattr(record, "event", None))
+        if rate is None or record.levelno >= logging.WARNING:
+            return True
+        if random.random() >= rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: timestamp, level, logger, event and its fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", record.getMessage()),
+        }
+        payload.update(
+            (name, value) for name, value in vars(record).items() if name not in _STANDARD_RECORD_ATTRS
+        )
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # Formatted by `_DroppingQueueHandler` before the record crossed the queue.
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def configure_async_logging(
+    handlers: list[logging.Handler] | None = None,
+    logger_name: str = "app",
+    level: int = logging.INFO,
+    queue_size: int = 10_000,
+    sample_rates: Mapping[str, float] | None = None,
+) -> QueueListener:
+    """Route `logger_name` through a QueueHandler so I/O happens on a listener thread.
+
+    Defaults to one JSON-formatted stderr handler. `sample_rates` maps events
+    to the fraction of INFO/DEBUG records kept (see `EventSampler`); sampled-out
+    records never enter the queue. Calling it again for the same logger stops
+    the previous listener and replaces its handler. The caller owns the
+    returned listener and should `stop()` it on shutdown to flush records.
+    """
+    if handlers is None:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(JsonFormatter())
+        handlers = [stream_handler]
+
+    logger = logging.getLogger(logger_name)
+    for previous in [handler for handler in logger.handlers if isinstance(handler, _DroppingQueueHandler)]:
+        logger.removeHandler(previous)
+        previous.listener.stop()
+
+    records: queue.Queue = queue.Queue(maxsize=queue_size)
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    queue_handler = _DroppingQueueHandler(records, listener)
+    if sample_rates:
+        queue_handler.addFilter(EventSampler(sample_rates))
+    logger.addHandler(queue_handler)
+    logger.setLevel(level)
+    logger.propagate = False
+
+    listener.start()
+    return listener
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Drops records instead of blocking the caller when the queue is full."""
+
+    def __init__(self, records: queue.Queue, listener: QueueListener) -> None:
+        super().__init__(records)
+        self.listener = listener
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The default prepare drops exc_info; keep the formatted traceback for JsonFormatter.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
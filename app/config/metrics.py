@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+import math
+import os
+from pathlib import Path
+import re
+import threading
+import time
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+STAGE_ROBOTS_CHECK = "robots_check"
+STAGE_RATE_LIMIT_WAIT = "rate_limit_wait"
+STAGE_HTTP_REQUEST = "http_request"
+STAGE_FETCH = "fetch"
+STAGE_PARSE = "parse"
+STAGE_UPSERT = "upsert"
+
+COUNTER_HTTP_REQUESTS = "http_requests"
+COUNTER_HTTP_RETRIES = "http_retries"
+COUNTER_HTTP_BYTES_RECEIVED = "http_bytes_received"
+COUNTER_PAGES_FETCHED = "pages_fetched"
+
+GAUGE_PAGES_PER_SECOND = "pages_per_second"
+
+_METRIC_NAME_PATTERN = re.compile(r"[^a-zA-Z0-9_]")
+
+
+@dataclass(frozen=True)
+class HistogramSummary:
+    count: int
+    total_seconds: float
+    mean_seconds: float
+    p50_seconds: float
+    p95_seconds: float
+    max_seconds: float
+
+
+@dataclass(frozen=True)
+class MetricsSummary:
+    counters: dict[str, float]
+    gauges: dict[str, float]
+    histograms: dict[str, HistogramSummary]
+
+
+class _Histogram:
+    __slots__ = ("bounds", "bucket_counts", "count", "total", "maximum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.bucket_counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (the max for the overflow bucket)."""
+        if self.count == 0:
+            return 0.0
+        rank = math.ceil(q * self.count)
+        seen = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.bounds[index], self.maximum) if index < len(self.bounds) else self.maximum
+        return self.maximum
+
+    def summary(self) -> HistogramSummary:
+        return HistogramSummary(
+            count=self.count,
+            total_seconds=round(self.total, 6),
+            mean_seconds=round(self.total / self.count, 6) if self.count else 0.0,
+            p50_seconds=self.quantile(0.5),
+            p95_seconds=self.quantile(0.95),
+            max_seconds=round(self.maximum, 6),
+        )
+
+
+class MetricsCollector:
+    """Thread-safe in-process counters, gauges and latency histograms.
+
+    One collector can be shared by the pipeline, HTTP client and access guard
+    of a crawl; `summary()` snapshots it and `write_prometheus()` dumps it in
+    Prometheus text format (e.g. for the node_exporter textfile collector).
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, float] = {}
+        self._histograms: dict[str, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def counter(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = _Histogram(self.buckets)
+                self._histograms[name] = histogram
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started_at)
+
+    def summary(self) -> MetricsSummary:
+        with self._lock:
+            return MetricsSummary(
+                counters=dict(self._counters),
+                gauges=dict(self._gauges),
+                histograms={name: histogram.summary() for name, histogram in self._histograms.items()},
+            )
+
+    def to_prometheus_text(self, prefix: str = "scrape_") -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name, value in sorted(self._counters.items()):
+                metric = _metric_name(prefix, name) + "_total"
+                lines.extend((f"# TYPE {metric} counter", f"{metric} {_format_value(value)}"))
+            for name, value in sorted(self._gauges.items()):
+                metric = _metric_name(prefix, name)
+                lines.extend((f"# TYPE {metric} gauge", f"{metric} {_format_value(value)}"))
+            for name, histogram in sorted(self._histograms.items()):
+                metric = _metric_name(prefix, name) + "_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.bounds, histogram.bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric}_bucket{{le="{_format_value(bound)}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+                lines.append(f"{metric}_sum {_format_value(histogram.total)}")
+                lines.append(f"{metric}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path, prefix: str = "scrape_") -> None:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        temp_path.write_text(self.to_prometheus_text(prefix), encoding="utf-8")
+        os.replace(temp_path, target)
+
+
+def _metric_name(prefix: str, name: str) -> str:
+    return _METRIC_NAME_PATTERN.sub("_", f"{prefix}{name}")
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
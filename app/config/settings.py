@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import os
+
+DEFAULT_TOP_N = 10
+RECOMMENDATION_TIME_BUDGET_MS = 150.0
+RECOMMENDATION_CACHE_SIZE = 1024
+DIVERSITY_POOL_SIZE = 50
+# MMR trade-off the API serves with (0 = pure relevance); requests can override it.
+RECOMMENDATION_DIVERSITY = float(os.environ.get("PERFUME_RECOMMENDATION_DIVERSITY", "0"))
+
+CATALOG_DB_PATH = os.environ.get("PERFUME_CATALOG_DB", "data/sqlite/catalog.db")
+SCORING_WORKERS = int(os.environ.get("PERFUME_SCORING_WORKERS", "4"))
+CATALOG_VERSION_MARKER = os.environ.get("PERFUME_CATALOG_MARKER", "data/sqlite/catalog.version")
+SERVER_WORKERS = int(os.environ.get("PERFUME_SERVER_WORKERS", "4"))
+SERVER_RELOAD_POLL_SECONDS = 2.0
+SERVER_WORKER_SHUTDOWN_SECONDS = 30.0
+FEEDBACK_FLUSH_BATCH_SIZE = 500
+FEEDBACK_FLUSH_INTERVAL_SECONDS = 1.0
+FEEDBACK_EVENT_WEIGHTS = {"click": 0.25, "like": 1.0, "dislike": -1.0, "purchase": 2.0}
+AFFINITY_HALF_LIFE_DAYS = 60.0
+AFFINITY_MAX_TOKENS = 64
+AFFINITY_CACHE_SIZE = 4096
+AFFINITY_CACHE_TTL_SECONDS = 30.0
+AFFINITY_PROFILE_NOTES = 5
+AFFINITY_PROFILE_FAMILIES = 2
+AFFINITY_MIN_SCORE = 0.5
+ITEM_PRIOR_POSITIVE_EVENTS = ("like", "purchase")
+ITEM_PRIOR_NEIGHBORS = 20
+API_MAX_TOP_N = 100
+API_MAX_PAGE_SIZE = 200
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Literal
+
+FeedbackEventType = Literal["click", "like", "dislike", "purchase"]
+FEEDBACK_EVENT_TYPES: tuple[FeedbackEventType, ...] = ("click", "like", "dislike", "purchase")
+_ALLOWED_STRENGTHS = {"subtle", "medium", "strong"}
+
+
+@dataclass(frozen=True)
+class FeedbackEvent:
+    user_id: str
+    perfume_id: str
+    event_type: FeedbackEventType
+    occurred_at: datetime
+    occasion: str | None = None
+    moods: tuple[str, ...] = field(default_factory=tuple)
+    strength_preference: str | None = None
+
+    def __post_init__(self) -> None:
+        _validate_required(self.user_id, "user_id")
+        _validate_required(self.perfume_id, "perfume_id")
+        if self.event_type not in FEEDBACK_EVENT_TYPES:
+            raise ValueError("event_type must be click, like, dislike, or purchase")
+        if self.strength_preference is not None and self.strength_preference not in _ALLOWED_STRENGTHS:
+            raise ValueError("strength_preference must be subtle, medium, or strong")
+
+        object.__setattr__(self, "user_id", self.user_id.strip())
+        object.__setattr__(self, "perfume_id", self.perfume_id.strip())
+        object.__setattr__(self, "occurred_at", _as_utc(self.occurred_at))
+        object.__setattr__(self, "occasion", (self.occasion or "").strip() or None)
+        object.__setattr__(self, "moods", tuple(mood.strip() for mood in self.moods if mood.strip()))
+
+
+def _validate_required(value: str, field_name: str) -> None:
+    if not value or not value.strip():
+        raise ValueError(f"{field_name} must not be empty")
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+
+@dataclass(frozen=True)
+class ItemPriors:
+    """Feedback-derived, profile-independent signals per perfume.
+
+    `popularity` is normalized to [0, 1]. `neighbors` holds, per perfume, its
+    top-k co-engaged perfumes with a cosine weight in [0, 1]; pairs outside
+    those lists count as 0. Keys are casefolded perfume ids.
+    """
+
+    popularity: Mapping[str, float] = field(default_factory=dict)
+    neighbors: Mapping[str, Mapping[str, float]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "popularity", MappingProxyType({key.casefold(): value for key, value in self.popularity.items()})
+        )
+        object.__setattr__(
+            self,
+            "neighbors",
+            MappingProxyType(
+                {
+                    key.casefold(): MappingProxyType({other.casefold(): weight for other, weight in values.items()})
+                    for key, values in self.neighbors.items()
+                }
+            ),
+        )
+
+    def popularity_of(self, perfume_id: str) -> float:
+        return self.popularity.get(perfume_id.casefold(), 0.0)
+
+    def co_occurrence(self, perfume_id: str, neighbor_id: str) -> float:
+        neighbors = self.neighbors.get(perfume_id.casefold())
+        if neighbors is None:
+            return 0.0
+        return neighbors.get(neighbor_id.casefold(), 0.0)
@@ -1,19 +1,21 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass, field
 from datetime import datetime
+from types import MappingProxyType
 from typing import Literal
 
 NotePosition = Literal["top", "middle", "base"]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NoteEntry:
     note: str
     position: NotePosition
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Perfume:
     perfume_id: str
     name: str
@@ -29,6 +31,7 @@ class Perfume:
     description: str = ""
     image_urls: tuple[str, ...] = field(default_factory=tuple)
     last_scraped_at: datetime | None = None
+    _derived: _DerivedViews | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         _validate_required(self.perfume_id, "perfume_id")
@@ -46,11 +49,59 @@ class Perfume:
 
     @property
     def notes_all(self) -> tuple[NoteEntry, ...]:
+        return self._derived_views().notes_all
+
+    @property
+    def note_map(self) -> Mapping[str, str]:
+        """Casefolded note -> first spelling seen across top, middle and base notes."""
+        return self._derived_views().note_map
+
+    @property
+    def note_keys(self) -> frozenset[str]:
+        return self._derived_views().note_keys
+
+    @property
+    def family_map(self) -> Mapping[str, str]:
+        """Casefolded scent family -> its spelling on this perfume."""
+        return self._derived_views().family_map
+
+    @property
+    def family_keys(self) -> frozenset[str]:
+        return self._derived_views().family_keys
+
+    def _derived_views(self) -> _DerivedViews:
+        derived = self._derived
+        if derived is None:
+            derived = _DerivedViews(self)
+            object.__setattr__(self, "_derived", derived)
+        return derived
+
+
+class _DerivedViews:
+    """Per-instance views of a `Perfume`, built once on first access.
+
+    Pickling drops the views (they unpickle as ``None``) so they are rebuilt
+    lazily instead of being shipped between processes.
+    """
+
+    __slots__ = ("notes_all", "note_map", "note_keys", "family_map", "family_keys")
+
+    def __init__(self, perfume: Perfume) -> None:
         entries: list[NoteEntry] = []
-        entries.extend(NoteEntry(note=note, position="top") for note in self.notes_top)
-        entries.extend(NoteEntry(note=note, position="middle") for note in self.notes_middle)
-        entries.extend(NoteEntry(note=note, position="base") for note in self.notes_base)
-        return tuple(entries)
+        entries.extend(NoteEntry(note=note, position="top") for note in perfume.notes_top)
+        entries.extend(NoteEntry(note=note, position="middle") for note in perfume.notes_middle)
+        entries.extend(NoteEntry(note=note, position="base") for note in perfume.notes_base)
+        self.notes_all = tuple(entries)
+
+        note_map = _casefold_map(entry.note for entry in entries)
+        family_map = _casefold_map(perfume.scent_families)
+        self.note_map = MappingProxyType(note_map)
+        self.note_keys = frozenset(note_map)
+        self.family_map = MappingProxyType(family_map)
+        self.family_keys = frozenset(family_map)
+
+    def __reduce__(self) -> tuple[type[None], tuple[()]]:
+        return type(None), ()
 
 
 def _validate_required(value: str, field_name: str) -> None:
@@ -65,6 +116,15 @@ def _validate_price_range(price_min: float | None, price_max: float | None) -> N
         raise ValueError("price_min must be <= price_max")
 
 
+def _casefold_map(values: Iterable[str]) -> dict[str, str]:
+    mapping: dict[str, str] = {}
+    for value in values:
+        key = value.casefold()
+        if key not in mapping:
+            mapping[key] = value
+    return mapping
+
+
 def _normalize_text_items(items: tuple[str, ...]) -> tuple[str, ...]:
     cleaned: list[str] = []
     seen: set[str] = set()
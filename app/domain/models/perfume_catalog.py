@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+import math
+import sys
+
+from app.domain.models.perfume import Perfume
+from app.domain.models.vocabulary import TokenVocabulary
+
+
+class PerfumeCatalog:
+    """Read-only, struct-of-arrays view over many perfumes.
+
+    Every field is stored as one column; tag and note strings are interned so
+    identical values are shared across perfumes. Full `Perfume` objects are only
+    built on demand through `perfume_at` / `get`. Notes and families are also
+    encoded as sorted token ids against the catalog's `TokenVocabulary`, packed
+    into one flat `array` per kind with per-perfume offsets; reading them
+    touches no per-perfume object, so forked workers share those pages.
+    """
+
+    __slots__ = (
+        "_index_by_id",
+        "_perfume_ids",
+        "_names",
+        "_urls",
+        "_price_min",
+        "_price_max",
+        "_gender_tags",
+        "_scent_families",
+        "_molecule_tags",
+        "_notes_top",
+        "_notes_middle",
+        "_notes_base",
+        "_descriptions",
+        "_image_urls",
+        "_last_scraped_at",
+        "_note_ids",
+        "_note_offsets",
+        "_family_ids",
+        "_family_offsets",
+        "_vocabulary",
+    )
+
+    def __init__(
+        self,
+        perfumes: Iterable[Perfume] = (),
+        vocabulary: TokenVocabulary | None = None,
+    ) -> None:
+        interner = _TupleInterner()
+        self._vocabulary = vocabulary if vocabulary is not None else TokenVocabulary()
+        self._note_ids = array("I")
+        self._note_offsets = array("I", (0,))
+        self._family_ids = array("I")
+        self._family_offsets = array("I", (0,))
+        self._perfume_ids: list[str] = []
+        self._names: list[str] = []
+        self._urls: list[str] = []
+        self._price_min = array("d")
+        self._price_max = array("d")
+        self._gender_tags: list[tuple[str, ...]] = []
+        self._scent_families: list[tuple[str, ...]] = []
+        self._molecule_tags: list[tuple[str, ...]] = []
+        self._notes_top: list[tuple[str, ...]] = []
+        self._notes_middle: list[tuple[str, ...]] = []
+        self._notes_base: list[tuple[str, ...]] = []
+        self._descriptions: list[str] = []
+        self._image_urls: list[tuple[str, ...]] = []
+        self._last_scraped_at: list[datetime | None] = []
+        self._index_by_id: dict[str, int] = {}
+
+        for perfume in perfumes:
+            if perfume.perfume_id in self._index_by_id:
+                raise ValueError(f"duplicate perfume_id in catalog: {perfume.perfume_id}")
+
+            self._index_by_id[perfume.perfume_id] = len(self._perfume_ids)
+            self._perfume_ids.append(perfume.perfume_id)
+            self._names.append(perfume.name)
+            self._urls.append(perfume.url)
+            self._price_min.append(_dump_price(perfume.price_min))
+            self._price_max.append(_dump_price(perfume.price_max))
+            self._gender_tags.append(interner.intern(perfume.gender_tags))
+            self._scent_families.append(interner.intern(perfume.scent_families))
+            self._molecule_tags.append(interner.intern(perfume.molecule_tags))
+            self._notes_top.append(interner.intern(perfume.notes_top))
+            self._notes_middle.append(interner.intern(perfume.notes_middle))
+            self._notes_base.append(interner.intern(perfume.notes_base))
+            self._descriptions.append(perfume.description)
+            self._image_urls.append(perfume.image_urls)
+            self._last_scraped_at.append(perfume.last_scraped_at)
+            self._note_ids.extend(self._encode("note", perfume.note_keys))
+            self._note_offsets.append(len(self._note_ids))
+            self._family_ids.extend(self._encode("family", perfume.family_keys))
+            self._family_offsets.append(len(self._family_ids))
+
+    @classmethod
+    def from_perfumes(
+        cls,
+        perfumes: Iterable[Perfume],
+        vocabulary: TokenVocabulary | None = None,
+    ) -> PerfumeCatalog:
+        return cls(perfumes, vocabulary)
+
+    def __len__(self) -> int:
+        return len(self._perfume_ids)
+
+    def __contains__(self, perfume_id: object) -> bool:
+        return perfume_id in self._index_by_id
+
+    def __iter__(self) -> Iterator[Perfume]:
+        for index in range(len(self._perfume_ids)):
+            yield self.perfume_at(index)
+
+    @property
+    def perfume_ids(self) -> tuple[str, ...]:
+        return tuple(self._perfume_ids)
+
+    @property
+    def vocabulary(self) -> TokenVocabulary:
+        return self._vocabulary
+
+    def index_of(self, perfume_id: str) -> int:
+        try:
+            return self._index_by_id[perfume_id]
+        except KeyError:
+            raise KeyError(f"unknown perfume_id: {perfume_id}") from None
+
+    def get(self, perfume_id: str) -> Perfume | None:
+        index = self._index_by_id.get(perfume_id)
+        if index is None:
+            return None
+        return self.perfume_at(index)
+
+    def perfume_at(self, index: int) -> Perfume:
+        return Perfume(
+            perfume_id=self._perfume_ids[index],
+            name=self._names[index],
+            url=self._urls[index],
+            price_min=_load_price(self._price_min[index]),
+            price_max=_load_price(self._price_max[index]),
+            gender_tags=self._gender_tags[index],
+            scent_families=self._scent_families[index],
+            molecule_tags=self._molecule_tags[index],
+            notes_top=self._notes_top[index],
+            notes_middle=self._notes_middle[index],
+            notes_base=self._notes_base[index],
+            description=self._descriptions[index],
+            image_urls=self._image_urls[index],
+            last_scraped_at=self._last_scraped_at[index],
+        )
+
+    def scent_families_at(self, index: int) -> tuple[str, ...]:
+        return self._scent_families[index]
+
+    def notes_at(self, index: int) -> tuple[str, ...]:
+        return self._notes_top[index] + self._notes_middle[index] + self._notes_base[index]
+
+    def note_ids_at(self, index: int) -> array:
+        return self._note_ids[self._note_offsets[index] : self._note_offsets[index + 1]]
+
+    def family_ids_at(self, index: int) -> array:
+        return self._family_ids[self._family_offsets[index] : self._family_offsets[index + 1]]
+
+    def _encode(self, kind: str, keys: frozenset[str]) -> array:
+        self._vocabulary.add_many(kind, sorted(keys))
+        return self._vocabulary.encode(kind, keys)
+
+
+class _TupleInterner:
+    def __init__(self) -> None:
+        self._tuples: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+    def intern(self, values: tuple[str, ...]) -> tuple[str, ...]:
+        shared = self._tuples.get(values)
+        if shared is None:
+            shared = tuple(sys.intern(value) for value in values)
+            self._tuples[shared] = shared
+        return shared
+
+
+def _dump_price(value: float | None) -> float:
+    if value is None:
+        return math.nan
+    return value
+
+
+def _load_price(value: float) -> float | None:
+    if math.isnan(value):
+        return None
+    return value
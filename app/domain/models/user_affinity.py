@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+
+
+@dataclass(frozen=True)
+class UserAffinity:
+    """Per-user note/family affinity scores, valid as of `as_of`.
+
+    Scores decay exponentially with `half_life_days`; decay is applied lazily
+    (`decayed`) instead of rewriting stored scores as time passes. Positive
+    scores mean the user engages with perfumes carrying that token, negative
+    scores that they reject them.
+    """
+
+    user_id: str
+    as_of: datetime
+    note_scores: Mapping[str, float] = field(default_factory=dict)
+    family_scores: Mapping[str, float] = field(default_factory=dict)
+    event_count: int = 0
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "note_scores", MappingProxyType(dict(self.note_scores)))
+        object.__setattr__(self, "family_scores", MappingProxyType(dict(self.family_scores)))
+
+    def decayed(self, now: datetime, half_life_days: float) -> UserAffinity:
+        factor = _decay_factor(self.as_of, now, half_life_days)
+        if factor == 1.0:
+            return self
+        return UserAffinity(
+            user_id=self.user_id,
+            as_of=max(now, self.as_of),
+            note_scores={key: score * factor for key, score in self.note_scores.items()},
+            family_scores={key: score * factor for key, score in self.family_scores.items()},
+            event_count=self.event_count,
+        )
+
+    def with_event(
+        self,
+        occurred_at: datetime,
+        weight: float,
+        note_keys: Iterable[str],
+        family_keys: Iterable[str],
+        half_life_days: float,
+        max_tokens: int,
+    ) -> UserAffinity:
+        """Decay to `occurred_at` (never backwards), add `weight` to every token, keep the strongest."""
+        current = self.decayed(occurred_at, half_life_days)
+        # A late event is discounted by how far it lies before as_of.
+        weight *= _decay_factor(occurred_at, current.as_of, half_life_days)
+        return UserAffinity(
+            user_id=self.user_id,
+            as_of=current.as_of,
+            note_scores=_add_and_prune(current.note_scores, note_keys, weight, max_tokens),
+            family_scores=_add_and_prune(current.family_scores, family_keys, weight, max_tokens),
+            event_count=self.event_count + 1,
+        )
+
+    def top_notes(self, limit: int, positive: bool = True) -> tuple[str, ...]:
+        return _top(self.note_scores, limit, positive)
+
+    def top_families(self, limit: int, positive: bool = True) -> tuple[str, ...]:
+        return _top(self.family_scores, limit, positive)
+
+
+def _decay_factor(start: datetime, end: datetime, half_life_days: float) -> float:
+    elapsed_days = (end - start).total_seconds() / 86400.0
+    if elapsed_days <= 0 or half_life_days <= 0:
+        return 1.0
+    return 0.5 ** (elapsed_days / half_life_days)
+
+
+def _add_and_prune(
+    scores: Mapping[str, float], keys: Iterable[str], weight: float, max_tokens: int
+) -> dict[str, float]:
+    updated = dict(scores)
+    for key in keys:
+        updated[key] = updated.get(key, 0.0) + weight
+    if len(updated) <= max_tokens:
+        return updated
+    strongest = sorted(updated.items(), key=lambda item: (-abs(item[1]), item[0]))[:max_tokens]
+    return dict(strongest)
+
+
+def _top(scores: Mapping[str, float], limit: int, positive: bool) -> tuple[str, ...]:
+    sign = 1.0 if positive else -1.0
+    ranked = sorted(
+        (item for item in scores.items() if item[1] * sign > 0),
+        key=lambda item: (-item[1] * sign, item[0]),
+    )
+    return tuple(key for key, _ in ranked[:limit])
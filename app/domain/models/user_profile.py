@@ -27,6 +27,10 @@ class UserProfile:
     moods: tuple[str, ...] = field(default_factory=tuple)
     strength_preference: StrengthPreference | None = None
     constraints: UserProfileConstraints = field(default_factory=UserProfileConstraints)
+    # Feedback-derived (token, weight) pairs, weight in [-1, 1]; scored by their own
+    # `affinity` component so they never dilute the explicit liked notes/families.
+    learned_notes: tuple[tuple[str, float], ...] = field(default_factory=tuple)
+    learned_families: tuple[tuple[str, float], ...] = field(default_factory=tuple)
 
     def __post_init__(self) -> None:
         object.__setattr__(self, "owned_perfume_ids", _normalize_text_items(self.owned_perfume_ids))
@@ -35,6 +39,8 @@ class UserProfile:
         object.__setattr__(self, "preferred_families", _normalize_text_items(self.preferred_families))
         object.__setattr__(self, "moods", _normalize_text_items(self.moods))
         object.__setattr__(self, "occasion", _normalize_optional_text(self.occasion))
+        object.__setattr__(self, "learned_notes", _normalize_weighted_items(self.learned_notes))
+        object.__setattr__(self, "learned_families", _normalize_weighted_items(self.learned_families))
         _validate_strength(self.strength_preference)
         _validate_note_preferences(self.liked_notes, self.disliked_notes)
 
@@ -88,3 +94,22 @@ def _normalize_text_items(items: tuple[str, ...]) -> tuple[str, ...]:
         cleaned.append(normalized)
 
     return tuple(cleaned)
+
+
+
+def _normalize_weighted_items(items: tuple[tuple[str, float], ...]) -> tuple[tuple[str, float], ...]:
+    cleaned: list[tuple[str, float]] = []
+    seen: set[str] = set()
+
+    for key, weight in items:
+        normalized = key.strip().casefold()
+        if not normalized or normalized in seen or not weight:
+            continue
+
+        if not -1.0 <= weight <= 1.0:
+            raise ValueError("learned weights must be between -1 and 1")
+
+        seen.add(normalized)
+        cleaned.append((normalized, float(weight)))
+
+    return tuple(cleaned)
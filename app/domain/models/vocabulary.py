@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+import sys
+import threading
+from typing import Literal
+
+TokenKind = Literal["note", "family", "gender", "molecule"]
+TOKEN_KINDS: tuple[TokenKind, ...] = ("note", "family", "gender", "molecule")
+
+
+class TokenVocabulary:
+    """Maps canonical casefolded tokens to dense integer ids, one id space per kind.
+
+    Ids are assigned in insertion order starting at 0 and never change, so id
+    arrays built against one vocabulary stay valid while it grows.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, dict[str, int]] = {kind: {} for kind in TOKEN_KINDS}
+        self._tokens: dict[str, list[str]] = {kind: [] for kind in TOKEN_KINDS}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[tuple[str, str, int]]) -> TokenVocabulary:
+        vocabulary = cls()
+        for kind, token, token_id in sorted(entries, key=lambda entry: (entry[0], entry[2])):
+            assigned = vocabulary.add(kind, token)
+            if assigned != token_id:
+                raise ValueError(f"vocabulary ids for {kind} are not dense at {token_id}")
+        return vocabulary
+
+    def add(self, kind: str, token: str) -> int:
+        key = _token_key(token)
+        ids = self._kind_ids(kind)
+        token_id = ids.get(key)
+        if token_id is not None:
+            return token_id
+
+        with self._lock:
+            token_id = ids.get(key)
+            if token_id is None:
+                token_id = len(self._tokens[kind])
+                self._tokens[kind].append(key)
+                ids[key] = token_id
+        return token_id
+
+    def add_many(self, kind: str, tokens: Iterable[str]) -> tuple[int, ...]:
+        return tuple(self.add(kind, token) for token in tokens)
+
+    def id_of(self, kind: str, token: str) -> int | None:
+        return self._kind_ids(kind).get(_token_key(token))
+
+    def token_of(self, kind: str, token_id: int) -> str:
+        self._kind_ids(kind)
+        return self._tokens[kind][token_id]
+
+    def encode(self, kind: str, tokens: Iterable[str]) -> array:
+        """Sorted, de-duplicated ids of the known `tokens`; unknown tokens are skipped."""
+        ids = self._kind_ids(kind)
+        known = {ids[key] for key in map(_token_key, tokens) if key in ids}
+        return array("I", sorted(known))
+
+    def size(self, kind: str) -> int:
+        self._kind_ids(kind)
+        return len(self._tokens[kind])
+
+    def entries(self) -> Iterator[tuple[str, str, int]]:
+        for kind in TOKEN_KINDS:
+            for token_id, token in enumerate(self._tokens[kind]):
+                yield kind, token, token_id
+
+    def _kind_ids(self, kind: str) -> dict[str, int]:
+        ids = self._ids.get(kind)
+        if ids is None:
+            raise ValueError(f"unknown token kind: {kind}")
+        return ids
+
+
+def _token_key(token: str) -> str:
+    return sys.intern(token.strip().casefold())
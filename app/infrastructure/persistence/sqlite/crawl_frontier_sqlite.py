@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import json
+from pathlib import Path
+import sqlite3
+
+
+@dataclass(frozen=True)
+class FrontierEntry:
+    url: str
+    stage: str
+    status: str
+    attempts: int
+    next_attempt_at: datetime | None
+    payload: dict | None
+
+
+class CrawlFrontierSqlite:
+    """Persistent crawl frontier: which listing/product URLs are pending, done or failed.
+
+    Changes are buffered in memory and written in one transaction per
+    `checkpoint()`, which also runs automatically every `checkpoint_every`
+    changes, so an interrupted crawl loses at most one batch of progress.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, checkpoint_every: int = 50) -> None:
+        self.connection = connection
+        self.connection.row_factory = sqlite3.Row
+        self.checkpoint_every = checkpoint_every
+        self._pending_ops: list[tuple[str, tuple]] = []
+
+    def initialize_schema(self, schema_path: str | None = None) -> None:
+        path = Path(schema_path) if schema_path else Path(__file__).with_name("schema.sql")
+        self.connection.executescript(path.read_text(encoding="utf-8"))
+        self.connection.commit()
+
+    def reset(self, seed_listing_urls: tuple[str, ...] | list[str]) -> None:
+        self._pending_ops.clear()
+        self.connection.execute("DELETE FROM crawl_frontier")
+        self.connection.executemany(
+            _INSERT_ENTRY_SQL, [(url, "listing", None) for url in seed_listing_urls]
+        )
+        self.connection.commit()
+
+    def add(self, url: str, stage: str, payload: dict | None = None) -> None:
+        encoded = json.dumps(payload, ensure_ascii=False) if payload is not None else None
+        self._record(_INSERT_ENTRY_SQL, (url, stage, encoded))
+
+    def mark_done(self, url: str) -> None:
+        self._record(_MARK_DONE_SQL, (url,))
+
+    def mark_failed(self, url: str) -> None:
+        self._record(_MARK_FAILED_SQL, (url,))
+
+    def mark_retry(self, url: str, next_attempt_at: datetime) -> None:
+        self._record(_MARK_RETRY_SQL, (next_attempt_at.isoformat(), url))
+
+    def checkpoint(self) -> None:
+        if not self._pending_ops:
+            return
+        with self.connection:
+            for sql, params in self._pending_ops:
+                self.connection.execute(sql, params)
+        self._pending_ops.clear()
+
+    def entries(self, stage: str | None = None) -> tuple[FrontierEntry, ...]:
+        query = "SELECT * FROM crawl_frontier"
+        params: tuple = ()
+        if stage is not None:
+            query += " WHERE stage = ?"
+            params = (stage,)
+        rows = self.connection.execute(query + " ORDER BY rowid", params).fetchall()
+        return tuple(_row_to_entry(row) for row in rows)
+
+    def _record(self, sql: str, params: tuple) -> None:
+        self._pending_ops.append((sql, params))
+        if len(self._pending_ops) >= self.checkpoint_every:
+            self.checkpoint()
+
+
+def _row_to_entry(row: sqlite3.Row) -> FrontierEntry:
+    return FrontierEntry(
+        url=row["url"],
+        stage=row["stage"],
+        status=row["status"],
+        attempts=row["attempts"],
+        next_attempt_at=datetime.fromisoformat(row["next_attempt_at"]) if row["next_attempt_at"] else None,
+        payload=json.loads(row["payload"]) if row["payload"] else None,
+    )
+
+
+_INSERT_ENTRY_SQL = """
+INSERT INTO crawl_frontier (url, stage, payload) VALUES (?, ?, ?)
+ON CONFLICT(url) DO NOTHING;
+"""
+
+_MARK_DONE_SQL = """
+UPDATE crawl_frontier SET status = 'done', next_attempt_at = NULL WHERE url = ?;
+"""
+
+_MARK_FAILED_SQL = """
+UPDATE crawl_frontier SET status = 'failed', attempts = attempts + 1, next_attempt_at = NULL
+WHERE url = ?;
+"""
+
+_MARK_RETRY_SQL = """
+UPDATE crawl_frontier SET attempts = attempts + 1, next_attempt_at = ? WHERE url = ?;
+"""
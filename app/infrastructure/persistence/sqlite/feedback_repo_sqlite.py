@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+import json
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Callable
+
+from app.config.settings import FEEDBACK_FLUSH_BATCH_SIZE
+from app.domain.models.feedback_event import FeedbackEvent
+
+_PARTITION_PREFIX = "feedback_events_"
+
+FlushListener = Callable[[tuple[FeedbackEvent, ...]], None]
+
+
+@dataclass(frozen=True)
+class FeedbackStat:
+    user_id: str | None
+    perfume_id: str
+    event_type: str
+    event_count: int
+    last_event_at: datetime
+    user_count: int | None = None
+
+
+class FeedbackListenerError(Exception):
+    """`on_flushed` failed after its batch was committed; the events themselves are stored."""
+
+    def __init__(self, flushed_count: int) -> None:
+        super().__init__(f"on_flushed failed for a committed batch of {flushed_count} events")
+        self.flushed_count = flushed_count
+
+
+class FeedbackRepositorySqlite:
+    """Append-optimized feedback store.
+
+    `append` only buffers; events reach SQLite in one transaction per
+    `flush()` (automatic every `flush_every` events). Raw events go to monthly
+    partition tables with no secondary indexes, and the same transaction folds
+    the batch into `feedback_user_stats` / `feedback_perfume_stats`, so
+    per-user and per-perfume reads never touch the event log.
+
+    All connection use is serialized by a lock; open the connection with
+    `check_same_thread=False` when flushing from a background thread.
+
+    `on_flushed` receives each batch once it is committed, which is where
+    derived per-user state (see `UserAffinityService`) is folded forward. If
+    it raises, `flush` raises `FeedbackListenerError` instead of the original
+    error so callers can tell a failed listener from a failed write.
+    """
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        flush_every: int = FEEDBACK_FLUSH_BATCH_SIZE,
+        on_flushed: FlushListener | None = None,
+    ) -> None:
+        self.connection = connection
+        self.connection.row_factory = sqlite3.Row
+        self.flush_every = flush_every
+        self.on_flushed = on_flushed
+        self._buffer: list[FeedbackEvent] = []
+        self._buffer_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._partitions: set[str] | None = None
+
+    def initialize_schema(self, schema_path: str | None = None) -> None:
+        path = Path(schema_path) if schema_path else Path(__file__).with_name("schema.sql")
+        with self._db_lock:
+            # WAL lets API readers proceed while a flush is writing; NORMAL sync is durable at checkpoints.
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.executescript(path.read_text(encoding="utf-8"))
+            self.connection.commit()
+
+    def pending_count(self) -> int:
+        with self._buffer_lock:
+            return len(self._buffer)
+
+    def append(self, event: FeedbackEvent) -> None:
+        with self._buffer_lock:
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.flush_every
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        with self._buffer_lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+        try:
+            with self._db_lock, self.connection:
+                self._write_batch(batch)
+        except Exception:
+            self._partitions = None
+            with self._buffer_lock:
+                self._buffer[:0] = batch
+            raise
+        if self.on_flushed is not None:
+            try:
+                self.on_flushed(tuple(batch))
+            except Exception as exc:
+                raise FeedbackListenerError(len(batch)) from exc
+        return len(batch)
+
+    def partitions(self) -> tuple[str, ...]:
+        with self._db_lock:
+            return tuple(sorted(self._known_partitions()))
+
+    def user_stats(self, user_id: str) -> tuple[FeedbackStat, ...]:
+        with self._db_lock:
+            rows = self.connection.execute(_SELECT_USER_STATS_SQL, (user_id,)).fetchall()
+        return tuple(_row_to_stat(row) for row in rows)
+
+    def perfume_stats(self, perfume_id: str) -> tuple[FeedbackStat, ...]:
+        with self._db_lock:
+            rows = self.connection.execute(_SELECT_PERFUME_STATS_SQL, (perfume_id,)).fetchall()
+        return tuple(_row_to_stat(row) for row in rows)
+
+    def events(self, start: datetime, end: datetime) -> tuple[FeedbackEvent, ...]:
+        """Raw events with `start <= occurred_at < end`, reading only the partitions that overlap."""
+        start_iso, end_iso = start.isoformat(), end.isoformat()
+        wanted = {_partition_name(start)} | {_partition_name(end)}
+        found: list[FeedbackEvent] = []
+        with self._db_lock:
+            for name in sorted(self._known_partitions()):
+                if not (min(wanted) <= name <= max(wanted)):
+                    continue
+                rows = self.connection.execute(
+                    f"SELECT * FROM {name} WHERE occurred_at >= ? AND occurred_at < ? ORDER BY occurred_at",
+                    (start_iso, end_iso),
+                ).fetchall()
+                found.extend(_row_to_event(row) for row in rows)
+        return tuple(found)
+
+    def events_since(
+        self, watermarks: Mapping[str, int]
+    ) -> tuple[tuple[FeedbackEvent, ...], dict[str, int]]:
+        """Events appended after the per-partition rowid `watermarks`, and the advanced watermarks.
+
+        Rowids only grow in these append-only tables, so late events (an old
+        `occurred_at` flushed today) are still picked up exactly once.
+        """
+        found: list[FeedbackEvent] = []
+        advanced = dict(watermarks)
+        with self._db_lock:
+            for name in sorted(self._known_partitions()):
+                rows = self.connection.execute(
+                    f"SELECT rowid, * FROM {name} WHERE rowid > ? ORDER BY rowid",
+                    (watermarks.get(name, 0),),
+                ).fetchall()
+                if rows:
+                    found.extend(_row_to_event(row) for row in rows)
+                    advanced[name] = rows[-1]["rowid"]
+        return tuple(found), advanced
+
+    def rebuild_aggregates(self) -> None:
+        """Recompute both aggregate tables from every partition (repair path, full scan)."""
+        with self._db_lock, self.connection:
+            self.connection.execute("DELETE FROM feedback_user_stats")
+            self.connection.execute("DELETE FROM feedback_perfume_stats")
+            partitions = sorted(self._known_partitions())
+            if not partitions:
+                return
+            union = " UNION ALL ".join(
+                f"SELECT user_id, perfume_id, event_type, occurred_at FROM {name}" for name in partitions
+            )
+            self.connection.execute(_REBUILD_USER_STATS_SQL.format(events=union))
+            self.connection.execute(_REBUILD_PERFUME_STATS_SQL)
+
+    def _write_batch(self, batch: list[FeedbackEvent]) -> None:
+        by_partition: dict[str, list[tuple]] = defaultdict(list)
+        user_deltas: dict[tuple[str, str, str], list] = {}
+        for event in batch:
+            occurred_at = event.occurred_at.isoformat()
+            by_partition[_partition_name(event.occurred_at)].append(
+                (
+                    event.user_id,
+                    event.perfume_id,
+                    event.event_type,
+                    occurred_at,
+                    event.occasion,
+                    json.dumps(event.moods) if event.moods else None,
+                    event.strength_preference,
+                )
+            )
+            delta = user_deltas.setdefault((event.user_id, event.perfume_id, event.event_type), [0, occurred_at])
+            delta[0] += 1
+            delta[1] = max(delta[1], occurred_at)
+
+        known = self._known_partitions()
+        for name, rows in by_partition.items():
+            if name not in known:
+                self.connection.execute(_CREATE_PARTITION_SQL.format(name=name))
+                known.add(name)
+            self.connection.executemany(_INSERT_EVENT_SQL.format(name=name), rows)
+
+        perfume_deltas: dict[tuple[str, str], list] = {}
+        for (user_id, perfume_id, event_type), (count, last_event_at) in user_deltas.items():
+            total = self.connection.execute(
+                _UPSERT_USER_STAT_SQL, (user_id, perfume_id, event_type, count, last_event_at)
+            ).fetchone()[0]
+            delta = perfume_deltas.setdefault((perfume_id, event_type), [0, 0, last_event_at])
+            delta[0] += count
+            delta[1] += 1 if total == count else 0
+            delta[2] = max(delta[2], last_event_at)
+
+        self.connection.executemany(
+            _UPSERT_PERFUME_STAT_SQL,
+            [
+                (perfume_id, event_type, count, new_users, last_event_at)
+                for (perfume_id, event_type), (count, new_users, last_event_at) in perfume_deltas.items()
+            ],
+        )
+
+    def _known_partitions(self) -> set[str]:
+        if self._partitions is None:
+            rows = self.connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ?",
+                (f"{_PARTITION_PREFIX}[0-9]*",),
+            ).fetchall()
+            self._partitions = {row["name"] for row in rows}
+        return self._partitions
+
+
+def _partition_name(occurred_at: datetime) -> str:
+    return f"{_PARTITION_PREFIX}{occurred_at.year:04d}{occurred_at.month:02d}"
+
+
+def _row_to_stat(row: sqlite3.Row) -> FeedbackStat:
+    keys = row.keys()
+    return FeedbackStat(
+        user_id=row["user_id"] if "user_id" in keys else None,
+        perfume_id=row["perfume_id"],
+        event_type=row["event_type"],
+        event_count=row["event_count"],
+        last_event_at=datetime.fromisoformat(row["last_event_at"]),
+        user_count=row["user_count"] if "user_count" in keys else None,
+    )
+
+
+def _row_to_event(row: sqlite3.Row) -> FeedbackEvent:
+    return FeedbackEvent(
+        user_id=row["user_id"],
+        perfume_id=row["perfume_id"],
+        event_type=row["event_type"],
+        occurred_at=datetime.fromisoformat(row["occurred_at"]),
+        occasion=row["occasion"],
+        moods=tuple(json.loads(row["moods"])) if row["moods"] else (),
+        strength_preference=row["strength_preference"],
+    )
+
+
+_CREATE_PARTITION_SQL = """
+CREATE TABLE IF NOT EXISTS {name} (
+    user_id TEXT NOT NULL,
+    perfume_id TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    occurred_at TEXT NOT NULL,
+    occasion TEXT,
+    moods TEXT,
+    strength_preference TEXT
+);
+"""
+
+_INSERT_EVENT_SQL = """
+INSERT INTO {name} (user_id, perfume_id, event_type, occurred_at, occasion, moods, strength_preference)
+VALUES (?, ?, ?, ?, ?, ?, ?);
+"""
+
+_UPSERT_USER_STAT_SQL = """
+INSERT INTO feedback_user_stats (user_id, perfume_id, event_type, event_count, last_event_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(user_id, perfume_id, event_type) DO UPDATE SET
+    event_count = event_count + excluded.event_count,
+    last_event_at = MAX(last_event_at, excluded.last_event_at)
+RETURNING event_count;
+"""
+
+_UPSERT_PERFUME_STAT_SQL = """
+INSERT INTO feedback_perfume_stats (perfume_id, event_type, event_count, user_count, last_event_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(perfume_id, event_type) DO UPDATE SET
+    event_count = event_count + excluded.event_count,
+    user_count = user_count + excluded.user_count,
+    last_event_at = MAX(last_event_at, excluded.last_event_at);
+"""
+
+_SELECT_USER_STATS_SQL = """
+SELECT user_id, perfume_id, event_type, event_count, last_event_at
+FROM feedback_user_stats WHERE user_id = ? ORDER BY perfume_id, event_type;
+"""
+
+_SELECT_PERFUME_STATS_SQL = """
+SELECT perfume_id, event_type, event_count, user_count, last_event_at
+FROM feedback_perfume_stats WHERE perfume_id = ? ORDER BY event_type;
+"""
+
+_REBUILD_USER_STATS_SQL = """
+INSERT INTO feedback_user_stats (user_id, perfume_id, event_type, event_count, last_event_at)
+SELECT user_id, perfume_id, event_type, COUNT(*), MAX(occurred_at)
+FROM ({events}) GROUP BY user_id, perfume_id, event_type;
+"""
+
+_REBUILD_PERFUME_STATS_SQL = """
+INSERT INTO feedback_perfume_stats (perfume_id, event_type, event_count, user_count, last_event_at)
+SELECT perfume_id, event_type, SUM(event_count), COUNT(*), MAX(last_event_at)
+FROM feedback_user_stats GROUP BY perfume_id, event_type;
+"""
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import gzip
+import hashlib
+import os
+from pathlib import Path
+import queue
+import sqlite3
+import threading
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+_BLOB_SUFFIXES = {"gzip": ".html.gz", "zstd": ".html.zst"}
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class HtmlSnapshot:
+    url: str
+    content_hash: str
+    fetched_at: datetime
+
+
+class HtmlSnapshotStore:
+    """Content-addressed archive of raw HTML pages.
+
+    Bodies are stored once per SHA-256 hash as compressed blobs under `root_dir`;
+    the `html_snapshots` table indexes url -> hash -> fetched_at. Compression and
+    blob writes happen on a background thread, index rows are batched and
+    committed on `flush()` (or every `index_batch_size` saves). A row is only
+    committed once the writer has stored its blob, so the index never points
+    at a body that is not on disk; rows whose blob failed are dropped and the
+    failure is raised from `flush()`.
+    """
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        root_dir: str | Path,
+        compression: str = "gzip",
+        index_batch_size: int = 100,
+    ) -> None:
+        if compression not in _BLOB_SUFFIXES:
+            raise ValueError(f"unsupported snapshot compression: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+
+        self.connection = connection
+        self.connection.row_factory = sqlite3.Row
+        self.root_dir = Path(root_dir)
+        self.compression = compression
+        self.index_batch_size = index_batch_size
+        self._pending_rows: list[tuple[str, str, str]] = []
+        self._queued_hashes: set[str] = set()
+        self._failed_hashes: set[str] = set()
+        self._hash_lock = threading.Lock()
+        self._blob_queue: queue.Queue = queue.Queue()
+        self._writer: threading.Thread | None = None
+        self._writer_error: BaseException | None = None
+
+    def initialize_schema(self, schema_path: str | None = None) -> None:
+        path = Path(schema_path) if schema_path else Path(__file__).with_name("schema.sql")
+        self.connection.executescript(path.read_text(encoding="utf-8"))
+        self.connection.commit()
+
+    def save(self, url: str, html: str, fetched_at: datetime | None = None) -> str:
+        body = html.encode("utf-8")
+        content_hash = hashlib.sha256(body).hexdigest()
+        with self._hash_lock:
+            queued = content_hash in self._queued_hashes
+            self._queued_hashes.add(content_hash)
+        if not queued:
+            self._ensure_writer()
+            self._blob_queue.put((content_hash, body))
+
+        timestamp = fetched_at or datetime.now(tz=timezone.utc)
+        self._pending_rows.append((url, content_hash, timestamp.isoformat()))
+        if len(self._pending_rows) >= self.index_batch_size:
+            self._commit_index_rows()
+        return content_hash
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._blob_queue.join()
+        self._commit_index_rows()
+        if self._writer_error is not None:
+            raise RuntimeError("snapshot blob writer failed") from self._writer_error
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._blob_queue.put(_STOP)
+            self._writer.join()
+            self._writer = None
+
+    def latest(self, url: str) -> HtmlSnapshot | None:
+        query = (
+            "SELECT url, content_hash, fetched_at FROM html_snapshots "
+            "WHERE url = ? ORDER BY fetched_at DESC LIMIT 1"
+        )
+        row = self.connection.execute(query, (url,)).fetchone()
+        if row is None:
+            return None
+        return _row_to_snapshot(row)
+
+    def iter_latest(self) -> Iterator[HtmlSnapshot]:
+        query = (
+            "SELECT url, content_hash, MAX(fetched_at) AS fetched_at "
+            "FROM html_snapshots GROUP BY url ORDER BY url"
+        )
+        for row in self.connection.execute(query):
+            yield _row_to_snapshot(row)
+
+    def load(self, content_hash: str) -> str:
+        for compression, suffix in _BLOB_SUFFIXES.items():
+            path = self._blob_path(content_hash, suffix)
+            if path.exists():
+                return _decompress(path.read_bytes(), compression).decode("utf-8")
+        raise FileNotFoundError(f"no snapshot blob for hash {content_hash}")
+
+    def load_latest_html(self, url: str) -> str | None:
+        snapshot = self.latest(url)
+        if snapshot is None:
+            return None
+        return self.load(snapshot.content_hash)
+
+    def _commit_index_rows(self) -> None:
+        if not self._pending_rows:
+            return
+        with self._hash_lock:
+            in_flight = set(self._queued_hashes)
+            failed = set(self._failed_hashes)
+        ready = [row for row in self._pending_rows if row[1] not in in_flight and row[1] not in failed]
+        self._pending_rows = [row for row in self._pending_rows if row[1] in in_flight]
+        if ready:
+            self.connection.executemany(_INSERT_SNAPSHOT_SQL, ready)
+            self.connection.commit()
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        self._writer = threading.Thread(
+            target=self._write_blobs, name="html-snapshot-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _write_blobs(self) -> None:
+        suffix = _BLOB_SUFFIXES[self.compression]
+        while True:
+            item = self._blob_queue.get()
+            try:
+                if item is _STOP:
+                    return
+                content_hash, body = item
+                written = False
+                try:
+                    self._write_blob(self._blob_path(content_hash, suffix), body)
+                    written = True
+                finally:
+                    self._finish_hash(content_hash, written)
+            except BaseException as exc:  # surfaced on the next flush()
+                self._writer_error = exc
+            finally:
+                self._blob_queue.task_done()
+
+    def _finish_hash(self, content_hash: str, written: bool) -> None:
+        # Only now may index rows for this hash commit (or be dropped, if the write failed).
+        with self._hash_lock:
+            self._queued_hashes.discard(content_hash)
+            if written:
+                self._failed_hashes.discard(content_hash)
+            else:
+                self._failed_hashes.add(content_hash)
+
+    def _write_blob(self, path: Path, body: bytes) -> None:
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(_compress(body, self.compression))
+        os.replace(temp_path, path)
+
+    def _blob_path(self, content_hash: str, suffix: str) -> Path:
+        return self.root_dir / content_hash[:2] / f"{content_hash}{suffix}"
+
+
+def _compress(body: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().compress(body)
+    return gzip.compress(body, mtime=0)
+
+
+def _decompress(blob: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd snapshots require the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return gzip.decompress(blob)
+
+
+def _row_to_snapshot(row: sqlite3.Row) -> HtmlSnapshot:
+    return HtmlSnapshot(
+        url=row["url"],
+        content_hash=row["content_hash"],
+        fetched_at=datetime.fromisoformat(row["fetched_at"]),
+    )
+
+
+_INSERT_SNAPSHOT_SQL = """
+INSERT INTO html_snapshots (url, content_hash, fetched_at) VALUES (?, ?, ?)
+ON CONFLICT(url, fetched_at) DO NOTHING;
+"""
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+import heapq
+import json
+import math
+from pathlib import Path
+import sqlite3
+import threading
+
+from app.domain.models.feedback_event import FeedbackEvent
+from app.domain.models.item_priors import ItemPriors
+
+_WEIGHT_DECIMALS = 6
+
+
+class ItemPriorRepositorySqlite:
+    """Popularity and item-item co-occurrence counts, folded forward one event batch at a time.
+
+    Co-occurrence counts distinct users with a positive event on both
+    perfumes. The full sparse counts stay in `item_cooccurrence`; what
+    scoring reads is `item_neighbors`, a top-k list per perfume weighted by
+    cosine (`pair_count / sqrt(users_a * users_b)`). A batch only re-ranks
+    the lists of perfumes whose counts it changed, so a weight in an untouched
+    list can lag until that perfume next sees feedback.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+        self.connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+    def initialize_schema(self, schema_path: str | None = None) -> None:
+        path = Path(schema_path) if schema_path else Path(__file__).with_name("schema.sql")
+        with self._lock:
+            self.connection.executescript(path.read_text(encoding="utf-8"))
+            self.connection.commit()
+
+    def watermarks(self) -> dict[str, int]:
+        with self._lock:
+            rows = self.connection.execute(_SELECT_WATERMARKS_SQL).fetchall()
+        return {row["partition_name"]: row["last_rowid"] for row in rows}
+
+    def apply_events(
+        self,
+        events: Iterable[FeedbackEvent],
+        watermarks: Mapping[str, int],
+        event_weights: Mapping[str, float],
+        positive_events: Iterable[str],
+        top_k: int,
+    ) -> tuple[str, ...]:
+        """Fold `events` into the priors and store `watermarks`, in one transaction.
+
+        Returns the perfume ids whose popularity or neighbor list changed.
+        """
+        positive = set(positive_events)
+        weighted: dict[str, float] = defaultdict(float)
+        new_positives: dict[str, list[str]] = {}
+        for event in events:
+            weight = event_weights.get(event.event_type, 0.0)
+            if weight:
+                weighted[event.perfume_id] += weight
+            if event.event_type in positive:
+                new_positives.setdefault(event.user_id, []).append(event.perfume_id)
+
+        with self._lock, self.connection:
+            user_deltas, pair_deltas, positive_rows = self._pair_deltas(new_positives)
+            self.connection.executemany(_INSERT_USER_POSITIVE_SQL, positive_rows)
+            self.connection.executemany(
+                _UPSERT_POPULARITY_SQL,
+                [
+                    (perfume_id, weighted.get(perfume_id, 0.0), user_deltas.get(perfume_id, 0))
+                    for perfume_id in set(weighted) | set(user_deltas)
+                ],
+            )
+            self.connection.executemany(
+                _UPSERT_COOCCURRENCE_SQL,
+                [(perfume_id, neighbor_id, count) for (perfume_id, neighbor_id), count in pair_deltas.items()],
+            )
+            reranked = set(user_deltas) | {perfume_id for perfume_id, _ in pair_deltas}
+            for perfume_id in sorted(reranked):
+                self._rerank_neighbors(perfume_id, top_k)
+            self.connection.executemany(_UPSERT_WATERMARK_SQL, list(watermarks.items()))
+        return tuple(sorted(set(weighted) | reranked))
+
+    def load(self) -> ItemPriors:
+        with self._lock:
+            popularity_rows = self.connection.execute(_SELECT_POPULARITY_SQL).fetchall()
+            neighbor_rows = self.connection.execute(_SELECT_NEIGHBORS_SQL).fetchall()
+
+        # Log-scaled so one viral perfume does not flatten everyone else to ~0.
+        top = max((max(row["weighted_count"], 0.0) for row in popularity_rows), default=0.0)
+        scale = math.log1p(top)
+        popularity = {
+            row["perfume_id"]: round(math.log1p(max(row["weighted_count"], 0.0)) / scale, _WEIGHT_DECIMALS)
+            for row in popularity_rows
+            if scale > 0
+        }
+        neighbors = {
+            row["perfume_id"]: {neighbor_id: weight for neighbor_id, weight in json.loads(row["neighbors"])}
+            for row in neighbor_rows
+        }
+        return ItemPriors(popularity=popularity, neighbors=neighbors)
+
+    def _pair_deltas(
+        self, new_positives: Mapping[str, list[str]]
+    ) -> tuple[dict[str, int], dict[tuple[str, str], int], list[tuple[str, str]]]:
+        user_deltas: dict[str, int] = defaultdict(int)
+        pair_deltas: dict[tuple[str, str], int] = defaultdict(int)
+        positive_rows: list[tuple[str, str]] = []
+        for user_id, perfume_ids in new_positives.items():
+            rows = self.connection.execute(_SELECT_USER_POSITIVES_SQL, (user_id,)).fetchall()
+            seen = {row["perfume_id"] for row in rows}
+            for perfume_id in perfume_ids:
+                if perfume_id in seen:
+                    continue
+                for other_id in seen:
+                    pair_deltas[(perfume_id, other_id)] += 1
+                    pair_deltas[(other_id, perfume_id)] += 1
+                seen.add(perfume_id)
+                user_deltas[perfume_id] += 1
+                positive_rows.append((user_id, perfume_id))
+        return user_deltas, pair_deltas, positive_rows
+
+    def _rerank_neighbors(self, perfume_id: str, top_k: int) -> None:
+        rows = self.connection.execute(_SELECT_PAIR_COUNTS_SQL, (perfume_id,)).fetchall()
+        if not rows:
+            return
+        own_users = rows[0]["own_users"]
+        weighted = (
+            (row["pair_count"] / math.sqrt(own_users * row["neighbor_users"]), row["neighbor_id"])
+            for row in rows
+            if own_users and row["neighbor_users"]
+        )
+        top = heapq.nsmallest(top_k, weighted, key=lambda pair: (-pair[0], pair[1]))
+        neighbors = [[neighbor_id, round(weight, _WEIGHT_DECIMALS)] for weight, neighbor_id in top]
+        self.connection.execute(
+            _UPSERT_NEIGHBORS_SQL,
+            (perfume_id, json.dumps(neighbors, ensure_ascii=False, separators=(",", ":"))),
+        )
+
+
+_SELECT_WATERMARKS_SQL = """
+SELECT partition_name, last_rowid FROM item_prior_watermarks;
+"""
+
+_UPSERT_WATERMARK_SQL = """
+INSERT INTO item_prior_watermarks (partition_name, last_rowid) VALUES (?, ?)
+ON CONFLICT(partition_name) DO UPDATE SET last_rowid = excluded.last_rowid;
+"""
+
+_SELECT_USER_POSITIVES_SQL = """
+SELECT perfume_id FROM item_user_positives WHERE user_id = ?;
+"""
+
+_INSERT_USER_POSITIVE_SQL = """
+INSERT OR IGNORE INTO item_user_positives (user_id, perfume_id) VALUES (?, ?);
+"""
+
+_UPSERT_POPULARITY_SQL = """
+INSERT INTO item_popularity (perfume_id, weighted_count, positive_user_count) VALUES (?, ?, ?)
+ON CONFLICT(perfume_id) DO UPDATE SET
+    weighted_count = weighted_count + excluded.weighted_count,
+    positive_user_count = positive_user_count + excluded.positive_user_count;
+"""
+
+_UPSERT_COOCCURRENCE_SQL = """
+INSERT INTO item_cooccurrence (perfume_id, neighbor_id, pair_count) VALUES (?, ?, ?)
+ON CONFLICT(perfume_id, neighbor_id) DO UPDATE SET pair_count = pair_count + excluded.pair_count;
+"""
+
+_SELECT_PAIR_COUNTS_SQL = """
+SELECT c.neighbor_id, c.pair_count, own.positive_user_count AS own_users,
+       other.positive_user_count AS neighbor_users
+FROM item_cooccurrence AS c
+JOIN item_popularity AS own ON own.perfume_id = c.perfume_id
+JOIN item_popularity AS other ON other.perfume_id = c.neighbor_id
+WHERE c.perfume_id = ?;
+"""
+
+_UPSERT_NEIGHBORS_SQL = """
+INSERT INTO item_neighbors (perfume_id, neighbors) VALUES (?, ?)
+ON CONFLICT(perfume_id) DO UPDATE SET neighbors = excluded.neighbors;
+"""
+
+_SELECT_POPULARITY_SQL = """
+SELECT perfume_id, weighted_count FROM item_popularity;
+"""
+
+_SELECT_NEIGHBORS_SQL = """
+SELECT perfume_id, neighbors FROM item_neighbors;
+"""
@@ -1,32 +1,56 @@
 from __future__ import annotations
 
-from dataclasses import asdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from datetime import datetime
 import json
 from pathlib import Path
 import sqlite3
 
 from app.domain.models.perfume import Perfume
+from app.domain.models.vocabulary import TOKEN_KINDS, TokenVocabulary
+
+_MAX_QUERY_PARAMS = 500
+
+
+@dataclass(frozen=True)
+class PerfumeScrapeState:
+    perfume_id: str
+    url: str
+    name: str
+    price_min: float | None
+    price_max: float | None
+    last_scraped_at: datetime | None
+    vanished_at: datetime | None
 
 
 class PerfumeRepositorySqlite:
+    """SQLite store for perfumes and the token vocabulary shared by every catalog build.
+
+    Upserts register the perfumes' note/family tokens in the same transaction,
+    so readers only ever `load_vocabulary()` and never write to assign ids.
+    """
+
     def __init__(self, connection: sqlite3.Connection) -> None:
         self.connection = connection
         self.connection.row_factory = sqlite3.Row
+        self._vocabulary: TokenVocabulary | None = None
 
     def initialize_schema(self, schema_path: str | None = None) -> None:
         sql = _load_schema_sql(schema_path)
+        self._add_missing_columns()
         self.connection.executescript(sql)
         self.connection.commit()
 
     def upsert_perfume(self, perfume: Perfume) -> None:
-        self.connection.execute(_UPSERT_SQL, _perfume_to_row(perfume))
-        self.connection.commit()
+        self.upsert_perfumes((perfume,))
 
     def upsert_perfumes(self, perfumes: tuple[Perfume, ...]) -> None:
         params = [_perfume_to_row(perfume) for perfume in perfumes]
-        self.connection.executemany(_UPSERT_SQL, params)
-        self.connection.commit()
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.executemany(_UPSERT_SQL, params)
+            self._register_tokens(perfumes)
 
     def get_perfume(self, perfume_id: str) -> Perfume | None:
         query = "SELECT * FROM perfumes WHERE perfume_id = ?"
@@ -35,11 +59,135 @@ class PerfumeRepositorySqlite:
             return None
         return _row_to_perfume(row)
 
-    def list_perfumes(self, limit: int = 100, offset: int = 0) -> tuple[Perfume, ...]:
-        query = "SELECT * FROM perfumes ORDER BY perfume_id LIMIT ? OFFSET ?"
+    def get_perfumes(self, perfume_ids: tuple[str, ...]) -> dict[str, Perfume]:
+        found: dict[str, Perfume] = {}
+        for start in range(0, len(perfume_ids), _MAX_QUERY_PARAMS):
+            batch = perfume_ids[start : start + _MAX_QUERY_PARAMS]
+            placeholders = ", ".join("?" for _ in batch)
+            query = f"SELECT * FROM perfumes WHERE perfume_id IN ({placeholders})"
+            for row in self.connection.execute(query, batch).fetchall():
+                found[row["perfume_id"]] = _row_to_perfume(row)
+        return found
+
+    def list_perfumes(
+        self, limit: int = 100, offset: int = 0, include_vanished: bool = False
+    ) -> tuple[Perfume, ...]:
+        """Perfumes by id; products marked vanished from the listings are skipped unless asked for."""
+        where = "" if include_vanished else "WHERE vanished_at IS NULL "
+        query = f"SELECT * FROM perfumes {where}ORDER BY perfume_id LIMIT ? OFFSET ?"
         rows = self.connection.execute(query, (limit, offset)).fetchall()
         return tuple(_row_to_perfume(row) for row in rows)
 
+    def iter_perfumes(self, page_size: int = 1000, include_vanished: bool = False) -> Iterator[Perfume]:
+        offset = 0
+        while True:
+            page = self.list_perfumes(limit=page_size, offset=offset, include_vanished=include_vanished)
+            yield from page
+            if len(page) < page_size:
+                return
+            offset += len(page)
+
+    def list_scrape_states(self) -> tuple[PerfumeScrapeState, ...]:
+        query = (
+            "SELECT perfume_id, url, name, price_min, price_max, last_scraped_at, vanished_at "
+            "FROM perfumes ORDER BY perfume_id"
+        )
+        return tuple(
+            PerfumeScrapeState(
+                perfume_id=row["perfume_id"],
+                url=row["url"],
+                name=row["name"],
+                price_min=row["price_min"],
+                price_max=row["price_max"],
+                last_scraped_at=_load_datetime(row["last_scraped_at"]),
+                vanished_at=_load_datetime(row["vanished_at"]),
+            )
+            for row in self.connection.execute(query)
+        )
+
+    def mark_vanished(self, perfume_ids: tuple[str, ...], vanished_at: datetime) -> None:
+        self.connection.executemany(
+            "UPDATE perfumes SET vanished_at = ? WHERE perfume_id = ?",
+            [(vanished_at.isoformat(), perfume_id) for perfume_id in perfume_ids],
+        )
+        self.connection.commit()
+
+    def clear_vanished(self, perfume_ids: tuple[str, ...]) -> None:
+        self.connection.executemany(
+            "UPDATE perfumes SET vanished_at = NULL WHERE perfume_id = ?",
+            [(perfume_id,) for perfume_id in perfume_ids],
+        )
+        self.connection.commit()
+
+    def save_vocabulary(self, vocabulary: TokenVocabulary) -> None:
+        """Append the tokens not stored yet; ids already stored must match exactly.
+
+        Raises `ValueError` when `vocabulary` disagrees with the stored ids
+        (e.g. it was not grown from `load_vocabulary()`), and writes nothing.
+        """
+        with self.connection:
+            self._append_vocabulary(vocabulary)
+
+    def load_vocabulary(self) -> TokenVocabulary:
+        return TokenVocabulary.from_entries(self._vocabulary_entries())
+
+    def extend_vocabulary(self, perfumes: Iterable[Perfume]) -> TokenVocabulary:
+        """Store the perfumes' note/family tokens not stored yet and return the whole vocabulary.
+
+        Upserts already do this; use it to backfill a database written before
+        they did. Runs in one write transaction, so concurrent writers never
+        hand the same id to two tokens.
+        """
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self._register_tokens(perfumes)
+        return self.load_vocabulary()
+
+    def _register_tokens(self, perfumes: Iterable[Perfume]) -> None:
+        # Runs inside the caller's write transaction. The table is append-only, so an
+        # unchanged row count means the cached copy is still exactly what is stored.
+        stored_count = self.connection.execute("SELECT COUNT(*) FROM token_vocabulary").fetchone()[0]
+        vocabulary = self._vocabulary
+        if vocabulary is None or sum(vocabulary.size(kind) for kind in TOKEN_KINDS) != stored_count:
+            vocabulary = TokenVocabulary.from_entries(self._vocabulary_entries())
+        sizes = {kind: vocabulary.size(kind) for kind in ("note", "family")}
+        for perfume in perfumes:
+            # Same order PerfumeCatalog encodes in, so building the catalog adds nothing.
+            vocabulary.add_many("note", sorted(perfume.note_keys))
+            vocabulary.add_many("family", sorted(perfume.family_keys))
+        rows = [
+            (kind, token, token_id)
+            for kind, token, token_id in vocabulary.entries()
+            if kind in sizes and token_id >= sizes[kind]
+        ]
+        self.connection.executemany(_INSERT_VOCABULARY_SQL, rows)
+        # If the transaction rolls back, the row count no longer matches and the next write reloads.
+        self._vocabulary = vocabulary
+
+    def _vocabulary_entries(self) -> list[tuple[str, str, int]]:
+        query = "SELECT kind, token, token_id FROM token_vocabulary"
+        rows = self.connection.execute(query).fetchall()
+        return [(row["kind"], row["token"], row["token_id"]) for row in rows]
+
+    def _append_vocabulary(self, vocabulary: TokenVocabulary) -> None:
+        stored = {(kind, token): token_id for kind, token, token_id in self._vocabulary_entries()}
+        taken = {(kind, token_id) for (kind, _), token_id in stored.items()}
+        rows: list[tuple[str, str, int]] = []
+        for kind, token, token_id in vocabulary.entries():
+            stored_id = stored.get((kind, token))
+            if stored_id is None and (kind, token_id) in taken:
+                raise ValueError(f"{kind} id {token_id} is already stored for another token than {token!r}")
+            if stored_id is not None and stored_id != token_id:
+                raise ValueError(f"{kind} token {token!r} is stored with id {stored_id}, not {token_id}")
+            if stored_id is None:
+                rows.append((kind, token, token_id))
+        self.connection.executemany(_INSERT_VOCABULARY_SQL, rows)
+
+    def _add_missing_columns(self) -> None:
+        columns = {row["name"] for row in self.connection.execute("PRAGMA table_info(perfumes)")}
+        if columns and "vanished_at" not in columns:
+            self.connection.execute("ALTER TABLE perfumes ADD COLUMN vanished_at TEXT")
+
 
 def _load_schema_sql(schema_path: str | None) -> str:
     if schema_path:
@@ -49,17 +197,23 @@ def _load_schema_sql(schema_path: str | None) -> str:
 
 
 def _perfume_to_row(perfume: Perfume) -> dict[str, object]:
-    payload = asdict(perfume)
-    payload["gender_tags"] = _dump_list(perfume.gender_tags)
-    payload["scent_families"] = _dump_list(perfume.scent_families)
-    payload["molecule_tags"] = _dump_list(perfume.molecule_tags)
-    payload["notes_top"] = _dump_list(perfume.notes_top)
-    payload["notes_middle"] = _dump_list(perfume.notes_middle)
-    payload["notes_base"] = _dump_list(perfume.notes_base)
-    payload["notes_all"] = _dump_notes_all(perfume)
-    payload["image_urls"] = _dump_list(perfume.image_urls)
-    payload["last_scraped_at"] = _dump_datetime(perfume.last_scraped_at)
-    return payload
+    return {
+        "perfume_id": perfume.perfume_id,
+        "name": perfume.name,
+        "url": perfume.url,
+        "price_min": perfume.price_min,
+        "price_max": perfume.price_max,
+        "gender_tags": _dump_list(perfume.gender_tags),
+        "scent_families": _dump_list(perfume.scent_families),
+        "molecule_tags": _dump_list(perfume.molecule_tags),
+        "notes_top": _dump_list(perfume.notes_top),
+        "notes_middle": _dump_list(perfume.notes_middle),
+        "notes_base": _dump_list(perfume.notes_base),
+        "notes_all": _dump_notes_all(perfume),
+        "description": perfume.description,
+        "image_urls": _dump_list(perfume.image_urls),
+        "last_scraped_at": _dump_datetime(perfume.last_scraped_at),
+    }
 
 
 def _row_to_perfume(row: sqlite3.Row) -> Perfume:
@@ -91,7 +245,8 @@ def _load_list(raw_value: str) -> tuple[str, ...]:
 
 
 def _dump_notes_all(perfume: Perfume) -> str:
-    return json.dumps([asdict(item) for item in perfume.notes_all], ensure_ascii=True)
+    entries = [{"note": item.note, "position": item.position} for item in perfume.notes_all]
+    return json.dumps(entries, ensure_ascii=True)
 
 
 def _dump_datetime(value: datetime | None) -> str | None:
@@ -135,3 +290,7 @@ ON CONFLICT(perfume_id) DO UPDATE SET
     last_scraped_at = excluded.last_scraped_at,
     updated_at = CURRENT_TIMESTAMP;
 """
+
+_INSERT_VOCABULARY_SQL = """
+INSERT INTO token_vocabulary (kind, token, token_id) VALUES (?, ?, ?);
+"""
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+import sqlite3
+
+
+@dataclass(frozen=True)
+class RobotsCacheEntry:
+    origin: str
+    body: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: datetime
+
+
+class RobotsCacheSqlite:
+    """robots.txt bodies and their HTTP validators, kept across scrape runs."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+        self.connection.row_factory = sqlite3.Row
+
+    def initialize_schema(self, schema_path: str | None = None) -> None:
+        path = Path(schema_path) if schema_path else Path(__file__).with_name("schema.sql")
+        self.connection.executescript(path.read_text(encoding="utf-8"))
+        self.connection.commit()
+
+    def get(self, origin: str) -> RobotsCacheEntry | None:
+        query = "SELECT origin, body, etag, last_modified, fetched_at FROM robots_cache WHERE origin = ?"
+        row = self.connection.execute(query, (origin,)).fetchone()
+        if row is None:
+            return None
+        return RobotsCacheEntry(
+            origin=row["origin"],
+            body=row["body"],
+            etag=row["etag"],
+            last_modified=row["last_modified"],
+            fetched_at=datetime.fromisoformat(row["fetched_at"]),
+        )
+
+    def save(
+        self,
+        origin: str,
+        body: str,
+        etag: str | None,
+        last_modified: str | None,
+        fetched_at: datetime,
+    ) -> None:
+        self.connection.execute(
+            _UPSERT_ROBOTS_SQL, (origin, body, etag, last_modified, fetched_at.isoformat())
+        )
+        self.connection.commit()
+
+
+_UPSERT_ROBOTS_SQL = """
+INSERT INTO robots_cache (origin, body, etag, last_modified, fetched_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(origin) DO UPDATE SET
+    body = excluded.body,
+    etag = excluded.etag,
+    last_modified = excluded.last_modified,
+    fetched_at = excluded.fetched_at;
+"""
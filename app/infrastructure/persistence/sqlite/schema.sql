@@ -16,6 +16,7 @@ CREATE TABLE IF NOT EXISTS perfumes (
     description TEXT NOT NULL DEFAULT '',
     image_urls TEXT NOT NULL DEFAULT '[]',
     last_scraped_at TEXT,
+    vanished_at TEXT,
     created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
     CHECK (price_min IS NULL OR price_min >= 0),
@@ -25,3 +26,104 @@ CREATE TABLE IF NOT EXISTS perfumes (
 
 CREATE INDEX IF NOT EXISTS idx_perfumes_name ON perfumes(name);
 CREATE INDEX IF NOT EXISTS idx_perfumes_last_scraped_at ON perfumes(last_scraped_at);
+
+CREATE TABLE IF NOT EXISTS token_vocabulary (
+    kind TEXT NOT NULL,
+    token TEXT NOT NULL,
+    token_id INTEGER NOT NULL,
+    PRIMARY KEY (kind, token),
+    UNIQUE (kind, token_id),
+    CHECK (token_id >= 0)
+);
+
+CREATE TABLE IF NOT EXISTS html_snapshots (
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (url, fetched_at)
+);
+
+CREATE INDEX IF NOT EXISTS idx_html_snapshots_content_hash ON html_snapshots(content_hash);
+
+CREATE TABLE IF NOT EXISTS robots_cache (
+    origin TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS crawl_frontier (
+    url TEXT PRIMARY KEY,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TEXT,
+    payload TEXT,
+    CHECK (stage IN ('listing', 'product')),
+    CHECK (status IN ('pending', 'done', 'failed'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_crawl_frontier_stage_status ON crawl_frontier(stage, status);
+
+-- Raw feedback events live in monthly partitions (feedback_events_YYYYMM), created on
+-- demand by FeedbackRepositorySqlite. These aggregates are updated with every flush so
+-- reads never scan the event log.
+CREATE TABLE IF NOT EXISTS feedback_user_stats (
+    user_id TEXT NOT NULL,
+    perfume_id TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    event_count INTEGER NOT NULL,
+    last_event_at TEXT NOT NULL,
+    PRIMARY KEY (user_id, perfume_id, event_type),
+    CHECK (event_type IN ('click', 'like', 'dislike', 'purchase'))
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS feedback_perfume_stats (
+    perfume_id TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    event_count INTEGER NOT NULL,
+    user_count INTEGER NOT NULL,
+    last_event_at TEXT NOT NULL,
+    PRIMARY KEY (perfume_id, event_type),
+    CHECK (event_type IN ('click', 'like', 'dislike', 'purchase'))
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS user_affinity (
+    user_id TEXT PRIMARY KEY,
+    as_of TEXT NOT NULL,
+    note_scores TEXT NOT NULL,
+    family_scores TEXT NOT NULL,
+    event_count INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- Item priors, maintained incrementally by ItemPriorService from feedback events past
+-- the per-partition rowid watermarks below.
+CREATE TABLE IF NOT EXISTS item_prior_watermarks (
+    partition_name TEXT PRIMARY KEY,
+    last_rowid INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS item_popularity (
+    perfume_id TEXT PRIMARY KEY,
+    weighted_count REAL NOT NULL DEFAULT 0,
+    positive_user_count INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS item_user_positives (
+    user_id TEXT NOT NULL,
+    perfume_id TEXT NOT NULL,
+    PRIMARY KEY (user_id, perfume_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS item_cooccurrence (
+    perfume_id TEXT NOT NULL,
+    neighbor_id TEXT NOT NULL,
+    pair_count INTEGER NOT NULL,
+    PRIMARY KEY (perfume_id, neighbor_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS item_neighbors (
+    perfume_id TEXT PRIMARY KEY,
+    neighbors TEXT NOT NULL
+) WITHOUT ROWID;
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from datetime import datetime
+import json
+from pathlib import Path
+import sqlite3
+import threading
+
+from app.domain.models.user_affinity import UserAffinity
+
+_SCORE_DECIMALS = 5
+
+
+class UserAffinityRepositorySqlite:
+    """One row per user: token -> score maps (JSON) valid as of a single timestamp."""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+        self.connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+    def initialize_schema(self, schema_path: str | None = None) -> None:
+        path = Path(schema_path) if schema_path else Path(__file__).with_name("schema.sql")
+        with self._lock:
+            self.connection.executescript(path.read_text(encoding="utf-8"))
+            self.connection.commit()
+
+    def get(self, user_id: str) -> UserAffinity | None:
+        with self._lock:
+            return self._get(user_id)
+
+    def update_many(
+        self,
+        user_ids: Iterable[str],
+        update: Callable[[str, UserAffinity | None], UserAffinity],
+    ) -> tuple[UserAffinity, ...]:
+        """Read, `update` and write back each user's row inside one write transaction.
+
+        `BEGIN IMMEDIATE` takes SQLite's write lock before the reads, so two
+        writers (threads or pre-forked API workers) can never interleave a
+        read-modify-write and drop each other's events.
+        """
+        with self._lock, self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            updated = tuple(update(user_id, self._get(user_id)) for user_id in user_ids)
+            self.connection.executemany(_UPSERT_SQL, [_to_params(affinity) for affinity in updated])
+        return updated
+
+    def _get(self, user_id: str) -> UserAffinity | None:
+        row = self.connection.execute(_SELECT_SQL, (user_id,)).fetchone()
+        if row is None:
+            return None
+        return UserAffinity(
+            user_id=row["user_id"],
+            as_of=datetime.fromisoformat(row["as_of"]),
+            note_scores=json.loads(row["note_scores"]),
+            family_scores=json.loads(row["family_scores"]),
+            event_count=row["event_count"],
+        )
+
+
+def _to_params(affinity: UserAffinity) -> tuple[str, str, str, str, int]:
+    return (
+        affinity.user_id,
+        affinity.as_of.isoformat(),
+        _dump_scores(affinity.note_scores),
+        _dump_scores(affinity.family_scores),
+        affinity.event_count,
+    )
+
+
+def _dump_scores(scores: Mapping[str, float]) -> str:
+    rounded = {key: round(score, _SCORE_DECIMALS) for key, score in scores.items()}
+    return json.dumps(rounded, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+_SELECT_SQL = """
+SELECT user_id, as_of, note_scores, family_scores, event_count FROM user_affinity WHERE user_id = ?;
+"""
+
+_UPSERT_SQL = """
+INSERT INTO user_affinity (user_id, as_of, note_scores, family_scores, event_count)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(user_id) DO UPDATE SET
+    as_of = excluded.as_of,
+    note_scores = excluded.note_scores,
+    family_scores = excluded.family_scores,
+    event_count = excluded.event_count;
+"""
@@ -36,9 +36,9 @@ class ContextRulesResult:
 
 
 def score_context_rules(candidate: Perfume, profile: UserProfile) -> ContextRulesResult:
-    family_map = _family_map(candidate)
-    note_map = _note_map(candidate)
-    candidate_tokens = set(family_map) | set(note_map)
+    family_map = candidate.family_map
+    note_map = candidate.note_map
+    candidate_tokens = candidate.family_keys | candidate.note_keys
     inferred_strength = _infer_strength(candidate_tokens)
 
     occasion_targets = _occasion_targets(profile.occasion)
@@ -55,8 +55,8 @@ def score_context_rules(candidate: Perfume, profile: UserProfile) -> ContextRule
         mood_score=round(mood_score, 6),
         strength_score=round(strength_score, 6),
         inferred_strength=inferred_strength,
-        matched_families=tuple(family_map[key] for key in sorted(set(family_map) & active_targets)),
-        matched_notes=tuple(note_map[key] for key in sorted(set(note_map) & active_targets)),
+        matched_families=tuple(family_map[key] for key in sorted(candidate.family_keys & active_targets)),
+        matched_notes=tuple(note_map[key] for key in sorted(candidate.note_keys & active_targets)),
     )
 
 
@@ -85,7 +85,7 @@ def _weighted_score(
 
 
 
-def _match_score(candidate_tokens: set[str], targets: set[str]) -> float:
+def _match_score(candidate_tokens: frozenset[str], targets: set[str]) -> float:
     overlap = len(candidate_tokens & targets)
     if overlap <= 0:
         return 0.0
@@ -130,7 +130,7 @@ def _strength_score(preference: str | None, inferred_strength: str) -> float:
 
 
 
-def _infer_strength(candidate_tokens: set[str]) -> str:
+def _infer_strength(candidate_tokens: frozenset[str]) -> str:
     strong_hits = len(candidate_tokens & _STRONG_CUES)
     subtle_hits = len(candidate_tokens & _SUBTLE_CUES)
     signal = strong_hits - subtle_hits
@@ -139,23 +139,3 @@ def _infer_strength(candidate_tokens: set[str]) -> str:
     if signal <= -2:
         return "subtle"
     return "medium"
-
-
-
-def _family_map(perfume: Perfume) -> dict[str, str]:
-    family_map: dict[str, str] = {}
-    for family in perfume.scent_families:
-        key = family.casefold()
-        if key not in family_map:
-            family_map[key] = family
-    return family_map
-
-
-
-def _note_map(perfume: Perfume) -> dict[str, str]:
-    note_map: dict[str, str] = {}
-    for note in perfume.notes_top + perfume.notes_middle + perfume.notes_base:
-        key = note.casefold()
-        if key not in note_map:
-            note_map[key] = note
-    return note_map
@@ -17,8 +17,8 @@ class FamilyMatchResult:
 
 def score_family_match(candidate: Perfume, profile: UserProfile) -> FamilyMatchResult:
     preferred_families = {family.casefold() for family in profile.preferred_families}
-    candidate_map = _candidate_family_map(candidate)
-    candidate_families = set(candidate_map)
+    candidate_map = candidate.family_map
+    candidate_families = candidate.family_keys
 
     if not preferred_families or not candidate_families:
         return FamilyMatchResult(score=0.0, coverage=0.0, precision=0.0, matched_families=tuple())
@@ -34,13 +34,3 @@ def score_family_match(candidate: Perfume, profile: UserProfile) -> FamilyMatchR
         precision=round(precision, 6),
         matched_families=matched_families,
     )
-
-
-
-def _candidate_family_map(candidate: Perfume) -> dict[str, str]:
-    family_map: dict[str, str] = {}
-    for family in candidate.scent_families:
-        key = family.casefold()
-        if key not in family_map:
-            family_map[key] = family
-    return family_map
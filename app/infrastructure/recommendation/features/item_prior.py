@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from app.domain.models.item_priors import ItemPriors
+from app.domain.models.perfume import Perfume
+from app.domain.models.user_profile import UserProfile
+
+
+@dataclass(frozen=True)
+class ItemPriorResult:
+    score: float
+    popularity: float
+    co_occurrence: float
+    co_engaged_with: str | None
+
+
+def score_item_prior(candidate: Perfume, profile: UserProfile, priors: ItemPriors) -> ItemPriorResult:
+    popularity = priors.popularity_of(candidate.perfume_id)
+    best = (0.0, None)
+
+    for owned_id in profile.owned_perfume_ids:
+        if owned_id.casefold() == candidate.perfume_id.casefold():
+            continue
+        weight = priors.co_occurrence(owned_id, candidate.perfume_id)
+        if weight > best[0]:
+            best = (weight, owned_id)
+
+    # Cold start (nothing owned) falls back to popularity; otherwise "people who
+    # liked what you own also liked this" is the sharper signal.
+    score = best[0] if profile.owned_perfume_ids else popularity
+    return ItemPriorResult(
+        score=round(score, 6),
+        popularity=round(popularity, 6),
+        co_occurrence=round(best[0], 6),
+        co_engaged_with=best[1],
+    )
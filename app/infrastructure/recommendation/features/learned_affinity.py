@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from app.domain.models.perfume import Perfume
+from app.domain.models.user_profile import UserProfile
+
+
+@dataclass(frozen=True)
+class LearnedAffinityResult:
+    score: float
+    note_share: float
+    family_share: float
+    matched_notes: tuple[str, ...]
+
+
+def score_learned_affinity(candidate: Perfume, profile: UserProfile) -> LearnedAffinityResult:
+    note_share, note_keys = _share(profile.learned_notes, candidate.note_keys)
+    family_share, _ = _share(profile.learned_families, candidate.family_keys)
+    # Shares are signed: learned dislikes pull the score below zero.
+    score = (0.7 * note_share) + (0.3 * family_share)
+    matched_notes = tuple(candidate.note_map[note] for note in note_keys)
+    return LearnedAffinityResult(
+        score=round(score, 6),
+        note_share=round(note_share, 6),
+        family_share=round(family_share, 6),
+        matched_notes=matched_notes,
+    )
+
+
+def _share(weights: Iterable[tuple[str, float]], candidate_keys: frozenset[str]) -> tuple[float, tuple[str, ...]]:
+    total = 0.0
+    matched = 0.0
+    liked: list[str] = []
+    for key, weight in weights:
+        total += abs(weight)
+        if key in candidate_keys:
+            matched += weight
+            if weight > 0:
+                liked.append(key)
+    if not total:
+        return 0.0, ()
+    return matched / total, tuple(sorted(liked))
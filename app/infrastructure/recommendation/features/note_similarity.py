@@ -17,8 +17,8 @@ class NoteSimilarityResult:
 
 def score_note_similarity(candidate: Perfume, profile: UserProfile) -> NoteSimilarityResult:
     desired_notes = {note.casefold() for note in profile.liked_notes}
-    candidate_map = _candidate_note_map(candidate)
-    candidate_notes = set(candidate_map)
+    candidate_map = candidate.note_map
+    candidate_notes = candidate.note_keys
 
     if not desired_notes or not candidate_notes:
         return NoteSimilarityResult(score=0.0, coverage=0.0, precision=0.0, matched_notes=tuple())
@@ -34,13 +34,3 @@ def score_note_similarity(candidate: Perfume, profile: UserProfile) -> NoteSimil
         precision=round(precision, 6),
         matched_notes=matched_notes,
     )
-
-
-
-def _candidate_note_map(candidate: Perfume) -> dict[str, str]:
-    note_map: dict[str, str] = {}
-    for note in candidate.notes_top + candidate.notes_middle + candidate.notes_base:
-        key = note.casefold()
-        if key not in note_map:
-            note_map[key] = note
-    return note_map
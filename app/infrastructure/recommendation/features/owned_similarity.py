@@ -23,21 +23,19 @@ def score_owned_similarity(
     profile: UserProfile,
     owned_penalty_value: float = 1.0,
 ) -> OwnedSimilarityResult:
-    candidate_notes = _note_map(candidate)
-    candidate_families = _family_map(candidate)
+    candidate_notes = candidate.note_keys
+    candidate_families = candidate.family_keys
     is_owned = candidate.perfume_id.casefold() in {pid.casefold() for pid in profile.owned_perfume_ids}
     best = (0.0, None, tuple(), tuple())
 
     for owned in owned_perfumes:
-        owned_notes = _note_map(owned)
-        owned_families = _family_map(owned)
-        note_overlap = set(candidate_notes) & set(owned_notes)
-        family_overlap = set(candidate_families) & set(owned_families)
-        note_score = _jaccard(set(candidate_notes), set(owned_notes))
-        family_score = _jaccard(set(candidate_families), set(owned_families))
+        note_overlap = candidate_notes & owned.note_keys
+        family_overlap = candidate_families & owned.family_keys
+        note_score = _jaccard(candidate_notes, owned.note_keys)
+        family_score = _jaccard(candidate_families, owned.family_keys)
         similarity = (0.7 * note_score) + (0.3 * family_score)
-        matched_notes = tuple(candidate_notes[note] for note in sorted(note_overlap))
-        matched_families = tuple(candidate_families[family] for family in sorted(family_overlap))
+        matched_notes = tuple(candidate.note_map[note] for note in sorted(note_overlap))
+        matched_families = tuple(candidate.family_map[family] for family in sorted(family_overlap))
 
         if similarity > best[0]:
             best = (similarity, owned.perfume_id, matched_notes, matched_families)
@@ -54,27 +52,7 @@ def score_owned_similarity(
 
 
 
-def _note_map(perfume: Perfume) -> dict[str, str]:
-    note_map: dict[str, str] = {}
-    for note in perfume.notes_top + perfume.notes_middle + perfume.notes_base:
-        key = note.casefold()
-        if key not in note_map:
-            note_map[key] = note
-    return note_map
-
-
-
-def _family_map(perfume: Perfume) -> dict[str, str]:
-    family_map: dict[str, str] = {}
-    for family in perfume.scent_families:
-        key = family.casefold()
-        if key not in family_map:
-            family_map[key] = family
-    return family_map
-
-
-
-def _jaccard(left: set[str], right: set[str]) -> float:
+def _jaccard(left: frozenset[str], right: frozenset[str]) -> float:
     union = left | right
     if not union:
         return 0.0
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import TypeVar
+
+from app.domain.models.perfume_catalog import PerfumeCatalog
+
+T = TypeVar("T")
+
+
+class DiversityReranker:
+    """Maximal marginal relevance over an already-scored shortlist.
+
+    Picks, one at a time, the item maximizing
+    `(1 - diversity) * score - diversity * max_similarity_to_picked`, where
+    similarity is the owned-similarity blend (0.7 * note Jaccard + 0.3 *
+    family Jaccard). Shortlisted perfumes become integer bitsets straight
+    from the catalog's token-id columns (nothing is re-tokenized), so each
+    pair costs two ANDs/ORs and popcounts; picking N of K keeps a running
+    max-similarity per candidate, O(K * N) pairs total. `diversity` is the
+    default trade-off; `rerank` can override it per call.
+    """
+
+    def __init__(self, catalog: PerfumeCatalog, diversity: float = 0.0) -> None:
+        self.diversity = _checked_diversity(diversity)
+        self.catalog = catalog
+        self._index_by_id = {perfume_id.casefold(): index for index, perfume_id in enumerate(catalog.perfume_ids)}
+
+    def similarity(self, left_id: str, right_id: str) -> float:
+        return _similarity(self._bits_of(left_id), self._bits_of(right_id))
+
+    def rerank(
+        self, ranked: Sequence[tuple[T, str, float]], top_n: int, diversity: float | None = None
+    ) -> tuple[T, ...]:
+        """Pick `top_n` of `ranked` `(item, perfume_id, score)` triples, best relevance first on ties."""
+        diversity = self.diversity if diversity is None else _checked_diversity(diversity)
+        if diversity <= 0.0 or len(ranked) <= 1:
+            return tuple(item for item, _, _ in ranked[:top_n])
+
+        remaining = [(item, self._bits_of(perfume_id), score) for item, perfume_id, score in ranked]
+        max_similarity = [0.0] * len(remaining)
+        picked: list[T] = []
+        while remaining and len(picked) < top_n:
+            best = max(
+                range(len(remaining)),
+                key=lambda index: (
+                    (1.0 - diversity) * remaining[index][2] - diversity * max_similarity[index],
+                    -index,
+                ),
+            )
+            item, bits, _ = remaining.pop(best)
+            max_similarity.pop(best)
+            picked.append(item)
+            for index, (_, other_bits, _) in enumerate(remaining):
+                max_similarity[index] = max(max_similarity[index], _similarity(bits, other_bits))
+        return tuple(picked)
+
+    def _bits_of(self, perfume_id: str) -> tuple[int, int]:
+        index = self._index_by_id.get(perfume_id.casefold())
+        if index is None:
+            return 0, 0
+        return _bitset(self.catalog.note_ids_at(index)), _bitset(self.catalog.family_ids_at(index))
+
+
+def _checked_diversity(diversity: float) -> float:
+    if not 0.0 <= diversity <= 1.0:
+        raise ValueError("diversity must be between 0 and 1")
+    return diversity
+
+
+def _bitset(token_ids: Iterable[int]) -> int:
+    bits = 0
+    for token_id in token_ids:
+        bits |= 1 << token_id
+    return bits
+
+
+def _similarity(left: tuple[int, int], right: tuple[int, int]) -> float:
+    return 0.7 * _jaccard(left[0], right[0]) + 0.3 * _jaccard(left[1], right[1])
+
+
+def _jaccard(left: int, right: int) -> float:
+    union = (left | right).bit_count()
+    if not union:
+        return 0.0
+    return (left & right).bit_count() / union
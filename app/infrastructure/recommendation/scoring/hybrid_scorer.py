@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from app.domain.models.item_priors import ItemPriors
+from app.domain.models.perfume import Perfume
+from app.domain.models.user_profile import UserProfile
+from app.infrastructure.recommendation.features.context_rules import score_context_rules
+from app.infrastructure.recommendation.features.family_match import score_family_match
+from app.infrastructure.recommendation.features.item_prior import score_item_prior
+from app.infrastructure.recommendation.features.learned_affinity import score_learned_affinity
+from app.infrastructure.recommendation.features.note_similarity import score_note_similarity
+from app.infrastructure.recommendation.features.owned_similarity import score_owned_similarity
+from app.infrastructure.recommendation.scoring.score_trace import ScoreComponent, ScoreTrace
+from app.infrastructure.recommendation.scoring.score_weights import DEFAULT_SCORE_WEIGHTS, ScoreWeights
+
+
+class HybridScorer:
+    """Weighted sum of the v1 feature scores minus the already-owned penalty.
+
+    `embedding_scorer` is the optional additive v2 component; it only counts
+    when `weights.embedding` is non-zero. `priors` adds the feedback-derived
+    `item_prior` component (co-occurrence with owned perfumes, or popularity
+    for a cold-start profile). A profile personalized from feedback (see
+    `UserAffinityService.personalize`) adds the `affinity` component.
+    """
+
+    def __init__(
+        self,
+        weights: ScoreWeights = DEFAULT_SCORE_WEIGHTS,
+        embedding_scorer: Callable[[Perfume, UserProfile], float] | None = None,
+        priors: ItemPriors | None = None,
+    ) -> None:
+        self.weights = weights
+        self.embedding_scorer = embedding_scorer
+        self.priors = priors
+
+    def score(
+        self,
+        candidate: Perfume,
+        profile: UserProfile,
+        owned_perfumes: tuple[Perfume, ...] = (),
+        skip_owned_similarity: bool = False,
+    ) -> ScoreTrace:
+        weights = self.weights
+        notes = score_note_similarity(candidate, profile)
+        families = score_family_match(candidate, profile)
+        context = score_context_rules(candidate, profile)
+        # Owned similarity walks every owned perfume; under load it is the first thing dropped,
+        # but the already-owned penalty stays.
+        owned = score_owned_similarity(
+            candidate,
+            () if skip_owned_similarity else owned_perfumes,
+            profile,
+            owned_penalty_value=weights.owned_penalty,
+        )
+
+        components = [
+            _component("note_similarity", notes.score, weights.note_similarity),
+            _component("family_match", families.score, weights.family_match),
+            _component("owned_similarity", owned.score, weights.owned_similarity),
+            _component("context", context.score, weights.context),
+        ]
+        if self.embedding_scorer is not None and weights.embedding > 0:
+            components.append(
+                _component("embedding", self.embedding_scorer(candidate, profile), weights.embedding)
+            )
+        if self.priors is not None and weights.item_prior > 0:
+            prior = score_item_prior(candidate, profile, self.priors)
+            components.append(_component("item_prior", prior.score, weights.item_prior))
+        learned_notes: tuple[str, ...] = ()
+        if (profile.learned_notes or profile.learned_families) and weights.affinity > 0:
+            learned = score_learned_affinity(candidate, profile)
+            components.append(_component("affinity", learned.score, weights.affinity))
+            learned_notes = learned.matched_notes
+
+        total = sum(component.contribution for component in components) - owned.owned_penalty
+        return ScoreTrace(
+            perfume_id=candidate.perfume_id,
+            components=tuple(components),
+            owned_penalty=owned.owned_penalty,
+            total=round(total, 6),
+            matched_notes=_merge(_merge(notes.matched_notes, context.matched_notes), learned_notes),
+            matched_families=_merge(families.matched_families, context.matched_families),
+            similar_to_owned=owned.matched_owned_perfume_id,
+        )
+
+
+def _component(name: str, value: float, weight: float) -> ScoreComponent:
+    return ScoreComponent(name=name, value=value, weight=weight, contribution=round(value * weight, 6))
+
+
+def _merge(primary: tuple[str, ...], secondary: tuple[str, ...]) -> tuple[str, ...]:
+    seen = {item.casefold() for item in primary}
+    return primary + tuple(item for item in secondary if item.casefold() not in seen)
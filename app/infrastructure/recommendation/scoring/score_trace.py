@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ScoreComponent:
+    name: str
+    value: float
+    weight: float
+    contribution: float
+
+
+@dataclass(frozen=True)
+class ScoreTrace:
+    perfume_id: str
+    components: tuple[ScoreComponent, ...]
+    owned_penalty: float
+    total: float
+    matched_notes: tuple[str, ...]
+    matched_families: tuple[str, ...]
+    similar_to_owned: str | None = None
+
+    def component(self, name: str) -> ScoreComponent | None:
+        for component in self.components:
+            if component.name == name:
+                return component
+        return None
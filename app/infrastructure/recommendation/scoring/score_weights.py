@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ScoreWeights:
+    """Single source of truth for hybrid scoring weights and penalties.
+
+    `diversity` is not a score component: it is the MMR trade-off used when
+    re-ranking the scored shortlist. It defaults to 0 (pure relevance order,
+    no re-ranking); the API reads `RECOMMENDATION_DIVERSITY`, and requests
+    can set their own.
+    """
+
+    note_similarity: float = 0.35
+    family_match: float = 0.25
+    owned_similarity: float = 0.2
+    context: float = 0.2
+    embedding: float = 0.0
+    item_prior: float = 0.1
+    affinity: float = 0.15
+    diversity: float = 0.0
+    owned_penalty: float = 1.0
+
+    def __post_init__(self) -> None:
+        for name in (
+            "note_similarity",
+            "family_match",
+            "owned_similarity",
+            "context",
+            "embedding",
+            "item_prior",
+            "affinity",
+            "diversity",
+            "owned_penalty",
+        ):
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} weight must be >= 0")
+        if self.diversity > 1:
+            raise ValueError("diversity weight must be <= 1")
+
+
+DEFAULT_SCORE_WEIGHTS = ScoreWeights()
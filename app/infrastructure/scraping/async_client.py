@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from email.message import Message
+import ssl
+from urllib import error
+from urllib.parse import urljoin, urlsplit
+
+from app.infrastructure.scraping.client import (
+    ScrapeHttpResponse,
+    is_retryable_error,
+    retry_after_seconds,
+)
+from app.infrastructure.scraping.robots import AsyncTokenBucketRateLimiter
+
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+_MAX_REDIRECTS = 5
+_THROTTLE_STATUSES = {429, 503}
+
+
+@dataclass
+class _Connection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+@dataclass
+class _HostPool:
+    slots: asyncio.Semaphore
+    idle: list[_Connection] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class _RawResponse:
+    status_code: int
+    reason: str
+    headers: dict[str, str]
+    body: bytes
+    keep_alive: bool
+
+
+class AsyncScrapeHttpClient:
+    """asyncio HTTP/1.1 client with per-host keep-alive connection pools.
+
+    Retry and backoff behave like `ScrapeHttpClient.fetch`: transient network
+    errors and 429/5xx responses are retried `max_retries` times with
+    exponential backoff, other HTTP errors raise `urllib.error.HTTPError`.
+    With a `rate_limiter`, each retry also waits for its own slot (after a
+    429/503 penalizes the domain), as the first attempt did.
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float = 20.0,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        backoff_multiplier: float = 2.0,
+        user_agent: str = "PerfumeRecommenderBot/1.0",
+        max_connections_per_host: int = 4,
+        max_concurrency: int = 16,
+        sleep_func: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        ssl_context: ssl.SSLContext | None = None,
+        rate_limiter: AsyncTokenBucketRateLimiter | None = None,
+    ) -> None:
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.backoff_multiplier = backoff_multiplier
+        self.user_agent = user_agent
+        self.max_connections_per_host = max_connections_per_host
+        self.sleep_func = sleep_func
+        self.ssl_context = ssl_context
+        self.rate_limiter = rate_limiter
+        self.opened_connection_count = 0
+        self._concurrency = asyncio.Semaphore(max_concurrency)
+        self._pools: dict[tuple[str, str, int], _HostPool] = {}
+
+    async def __aenter__(self) -> AsyncScrapeHttpClient:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        await self.close()
+
+    async def fetch(self, url: str, extra_headers: dict[str, str] | None = None) -> ScrapeHttpResponse:
+        headers = {"User-Agent": self.user_agent}
+        if extra_headers:
+            headers.update(extra_headers)
+
+        attempt = 0
+        backoff = self.backoff_seconds
+
+        while True:
+            try:
+                async with self._concurrency:
+                    return await self._fetch_following_redirects(url, headers)
+            except (error.URLError, TimeoutError) as exc:
+                if not is_retryable_error(exc) or attempt >= self.max_retries:
+                    raise
+                failure = exc
+
+            await self.sleep_func(backoff)
+            await self._wait_for_retry_slot(url, failure)
+            attempt += 1
+            backoff *= self.backoff_multiplier
+
+    async def _wait_for_retry_slot(self, url: str, failure: Exception) -> None:
+        if self.rate_limiter is None:
+            return
+        if isinstance(failure, error.HTTPError) and failure.code in _THROTTLE_STATUSES:
+            self.rate_limiter.penalize(url, retry_after_seconds(failure))
+        await self.rate_limiter.wait_for_slot(url)
+
+    async def close(self) -> None:
+        for pool in self._pools.values():
+            while pool.idle:
+                pool.idle.pop().close()
+        self._pools.clear()
+
+    async def _fetch_following_redirects(self, url: str, headers: dict[str, str]) -> ScrapeHttpResponse:
+        current_url = url
+        for _ in range(_MAX_REDIRECTS + 1):
+            raw = await self._fetch_once(current_url, headers)
+            location = raw.headers.get("Location") or raw.headers.get("location")
+            if raw.status_code in _REDIRECT_STATUSES and location:
+                current_url = urljoin(current_url, location)
+                continue
+
+            if raw.status_code >= 400:
+                raise error.HTTPError(current_url, raw.status_code, raw.reason, _to_message(raw.headers), None)
+
+            return ScrapeHttpResponse(
+                url=current_url,
+                status_code=raw.status_code,
+                text=raw.body.decode("utf-8", errors="replace"),
+                headers=raw.headers,
+            )
+
+        raise error.URLError(f"too many redirects: {url}")
+
+    async def _fetch_once(self, url: str, headers: dict[str, str]) -> _RawResponse:
+        parts = urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise error.URLError(f"unsupported url: {url}")
+
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        pool = self._pool_for(key)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        request_bytes = _build_request(target, parts.netloc, headers)
+
+        async with pool.slots:
+            reused = bool(pool.idle)
+            connection = pool.idle.pop() if reused else await self._open_connection(key)
+            try:
+                response = await self._exchange_or_close(connection, request_bytes)
+            except _STALE_CONNECTION_ERRORS as exc:
+                if not reused:
+                    raise error.URLError(exc) from exc
+                # The server dropped an idle keep-alive connection; retry once on a fresh one.
+                connection = await self._open_connection(key)
+                try:
+                    response = await self._exchange_or_close(connection, request_bytes)
+                except _STALE_CONNECTION_ERRORS as retry_exc:
+                    raise error.URLError(retry_exc) from retry_exc
+
+            if response.keep_alive:
+                pool.idle.append(connection)
+            else:
+                connection.close()
+            return response
+
+    async def _exchange_or_close(self, connection: _Connection, request_bytes: bytes) -> _RawResponse:
+        try:
+            return await asyncio.wait_for(_exchange(connection, request_bytes), self.timeout_seconds)
+        except BaseException:
+            connection.close()
+            raise
+
+    def _pool_for(self, key: tuple[str, str, int]) -> _HostPool:
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = _HostPool(slots=asyncio.Semaphore(self.max_connections_per_host))
+            self._pools[key] = pool
+        return pool
+
+    async def _open_connection(self, key: tuple[str, str, int]) -> _Connection:
+        scheme, host, port = key
+        ssl_context = None
+        if scheme == "https":
+            ssl_context = self.ssl_context or ssl.create_default_context()
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=ssl_context), self.timeout_seconds
+            )
+        except OSError as exc:
+            raise error.URLError(exc) from exc
+        self.opened_connection_count += 1
+        return _Connection(reader=reader, writer=writer)
+
+
+class _EmptyResponseError(Exception):
+    pass
+
+
+_STALE_CONNECTION_ERRORS = (ConnectionError, asyncio.IncompleteReadError, _EmptyResponseError)
+
+
+def _build_request(target: str, host: str, headers: dict[str, str]) -> bytes:
+    lines = [f"GET {target} HTTP/1.1", f"Host: {host}"]
+    request_headers = {"Accept-Encoding": "identity", "Connection": "keep-alive", **headers}
+    lines.extend(f"{name}: {value}" for name, value in request_headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _exchange(connection: _Connection, request_bytes: bytes) -> _RawResponse:
+    connection.writer.write(request_bytes)
+    await connection.writer.drain()
+
+    status_line = await connection.reader.readline()
+    if not status_line:
+        raise _EmptyResponseError("connection closed before response")
+    version, status_code, reason = _parse_status_line(status_line)
+    headers = await _read_headers(connection.reader)
+    lowered = {name.casefold(): value for name, value in headers.items()}
+
+    connection_header = lowered.get("connection", "").casefold()
+    keep_alive = version == "HTTP/1.1" and connection_header != "close"
+    if version == "HTTP/1.0" and connection_header == "keep-alive":
+        keep_alive = True
+
+    if "chunked" in lowered.get("transfer-encoding", "").casefold():
+        body = await _read_chunked(connection.reader)
+    elif "content-length" in lowered:
+        body = await connection.reader.readexactly(int(lowered["content-length"]))
+    elif status_code in {204, 304} or 100 <= status_code < 200:
+        body = b""
+    else:
+        body = await connection.reader.read()
+        keep_alive = False
+
+    return _RawResponse(
+        status_code=status_code,
+        reason=reason,
+        headers=headers,
+        body=body,
+        keep_alive=keep_alive,
+    )
+
+
+def _parse_status_line(raw_line: bytes) -> tuple[str, int, str]:
+    parts = raw_line.decode("latin-1").strip().split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise error.URLError(f"malformed status line: {raw_line!r}")
+    reason = parts[2] if len(parts) > 2 else ""
+    return parts[0], int(parts[1]), reason
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in {b"\r\n", b"\n", b""}:
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip()] = value.strip()
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks: list[bytes] = []
+    while True:
+        size_line = await reader.readline()
+        size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+        if size == 0:
+            await _read_headers(reader)
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+def _to_message(headers: dict[str, str]) -> Message:
+    message = Message()
+    for name, value in headers.items():
+        message[name] = value
+    return message
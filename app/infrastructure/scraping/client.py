@@ -1,9 +1,26 @@
 from __future__ import annotations
 
+import codecs
+from collections.abc import Iterator
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import time
 from typing import Callable
 from urllib import error, request
+import zlib
+
+from app.config.metrics import (
+    COUNTER_HTTP_BYTES_RECEIVED,
+    COUNTER_HTTP_REQUESTS,
+    COUNTER_HTTP_RETRIES,
+    STAGE_HTTP_REQUEST,
+    MetricsCollector,
+)
+from app.infrastructure.scraping.robots import TokenBucketRateLimiter
+
+_COMPRESSED_ENCODINGS = "gzip, deflate"
+_THROTTLE_STATUSES = {429, 503}
 
 
 @dataclass(frozen=True)
@@ -14,7 +31,19 @@ class ScrapeHttpResponse:
     headers: dict[str, str]
 
 
+class ResponseTooLargeError(Exception):
+    pass
+
+
 class ScrapeHttpClient:
+    """Blocking HTTP client with inline retry and exponential backoff.
+
+    With a `rate_limiter` (normally the access guard's), every retry also
+    waits for its own slot in the domain's budget, and 429/503 responses
+    penalize the domain first so Retry-After is honored. The first attempt
+    is admitted by the caller, e.g. `ScrapeAccessGuard.enforce`.
+    """
+
     def __init__(
         self,
         timeout_seconds: float = 20.0,
@@ -23,6 +52,12 @@ class ScrapeHttpClient:
         backoff_multiplier: float = 2.0,
         user_agent: str = "PerfumeRecommenderBot/1.0",
         sleep_func: Callable[[float], None] = time.sleep,
+        stream: bool = False,
+        max_body_bytes: int | None = None,
+        read_chunk_size: int = 64 * 1024,
+        accept_compressed: bool = False,
+        metrics: MetricsCollector | None = None,
+        rate_limiter: TokenBucketRateLimiter | None = None,
     ) -> None:
         self.timeout_seconds = timeout_seconds
         self.max_retries = max_retries
@@ -30,9 +65,25 @@ class ScrapeHttpClient:
         self.backoff_multiplier = backoff_multiplier
         self.user_agent = user_agent
         self.sleep_func = sleep_func
+        self.stream = stream
+        self.max_body_bytes = max_body_bytes
+        self.read_chunk_size = read_chunk_size
+        self.accept_compressed = accept_compressed
+        self.metrics = metrics
+        self.rate_limiter = rate_limiter
 
-    def fetch(self, url: str, extra_headers: dict[str, str] | None = None) -> ScrapeHttpResponse:
+    def fetch(
+        self, url: str, extra_headers: dict[str, str] | None = None, retry: bool = True
+    ) -> ScrapeHttpResponse:
+        """GET `url`, retrying transient failures inline with backoff unless `retry` is False.
+
+        Callers that reschedule failures themselves (see `RetryScheduler`) pass
+        `retry=False` so a failure is reported at once instead of slept on.
+        """
+        max_retries = self.max_retries if retry else 0
         headers = {"User-Agent": self.user_agent}
+        if self.stream and self.accept_compressed:
+            headers["Accept-Encoding"] = _COMPRESSED_ENCODINGS
         if extra_headers:
             headers.update(extra_headers)
 
@@ -41,22 +92,42 @@ class ScrapeHttpClient:
 
         while True:
             try:
-                return self._fetch_once(url=url, headers=headers)
-            except error.HTTPError as exc:
-                if not _should_retry_status(exc.code) or attempt >= self.max_retries:
-                    raise
-            except (error.URLError, TimeoutError):
-                if attempt >= self.max_retries:
+                return self._fetch_timed(url=url, headers=headers)
+            except (error.URLError, TimeoutError) as exc:
+                if not is_retryable_error(exc) or attempt >= max_retries:
                     raise
+                failure = exc
 
+            if self.metrics is not None:
+                self.metrics.increment(COUNTER_HTTP_RETRIES)
             self.sleep_func(backoff)
+            self._wait_for_retry_slot(url, failure)
             attempt += 1
             backoff *= self.backoff_multiplier
 
+    def _wait_for_retry_slot(self, url: str, failure: Exception) -> None:
+        if self.rate_limiter is None:
+            return
+        if isinstance(failure, error.HTTPError) and failure.code in _THROTTLE_STATUSES:
+            self.rate_limiter.penalize(url, retry_after_seconds(failure))
+        self.rate_limiter.wait_for_slot(url)
+
+    def _fetch_timed(self, url: str, headers: dict[str, str]) -> ScrapeHttpResponse:
+        if self.metrics is None:
+            return self._fetch_once(url=url, headers=headers)
+        self.metrics.increment(COUNTER_HTTP_REQUESTS)
+        with self.metrics.timer(STAGE_HTTP_REQUEST):
+            return self._fetch_once(url=url, headers=headers)
+
     def _fetch_once(self, url: str, headers: dict[str, str]) -> ScrapeHttpResponse:
         req = request.Request(url=url, headers=headers)
         with request.urlopen(req, timeout=self.timeout_seconds) as response:
-            body = response.read().decode("utf-8", errors="replace")
+            if self.stream:
+                body = self._read_streaming(url, response)
+            else:
+                raw_body = response.read()
+                self._count_bytes(len(raw_body))
+                body = raw_body.decode("utf-8", errors="replace")
             status_code = int(response.getcode())
             response_headers = {key: value for key, value in response.headers.items()}
             return ScrapeHttpResponse(
@@ -66,6 +137,93 @@ class ScrapeHttpClient:
                 headers=response_headers,
             )
 
+    def _count_bytes(self, byte_count: int) -> None:
+        if self.metrics is not None:
+            self.metrics.increment(COUNTER_HTTP_BYTES_RECEIVED, byte_count)
+
+    def _read_streaming(self, url: str, response) -> str:
+        """Read the body in chunks, inflating and decoding incrementally under `max_body_bytes`."""
+        limit = self.max_body_bytes
+        declared_length = response.headers.get("Content-Length")
+        if limit is not None and declared_length and declared_length.isdigit() and int(declared_length) > limit:
+            raise ResponseTooLargeError(f"response body exceeds {limit} bytes: {url}")
+
+        decompressor = _build_decompressor(response.headers.get("Content-Encoding"))
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        text_parts: list[str] = []
+        body_size = 0
+
+        while True:
+            chunk = response.read(self.read_chunk_size)
+            if not chunk:
+                break
+            self._count_bytes(len(chunk))
+            for data in _inflate(decompressor, chunk, self.read_chunk_size):
+                body_size += len(data)
+                if limit is not None and body_size > limit:
+                    raise ResponseTooLargeError(f"response body exceeds {limit} bytes: {url}")
+                text_parts.append(decoder.decode(data))
+
+        if decompressor is not None and not decompressor.eof:
+            raise error.URLError(f"truncated compressed body: {url}")
+        text_parts.append(decoder.decode(b"", final=True))
+        return "".join(text_parts)
 
-def _should_retry_status(status_code: int) -> bool:
+
+def _build_decompressor(content_encoding: str | None):
+    encoding = (content_encoding or "identity").strip().casefold()
+    if encoding == "identity":
+        return None
+    if encoding in {"gzip", "x-gzip"}:
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return zlib.decompressobj(zlib.MAX_WBITS)
+    raise error.URLError(f"unsupported Content-Encoding: {content_encoding}")
+
+
+def _inflate(decompressor, chunk: bytes, max_length: int) -> Iterator[bytes]:
+    if decompressor is None:
+        yield chunk
+        return
+
+    yield decompressor.decompress(chunk, max_length)
+    while decompressor.unconsumed_tail:
+        yield decompressor.decompress(decompressor.unconsumed_tail, max_length)
+
+
+def parse_retry_after(value: str | None, now: datetime | None = None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if value is None or not value.strip():
+        return None
+
+    raw_value = value.strip()
+    if raw_value.isdigit():
+        return float(raw_value)
+
+    try:
+        retry_at = parsedate_to_datetime(raw_value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    reference = now or datetime.now(tz=timezone.utc)
+    return max((retry_at - reference).total_seconds(), 0.0)
+
+
+def retry_after_seconds(exc: Exception) -> float | None:
+    """Seconds from a failed response's Retry-After header, if it carried one."""
+    headers = getattr(exc, "headers", None)
+    if headers is None:
+        return None
+    return parse_retry_after(headers.get("Retry-After"))
+
+
+def is_retryable_status(status_code: int) -> bool:
     return status_code in {429, 500, 502, 503, 504}
+
+
+def is_retryable_error(exc: Exception) -> bool:
+    """Whether a fetch failure is transient: 429/5xx responses, network errors and timeouts."""
+    if isinstance(exc, error.HTTPError):
+        return is_retryable_status(exc.code)
+    return isinstance(exc, (error.URLError, TimeoutError))
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+import json
+from pathlib import Path
 import re
-from collections.abc import Iterable
+from types import MappingProxyType
+
+from app.domain.models.vocabulary import TokenVocabulary
 
 _SECTION_LABEL_PATTERN = re.compile(
     r"^(top notes?|middle notes?|base notes?|head notes?|heart notes?|kopfnote[n]?|herznote[n]?|basisnote[n]?)[:\-\s]+",
@@ -9,7 +15,10 @@ _SECTION_LABEL_PATTERN = re.compile(
 )
 _SPLIT_PATTERN = re.compile(r"[,;/|+]")
 _SPACE_PATTERN = re.compile(r"\s+")
+_AND_PATTERN = re.compile(r"\s+(and|und)\s+", re.IGNORECASE)
 _NOISE_TOKENS = {"", "-", "n/a", "none", "null", "unknown", "k.a."}
+_RAW_NOTE_CACHE_SIZE = 16_384
+_DEFAULT_NOTE_ALIASES_PATH = Path(__file__).with_name("note_aliases.json")
 
 
 def normalize_note(raw_note: str) -> str:
@@ -20,43 +29,97 @@ def normalize_note(raw_note: str) -> str:
 
 
 def split_note_tokens(raw_note: str) -> tuple[str, ...]:
-    collapsed = _SPACE_PATTERN.sub(" ", raw_note.strip())
-    collapsed = re.sub(r"\s+(and|und)\s+", ",", collapsed, flags=re.IGNORECASE)
-    tokens = _SPLIT_PATTERN.split(collapsed)
-    return tuple(token.strip() for token in tokens if token.strip())
+    return _split_collapsed(_SPACE_PATTERN.sub(" ", raw_note.strip()))
 
 
-def normalize_note_list(raw_notes: Iterable[str]) -> tuple[str, ...]:
+def normalize_note_list(
+    raw_notes: Iterable[str],
+    vocabulary: TokenVocabulary | None = None,
+    aliases: Mapping[str, str] | None = None,
+) -> tuple[str, ...]:
+    """Split, clean and dedupe raw notes, mapping aliases to canonical names.
+
+    `aliases` defaults to the bundled `note_aliases.json` table; pass `{}`
+    to keep the names as scraped.
+    """
+    if aliases is None:
+        aliases = _default_note_aliases()
     normalized_notes: list[str] = []
     seen: set[str] = set()
 
     for raw_note in raw_notes:
-        compact_raw_note = _SPACE_PATTERN.sub(" ", raw_note.strip()).casefold()
-        if compact_raw_note in _NOISE_TOKENS:
-            continue
-
-        for token in split_note_tokens(raw_note):
-            normalized = normalize_note(token)
-            if normalized.casefold() in _NOISE_TOKENS:
-                continue
+        for normalized in _normalize_raw_note(raw_note):
+            if aliases:
+                normalized = aliases.get(normalized.casefold(), normalized)
 
             dedupe_key = normalized.casefold()
-            if not normalized or dedupe_key in seen:
+            if dedupe_key in seen:
                 continue
 
             seen.add(dedupe_key)
             normalized_notes.append(normalized)
 
+    if vocabulary is not None:
+        vocabulary.add_many("note", normalized_notes)
     return tuple(normalized_notes)
 
 
+def normalize_note_lists(
+    raw_note_lists: Iterable[Iterable[str]],
+    vocabulary: TokenVocabulary | None = None,
+    aliases: Mapping[str, str] | None = None,
+) -> tuple[tuple[str, ...], ...]:
+    """Normalize many note lists at once; repeated raw strings hit a shared LRU cache."""
+    return tuple(
+        normalize_note_list(raw_notes, vocabulary, aliases) for raw_notes in raw_note_lists
+    )
+
+
+def load_note_aliases(path: str | Path | None = None) -> dict[str, str]:
+    """Load a JSON object of alias -> canonical note; keys are casefolded."""
+    alias_path = Path(path) if path else _DEFAULT_NOTE_ALIASES_PATH
+    raw_aliases = json.loads(alias_path.read_text(encoding="utf-8"))
+    if not isinstance(raw_aliases, dict):
+        raise ValueError(f"note alias table must be a JSON object: {alias_path}")
+    return {
+        str(alias).strip().casefold(): str(canonical).strip()
+        for alias, canonical in raw_aliases.items()
+    }
+
+
 def normalize_note_sections(
     notes_top: Iterable[str],
     notes_middle: Iterable[str],
     notes_base: Iterable[str],
+    vocabulary: TokenVocabulary | None = None,
+    aliases: Mapping[str, str] | None = None,
 ) -> dict[str, tuple[str, ...]]:
     return {
-        "notes_top": normalize_note_list(notes_top),
-        "notes_middle": normalize_note_list(notes_middle),
-        "notes_base": normalize_note_list(notes_base),
+        "notes_top": normalize_note_list(notes_top, vocabulary, aliases),
+        "notes_middle": normalize_note_list(notes_middle, vocabulary, aliases),
+        "notes_base": normalize_note_list(notes_base, vocabulary, aliases),
     }
+
+
+@lru_cache(maxsize=1)
+def _default_note_aliases() -> Mapping[str, str]:
+    return MappingProxyType(load_note_aliases())
+
+
+@lru_cache(maxsize=_RAW_NOTE_CACHE_SIZE)
+def _normalize_raw_note(raw_note: str) -> tuple[str, ...]:
+    collapsed = _SPACE_PATTERN.sub(" ", raw_note.strip())
+    if collapsed.casefold() in _NOISE_TOKENS:
+        return tuple()
+
+    normalized_tokens: list[str] = []
+    for token in _split_collapsed(collapsed):
+        normalized = normalize_note(token)
+        if normalized and normalized.casefold() not in _NOISE_TOKENS:
+            normalized_tokens.append(normalized)
+    return tuple(normalized_tokens)
+
+
+def _split_collapsed(collapsed: str) -> tuple[str, ...]:
+    tokens = _SPLIT_PATTERN.split(_AND_PATTERN.sub(",", collapsed))
+    return tuple(token.strip() for token in tokens if token.strip())
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
 import re
-from collections.abc import Iterable
+
+from app.domain.models.vocabulary import TokenKind, TokenVocabulary
 
 _SPACE_PATTERN = re.compile(r"\s+")
 _SPLIT_PATTERN = re.compile(r"[,;/|+]")
+_AND_PATTERN = re.compile(r"\s+(and|und)\s+", re.IGNORECASE)
 _LABEL_PATTERN = re.compile(
     r"^(duftfamilie|familie|family|geschlecht|gender|molek[üu]le|molecules?)[:\-\s]+",
     re.IGNORECASE,
 )
 _NOISE_TOKENS = {"", "-", "n/a", "none", "null", "unknown", "k.a."}
+_RAW_TAG_CACHE_SIZE = 16_384
 _FAMILY_ALIASES = {
     "blumig": "Floral",
     "floral": "Floral",
@@ -38,40 +43,56 @@ def normalize_tag(raw_tag: str) -> str:
 
 
 def split_tag_tokens(raw_tag: str) -> tuple[str, ...]:
-    collapsed = _SPACE_PATTERN.sub(" ", raw_tag.strip())
-    collapsed = re.sub(r"\s+(and|und)\s+", ",", collapsed, flags=re.IGNORECASE)
-    tokens = _SPLIT_PATTERN.split(collapsed)
-    return tuple(token.strip() for token in tokens if token.strip())
+    return _split_collapsed(_SPACE_PATTERN.sub(" ", raw_tag.strip()))
 
 
-def normalize_tag_list(raw_tags: Iterable[str]) -> tuple[str, ...]:
+def normalize_tag_list(
+    raw_tags: Iterable[str],
+    vocabulary: TokenVocabulary | None = None,
+    kind: TokenKind | None = None,
+) -> tuple[str, ...]:
+    if vocabulary is not None and kind is None:
+        raise ValueError("kind is required when a vocabulary is given")
+
     normalized_tags: list[str] = []
     seen: set[str] = set()
 
     for raw_tag in raw_tags:
-        compact_raw_tag = _SPACE_PATTERN.sub(" ", raw_tag.strip()).casefold()
-        if compact_raw_tag in _NOISE_TOKENS:
-            continue
-
-        for token in split_tag_tokens(raw_tag):
-            normalized = normalize_tag(token)
+        for normalized in _normalize_raw_tag(raw_tag):
             dedupe_key = normalized.casefold()
-            if not normalized or dedupe_key in _NOISE_TOKENS or dedupe_key in seen:
+            if dedupe_key in seen:
                 continue
 
             seen.add(dedupe_key)
             normalized_tags.append(normalized)
 
+    if vocabulary is not None and kind is not None:
+        vocabulary.add_many(kind, normalized_tags)
     return tuple(normalized_tags)
 
 
-def normalize_family_list(raw_families: Iterable[str]) -> tuple[str, ...]:
+def normalize_tag_lists(
+    raw_tag_lists: Iterable[Iterable[str]],
+    vocabulary: TokenVocabulary | None = None,
+    kind: TokenKind | None = None,
+) -> tuple[tuple[str, ...], ...]:
+    """Normalize many tag lists at once; repeated raw strings hit a shared LRU cache."""
+    return tuple(normalize_tag_list(raw_tags, vocabulary, kind) for raw_tags in raw_tag_lists)
+
+
+def normalize_family_list(
+    raw_families: Iterable[str],
+    vocabulary: TokenVocabulary | None = None,
+    aliases: Mapping[str, str] | None = None,
+) -> tuple[str, ...]:
     normalized_families: list[str] = []
     seen: set[str] = set()
 
     for family in normalize_tag_list(raw_families):
         alias_key = family.casefold()
         canonical = _FAMILY_ALIASES.get(alias_key, family)
+        if aliases:
+            canonical = aliases.get(alias_key, canonical)
         dedupe_key = canonical.casefold()
         if dedupe_key in seen:
             continue
@@ -79,16 +100,49 @@ def normalize_family_list(raw_families: Iterable[str]) -> tuple[str, ...]:
         seen.add(dedupe_key)
         normalized_families.append(canonical)
 
+    if vocabulary is not None:
+        vocabulary.add_many("family", normalized_families)
     return tuple(normalized_families)
 
 
+def normalize_family_lists(
+    raw_family_lists: Iterable[Iterable[str]],
+    vocabulary: TokenVocabulary | None = None,
+    aliases: Mapping[str, str] | None = None,
+) -> tuple[tuple[str, ...], ...]:
+    return tuple(
+        normalize_family_list(raw_families, vocabulary, aliases)
+        for raw_families in raw_family_lists
+    )
+
+
 def normalize_tag_sections(
     gender_tags: Iterable[str],
     scent_families: Iterable[str],
     molecule_tags: Iterable[str],
+    vocabulary: TokenVocabulary | None = None,
 ) -> dict[str, tuple[str, ...]]:
     return {
-        "gender_tags": normalize_tag_list(gender_tags),
-        "scent_families": normalize_family_list(scent_families),
-        "molecule_tags": normalize_tag_list(molecule_tags),
+        "gender_tags": normalize_tag_list(gender_tags, vocabulary, kind="gender"),
+        "scent_families": normalize_family_list(scent_families, vocabulary),
+        "molecule_tags": normalize_tag_list(molecule_tags, vocabulary, kind="molecule"),
     }
+
+
+@lru_cache(maxsize=_RAW_TAG_CACHE_SIZE)
+def _normalize_raw_tag(raw_tag: str) -> tuple[str, ...]:
+    collapsed = _SPACE_PATTERN.sub(" ", raw_tag.strip())
+    if collapsed.casefold() in _NOISE_TOKENS:
+        return tuple()
+
+    normalized_tokens: list[str] = []
+    for token in _split_collapsed(collapsed):
+        normalized = normalize_tag(token)
+        if normalized and normalized.casefold() not in _NOISE_TOKENS:
+            normalized_tokens.append(normalized)
+    return tuple(normalized_tokens)
+
+
+def _split_collapsed(collapsed: str) -> tuple[str, ...]:
+    tokens = _SPLIT_PATTERN.split(_AND_PATTERN.sub(",", collapsed))
+    return tuple(token.strip() for token in tokens if token.strip())
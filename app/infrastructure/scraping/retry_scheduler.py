@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import heapq
+import itertools
+import random
+import time
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class ScheduledRetry:
+    ready_at: float
+    url: str
+    attempt: int
+
+
+class RetryScheduler:
+    """Delay-ordered queue of URLs waiting for another attempt.
+
+    Delays use decorrelated jitter (`min(cap, uniform(base, previous * 3))`)
+    and never undercut a server's Retry-After. Each URL gets at most
+    `max_attempts` retries; `schedule` returns None once they are used up.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay_seconds: float = 1.0,
+        max_delay_seconds: float = 60.0,
+        time_func: Callable[[], float] = time.monotonic,
+        random_func: Callable[[float, float], float] = random.uniform,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.time_func = time_func
+        self.random_func = random_func
+        self._heap: list[tuple[float, int, ScheduledRetry]] = []
+        self._sequence = itertools.count()
+        self._attempts: dict[str, int] = {}
+        self._last_delay: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def attempts(self, url: str) -> int:
+        return self._attempts.get(url, 0)
+
+    def schedule(self, url: str, retry_after_seconds: float | None = None) -> ScheduledRetry | None:
+        attempt = self._attempts.get(url, 0) + 1
+        if attempt > self.max_attempts:
+            return None
+
+        delay = self._next_delay(url)
+        if retry_after_seconds is not None:
+            delay = max(delay, retry_after_seconds)
+
+        self._attempts[url] = attempt
+        retry = ScheduledRetry(ready_at=self.time_func() + delay, url=url, attempt=attempt)
+        heapq.heappush(self._heap, (retry.ready_at, next(self._sequence), retry))
+        return retry
+
+    def pop_ready(self) -> ScheduledRetry | None:
+        if not self._heap or self._heap[0][0] > self.time_func():
+            return None
+        return heapq.heappop(self._heap)[2]
+
+    def next_ready_in(self) -> float | None:
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - self.time_func(), 0.0)
+
+    def _next_delay(self, url: str) -> float:
+        previous = self._last_delay.get(url, self.base_delay_seconds)
+        upper = max(previous * 3, self.base_delay_seconds)
+        delay = min(self.max_delay_seconds, self.random_func(self.base_delay_seconds, upper))
+        self._last_delay[url] = delay
+        return delay
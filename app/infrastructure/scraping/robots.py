@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import threading
 import time
-from typing import Callable
-from urllib import error, request, robotparser
+from typing import Awaitable, Callable
+from urllib import error, request
 from urllib.parse import urlparse
 
+from app.config.metrics import STAGE_RATE_LIMIT_WAIT, STAGE_ROBOTS_CHECK, MetricsCollector
+from app.infrastructure.scraping.robots_rules import RobotsRules, compile_robots_rules
+
 
 def _origin_from_url(url: str) -> str:
     parsed = urlparse(url)
@@ -16,27 +23,119 @@ def _domain_from_url(url: str) -> str:
     return urlparse(url).netloc
 
 
+@dataclass(frozen=True)
+class RobotsFetchResult:
+    body: str | None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.body is None
+
+
 class RobotsTxtPolicy:
+    """robots.txt checks backed by compiled rules and an optional persistent cache.
+
+    With a `cache` (see `RobotsCacheSqlite`), bodies younger than
+    `cache_ttl_seconds` are reused across runs; older ones are revalidated
+    with If-None-Match / If-Modified-Since, and kept if the refetch fails.
+
+    Compiled rules are shared safely between threads, but the first lookup
+    for an origin goes through `cache`, whose SQLite connection belongs to
+    one thread: multi-threaded callers `resolve` each origin on that thread
+    first (see `StagedScrapePipeline`); `is_resolved` tells them when.
+    """
+
     def __init__(
         self,
         user_agent: str = "PerfumeRecommenderBot/1.0",
         robots_fetcher: Callable[[str], str] | None = None,
+        cache=None,
+        cache_ttl_seconds: float = 86_400.0,
+        conditional_fetcher: Callable[[str, str | None, str | None], RobotsFetchResult] | None = None,
+        now_func: Callable[[], datetime] = lambda: datetime.now(tz=timezone.utc),
     ) -> None:
         self.user_agent = user_agent
-        self.robots_fetcher = robots_fetcher or _default_robots_fetcher
-        self._parsers: dict[str, robotparser.RobotFileParser | None] = {}
+        self.robots_fetcher = robots_fetcher
+        self.cache = cache
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.conditional_fetcher = conditional_fetcher or _default_conditional_fetcher
+        self.now_func = now_func
+        self._rules: dict[str, RobotsRules | None] = {}
+        self._loading: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
 
-    def can_fetch(self, url: str) -> bool:
-        origin = _origin_from_url(url)
-        parser = self._parsers.get(origin)
-        if parser is None and origin not in self._parsers:
-            parser = _build_robot_parser(origin, self.robots_fetcher)
-            self._parsers[origin] = parser
+    def is_resolved(self, url: str) -> bool:
+        with self._lock:
+            return _origin_from_url(url) in self._rules
+
+    def resolve(self, url: str) -> None:
+        """Load and compile robots.txt for `url`'s origin now, on the calling thread."""
+        self._rules_for(_origin_from_url(url))
 
-        if parser is None:
+    def can_fetch(self, url: str) -> bool:
+        rules = self._rules_for(_origin_from_url(url))
+        if rules is None:
             return True
+        return rules.can_fetch(url)
+
+    def crawl_delay(self, url: str) -> float | None:
+        """Crawl-delay (or Request-rate interval) robots.txt sets for our user agent."""
+        with self._lock:
+            rules = self._rules.get(_origin_from_url(url))
+        if rules is None:
+            return None
+        return rules.crawl_delay
+
+    def _rules_for(self, origin: str) -> RobotsRules | None:
+        with self._lock:
+            if origin in self._rules:
+                return self._rules[origin]
+            origin_lock = self._loading.setdefault(origin, threading.Lock())
 
-        return parser.can_fetch(self.user_agent, url)
+        # Only this origin's lock is held across the load: concurrent first lookups
+        # fetch its robots.txt once, and lookups for other origins never wait on it.
+        with origin_lock:
+            with self._lock:
+                if origin in self._rules:
+                    return self._rules[origin]
+            body = self._load_robots_body(origin)
+            rules = compile_robots_rules(body, self.user_agent) if body is not None else None
+            with self._lock:
+                self._rules[origin] = rules
+                self._loading.pop(origin, None)
+            return rules
+
+    def _load_robots_body(self, origin: str) -> str | None:
+        cached = self.cache.get(origin) if self.cache is not None else None
+        now = self.now_func()
+        if cached is not None and (now - cached.fetched_at).total_seconds() < self.cache_ttl_seconds:
+            return cached.body
+
+        try:
+            result = self._fetch(origin, cached)
+        except OSError:
+            return cached.body if cached is not None else None
+
+        if result.not_modified and cached is not None:
+            body = cached.body
+            etag = result.etag or cached.etag
+            last_modified = result.last_modified or cached.last_modified
+        else:
+            body = result.body or ""
+            etag, last_modified = result.etag, result.last_modified
+
+        if self.cache is not None:
+            self.cache.save(origin, body, etag, last_modified, now)
+        return body
+
+    def _fetch(self, origin: str, cached) -> RobotsFetchResult:
+        if self.robots_fetcher is not None:
+            return RobotsFetchResult(body=self.robots_fetcher(origin))
+        if cached is None:
+            return self.conditional_fetcher(origin, None, None)
+        return self.conditional_fetcher(origin, cached.etag, cached.last_modified)
 
 
 @dataclass
@@ -59,40 +158,171 @@ class DomainRateLimiter:
         self._last_seen_at[domain] = self.time_func()
 
 
+@dataclass
+class _DomainBucket:
+    rate_per_second: float
+    theoretical_arrival_at: float = 0.0
+    blocked_until: float = 0.0
+    throttled_rate: float | None = None
+    throttled_at: float = 0.0
+
+
+@dataclass
+class TokenBucketRateLimiter:
+    """Thread-safe per-domain token bucket (GCRA form) with burst allowance.
+
+    `reserve` books the next free slot under a lock and returns how long the
+    caller must wait, so concurrent workers get distinct, evenly spaced slots.
+    Crawl-delay from robots.txt lowers a domain's rate, and `penalize` (429 or
+    503 responses) halves it and honors Retry-After; throttled rates recover
+    linearly to the configured rate over `recovery_seconds`.
+    """
+
+    rate_per_second: float = 1.0
+    burst: int = 1
+    min_rate_per_second: float = 0.05
+    throttle_factor: float = 0.5
+    recovery_seconds: float = 60.0
+    time_func: Callable[[], float] = time.monotonic
+    sleep_func: Callable[[float], None] = time.sleep
+    _buckets: dict[str, _DomainBucket] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        if self.rate_per_second <= 0:
+            raise ValueError("rate_per_second must be > 0")
+        if self.burst < 1:
+            raise ValueError("burst must be >= 1")
+
+    def wait_for_slot(self, url: str) -> None:
+        delay = self.reserve(url)
+        if delay > 0:
+            self.sleep_func(delay)
+
+    def reserve(self, url: str) -> float:
+        with self._lock:
+            now = self.time_func()
+            bucket = self._bucket(_domain_from_url(url))
+            interval = 1.0 / self._effective_rate(bucket, now)
+            burst_tolerance = (self.burst - 1) * interval
+            allowed_at = max(bucket.theoretical_arrival_at - burst_tolerance, now, bucket.blocked_until)
+            bucket.theoretical_arrival_at = max(bucket.theoretical_arrival_at, allowed_at) + interval
+            return allowed_at - now
+
+    def set_crawl_delay(self, url: str, delay_seconds: float) -> None:
+        if delay_seconds <= 0:
+            return
+        with self._lock:
+            bucket = self._bucket(_domain_from_url(url))
+            bucket.rate_per_second = min(self.rate_per_second, 1.0 / delay_seconds)
+
+    def penalize(self, url: str, retry_after_seconds: float | None = None) -> None:
+        with self._lock:
+            now = self.time_func()
+            bucket = self._bucket(_domain_from_url(url))
+            current_rate = self._effective_rate(bucket, now)
+            bucket.throttled_rate = max(current_rate * self.throttle_factor, self.min_rate_per_second)
+            bucket.throttled_at = now
+            if retry_after_seconds is not None:
+                bucket.blocked_until = max(bucket.blocked_until, now + retry_after_seconds)
+
+    def current_rate(self, url: str) -> float:
+        with self._lock:
+            return self._effective_rate(self._bucket(_domain_from_url(url)), self.time_func())
+
+    def _bucket(self, domain: str) -> _DomainBucket:
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            bucket = _DomainBucket(rate_per_second=self.rate_per_second)
+            self._buckets[domain] = bucket
+        return bucket
+
+    def _effective_rate(self, bucket: _DomainBucket, now: float) -> float:
+        if bucket.throttled_rate is None:
+            return bucket.rate_per_second
+
+        progress = (now - bucket.throttled_at) / self.recovery_seconds if self.recovery_seconds > 0 else 1.0
+        if progress >= 1.0:
+            bucket.throttled_rate = None
+            return bucket.rate_per_second
+        ceiling = max(bucket.rate_per_second, bucket.throttled_rate)
+        return bucket.throttled_rate + (ceiling - bucket.throttled_rate) * progress
+
+
+@dataclass
+class AsyncTokenBucketRateLimiter:
+    """asyncio front-end sharing a `TokenBucketRateLimiter`'s per-domain budget."""
+
+    limiter: TokenBucketRateLimiter = field(default_factory=TokenBucketRateLimiter)
+    sleep_func: Callable[[float], Awaitable[None]] = asyncio.sleep
+
+    async def wait_for_slot(self, url: str) -> None:
+        delay = self.limiter.reserve(url)
+        if delay > 0:
+            await self.sleep_func(delay)
+
+    def set_crawl_delay(self, url: str, delay_seconds: float) -> None:
+        self.limiter.set_crawl_delay(url, delay_seconds)
+
+    def penalize(self, url: str, retry_after_seconds: float | None = None) -> None:
+        self.limiter.penalize(url, retry_after_seconds)
+
+
 @dataclass
 class ScrapeAccessGuard:
     robots_policy: RobotsTxtPolicy = field(default_factory=RobotsTxtPolicy)
-    rate_limiter: DomainRateLimiter = field(default_factory=DomainRateLimiter)
+    rate_limiter: DomainRateLimiter | TokenBucketRateLimiter = field(
+        default_factory=TokenBucketRateLimiter
+    )
+    metrics: MetricsCollector | None = None
 
     def enforce(self, url: str) -> None:
-        if not self.robots_policy.can_fetch(url):
+        with self._timed(STAGE_ROBOTS_CHECK):
+            allowed = self.robots_policy.can_fetch(url)
+        if not allowed:
             raise PermissionError(f"robots.txt forbids scraping: {url}")
 
-        self.rate_limiter.wait_for_slot(url)
+        self._apply_crawl_delay(url)
+        with self._timed(STAGE_RATE_LIMIT_WAIT):
+            self.rate_limiter.wait_for_slot(url)
 
+    def report_throttled(self, url: str, retry_after_seconds: float | None = None) -> None:
+        penalize = getattr(self.rate_limiter, "penalize", None)
+        if penalize is not None:
+            penalize(url, retry_after_seconds)
 
-def _build_robot_parser(
-    origin: str,
-    robots_fetcher: Callable[[str], str],
-) -> robotparser.RobotFileParser | None:
-    try:
-        robots_text = robots_fetcher(origin)
-    except OSError:
-        return None
+    def _timed(self, stage: str) -> AbstractContextManager[None]:
+        return self.metrics.timer(stage) if self.metrics is not None else nullcontext()
+
+    def _apply_crawl_delay(self, url: str) -> None:
+        set_crawl_delay = getattr(self.rate_limiter, "set_crawl_delay", None)
+        if set_crawl_delay is None:
+            return
+        delay = self.robots_policy.crawl_delay(url)
+        if delay is not None:
+            set_crawl_delay(url, delay)
 
-    parser = robotparser.RobotFileParser()
-    parser.set_url(f"{origin}/robots.txt")
-    parser.parse(robots_text.splitlines())
-    return parser
 
+def _default_conditional_fetcher(
+    origin: str, etag: str | None = None, last_modified: str | None = None
+) -> RobotsFetchResult:
+    headers = {"User-Agent": "PerfumeRecommenderBot/1.0"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
 
-def _default_robots_fetcher(origin: str) -> str:
-    robots_url = f"{origin}/robots.txt"
-    req = request.Request(robots_url, headers={"User-Agent": "PerfumeRecommenderBot/1.0"})
+    req = request.Request(f"{origin}/robots.txt", headers=headers)
     try:
         with request.urlopen(req, timeout=10.0) as response:
-            return response.read().decode("utf-8", errors="replace")
+            return RobotsFetchResult(
+                body=response.read().decode("utf-8", errors="replace"),
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
     except error.HTTPError as exc:
+        if exc.code == 304:
+            return RobotsFetchResult(body=None, etag=exc.headers.get("ETag"))
         if exc.code == 404:
-            return ""
+            return RobotsFetchResult(body="")
         raise
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import re
+from urllib.parse import quote, unquote, urlsplit
+
+_SAFE_PATH_CHARS = "/?=&;:@!,+~*$'()"
+_ALWAYS_ALLOWED_PATH = "/robots.txt"
+
+
+class _TrieNode:
+    __slots__ = ("children", "allow")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.allow: bool | None = None
+
+
+@dataclass(frozen=True)
+class _WildcardRule:
+    pattern: re.Pattern[str]
+    length: int
+    allow: bool
+
+
+class RobotsRules:
+    """Allow/disallow rules of one robots.txt group, compiled for fast lookups.
+
+    Plain path prefixes live in a character trie, so a check walks the URL path
+    once instead of testing every rule. Rules with `*` or a trailing `$` are
+    matched as regexes. The most specific (longest) matching rule wins and
+    Allow wins ties, as in RFC 9309.
+    """
+
+    def __init__(
+        self,
+        rules: list[tuple[str, bool]] | tuple[tuple[str, bool], ...] = (),
+        crawl_delay: float | None = None,
+    ) -> None:
+        self.crawl_delay = crawl_delay
+        self._root = _TrieNode()
+        self._wildcards: list[_WildcardRule] = []
+        for path, allow in rules:
+            self._add_rule(_normalize_path(path), allow)
+
+    def can_fetch(self, url: str) -> bool:
+        parts = urlsplit(url)
+        path = _normalize_path(f"{parts.path or '/'}?{parts.query}" if parts.query else parts.path or "/")
+        if path == _ALWAYS_ALLOWED_PATH:
+            return True
+
+        best_length, best_allow = self._longest_prefix_match(path)
+        for rule in self._wildcards:
+            if rule.length < best_length or (rule.length == best_length and best_allow):
+                continue
+            if rule.pattern.match(path):
+                best_length, best_allow = rule.length, rule.allow
+        return best_allow
+
+    def _add_rule(self, path: str, allow: bool) -> None:
+        if "*" in path or path.endswith("$"):
+            self._wildcards.append(
+                _WildcardRule(pattern=_compile_wildcard(path), length=len(path), allow=allow)
+            )
+            return
+
+        node = self._root
+        for char in path:
+            node = node.children.setdefault(char, _TrieNode())
+        node.allow = allow or bool(node.allow)
+
+    def _longest_prefix_match(self, path: str) -> tuple[int, bool]:
+        node = self._root
+        best_length, best_allow = 0, True
+        for depth, char in enumerate(path, start=1):
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.allow is not None:
+                best_length, best_allow = depth, node.allow
+        return best_length, best_allow
+
+
+def compile_robots_rules(robots_text: str, user_agent: str) -> RobotsRules:
+    """Pick the group(s) addressed to `user_agent` (else `*`) and compile them."""
+    agent_token = user_agent.split("/", 1)[0].strip().casefold()
+    specific: list[_Group] = []
+    wildcard: list[_Group] = []
+
+    for group in _parse_groups(robots_text):
+        if any(agent != "*" and agent in agent_token for agent in group.agents):
+            specific.append(group)
+        elif "*" in group.agents:
+            wildcard.append(group)
+
+    selected = specific or wildcard
+    rules = [rule for group in selected for rule in group.rules]
+    crawl_delay = next((group.crawl_delay for group in selected if group.crawl_delay is not None), None)
+    return RobotsRules(rules, crawl_delay=crawl_delay)
+
+
+@dataclass
+class _Group:
+    agents: list[str]
+    rules: list[tuple[str, bool]]
+    crawl_delay: float | None = None
+
+
+def _parse_groups(robots_text: str) -> list[_Group]:
+    groups: list[_Group] = []
+    current: _Group | None = None
+    collecting_agents = False
+
+    for raw_line in robots_text.splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        key, separator, value = line.partition(":")
+        if not separator:
+            continue
+        key = key.strip().casefold()
+        value = value.strip()
+
+        if key == "user-agent":
+            if current is None or not collecting_agents:
+                current = _Group(agents=[], rules=[])
+                groups.append(current)
+            current.agents.append(value.casefold())
+            collecting_agents = True
+            continue
+
+        if current is None:
+            continue
+        collecting_agents = False
+
+        if key in {"allow", "disallow"} and value:
+            current.rules.append((value, key == "allow"))
+        elif key == "crawl-delay":
+            current.crawl_delay = _parse_float(value)
+        elif key == "request-rate" and current.crawl_delay is None:
+            requests, _, seconds = value.partition("/")
+            requests_value, seconds_value = _parse_float(requests), _parse_float(seconds)
+            if requests_value and seconds_value is not None:
+                current.crawl_delay = seconds_value / requests_value
+
+    return groups
+
+
+def _parse_float(value: str) -> float | None:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _normalize_path(path: str) -> str:
+    return quote(unquote(path), safe=_SAFE_PATH_CHARS)
+
+
+def _compile_wildcard(path: str) -> re.Pattern[str]:
+    anchored = path.endswith("$")
+    body = path[:-1] if anchored else path
+    regex = ".*".join(re.escape(part) for part in body.split("*"))
+    return re.compile(regex + ("$" if anchored else ""))
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+import sqlite3
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+
+from app.api.dependencies import ApiResources
+from app.api.routers import feedback as feedback_router
+from app.api.routers import perfumes as perfumes_router
+from app.api.routers import recommendations as recommendations_router
+from app.application.services.catalog_refresh_service import (
+    CatalogHandle,
+    CatalogSnapshot,
+    VersionedCache,
+    build_catalog_snapshot,
+    load_catalog_snapshot,
+)
+from app.application.services.feedback_service import FeedbackService
+from app.application.services.user_affinity_service import UserAffinityService
+from app.config.settings import (
+    CATALOG_DB_PATH,
+    CATALOG_VERSION_MARKER,
+    SCORING_WORKERS,
+    SERVER_RELOAD_POLL_SECONDS,
+)
+from app.domain.models.perfume import Perfume
+from app.infrastructure.persistence.sqlite.feedback_repo_sqlite import FeedbackRepositorySqlite
+from app.infrastructure.persistence.sqlite.user_affinity_repo_sqlite import UserAffinityRepositorySqlite
+
+
+def create_app(
+    perfumes: Iterable[Perfume] | None = None,
+    db_path: str = CATALOG_DB_PATH,
+    scoring_workers: int = SCORING_WORKERS,
+    snapshot: CatalogSnapshot | None = None,
+    marker_path: str = CATALOG_VERSION_MARKER,
+    reload_poll_seconds: float = SERVER_RELOAD_POLL_SECONDS,
+    affinity_service: UserAffinityService | None = None,
+) -> FastAPI:
+    """Build the API; the catalog and indexes load once, in the lifespan hook.
+
+    A pre-built `snapshot` (see `app.server`) is used as-is, so forked workers
+    share the parent's copy instead of loading their own; the pre-fork parent
+    then owns reloading. A catalog loaded from `db_path` is watched instead:
+    publishing a new version marker rebuilds it in the background and swaps it
+    in without restarting the process.
+
+    A catalog backed by `db_path` (loaded here or pre-built by the server) also
+    gets feedback ingestion: `POST /feedback` events are flushed to the same
+    database and folded into per-user affinities, which personalize
+    `/recommendations` for a known `user_id`. An injected `affinity_service`
+    replaces the one built here.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        if snapshot is not None:
+            handle = CatalogHandle(snapshot)
+        elif perfumes is not None:
+            handle = CatalogHandle(build_catalog_snapshot(perfumes))
+        else:
+            loader = partial(load_catalog_snapshot, db_path, marker_path)
+            handle = CatalogHandle(loader(), loader=loader)
+            handle.start_watching(marker_path, reload_poll_seconds)
+        # Created here rather than with the snapshot: threads (and SQLite connections) do not survive fork.
+        executor = ThreadPoolExecutor(max_workers=scoring_workers, thread_name_prefix="scoring")
+        affinity: UserAffinityService | None = affinity_service
+        feedback: FeedbackService | None = None
+        connections: list[sqlite3.Connection] = []
+        if perfumes is None:
+            affinity, feedback, connections = _open_feedback(db_path, handle, affinity_service)
+            feedback.start()
+        app.state.resources = ApiResources(
+            catalog_handle=handle,
+            scoring_executor=executor,
+            perfume_page_cache=VersionedCache(lambda: handle.version),
+            affinity_service=affinity,
+            feedback_service=feedback,
+        )
+        try:
+            yield
+        finally:
+            handle.stop_watching()
+            executor.shutdown(wait=False, cancel_futures=True)
+            if feedback is not None:
+                feedback.stop()
+            for connection in connections:
+                connection.close()
+
+    app = FastAPI(title="Perfume Recommender", default_response_class=ORJSONResponse, lifespan=lifespan)
+    app.include_router(perfumes_router.router)
+    app.include_router(recommendations_router.router)
+    app.include_router(feedback_router.router)
+    return app
+
+
+def _open_feedback(
+    db_path: str, handle: CatalogHandle, affinity_service: UserAffinityService | None
+) -> tuple[UserAffinityService, FeedbackService, list[sqlite3.Connection]]:
+    # One connection per repository: each commits its own transactions under its own lock.
+    feedback_connection = sqlite3.connect(db_path, check_same_thread=False)
+    connections = [feedback_connection]
+    if affinity_service is None:
+        affinity_connection = sqlite3.connect(db_path, check_same_thread=False)
+        connections.append(affinity_connection)
+        affinity_repository = UserAffinityRepositorySqlite(affinity_connection)
+        affinity_repository.initialize_schema()
+        # Resolved per event, so affinities follow the catalog version being served.
+        affinity_service = UserAffinityService(
+            affinity_repository, lambda perfume_id: handle.current().catalog.get(perfume_id)
+        )
+    feedback_repository = FeedbackRepositorySqlite(feedback_connection, on_flushed=affinity_service.apply_events)
+    feedback_repository.initialize_schema()
+    return affinity_service, FeedbackService(feedback_repository), connections
+
+
+app = create_app()
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import argparse
+from functools import partial
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Callable
+
+from app.application.services.catalog_refresh_service import (
+    CatalogSnapshot,
+    load_catalog_snapshot,
+    read_catalog_version,
+)
+from app.config.logging import (
+    CATALOG_REFRESH_FAILED,
+    SERVER_RELOAD,
+    SERVER_WORKER_EXITED,
+    SERVER_WORKER_STARTED,
+    get_logger,
+    log_event,
+)
+from app.config.settings import (
+    CATALOG_DB_PATH,
+    CATALOG_VERSION_MARKER,
+    SERVER_RELOAD_POLL_SECONDS,
+    SERVER_WORKER_SHUTDOWN_SECONDS,
+    SERVER_WORKERS,
+)
+
+WorkerTarget = Callable[[CatalogSnapshot, socket.socket], None]
+
+
+class PreforkServer:
+    """Load the catalog once in a parent process and fork API workers from it.
+
+    Workers inherit the parent's snapshot through copy-on-write pages, so the
+    catalog is loaded and indexed once instead of once per worker. The
+    snapshot is `gc.freeze()`-d before forking so the cyclic GC never walks
+    it. The catalog's token-id columns and the retrieval postings are flat
+    arrays, so reading them writes no reference counts and their pages stay
+    shared. Per-worker memory is not flat, though: scoring still reads the
+    `Perfume` objects of every candidate, each read writes its reference
+    count, and a worker serving broad queries ends up with a private copy of
+    most of the perfumes (see `benchmarks/prefork_memory.py`). Scoring from
+    the shared columns alone is not implemented. All workers accept on one
+    listening socket owned by the parent.
+
+    When the version marker changes (see `publish_catalog_version`), the
+    parent loads the new snapshot, forks a fresh set of workers and sends the
+    old ones SIGTERM so they drain in-flight requests; the socket never closes,
+    so no connection is refused during the switch. Dead workers are replaced.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = SERVER_WORKERS,
+        db_path: str = CATALOG_DB_PATH,
+        marker_path: str = CATALOG_VERSION_MARKER,
+        poll_seconds: float = SERVER_RELOAD_POLL_SECONDS,
+        shutdown_seconds: float = SERVER_WORKER_SHUTDOWN_SECONDS,
+        snapshot_loader: Callable[[], CatalogSnapshot] | None = None,
+        worker_target: WorkerTarget | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.marker_path = marker_path
+        self.poll_seconds = poll_seconds
+        self.shutdown_seconds = shutdown_seconds
+        self.snapshot_loader = snapshot_loader or partial(load_catalog_snapshot, db_path, marker_path)
+        self.worker_target = worker_target or partial(_serve_with_uvicorn, db_path=db_path)
+        self.logger = logger or get_logger("app.server")
+        self.snapshot: CatalogSnapshot | None = None
+        self._socket: socket.socket | None = None
+        self._workers: dict[int, str] = {}
+        self._draining: dict[int, float] = {}
+        self._stopping = False
+        self._reload_requested = False
+
+    @property
+    def address(self) -> tuple[str, int]:
+        if self._socket is None:
+            raise RuntimeError("server is not started")
+        return self._socket.getsockname()[:2]
+
+    @property
+    def worker_pids(self) -> tuple[int, ...]:
+        return tuple(self._workers)
+
+    def serve_forever(self) -> None:
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGHUP, self._request_reload)
+        self.start()
+        try:
+            while not self._stopping:
+                time.sleep(self.poll_seconds)
+                self.poll_once()
+        finally:
+            self.stop()
+
+    def start(self) -> None:
+        self._socket = socket.create_server((self.host, self.port), reuse_port=False, backlog=2048)
+        self._socket.set_inheritable(True)
+        self._load_snapshot()
+        self._spawn_missing()
+
+    def poll_once(self) -> None:
+        self._reap()
+        self._kill_overdue()
+        version = read_catalog_version(self.marker_path)
+        if self._reload_requested or (version is not None and version != self.snapshot.version):
+            self._reload_requested = False
+            self.reload()
+        self._spawn_missing()
+
+    def reload(self) -> bool:
+        """Load the published catalog and replace the workers; on failure keep serving the current one."""
+        previous_version = self.snapshot.version
+        old_workers = list(self._workers)
+        try:
+            self._load_snapshot()
+        except Exception as exc:
+            # The next poll retries; the current workers keep serving the previous snapshot.
+            log_event(
+                self.logger,
+                CATALOG_REFRESH_FAILED,
+                level=logging.ERROR,
+                version=read_catalog_version(self.marker_path),
+                error_type=type(exc).__name__,
+            )
+            return False
+        self._spawn_missing(replace_all=True)
+        for pid in old_workers:
+            self._drain(pid)
+        log_event(
+            self.logger,
+            SERVER_RELOAD,
+            previous_version=previous_version,
+            version=self.snapshot.version,
+            drained_worker_count=len(old_workers),
+        )
+        return True
+
+    def stop(self) -> None:
+        for pid in list(self._workers):
+            self._drain(pid)
+        deadline = time.monotonic() + self.shutdown_seconds
+        while self._draining and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+        self._kill_overdue(force=True)
+        self._reap(block=True)
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def _load_snapshot(self) -> None:
+        # Build the new snapshot before touching the old one, so a failed load changes nothing.
+        snapshot = self.snapshot_loader()
+        # The old snapshot must leave the permanent generation to be collectable.
+        gc.unfreeze()
+        self.snapshot = snapshot
+        del snapshot
+        gc.collect()
+        gc.freeze()
+
+    def _spawn_missing(self, replace_all: bool = False) -> None:
+        if replace_all:
+            self._workers.clear()
+        while len(self._workers) < self.workers:
+            pid = os.fork()
+            if pid == 0:
+                self._run_worker()
+            self._workers[pid] = self.snapshot.version
+            log_event(self.logger, SERVER_WORKER_STARTED, pid=pid, version=self.snapshot.version)
+
+    def _run_worker(self) -> None:
+        exit_code = 0
+        try:
+            for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+                signal.signal(signum, signal.SIG_DFL)
+            self.worker_target(self.snapshot, self._socket)
+        except BaseException:
+            self.logger.exception("worker crashed")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _drain(self, pid: int) -> None:
+        self._workers.pop(pid, None)
+        self._draining[pid] = time.monotonic() + self.shutdown_seconds
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _kill_overdue(self, force: bool = False) -> None:
+        now = time.monotonic()
+        for pid, deadline in list(self._draining.items()):
+            if force or now >= deadline:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+    def _reap(self, block: bool = False) -> None:
+        while self._workers or self._draining:
+            try:
+                pid, status = os.waitpid(-1, 0 if block else os.WNOHANG)
+            except ChildProcessError:
+                self._workers.clear()
+                self._draining.clear()
+                return
+            if pid == 0:
+                return
+            expected = self._draining.pop(pid, None) is not None
+            self._workers.pop(pid, None)
+            log_event(
+                self.logger,
+                SERVER_WORKER_EXITED,
+                level=logging.INFO if expected else logging.WARNING,
+                pid=pid,
+                exit_code=os.waitstatus_to_exitcode(status),
+                expected=expected,
+            )
+
+    def _request_stop(self, signum: int, frame: object) -> None:
+        self._stopping = True
+
+    def _request_reload(self, signum: int, frame: object) -> None:
+        self._reload_requested = True
+
+
+def _serve_with_uvicorn(
+    snapshot: CatalogSnapshot, listen_socket: socket.socket, db_path: str = CATALOG_DB_PATH
+) -> None:
+    import uvicorn
+
+    from app.main import create_app
+
+    # Each worker opens its own feedback/affinity connections to `db_path` after the fork.
+    config = uvicorn.Config(create_app(snapshot=snapshot, db_path=db_path), lifespan="on", log_config=None)
+    uvicorn.Server(config).run(sockets=[listen_socket])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the API from pre-forked workers sharing one catalog.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    parser.add_argument("--db", default=CATALOG_DB_PATH, help="SQLite catalog database path")
+    parser.add_argument("--marker", default=CATALOG_VERSION_MARKER, help="catalog version marker to watch")
+    args = parser.parse_args(argv)
+
+    PreforkServer(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        db_path=args.db,
+        marker_path=args.marker,
+    ).serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
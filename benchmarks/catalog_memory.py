@@ -0,0 +1,81 @@
+"""Compare memory held by a list of `Perfume` objects and a `PerfumeCatalog`.
+
+Run from the repository root:
+
+    python benchmarks/catalog_memory.py [size ...]
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import gc
+from pathlib import Path
+import sys
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.domain.models.perfume import Perfume
+from app.domain.models.perfume_catalog import PerfumeCatalog
+
+_NOTES = ("Bergamot", "Lemon", "Rose", "Jasmine", "Iris", "Vanilla", "Musk", "Amber", "Oud", "Tonka")
+_FAMILIES = ("Floral", "Fresh", "Gourmand", "Woody", "Oriental", "Sweet", "Warm")
+_GENDERS = ("Unisex", "Female", "Male")
+_DEFAULT_SIZES = (10_000, 100_000)
+
+
+def build_perfumes(count: int) -> list[Perfume]:
+    scraped_at = datetime(2026, 2, 19, tzinfo=timezone.utc)
+    perfumes: list[Perfume] = []
+
+    for index in range(count):
+        perfumes.append(
+            Perfume(
+                perfume_id=f"perfume-{index}",
+                name=f"Perfume {index}",
+                url=f"https://vicioso.example/products/perfume-{index}",
+                price_min=49.0 + index % 40,
+                price_max=89.0 + index % 40,
+                gender_tags=(_fresh(_GENDERS[index % 3]),),
+                scent_families=(_fresh(_FAMILIES[index % 7]), _fresh(_FAMILIES[(index + 3) % 7])),
+                notes_top=(_fresh(_NOTES[index % 10]),),
+                notes_middle=(_fresh(_NOTES[(index + 2) % 10]), _fresh(_NOTES[(index + 4) % 10])),
+                notes_base=(_fresh(_NOTES[(index + 5) % 10]), _fresh(_NOTES[(index + 7) % 10])),
+                description=f"Scraped description number {index} with a few words.",
+                image_urls=(f"https://img.example/perfume-{index}.jpg",),
+                last_scraped_at=scraped_at,
+            )
+        )
+
+    return perfumes
+
+
+def measure(count: int) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    perfumes = build_perfumes(count)
+    list_bytes = tracemalloc.get_traced_memory()[0]
+    catalog = PerfumeCatalog.from_perfumes(perfumes)
+    del perfumes
+    gc.collect()
+    catalog_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(catalog) == count
+    return list_bytes, catalog_bytes
+
+
+def _fresh(value: str) -> str:
+    # Parsed pages produce a new string object per perfume; mimic that here.
+    return "".join(list(value))
+
+
+def main(argv: list[str]) -> None:
+    sizes = tuple(int(value) for value in argv) or _DEFAULT_SIZES
+    print(f"{'perfumes':>10} {'list[Perfume]':>16} {'PerfumeCatalog':>16} {'ratio':>7}")
+    for size in sizes:
+        list_bytes, catalog_bytes = measure(size)
+        ratio = catalog_bytes / list_bytes
+        print(f"{size:>10} {list_bytes / 1e6:>13.1f} MB {catalog_bytes / 1e6:>13.1f} MB {ratio:>7.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,105 @@
+"""Per-worker memory of `PreforkServer` workers sharing one catalog snapshot.
+
+Forks workers from a synthetic catalog and reads `/proc/<pid>/smaps_rollup`
+for each: RSS, PSS and Private_Dirty (pages the worker copied). Each size is
+measured twice, once right after fork and once after every worker has served
+`--requests` recommendations, to show how far reads (refcount writes) copy
+the shared pages. Linux only. Run from the repository root:
+
+    python benchmarks/prefork_memory.py --size 20000 --workers 4 --requests 200
+
+On CPython 3.11, 20k perfumes, 2 workers, 100 requests each: Private_Dirty
+grows from ~1 MiB per worker right after fork to ~73 MiB once requests have
+scored the perfumes (parent RSS ~98 MiB). The liked notes below match almost
+every perfume, so nearly all `Perfume` objects get scored and copied; only
+the flat token-id and postings arrays stay shared.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+import random
+import socket
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.catalog_memory import build_perfumes
+
+from app.application.services.catalog_refresh_service import CatalogSnapshot, build_catalog_snapshot
+from app.domain.models.user_profile import UserProfile
+from app.server import PreforkServer, WorkerTarget
+
+_NOTES = ("Bergamot", "Lemon", "Rose", "Jasmine", "Iris", "Vanilla", "Musk", "Amber", "Oud", "Tonka")
+_FIELDS = ("Rss", "Pss", "Private_Dirty")
+
+
+def memory_kib(pid: int) -> dict[str, int]:
+    values: dict[str, int] = {}
+    with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as handle:
+        for line in handle:
+            name, _, rest = line.partition(":")
+            if name in _FIELDS:
+                values[name] = int(rest.split()[0])
+    return values
+
+
+def _warm_and_wait(ready_dir: Path, requests: int) -> WorkerTarget:
+    def worker(snapshot: CatalogSnapshot, listen_socket: socket.socket) -> None:
+        rng = random.Random(os.getpid())
+        service = snapshot.recommendation_service
+        for _ in range(requests):
+            profile = UserProfile(liked_notes=tuple(rng.sample(_NOTES, 2)))
+            service.recommend(profile, time_budget_ms=10_000.0)
+        (ready_dir / str(os.getpid())).touch()
+        while True:
+            time.sleep(1.0)
+
+    return worker
+
+
+def measure(size: int, workers: int, requests: int) -> None:
+    perfumes = build_perfumes(size)
+    with tempfile.TemporaryDirectory() as ready:
+        ready_dir = Path(ready)
+        server = PreforkServer(
+            port=0,
+            workers=workers,
+            marker_path=str(ready_dir / "unused.version"),
+            shutdown_seconds=2.0,
+            snapshot_loader=lambda: build_catalog_snapshot(perfumes),
+            worker_target=_warm_and_wait(ready_dir, requests),
+        )
+        server.start()
+        try:
+            while len(list(ready_dir.iterdir())) < workers:
+                time.sleep(0.05)
+            parent = memory_kib(os.getpid())
+            samples = [memory_kib(pid) for pid in server.worker_pids]
+        finally:
+            server.stop()
+
+    print(f"catalog={size} workers={workers} requests/worker={requests}")
+    print(f"  parent  rss={parent['Rss'] / 1024:8.1f} MiB")
+    for field in _FIELDS:
+        values = [sample[field] / 1024 for sample in samples]
+        print(f"  worker {field.lower():>13}: mean={sum(values) / len(values):8.1f} MiB  max={max(values):8.1f} MiB")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    for requests in (0, args.requests):
+        measure(args.size, args.workers, requests)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Closed-loop load test for a running API: RPS and p50/p95/p99 latency.
+
+Start the server, then run from the repository root:
+
+    uvicorn app.main:app --workers 4
+    python benchmarks/recommendation_load.py --url http://127.0.0.1:8000 --concurrency 32 --duration 30
+"""
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+import http.client
+import json
+import math
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+_NOTES = ("Bergamot", "Lemon", "Rose", "Jasmine", "Iris", "Vanilla", "Musk", "Amber", "Oud", "Tonka")
+_FAMILIES = ("Floral", "Fresh", "Gourmand", "Woody", "Oriental", "Sweet", "Warm")
+_OCCASIONS = (None, "office", "date", "evening", "everyday")
+
+
+def build_payload(rng: random.Random) -> bytes:
+    profile = {
+        "liked_notes": rng.sample(_NOTES, rng.randint(0, 3)),
+        "preferred_families": rng.sample(_FAMILIES, rng.randint(0, 2)),
+        "occasion": rng.choice(_OCCASIONS),
+        "top_n": 10,
+    }
+    return json.dumps(profile).encode("utf-8")
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+def _worker(
+    base_url: str,
+    path: str,
+    deadline: float,
+    seed: int,
+    latencies: list[float],
+    outcomes: Counter,
+    lock: threading.Lock,
+) -> None:
+    parts = urlsplit(base_url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=10)
+    rng = random.Random(seed)
+    local_latencies: list[float] = []
+    local_outcomes: Counter = Counter()
+
+    while time.perf_counter() < deadline:
+        body = build_payload(rng)
+        started_at = time.perf_counter()
+        try:
+            connection.request("POST", path, body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            local_outcomes["error"] += 1
+            connection.close()
+            continue
+        local_latencies.append(time.perf_counter() - started_at)
+        if response.status == 200:
+            local_outcomes[json.loads(data).get("mode", "ok")] += 1
+        else:
+            local_outcomes[f"http_{response.status}"] += 1
+
+    connection.close()
+    with lock:
+        latencies.extend(local_latencies)
+        outcomes.update(local_outcomes)
+
+
+def run(base_url: str, concurrency: int, duration: float, path: str = "/recommendations") -> None:
+    latencies: list[float] = []
+    outcomes: Counter = Counter()
+    lock = threading.Lock()
+    started_at = time.perf_counter()
+    deadline = started_at + duration
+    threads = [
+        threading.Thread(target=_worker, args=(base_url, path, deadline, seed, latencies, outcomes, lock))
+        for seed in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    print(f"requests {len(latencies)} in {elapsed:.1f}s with {concurrency} clients")
+    print(f"rps      {len(latencies) / elapsed:.1f}")
+    for label, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        print(f"{label}      {percentile(latencies, q) * 1000:.1f} ms")
+    print("outcomes " + ", ".join(f"{name}={count}" for name, count in sorted(outcomes.items())))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Load-test POST /recommendations.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args(argv)
+    run(args.url, args.concurrency, args.duration)
+
+
+if __name__ == "__main__":
+    main()
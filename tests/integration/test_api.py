@@ -0,0 +1,144 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import sqlite3
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient
+
+from app.application.services.catalog_refresh_service import publish_catalog_version
+from app.application.services.user_affinity_service import UserAffinityService
+from app.domain.models.feedback_event import FeedbackEvent
+from app.domain.models.perfume import Perfume
+from app.infrastructure.persistence.sqlite.perfume_repo_sqlite import PerfumeRepositorySqlite
+from app.infrastructure.persistence.sqlite.user_affinity_repo_sqlite import UserAffinityRepositorySqlite
+from app.main import create_app
+
+
+def _perfumes() -> tuple[Perfume, ...]:
+    return (
+        Perfume(
+            perfume_id="amber-night",
+            name="Amber Night",
+            url="https://example.com/products/amber-night",
+            scent_families=("Warm",),
+            notes_base=("Vanilla", "Amber"),
+        ),
+        Perfume(
+            perfume_id="citrus-day",
+            name="Citrus Day",
+            url="https://example.com/products/citrus-day",
+            scent_families=("Fresh",),
+            notes_top=("Lemon",),
+        ),
+    )
+
+
+def test_catalog_loads_from_sqlite_at_startup_and_lists_perfumes(tmp_path: Path) -> None:
+    db_path = tmp_path / "catalog.db"
+    connection = sqlite3.connect(db_path)
+    repository = PerfumeRepositorySqlite(connection)
+    repository.initialize_schema()
+    repository.upsert_perfumes(_perfumes())
+    connection.close()
+
+    with TestClient(create_app(db_path=str(db_path))) as client:
+        response = client.get("/perfumes", params={"limit": 1, "offset": 1})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 2
+    assert [item["perfume_id"] for item in body["items"]] == ["citrus-day"]
+
+
+def test_published_catalog_version_is_swapped_in_without_restart(tmp_path: Path) -> None:
+    db_path = tmp_path / "catalog.db"
+    marker = tmp_path / "catalog.version"
+    connection = sqlite3.connect(db_path)
+    repository = PerfumeRepositorySqlite(connection)
+    repository.initialize_schema()
+    repository.upsert_perfumes(_perfumes()[:1])
+    publish_catalog_version(marker, "v1")
+
+    app = create_app(db_path=str(db_path), marker_path=str(marker), reload_poll_seconds=0.01)
+    with TestClient(app) as client:
+        assert client.get("/perfumes").json()["total"] == 1
+        repository.upsert_perfumes(_perfumes()[1:])
+        publish_catalog_version(marker, "v2")
+        handle = app.state.resources.catalog_handle
+        deadline = time.monotonic() + 5.0
+        while handle.version != "v2":
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        body = client.get("/perfumes").json()
+
+    connection.close()
+    assert body["catalog_version"] == "v2"
+    assert body["total"] == 2
+
+
+def test_recommendations_returns_ranked_items_mode_and_request_id() -> None:
+    with TestClient(create_app(perfumes=_perfumes())) as client:
+        response = client.post(
+            "/recommendations",
+            json={"liked_notes": ["Vanilla"], "preferred_families": ["Warm"], "top_n": 1},
+            headers={"X-Request-ID": "req-1"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["X-Request-ID"] == "req-1"
+    body = response.json()
+    assert body["mode"] == "full"
+    assert body["request_id"] == "req-1"
+    assert body["items"][0]["perfume_id"] == "amber-night"
+    assert body["items"][0]["matched_notes"] == ["Vanilla"]
+
+
+def test_recommendations_rejects_conflicting_note_preferences() -> None:
+    with TestClient(create_app(perfumes=_perfumes())) as client:
+        response = client.post("/recommendations", json={"liked_notes": ["Rose"], "disliked_notes": ["rose"]})
+
+    assert response.status_code == 422
+
+
+def test_recommendations_merge_learned_affinity_for_user_id() -> None:
+    perfumes = {perfume.perfume_id: perfume for perfume in _perfumes()}
+    repository = UserAffinityRepositorySqlite(sqlite3.connect(":memory:", check_same_thread=False))
+    repository.initialize_schema()
+    affinity_service = UserAffinityService(repository, perfumes.get)
+    affinity_service.apply_events([FeedbackEvent("u1", "citrus-day", "purchase", datetime.now(tz=timezone.utc))])
+
+    with TestClient(create_app(perfumes=perfumes.values(), affinity_service=affinity_service)) as client:
+        anonymous = client.post("/recommendations", json={"top_n": 1})
+        known = client.post("/recommendations", json={"user_id": "u1", "top_n": 1})
+
+    assert anonymous.status_code == known.status_code == 200
+    assert known.json()["items"][0]["perfume_id"] == "citrus-day"
+
+
+def test_feedback_is_folded_into_affinities_for_a_database_backed_catalog(tmp_path: Path) -> None:
+    db_path = tmp_path / "catalog.db"
+    connection = sqlite3.connect(db_path)
+    repository = PerfumeRepositorySqlite(connection)
+    repository.initialize_schema()
+    repository.upsert_perfumes(_perfumes())
+    connection.close()
+
+    app = create_app(db_path=str(db_path))
+    with TestClient(app) as client:
+        accepted = client.post("/feedback", json={"user_id": "u1", "perfume_id": "citrus-day", "event_type": "purchase"})
+        app.state.resources.feedback_service.flush()
+        known = client.post("/recommendations", json={"user_id": "u1", "top_n": 1})
+        rejected = client.post("/feedback", json={"user_id": " ", "perfume_id": "citrus-day", "event_type": "like"})
+
+    assert accepted.status_code == 202
+    assert known.json()["items"][0]["perfume_id"] == "citrus-day"
+    assert rejected.status_code == 422
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import sqlite3
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.domain.models.feedback_event import FeedbackEvent
+from app.infrastructure.persistence.sqlite.feedback_repo_sqlite import FeedbackRepositorySqlite
+
+
+def _event(user_id: str, perfume_id: str, event_type: str, month: int, day: int = 1) -> FeedbackEvent:
+    return FeedbackEvent(
+        user_id=user_id,
+        perfume_id=perfume_id,
+        event_type=event_type,
+        occurred_at=datetime(2026, month, day, 9, 0, tzinfo=timezone.utc),
+        occasion="date",
+        moods=("cozy",),
+    )
+
+
+def test_flush_writes_monthly_partitions_and_incremental_aggregates(tmp_path: Path) -> None:
+    connection = sqlite3.connect(tmp_path / "feedback.db")
+    repository = FeedbackRepositorySqlite(connection, flush_every=3)
+    repository.initialize_schema()
+
+    repository.append(_event("u1", "amber-night", "like", month=1))
+    repository.append(_event("u1", "amber-night", "like", month=2))
+    assert repository.partitions() == ()
+    repository.append(_event("u2", "amber-night", "like", month=2, day=5))
+    assert repository.pending_count() == 0
+
+    repository.append(_event("u1", "amber-night", "like", month=3))
+    repository.append(_event("u1", "citrus-day", "dislike", month=3))
+    repository.flush()
+
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert repository.partitions() == (
+        "feedback_events_202601",
+        "feedback_events_202602",
+        "feedback_events_202603",
+    )
+    user_stats = {(stat.perfume_id, stat.event_type): stat for stat in repository.user_stats("u1")}
+    assert user_stats[("amber-night", "like")].event_count == 3
+    assert user_stats[("amber-night", "like")].last_event_at == datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+    assert user_stats[("citrus-day", "dislike")].event_count == 1
+    (perfume_like,) = repository.perfume_stats("amber-night")
+    assert (perfume_like.event_count, perfume_like.user_count) == (4, 2)
+
+
+def test_events_reads_only_requested_range_and_rebuild_matches_incremental(tmp_path: Path) -> None:
+    connection = sqlite3.connect(tmp_path / "feedback.db")
+    repository = FeedbackRepositorySqlite(connection)
+    repository.initialize_schema()
+    for month in (1, 2, 3):
+        repository.append(_event("u1", "amber-night", "click", month=month))
+        repository.append(_event("u2", "amber-night", "click", month=month))
+    repository.flush()
+    incremental = (repository.user_stats("u1"), repository.perfume_stats("amber-night"))
+
+    events = repository.events(
+        datetime(2026, 2, 1, tzinfo=timezone.utc),
+        datetime(2026, 3, 1, tzinfo=timezone.utc),
+    )
+    repository.rebuild_aggregates()
+
+    assert [(event.user_id, event.occurred_at.month) for event in events] == [("u1", 2), ("u2", 2)]
+    assert events[0].moods == ("cozy",)
+    assert (repository.user_stats("u1"), repository.perfume_stats("amber-night")) == incremental
@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import sqlite3
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.application.services.catalog_refresh_service import load_catalog_snapshot
+from app.application.services.item_prior_service import ItemPriorService
+from app.domain.models.feedback_event import FeedbackEvent
+from app.domain.models.perfume import Perfume
+from app.domain.models.user_profile import UserProfile
+from app.infrastructure.persistence.sqlite.feedback_repo_sqlite import FeedbackRepositorySqlite
+from app.infrastructure.persistence.sqlite.item_prior_repo_sqlite import ItemPriorRepositorySqlite
+from app.infrastructure.persistence.sqlite.perfume_repo_sqlite import PerfumeRepositorySqlite
+
+
+def _event(user_id: str, perfume_id: str, event_type: str, month: int = 3) -> FeedbackEvent:
+    return FeedbackEvent(user_id, perfume_id, event_type, datetime(2026, month, 1, 9, 0, tzinfo=timezone.utc))
+
+
+def _service(connection: sqlite3.Connection) -> tuple[FeedbackRepositorySqlite, ItemPriorService]:
+    feedback = FeedbackRepositorySqlite(connection)
+    feedback.initialize_schema()
+    priors = ItemPriorRepositorySqlite(connection)
+    return feedback, ItemPriorService(feedback, priors, top_k=1)
+
+
+def _record(feedback: FeedbackRepositorySqlite, *events: FeedbackEvent) -> None:
+    for event in events:
+        feedback.append(event)
+    feedback.flush()
+
+
+def test_update_folds_only_new_events_into_popularity_and_neighbors(tmp_path: Path) -> None:
+    feedback, service = _service(sqlite3.connect(tmp_path / "catalog.db"))
+    _record(
+        feedback,
+        _event("u1", "amber-night", "like"),
+        _event("u1", "vanilla-cloud", "purchase"),
+        _event("u2", "amber-night", "like"),
+        _event("u2", "citrus-day", "click"),
+    )
+
+    first = service.update()
+    assert (first.event_count, first.perfume_count) == (4, 3)
+    assert service.update().event_count == 0
+
+    # A late event lands in an older partition; the rowid watermark still picks it up once.
+    _record(feedback, _event("u2", "vanilla-cloud", "like", month=1), _event("u3", "rose-veil", "like"))
+    assert service.update().event_count == 2
+    assert service.update().event_count == 0
+
+    priors = service.load()
+    assert priors.popularity_of("vanilla-cloud") == 1.0
+    assert priors.popularity_of("citrus-day") < priors.popularity_of("amber-night") < 1.0
+    assert dict(priors.neighbors["amber-night"]) == {"vanilla-cloud": 1.0}
+    assert priors.co_occurrence("rose-veil", "amber-night") == 0.0
+
+
+def test_catalog_snapshot_scores_cold_start_with_stored_priors(tmp_path: Path) -> None:
+    db_path = tmp_path / "catalog.db"
+    connection = sqlite3.connect(db_path)
+    perfumes = PerfumeRepositorySqlite(connection)
+    perfumes.initialize_schema()
+    perfumes.upsert_perfumes(
+        tuple(
+            Perfume(perfume_id=perfume_id, name=perfume_id, url=f"https://example.com/products/{perfume_id}")
+            for perfume_id in ("amber-night", "citrus-day")
+        )
+    )
+    feedback, service = _service(connection)
+    _record(feedback, _event("u1", "citrus-day", "purchase"))
+    service.update()
+    connection.close()
+
+    result = load_catalog_snapshot(str(db_path)).recommendation_service.recommend(UserProfile(), top_n=2)
+
+    assert [item.perfume_id for item in result.items] == ["citrus-day", "amber-night"]
+    assert result.items[0].trace.component("item_prior").value == 1.0
@@ -16,7 +16,7 @@ class _FakeHttpClient:
         self.pages = pages
         self.failing_urls = failing_urls or set()
 
-    def fetch(self, url: str) -> ScrapeHttpResponse:
+    def fetch(self, url: str, retry: bool = True) -> ScrapeHttpResponse:
         if url in self.failing_urls:
             raise RuntimeError("fetch failed")
         return ScrapeHttpResponse(url=url, status_code=200, text=self.pages[url], headers={})
@@ -69,3 +69,59 @@ def test_scrape_pipeline_integration_persists_perfumes_and_logs_success_rate(cap
     assert len(stored) == 1
     assert stored[0].perfume_id == "amber-night"
     assert stored[0].scent_families == ("Floral",)
+
+
+def test_scrape_pipeline_refresh_fetches_only_new_and_changed_products() -> None:
+    connection = sqlite3.connect(":memory:")
+    repo = PerfumeRepositorySqlite(connection)
+    repo.initialize_schema()
+
+    first_pages = {
+        "https://vicioso.example/collections/all": """
+            <article><a href=\"/products/amber-night\">Amber Night</a><span>€59,90</span></article>
+            <article><a href=\"/products/fresh-dawn\">Fresh Dawn</a><span>49 EUR</span></article>
+            <article><a href=\"/products/old-wood\">Old Wood</a><span>39 EUR</span></article>
+        """,
+        "https://vicioso.example/products/amber-night": "<div>Top Notes: Bergamot</div>",
+        "https://vicioso.example/products/fresh-dawn": "<div>Top Notes: Lemon</div>",
+        "https://vicioso.example/products/old-wood": "<div>Base Notes: Cedar</div>",
+    }
+    ScrapePipeline(
+        http_client=_FakeHttpClient(first_pages),
+        access_guard=_AllowAllGuard(),
+        perfume_repository=repo,
+        base_url="https://vicioso.example",
+    ).run(seed_listing_urls=("/collections/all",))
+
+    second_pages = dict(first_pages)
+    second_pages["https://vicioso.example/collections/all"] = """
+        <article><a href=\"/products/amber-night\">Amber Night</a><span>€54,90</span></article>
+        <article><a href=\"/products/fresh-dawn\">Fresh Dawn</a><span>49 EUR</span></article>
+        <article><a href=\"/products/night-rose\">Night Rose</a><span>69 EUR</span></article>
+    """
+    second_pages["https://vicioso.example/products/night-rose"] = "<div>Heart Notes: Rose</div>"
+    fetched: list[str] = []
+
+    class _RecordingHttpClient(_FakeHttpClient):
+        def fetch(self, url: str, retry: bool = True) -> ScrapeHttpResponse:
+            fetched.append(url)
+            return super().fetch(url)
+
+    result = ScrapePipeline(
+        http_client=_RecordingHttpClient(second_pages),
+        access_guard=_AllowAllGuard(),
+        perfume_repository=repo,
+        base_url="https://vicioso.example",
+    ).refresh(seed_listing_urls=("/collections/all",))
+
+    assert fetched == [
+        "https://vicioso.example/collections/all",
+        "https://vicioso.example/products/night-rose",
+        "https://vicioso.example/products/amber-night",
+    ]
+    assert result.scraped_count == 2
+    assert result.skipped_fresh_count == 1
+    assert result.vanished_perfume_ids == ("old-wood",)
+    states = {state.perfume_id: state for state in repo.list_scrape_states()}
+    assert states["old-wood"].vanished_at is not None
+    assert states["amber-night"].price_min == 54.9
@@ -0,0 +1,179 @@
+import asyncio
+from pathlib import Path
+import sys
+from urllib import error
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.infrastructure.scraping.async_client import AsyncScrapeHttpClient
+from app.infrastructure.scraping.robots import AsyncTokenBucketRateLimiter, TokenBucketRateLimiter
+
+
+class _StandInServer:
+    """Local HTTP/1.1 server that keeps connections open and replays canned responses."""
+
+    def __init__(self, responses: dict[str, list[bytes]]) -> None:
+        self.responses = responses
+        self.connection_count = 0
+        self.request_paths: list[str] = []
+        self._server: asyncio.AbstractServer | None = None
+
+    async def __aenter__(self) -> "_StandInServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:  # noqa: ANN001
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connection_count += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                while (await reader.readline()) not in {b"\r\n", b""}:
+                    pass
+                path = request_line.decode("latin-1").split(" ")[1]
+                self.request_paths.append(path)
+                queued = self.responses[path]
+                writer.write(queued.pop(0) if len(queued) > 1 else queued[0])
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+def _ok(body: str, extra: str = "") -> bytes:
+    payload = body.encode("utf-8")
+    return (
+        f"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Length: {len(payload)}\r\n{extra}\r\n"
+    ).encode("latin-1") + payload
+
+
+def _status(code: int, reason: str, extra: str = "") -> bytes:
+    return f"HTTP/1.1 {code} {reason}\r\nContent-Length: 0\r\n{extra}\r\n".encode("latin-1")
+
+
+def test_async_client_reuses_keep_alive_connection() -> None:
+    async def scenario() -> tuple[list[str], int, int]:
+        responses = {"/a": [_ok("<html>a</html>")], "/b": [_ok("<html>b</html>")]}
+        async with _StandInServer(responses) as server:
+            async with AsyncScrapeHttpClient(user_agent="UnitTestBot/1.0") as client:
+                texts = [
+                    (await client.fetch(f"{server.base_url}{path}")).text
+                    for path in ("/a", "/b", "/a")
+                ]
+                return texts, server.connection_count, client.opened_connection_count
+
+    texts, server_connections, client_connections = asyncio.run(scenario())
+
+    assert texts == ["<html>a</html>", "<html>b</html>", "<html>a</html>"]
+    assert server_connections == 1
+    assert client_connections == 1
+
+
+def test_async_client_caps_connections_per_host_under_concurrency() -> None:
+    async def scenario() -> int:
+        async with _StandInServer({"/p": [_ok("ok")]}) as server:
+            client = AsyncScrapeHttpClient(max_connections_per_host=2)
+            await asyncio.gather(*(client.fetch(f"{server.base_url}/p") for _ in range(10)))
+            await client.close()
+            return server.connection_count
+
+    assert asyncio.run(scenario()) <= 2
+
+
+def test_async_client_decodes_chunked_body() -> None:
+    chunked = (
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+        b"6\r\n<html>\r\n7\r\n</html>\r\n0\r\n\r\n"
+    )
+
+    async def scenario() -> str:
+        async with _StandInServer({"/c": [chunked]}) as server:
+            async with AsyncScrapeHttpClient() as client:
+                return (await client.fetch(f"{server.base_url}/c")).text
+
+    assert asyncio.run(scenario()) == "<html></html>"
+
+
+def test_async_client_retries_transient_status_with_backoff() -> None:
+    slept: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        slept.append(seconds)
+
+    async def scenario() -> str:
+        responses = {"/r": [_status(503, "Service Unavailable"), _status(429, "Too Many"), _ok("done")]}
+        async with _StandInServer(responses) as server:
+            async with AsyncScrapeHttpClient(backoff_seconds=0.5, sleep_func=fake_sleep) as client:
+                return (await client.fetch(f"{server.base_url}/r")).text
+
+    assert asyncio.run(scenario()) == "done"
+    assert slept == [0.5, 1.0]
+
+
+def test_async_client_waits_for_a_rate_limit_slot_before_each_retry() -> None:
+    limiter_slept: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        limiter_slept.append(seconds)
+
+    async def no_backoff(seconds: float) -> None:
+        return None
+
+    clock = {"now": 0.0}
+    limiter = AsyncTokenBucketRateLimiter(
+        TokenBucketRateLimiter(rate_per_second=10.0, time_func=lambda: clock["now"]),
+        sleep_func=fake_sleep,
+    )
+
+    async def scenario() -> str:
+        responses = {"/r": [_status(503, "Service Unavailable", "Retry-After: 4\r\n"), _ok("done")]}
+        async with _StandInServer(responses) as server:
+            async with AsyncScrapeHttpClient(sleep_func=no_backoff, rate_limiter=limiter) as client:
+                return (await client.fetch(f"{server.base_url}/r")).text
+
+    assert asyncio.run(scenario()) == "done"
+    assert limiter_slept == [4.0]
+
+
+def test_async_client_raises_http_error_without_retry_for_404() -> None:
+    slept: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        slept.append(seconds)
+
+    async def scenario() -> None:
+        async with _StandInServer({"/missing": [_status(404, "Not Found")]}) as server:
+            async with AsyncScrapeHttpClient(sleep_func=fake_sleep) as client:
+                await client.fetch(f"{server.base_url}/missing")
+
+    with pytest.raises(error.HTTPError) as exc_info:
+        asyncio.run(scenario())
+
+    assert exc_info.value.code == 404
+    assert slept == []
+
+
+def test_async_client_follows_redirects() -> None:
+    redirect = b"HTTP/1.1 302 Found\r\nLocation: /final\r\nContent-Length: 0\r\n\r\n"
+
+    async def scenario() -> tuple[str, str]:
+        async with _StandInServer({"/start": [redirect], "/final": [_ok("final")]}) as server:
+            async with AsyncScrapeHttpClient() as client:
+                response = await client.fetch(f"{server.base_url}/start")
+                return response.url, response.text
+
+    url, text = asyncio.run(scenario())
+
+    assert url.endswith("/final")
+    assert text == "final"
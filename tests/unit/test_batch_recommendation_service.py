@@ -0,0 +1,151 @@
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.application.services import batch_recommendation_service
+from app.application.services.batch_recommendation_service import (
+    BatchRecommender,
+    main,
+    recommend_batch,
+)
+from app.application.services.recommendation_service import RecommendationService
+from app.domain.models.perfume import Perfume
+from app.domain.models.user_profile import UserProfile, UserProfileConstraints
+from app.infrastructure.persistence.sqlite.perfume_repo_sqlite import PerfumeRepositorySqlite
+from app.infrastructure.recommendation.features.context_rules import ContextRulesResult
+from app.infrastructure.recommendation.scoring.hybrid_scorer import HybridScorer
+from app.infrastructure.recommendation.scoring.score_weights import ScoreWeights
+
+
+def _catalog() -> list[Perfume]:
+    specs = [
+        ("amber-night", ("Warm", "Amber"), ("Vanilla", "Amber", "Musk")),
+        ("citrus-day", ("Fresh", "Citrus"), ("Lemon", "Bergamot")),
+        ("rose-veil", ("Floral",), ("Rose", "Musk")),
+        ("cedar-walk", ("Woody", "Green"), ("Cedar", "Vetiver", "Bergamot")),
+        ("vanilla-cloud", ("Gourmand", "Sweet"), ("Vanilla", "Tonka")),
+    ]
+    return [
+        Perfume(
+            perfume_id=perfume_id,
+            name=perfume_id.replace("-", " ").title(),
+            url=f"https://example.com/products/{perfume_id}",
+            scent_families=families,
+            notes_base=notes,
+        )
+        for perfume_id, families, notes in specs
+    ]
+
+
+def _profiles() -> list[UserProfile]:
+    return [
+        UserProfile(liked_notes=("Vanilla", "Musk"), preferred_families=("Warm",), occasion="date"),
+        UserProfile(owned_perfume_ids=("amber-night",), liked_notes=("Vanilla",), occasion="date"),
+        UserProfile(liked_notes=("Bergamot", "Oud"), moods=("energetic",), strength_preference="subtle"),
+        UserProfile(constraints=UserProfileConstraints(exclude_notes=("Vanilla",))),
+        UserProfile(),
+    ]
+
+
+def test_batch_matches_single_profile_hybrid_scoring() -> None:
+    perfumes = _catalog()
+    scorer = HybridScorer()
+
+    results = recommend_batch(perfumes, _profiles(), top_n=3)
+
+    for result, profile in zip(results, _profiles()):
+        owned = tuple(perfume for perfume in perfumes if perfume.perfume_id in profile.owned_perfume_ids)
+        excluded = {note.casefold() for note in profile.constraints.exclude_notes}
+        traces = sorted(
+            (
+                scorer.score(perfume, profile, owned)
+                for perfume in perfumes
+                if not perfume.note_keys & excluded
+            ),
+            key=lambda trace: (-trace.total, trace.perfume_id),
+        )[:3]
+        assert [item.perfume_id for item in result.items] == [trace.perfume_id for trace in traces]
+        assert [item.score for item in result.items] == [trace.total for trace in traces]
+
+
+def test_batch_ranks_learned_affinities_like_the_recommendation_service() -> None:
+    perfumes = _catalog()
+    profile = UserProfile(
+        liked_notes=("Vanilla", "Musk", "Bergamot"),
+        learned_notes=(("tonka", 1.0), ("lemon", -0.5)),
+        learned_families=(("floral", 0.4),),
+    )
+    service = RecommendationService(perfumes, scorer=HybridScorer(ScoreWeights(diversity=0.0)))
+
+    (result,) = recommend_batch(perfumes, [profile], top_n=5)
+    expected = service.recommend(profile, top_n=5).items
+
+    scores = [item.score for item in result.items]
+    assert scores == sorted(scores, reverse=True)
+    assert [(item.perfume_id, item.score) for item in result.items] == [
+        (item.perfume_id, item.score) for item in expected
+    ]
+    assert any(component.name == "affinity" for component in result.items[0].trace.components)
+
+
+def test_batch_keeps_profile_order_and_penalizes_owned() -> None:
+    results = recommend_batch(_catalog(), _profiles(), top_n=5)
+
+    assert [result.profile_index for result in results] == [0, 1, 2, 3, 4]
+    owned_item = next(item for item in results[1].items if item.perfume_id == "amber-night")
+    assert owned_item.score < 0
+    assert owned_item.trace.owned_penalty == 1.0
+    assert all(item.perfume_id not in {"amber-night", "vanilla-cloud"} for item in results[3].items)
+
+
+def test_batch_computes_context_scores_once_per_distinct_context(monkeypatch: pytest.MonkeyPatch) -> None:
+    scored_contexts: list[tuple] = []
+    score_context_rules = batch_recommendation_service.score_context_rules
+
+    def counting_score_context_rules(perfume: Perfume, profile: UserProfile) -> ContextRulesResult:
+        scored_contexts.append((profile.occasion, profile.moods, profile.strength_preference))
+        return score_context_rules(perfume, profile)
+
+    monkeypatch.setattr(batch_recommendation_service, "score_context_rules", counting_score_context_rules)
+    catalog = _catalog()
+
+    BatchRecommender(catalog).recommend(_profiles())
+
+    assert len(scored_contexts) == 3 * len(catalog)
+    assert len(set(scored_contexts)) == 3
+
+
+def test_main_writes_jsonl_recommendations(tmp_path: Path) -> None:
+    db_path = tmp_path / "catalog.db"
+    connection = sqlite3.connect(db_path)
+    repository = PerfumeRepositorySqlite(connection)
+    repository.initialize_schema()
+    repository.upsert_perfumes(tuple(_catalog()))
+    connection.close()
+
+    profiles_path = tmp_path / "profiles.jsonl"
+    profiles_path.write_text(
+        json.dumps({"user_id": "u1", "profile": {"liked_notes": ["Lemon"], "preferred_families": ["Citrus"]}})
+        + "\n"
+        + json.dumps({"user_id": "u2", "profile": {"constraints": {"exclude_families": ["Fresh"]}}})
+        + "\n",
+        encoding="utf-8",
+    )
+    output_path = tmp_path / "out" / "recommendations.jsonl"
+
+    exit_code = main(
+        ["--db", str(db_path), "--profiles", str(profiles_path), "--output", str(output_path), "--top-n", "2"]
+    )
+
+    assert exit_code == 0
+    records = [json.loads(line) for line in output_path.read_text(encoding="utf-8").splitlines()]
+    assert [record["user_id"] for record in records] == ["u1", "u2"]
+    assert records[0]["recommendations"][0]["perfume_id"] == "citrus-day"
+    assert records[0]["recommendations"][0]["matched_notes"] == ["Lemon"]
+    assert len(records[1]["recommendations"]) == 2
+    assert all(item["perfume_id"] != "citrus-day" for item in records[1]["recommendations"])
@@ -0,0 +1,162 @@
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.application.services.catalog_refresh_service import (
+    CatalogHandle,
+    CatalogSnapshot,
+    VersionedCache,
+    build_catalog_snapshot,
+    load_catalog_snapshot,
+    publish_catalog_version,
+    read_catalog_version,
+)
+from app.domain.models.perfume import Perfume
+from app.infrastructure.persistence.sqlite.perfume_repo_sqlite import PerfumeRepositorySqlite
+
+
+def test_publish_and_read_catalog_version(tmp_path: Path) -> None:
+    marker = tmp_path / "sqlite" / "catalog.version"
+
+    assert read_catalog_version(marker) is None
+    assert publish_catalog_version(marker, "v1") == "v1"
+    assert read_catalog_version(marker) == "v1"
+    assert publish_catalog_version(marker) != "v1"
+    assert list(marker.parent.iterdir()) == [marker]
+
+
+def test_load_catalog_snapshot_indexes_sqlite_catalog_with_marker_version(tmp_path: Path) -> None:
+    db_path = tmp_path / "catalog.db"
+    connection = sqlite3.connect(db_path)
+    repository = PerfumeRepositorySqlite(connection)
+    repository.initialize_schema()
+    repository.upsert_perfumes(
+        tuple(
+            Perfume(perfume_id=perfume_id, name=perfume_id, url=f"https://example.com/products/{perfume_id}")
+            for perfume_id in ("amber-night", "retired-rose")
+        )
+    )
+    repository.mark_vanished(("retired-rose",), datetime(2026, 3, 1, tzinfo=timezone.utc))
+    connection.close()
+    marker = tmp_path / "catalog.version"
+    publish_catalog_version(marker, "v7")
+
+    snapshot = load_catalog_snapshot(str(db_path), str(marker))
+
+    assert snapshot.version == "v7"
+    assert snapshot.catalog.perfume_ids == ("amber-night",)
+    assert snapshot.recommendation_service.perfumes[0].perfume_id == "amber-night"
+
+
+def _snapshot(version: str, count: int = 1) -> CatalogSnapshot:
+    perfumes = [
+        Perfume(perfume_id=f"p-{index}", name=f"P {index}", url=f"https://example.com/products/p-{index}")
+        for index in range(count)
+    ]
+    return build_catalog_snapshot(perfumes, version)
+
+
+def test_catalog_handle_swap_leaves_pinned_readers_on_old_version() -> None:
+    handle = CatalogHandle(_snapshot("v1"), loader=lambda: _snapshot("v2", count=2))
+    pinned = handle.current()
+
+    handle.refresh()
+
+    assert handle.version == "v2"
+    assert len(handle.current().catalog) == 2
+    assert pinned.version == "v1"
+    assert len(pinned.catalog) == 1
+
+
+def test_catalog_handle_refreshes_only_when_marker_changes(tmp_path: Path) -> None:
+    marker = tmp_path / "catalog.version"
+    loads: list[str] = []
+
+    def loader() -> CatalogSnapshot:
+        loads.append(read_catalog_version(marker))
+        return _snapshot(read_catalog_version(marker))
+
+    handle = CatalogHandle(_snapshot("v1"), loader=loader)
+    assert handle.refresh_if_published(marker) is False
+
+    publish_catalog_version(marker, "v1")
+    assert handle.refresh_if_published(marker) is False
+
+    publish_catalog_version(marker, "v2")
+    assert handle.refresh_if_published(marker) is True
+    assert handle.version == "v2"
+    assert loads == ["v2"]
+
+
+def test_catalog_handle_keeps_serving_when_refresh_fails(tmp_path: Path) -> None:
+    marker = tmp_path / "catalog.version"
+    publish_catalog_version(marker, "v2")
+
+    def broken_loader() -> CatalogSnapshot:
+        raise sqlite3.OperationalError("database is locked")
+
+    handle = CatalogHandle(_snapshot("v1"), loader=broken_loader)
+
+    assert handle.refresh_if_published(marker) is False
+    assert handle.version == "v1"
+
+
+def test_catalog_handle_refresh_requires_loader() -> None:
+    with pytest.raises(ValueError, match="loader"):
+        CatalogHandle(_snapshot("v1")).refresh()
+
+
+def test_catalog_handle_watcher_swaps_in_published_version(tmp_path: Path) -> None:
+    marker = tmp_path / "catalog.version"
+    handle = CatalogHandle(_snapshot("v1"), loader=lambda: _snapshot(read_catalog_version(marker), count=3))
+    handle.start_watching(marker, poll_seconds=0.01)
+    try:
+        publish_catalog_version(marker, "v2")
+        deadline = time.monotonic() + 5.0
+        while handle.version != "v2":
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        handle.stop_watching()
+
+    assert len(handle.current().catalog) == 3
+
+
+def test_versioned_cache_drops_entries_when_live_version_changes() -> None:
+    live = {"version": "v1"}
+    cache = VersionedCache(lambda: live["version"], max_size=2)
+    cache.put("v1", "page-0", "old")
+    assert cache.get("v1", "page-0") == "old"
+
+    live["version"] = "v2"
+
+    assert cache.get("v2", "page-0") is None
+    assert len(cache) == 0
+
+
+def test_versioned_cache_bypasses_requests_pinned_to_stale_version() -> None:
+    live = {"version": "v2"}
+    cache = VersionedCache(lambda: live["version"], max_size=2)
+    cache.put("v2", "page-0", "fresh")
+
+    cache.put("v1", "page-0", "stale")
+
+    assert cache.get("v1", "page-0") is None
+    assert cache.get("v2", "page-0") == "fresh"
+
+
+def test_versioned_cache_evicts_least_recently_used() -> None:
+    cache = VersionedCache(lambda: "v1", max_size=2)
+    cache.put("v1", "a", 1)
+    cache.put("v1", "b", 2)
+    cache.get("v1", "a")
+    cache.put("v1", "c", 3)
+
+    assert cache.get("v1", "b") is None
+    assert cache.get("v1", "a") == 1
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import sqlite3
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.infrastructure.persistence.sqlite.crawl_frontier_sqlite import CrawlFrontierSqlite
+
+
+def _frontier(connection: sqlite3.Connection, checkpoint_every: int = 50) -> CrawlFrontierSqlite:
+    frontier = CrawlFrontierSqlite(connection, checkpoint_every=checkpoint_every)
+    frontier.initialize_schema()
+    return frontier
+
+
+def test_crawl_frontier_buffers_changes_until_checkpoint() -> None:
+    connection = sqlite3.connect(":memory:")
+    frontier = _frontier(connection)
+    frontier.reset(["https://vicioso.example/collections/all"])
+
+    frontier.add("https://vicioso.example/products/a", "product", {"name": "A", "price_min": 10.0})
+    frontier.mark_done("https://vicioso.example/collections/all")
+
+    assert [entry.status for entry in frontier.entries()] == ["pending"]
+
+    frontier.checkpoint()
+    listing, product = frontier.entries()
+
+    assert (listing.stage, listing.status) == ("listing", "done")
+    assert (product.stage, product.status, product.payload) == (
+        "product",
+        "pending",
+        {"name": "A", "price_min": 10.0},
+    )
+
+
+def test_crawl_frontier_checkpoints_automatically_and_tracks_attempts() -> None:
+    connection = sqlite3.connect(":memory:")
+    frontier = _frontier(connection, checkpoint_every=2)
+    frontier.reset([])
+    retry_at = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+    frontier.add("https://vicioso.example/products/a", "product")
+    frontier.mark_retry("https://vicioso.example/products/a", retry_at)
+    frontier.mark_failed("https://vicioso.example/products/a")
+
+    reopened = CrawlFrontierSqlite(connection)
+    (entry,) = reopened.entries(stage="product")
+
+    assert entry.attempts == 1
+    assert entry.next_attempt_at == retry_at
+    assert entry.status == "pending"
+
+    frontier.checkpoint()
+    (entry,) = reopened.entries(stage="product")
+
+    assert (entry.status, entry.attempts, entry.next_attempt_at) == ("failed", 2, None)
@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.domain.models.perfume import Perfume
+from app.domain.models.perfume_catalog import PerfumeCatalog
+from app.infrastructure.recommendation.scoring.diversity_reranker import DiversityReranker
+
+
+def _perfume(perfume_id: str, families: tuple[str, ...], notes: tuple[str, ...]) -> Perfume:
+    return Perfume(
+        perfume_id=perfume_id,
+        name=perfume_id.replace("-", " ").title(),
+        url=f"https://example.com/products/{perfume_id}",
+        scent_families=families,
+        notes_base=notes,
+    )
+
+
+_CATALOG = PerfumeCatalog(
+    (
+        _perfume("vanilla-a", ("Gourmand",), ("Vanilla", "Tonka")),
+        _perfume("vanilla-b", ("Gourmand",), ("Vanilla", "Tonka")),
+        _perfume("vanilla-c", ("Gourmand",), ("Vanilla", "Tonka", "Caramel")),
+        _perfume("cedar-walk", ("Woody",), ("Cedar", "Vetiver")),
+    )
+)
+_RANKED = [("vanilla-a", 0.9), ("vanilla-b", 0.89), ("vanilla-c", 0.88), ("cedar-walk", 0.6)]
+
+
+def test_similarity_matches_owned_similarity_blend() -> None:
+    reranker = DiversityReranker(_CATALOG, diversity=0.3)
+
+    assert reranker.similarity("vanilla-a", "Vanilla-B") == 1.0
+    assert reranker.similarity("vanilla-a", "vanilla-c") == pytest.approx(0.7 * 2 / 3 + 0.3)
+    assert reranker.similarity("vanilla-a", "cedar-walk") == 0.0
+    assert reranker.similarity("vanilla-a", "unknown") == 0.0
+
+
+def test_rerank_promotes_dissimilar_item_over_near_duplicates() -> None:
+    reranker = DiversityReranker(_CATALOG, diversity=0.3)
+
+    picked = reranker.rerank([(perfume_id, perfume_id, score) for perfume_id, score in _RANKED], top_n=3)
+
+    assert picked == ("vanilla-a", "cedar-walk", "vanilla-c")
+
+
+def test_zero_diversity_keeps_relevance_order() -> None:
+    reranker = DiversityReranker(_CATALOG, diversity=0.0)
+
+    picked = reranker.rerank([(perfume_id, perfume_id, score) for perfume_id, score in _RANKED], top_n=2)
+
+    assert picked == ("vanilla-a", "vanilla-b")
+    with pytest.raises(ValueError):
+        DiversityReranker(_CATALOG, diversity=1.5)
+
+
+def test_rerank_diversity_can_be_set_per_call() -> None:
+    reranker = DiversityReranker(_CATALOG)
+    ranked = [(perfume_id, perfume_id, score) for perfume_id, score in _RANKED]
+
+    assert reranker.rerank(ranked, top_n=2) == ("vanilla-a", "vanilla-b")
+    assert reranker.rerank(ranked, top_n=2, diversity=0.3) == ("vanilla-a", "cedar-walk")
+    with pytest.raises(ValueError):
+        reranker.rerank(ranked, top_n=2, diversity=-0.1)
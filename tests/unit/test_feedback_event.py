@@ -0,0 +1,48 @@
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.domain.models.feedback_event import FeedbackEvent
+
+
+def test_feedback_event_normalizes_fields_and_time_to_utc() -> None:
+    event = FeedbackEvent(
+        user_id=" u1 ",
+        perfume_id="amber-night ",
+        event_type="like",
+        occurred_at=datetime(2026, 3, 1, 12, 0, tzinfo=timezone(timedelta(hours=2))),
+        occasion="  ",
+        moods=("cozy", " "),
+    )
+
+    assert event.user_id == "u1"
+    assert event.perfume_id == "amber-night"
+    assert event.occurred_at == datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc)
+    assert event.occasion is None
+    assert event.moods == ("cozy",)
+
+
+def test_feedback_event_treats_naive_time_as_utc() -> None:
+    event = FeedbackEvent(user_id="u1", perfume_id="p", event_type="click", occurred_at=datetime(2026, 3, 1))
+
+    assert event.occurred_at.tzinfo == timezone.utc
+
+
+@pytest.mark.parametrize(
+    ("overrides", "message"),
+    [
+        ({"user_id": " "}, "user_id"),
+        ({"event_type": "share"}, "event_type"),
+        ({"strength_preference": "loud"}, "strength_preference"),
+    ],
+)
+def test_feedback_event_rejects_invalid_values(overrides: dict[str, object], message: str) -> None:
+    fields = {"user_id": "u1", "perfume_id": "p", "event_type": "click", "occurred_at": datetime(2026, 3, 1)}
+    fields.update(overrides)
+
+    with pytest.raises(ValueError, match=message):
+        FeedbackEvent(**fields)
@@ -0,0 +1,81 @@
+import logging
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.application.services.feedback_service import FeedbackService
+from app.config.logging import FEEDBACK_EVENTS_FLUSHED, FEEDBACK_FLUSH_FAILED, FEEDBACK_LISTENER_FAILED
+from app.domain.models.feedback_event import FeedbackEvent
+from app.infrastructure.persistence.sqlite.feedback_repo_sqlite import FeedbackRepositorySqlite
+
+_NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _service(flush_every: int = 100) -> FeedbackService:
+    repository = FeedbackRepositorySqlite(sqlite3.connect(":memory:", check_same_thread=False), flush_every)
+    repository.initialize_schema()
+    return FeedbackService(repository, flush_interval_seconds=0.01, now_func=lambda: _NOW)
+
+
+def test_record_buffers_until_flush_and_logs_batch(caplog: pytest.LogCaptureFixture) -> None:
+    service = _service()
+    service.record("u1", "amber-night", "like")
+    service.record("u1", "amber-night", "click")
+
+    assert service.user_stats("u1") == ()
+
+    with caplog.at_level(logging.INFO):
+        assert service.flush() == 2
+
+    assert {(stat.event_type, stat.event_count) for stat in service.user_stats("u1")} == {("click", 1), ("like", 1)}
+    assert service.user_stats("u1")[0].last_event_at == _NOW
+    flushed = [record for record in caplog.records if record.event == FEEDBACK_EVENTS_FLUSHED]
+    assert flushed[0].event_count == 2
+
+
+def test_background_flusher_writes_events_and_stop_drains_buffer() -> None:
+    service = _service()
+    service.start()
+    service.record("u1", "amber-night", "purchase")
+    service.stop()
+
+    assert service.repository.pending_count() == 0
+    assert service.perfume_stats("amber-night")[0].event_count == 1
+
+
+def test_failed_flush_keeps_events_buffered_and_logs_error(caplog: pytest.LogCaptureFixture) -> None:
+    service = _service()
+    service.record("u1", "amber-night", "like")
+    service.repository.connection.execute("DROP TABLE feedback_user_stats")
+
+    with caplog.at_level(logging.INFO):
+        assert service.flush() == 0
+
+    assert service.repository.pending_count() == 1
+    failures = [record for record in caplog.records if record.event == FEEDBACK_FLUSH_FAILED]
+    assert failures[0].pending_count == 1
+
+
+def test_failed_listener_is_logged_apart_from_a_committed_flush(caplog: pytest.LogCaptureFixture) -> None:
+    service = _service()
+
+    def broken_listener(batch: tuple[FeedbackEvent, ...]) -> None:
+        raise KeyError("amber-night")
+
+    service.repository.on_flushed = broken_listener
+    service.record("u1", "amber-night", "like")
+
+    with caplog.at_level(logging.INFO):
+        assert service.flush() == 1
+
+    assert service.repository.pending_count() == 0
+    assert service.user_stats("u1")[0].event_count == 1
+    assert not [record for record in caplog.records if record.event == FEEDBACK_FLUSH_FAILED]
+    failures = [record for record in caplog.records if record.event == FEEDBACK_LISTENER_FAILED]
+    assert failures[0].event_count == 1
+    assert failures[0].error_type == "KeyError"
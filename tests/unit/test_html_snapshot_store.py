@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.infrastructure.persistence.sqlite.html_snapshot_store import HtmlSnapshotStore
+
+
+def _store(tmp_path: Path, **kwargs) -> HtmlSnapshotStore:  # noqa: ANN003
+    store = HtmlSnapshotStore(sqlite3.connect(":memory:"), tmp_path / "raw_html", **kwargs)
+    store.initialize_schema()
+    return store
+
+
+def test_snapshot_store_deduplicates_blobs_by_content_hash(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+
+    first = store.save("https://vicioso.example/products/a", "<html>same</html>")
+    second = store.save("https://vicioso.example/products/b", "<html>same</html>")
+    store.close()
+
+    blobs = list((tmp_path / "raw_html").rglob("*.html.gz"))
+    assert first == second
+    assert len(blobs) == 1
+    assert store.load(first) == "<html>same</html>"
+
+
+def test_snapshot_store_returns_latest_snapshot_per_url(tmp_path: Path) -> None:
+    store = _store(tmp_path, index_batch_size=1)
+    url = "https://vicioso.example/products/a"
+
+    store.save(url, "<html>old</html>", fetched_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+    store.save(url, "<html>new</html>", fetched_at=datetime(2026, 2, 1, tzinfo=timezone.utc))
+    store.save("https://vicioso.example/products/b", "<html>b</html>")
+    store.flush()
+
+    assert store.load_latest_html(url) == "<html>new</html>"
+    assert store.latest(url).fetched_at == datetime(2026, 2, 1, tzinfo=timezone.utc)
+    assert [snapshot.url for snapshot in store.iter_latest()] == [
+        url,
+        "https://vicioso.example/products/b",
+    ]
+    assert store.load_latest_html("https://vicioso.example/products/missing") is None
+
+
+def test_snapshot_store_rejects_unknown_compression(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="unsupported snapshot compression"):
+        HtmlSnapshotStore(sqlite3.connect(":memory:"), tmp_path, compression="brotli")
+
+
+def test_index_rows_wait_for_their_blob_to_be_written(tmp_path: Path) -> None:
+    store = _store(tmp_path, index_batch_size=1)
+    release = threading.Event()
+    write_blob = store._write_blob
+
+    def gated_write(path: Path, body: bytes) -> None:
+        release.wait(5.0)
+        write_blob(path, body)
+
+    store._write_blob = gated_write
+    url = "https://vicioso.example/products/a"
+    store.save(url, "<html>a</html>")
+    store.save("https://vicioso.example/products/b", "<html>b</html>")
+
+    assert store.latest(url) is None
+
+    release.set()
+    store.flush()
+
+    assert store.load_latest_html(url) == "<html>a</html>"
+
+
+def test_rows_for_a_failed_blob_are_not_indexed(tmp_path: Path) -> None:
+    (tmp_path / "raw_html").write_text("not a directory", encoding="utf-8")
+    store = _store(tmp_path)
+    store.save("https://vicioso.example/products/a", "<html>a</html>")
+
+    with pytest.raises(RuntimeError, match="blob writer failed"):
+        store.flush()
+    assert store.latest("https://vicioso.example/products/a") is None
@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.domain.models.perfume import Perfume
+from app.domain.models.user_profile import UserProfile
+from app.infrastructure.recommendation.scoring.hybrid_scorer import HybridScorer
+from app.infrastructure.recommendation.scoring.score_weights import ScoreWeights
+
+
+def _perfume(perfume_id: str, families: tuple[str, ...], notes: tuple[str, ...]) -> Perfume:
+    return Perfume(
+        perfume_id=perfume_id,
+        name=perfume_id.title(),
+        url=f"https://example.com/products/{perfume_id}",
+        scent_families=families,
+        notes_base=notes,
+    )
+
+
+def test_hybrid_scorer_traces_each_weighted_component() -> None:
+    candidate = _perfume("amber-night", ("Warm",), ("Vanilla", "Musk"))
+    profile = UserProfile(liked_notes=("Vanilla",), preferred_families=("Warm",))
+
+    trace = HybridScorer().score(candidate, profile)
+
+    assert [component.name for component in trace.components] == [
+        "note_similarity",
+        "family_match",
+        "owned_similarity",
+        "context",
+    ]
+    assert trace.total == round(sum(component.contribution for component in trace.components), 6)
+    assert trace.matched_notes == ("Vanilla",)
+    assert trace.matched_families == ("Warm",)
+    assert trace.owned_penalty == 0.0
+
+
+def test_hybrid_scorer_penalizes_owned_candidate_even_when_skipping_owned_similarity() -> None:
+    candidate = _perfume("amber-night", ("Warm",), ("Vanilla",))
+    profile = UserProfile(owned_perfume_ids=("amber-night",), liked_notes=("Vanilla",))
+    scorer = HybridScorer()
+
+    full = scorer.score(candidate, profile, owned_perfumes=(candidate,))
+    degraded = scorer.score(candidate, profile, owned_perfumes=(candidate,), skip_owned_similarity=True)
+
+    assert full.owned_penalty == 1.0
+    assert degraded.owned_penalty == 1.0
+    assert degraded.component("owned_similarity").value == 0.0
+    assert degraded.total < 0
+
+
+def test_hybrid_scorer_adds_embedding_only_with_positive_weight() -> None:
+    candidate = _perfume("amber-night", ("Warm",), ("Vanilla",))
+
+    def embedding(perfume: Perfume, profile: UserProfile) -> float:
+        return 0.5
+
+    without = HybridScorer(embedding_scorer=embedding).score(candidate, UserProfile())
+    with_weight = HybridScorer(ScoreWeights(embedding=0.4), embedding_scorer=embedding).score(
+        candidate, UserProfile()
+    )
+
+    assert without.component("embedding") is None
+    assert with_weight.component("embedding").contribution == 0.2
+
+
+def test_score_weights_reject_negative_values() -> None:
+    with pytest.raises(ValueError, match="family_match"):
+        ScoreWeights(family_match=-0.1)
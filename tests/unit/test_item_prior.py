@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.domain.models.item_priors import ItemPriors
+from app.domain.models.perfume import Perfume
+from app.domain.models.user_profile import UserProfile
+from app.infrastructure.recommendation.features.item_prior import score_item_prior
+from app.infrastructure.recommendation.scoring.hybrid_scorer import HybridScorer
+
+_PRIORS = ItemPriors(
+    popularity={"Amber-Night": 1.0, "citrus-day": 0.4},
+    neighbors={"rose-veil": {"citrus-day": 0.8, "amber-night": 0.2}},
+)
+
+
+def _perfume(perfume_id: str) -> Perfume:
+    return Perfume(
+        perfume_id=perfume_id,
+        name=perfume_id.replace("-", " ").title(),
+        url=f"https://example.com/products/{perfume_id}",
+        notes_base=("Musk",),
+    )
+
+
+def test_cold_start_profile_scores_by_popularity() -> None:
+    result = score_item_prior(_perfume("amber-night"), UserProfile(), _PRIORS)
+
+    assert result.score == 1.0
+    assert result.co_engaged_with is None
+    assert score_item_prior(_perfume("unknown"), UserProfile(), _PRIORS).score == 0.0
+
+
+def test_owned_profile_scores_by_best_co_occurrence() -> None:
+    profile = UserProfile(owned_perfume_ids=("Rose-Veil",))
+
+    result = score_item_prior(_perfume("citrus-day"), profile, _PRIORS)
+
+    assert result.score == 0.8
+    assert result.popularity == 0.4
+    assert result.co_engaged_with == "Rose-Veil"
+    assert score_item_prior(_perfume("amber-night"), profile, _PRIORS).score == 0.2
+
+
+def test_hybrid_scorer_adds_item_prior_component_only_with_priors() -> None:
+    candidate = _perfume("amber-night")
+
+    with_priors = HybridScorer(priors=_PRIORS).score(candidate, UserProfile())
+    without_priors = HybridScorer().score(candidate, UserProfile())
+
+    assert with_priors.component("item_prior").contribution == 0.1
+    assert with_priors.total == round(without_priors.total + 0.1, 6)
+    assert without_priors.component("item_prior") is None
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.domain.models.perfume import Perfume
+from app.domain.models.user_profile import UserProfile
+from app.infrastructure.recommendation.features.learned_affinity import score_learned_affinity
+from app.infrastructure.recommendation.scoring.hybrid_scorer import HybridScorer
+
+
+def _perfume(perfume_id: str, families: tuple[str, ...], notes: tuple[str, ...]) -> Perfume:
+    return Perfume(
+        perfume_id=perfume_id,
+        name=perfume_id.replace("-", " ").title(),
+        url=f"https://example.com/products/{perfume_id}",
+        scent_families=families,
+        notes_base=notes,
+    )
+
+
+_LEARNED = UserProfile(
+    liked_notes=("Rose",),
+    learned_notes=(("vanilla", 1.0), ("amber", 0.5), ("lemon", -0.5)),
+    learned_families=(("warm", 1.0),),
+)
+
+
+def test_learned_affinity_scores_the_share_of_learned_weight_a_candidate_carries() -> None:
+    result = score_learned_affinity(_perfume("amber-night", ("Warm",), ("Vanilla", "Musk")), _LEARNED)
+
+    assert result.note_share == 0.5
+    assert result.family_share == 1.0
+    assert result.score == 0.65
+    assert result.matched_notes == ("Vanilla",)
+
+
+def test_learned_dislikes_pull_the_score_below_zero() -> None:
+    result = score_learned_affinity(_perfume("citrus-day", ("Fresh",), ("Lemon",)), _LEARNED)
+
+    assert result.score == -0.175
+    assert result.matched_notes == ()
+
+
+def test_learned_tokens_get_their_own_component_and_leave_note_similarity_alone() -> None:
+    candidate = _perfume("rose-veil", ("Floral",), ("Rose",))
+
+    explicit = HybridScorer().score(candidate, UserProfile(liked_notes=("Rose",)))
+    personalized = HybridScorer().score(candidate, _LEARNED)
+
+    assert explicit.component("affinity") is None
+    assert personalized.component("note_similarity") == explicit.component("note_similarity")
+    assert personalized.component("affinity").value == 0.0
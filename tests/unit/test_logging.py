@@ -0,0 +1,160 @@
+import json
+import logging
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.config.logging import (
+    JsonFormatter,
+    EventSampler,
+    LazyField,
+    configure_async_logging,
+    log_event,
+)
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def _logger(name: str, level: int = logging.INFO) -> tuple[logging.Logger, _ListHandler]:
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(level)
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    return logger, handler
+
+
+def test_log_event_skips_disabled_levels_without_evaluating_lazy_fields() -> None:
+    logger, handler = _logger("test.logging.disabled", level=logging.WARNING)
+    evaluated: list[str] = []
+
+    log_event(logger, "debug_event", content_length=LazyField(lambda: evaluated.append("x")))
+
+    assert handler.records == []
+    assert evaluated == []
+
+
+def test_log_event_resolves_lazy_fields_when_emitted() -> None:
+    logger, handler = _logger("test.logging.lazy")
+
+    log_event(logger, "page_fetched", url="https://a.example", content_length=LazyField(lambda: 42))
+
+    (record,) = handler.records
+    assert record.event == "page_fetched"
+    assert record.content_length == 42
+
+
+def test_event_sampler_samples_info_events_but_keeps_warnings(monkeypatch: pytest.MonkeyPatch) -> None:
+    logger, handler = _logger("test.logging.sampled")
+    handler.addFilter(EventSampler({"noisy_event": 0.01}))
+    draws = iter([0.5, 0.005])
+    monkeypatch.setattr("app.config.logging.random.random", lambda: next(draws))
+
+    log_event(logger, "noisy_event", attempt=1)
+    log_event(logger, "noisy_event", attempt=2)
+    log_event(logger, "noisy_event", level=logging.WARNING, attempt=3)
+
+    assert [record.attempt for record in handler.records] == [2, 3]
+    assert handler.records[0].sample_rate == 0.01
+    with pytest.raises(ValueError):
+        EventSampler({"noisy_event": 1.5})
+
+
+def test_event_sampler_only_applies_to_its_handler(monkeypatch: pytest.MonkeyPatch) -> None:
+    logger, sampled = _logger("test.logging.scoped")
+    sampled.addFilter(EventSampler({"noisy_event": 0.01}))
+    unsampled = _ListHandler()
+    logger.addHandler(unsampled)
+    other_logger, other = _logger("test.logging.unscoped")
+    monkeypatch.setattr("app.config.logging.random.random", lambda: 0.5)
+
+    log_event(logger, "noisy_event")
+    log_event(other_logger, "noisy_event")
+
+    assert sampled.records == []
+    assert len(unsampled.records) == 1
+    assert len(other.records) == 1
+
+
+def test_async_logging_emits_json_lines_on_listener_thread() -> None:
+    sink = _ListHandler()
+    sink.setFormatter(JsonFormatter())
+    listener = configure_async_logging(handlers=[sink], logger_name="test.logging.async")
+    try:
+        log_event(logging.getLogger("test.logging.async.child"), "scrape_url_fetched", url="https://a.example")
+    finally:
+        listener.stop()
+        logging.getLogger("test.logging.async").handlers.clear()
+
+    (record,) = sink.records
+    payload = json.loads(sink.format(record))
+    assert payload["event"] == "scrape_url_fetched"
+    assert payload["url"] == "https://a.example"
+    assert payload["logger"] == "test.logging.async.child"
+    assert payload["level"] == "INFO"
+
+
+def test_async_logging_reconfiguration_replaces_the_previous_handler() -> None:
+    first_sink = _ListHandler()
+    second_sink = _ListHandler()
+    logger = logging.getLogger("test.logging.reconfigured")
+    first = configure_async_logging(handlers=[first_sink], logger_name="test.logging.reconfigured")
+    second = configure_async_logging(handlers=[second_sink], logger_name="test.logging.reconfigured")
+    try:
+        handler_count = len(logger.handlers)
+        log_event(logger, "scrape_url_fetched")
+    finally:
+        second.stop()
+        logger.handlers.clear()
+
+    assert handler_count == 1
+    assert first_sink.records == []
+    assert len(second_sink.records) == 1
+
+
+def test_async_logging_keeps_exception_tracebacks_in_json() -> None:
+    sink = _ListHandler()
+    sink.setFormatter(JsonFormatter())
+    logger = logging.getLogger("test.logging.exc")
+    listener = configure_async_logging(handlers=[sink], logger_name="test.logging.exc")
+    try:
+        try:
+            raise RuntimeError("feed unavailable")
+        except RuntimeError:
+            logger.exception("scrape_url_failed")
+    finally:
+        listener.stop()
+        logger.handlers.clear()
+
+    (record,) = sink.records
+    payload = json.loads(sink.format(record))
+    assert payload["event"] == "scrape_url_failed"
+    assert "RuntimeError: feed unavailable" in payload["exc_info"]
+    assert "Traceback" not in record.getMessage()
+
+
+def test_async_logging_samples_only_on_its_queue(monkeypatch: pytest.MonkeyPatch) -> None:
+    sink = _ListHandler()
+    monkeypatch.setattr("app.config.logging.random.random", lambda: 0.5)
+    listener = configure_async_logging(
+        handlers=[sink], logger_name="test.logging.async_sampled", sample_rates={"noisy_event": 0.1}
+    )
+    try:
+        log_event(logging.getLogger("test.logging.async_sampled"), "noisy_event")
+        log_event(logging.getLogger("test.logging.async_sampled"), "scrape_url_fetched")
+    finally:
+        listener.stop()
+        logging.getLogger("test.logging.async_sampled").handlers.clear()
+
+    assert [record.event for record in sink.records] == ["scrape_url_fetched"]
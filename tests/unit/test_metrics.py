@@ -0,0 +1,57 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.config.metrics import MetricsCollector
+
+
+def test_metrics_collector_summarizes_histograms_counters_and_gauges() -> None:
+    metrics = MetricsCollector(buckets=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.05, 0.05, 0.5, 3.0):
+        metrics.observe("fetch", seconds)
+    metrics.increment("http_bytes_received", 1024)
+    metrics.increment("http_bytes_received", 512)
+    metrics.set_gauge("pages_per_second", 2.5)
+
+    summary = metrics.summary()
+    fetch = summary.histograms["fetch"]
+
+    assert (fetch.count, fetch.max_seconds) == (5, 3.0)
+    assert fetch.p50_seconds == 0.1
+    assert fetch.p95_seconds == 3.0
+    assert summary.counters == {"http_bytes_received": 1536}
+    assert summary.gauges == {"pages_per_second": 2.5}
+
+
+def test_metrics_collector_timer_records_elapsed_time_on_error() -> None:
+    metrics = MetricsCollector()
+
+    try:
+        with metrics.timer("parse"):
+            raise ValueError("bad page")
+    except ValueError:
+        pass
+
+    assert metrics.summary().histograms["parse"].count == 1
+
+
+def test_metrics_collector_writes_prometheus_text(tmp_path: Path) -> None:
+    metrics = MetricsCollector(buckets=(0.1, 1.0))
+    metrics.observe("upsert", 0.05)
+    metrics.observe("upsert", 2.0)
+    metrics.increment("http_retries")
+    target = tmp_path / "textfile" / "scrape.prom"
+
+    metrics.write_prometheus(target)
+
+    assert target.read_text(encoding="utf-8").splitlines() == [
+        "# TYPE scrape_http_retries_total counter",
+        "scrape_http_retries_total 1",
+        "# TYPE scrape_upsert_seconds histogram",
+        'scrape_upsert_seconds_bucket{le="0.1"} 1',
+        'scrape_upsert_seconds_bucket{le="1"} 1',
+        'scrape_upsert_seconds_bucket{le="+Inf"} 2',
+        "scrape_upsert_seconds_sum 2.05",
+        "scrape_upsert_seconds_count 2",
+    ]
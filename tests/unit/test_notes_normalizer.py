@@ -4,8 +4,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 from app.infrastructure.scraping.normalizers.notes_normalizer import (
+    load_note_aliases,
     normalize_note,
     normalize_note_list,
+    normalize_note_lists,
     normalize_note_sections,
     split_note_tokens,
 )
@@ -43,7 +45,7 @@ def test_normalize_note_sections_normalizes_each_pyramid_group() -> None:
 
     assert sections == {
         "notes_top": ("Lemon", "Bergamot"),
-        "notes_middle": ("Rose", "Jasmin"),
+        "notes_middle": ("Rose", "Jasmine"),
         "notes_base": ("Vanilla", "Musk"),
     }
 
@@ -65,3 +67,40 @@ def test_normalize_note_list_filters_noise_variants_and_preserves_order() -> Non
         ]
     )
     assert normalized == ("Cardamom", "Ambroxan", "Musk")
+
+
+def test_normalize_note_lists_matches_single_list_results() -> None:
+    batch = [
+        ["Top Notes: Bergamot, bergamot", "Rose and Musk"],
+        ["N/A"],
+        ["Rose und Musk", "Vanilla"],
+    ]
+
+    normalized = normalize_note_lists(batch)
+
+    assert normalized == tuple(normalize_note_list(raw_notes) for raw_notes in batch)
+    assert normalized[1] == tuple()
+    assert normalized[2] == ("Rose", "Musk", "Vanilla")
+
+
+def test_normalize_note_list_applies_alias_table_and_dedupes_canonical_notes(tmp_path: Path) -> None:
+    alias_file = tmp_path / "aliases.json"
+    alias_file.write_text('{"Vanille": "Vanilla", " Moschus ": "Musk"}', encoding="utf-8")
+    aliases = load_note_aliases(alias_file)
+
+    normalized = normalize_note_list(["Vanille, Vanilla", "Moschus"], aliases=aliases)
+
+    assert aliases == {"vanille": "Vanilla", "moschus": "Musk"}
+    assert normalized == ("Vanilla", "Musk")
+
+
+def test_load_note_aliases_reads_bundled_table() -> None:
+    aliases = load_note_aliases()
+
+    assert aliases["bergamotte"] == "Bergamot"
+    assert all(key == key.casefold() for key in aliases)
+
+
+def test_normalize_note_list_uses_bundled_aliases_unless_given_a_table() -> None:
+    assert normalize_note_list(["Bergamotte, Bergamot", "Zimt"]) == ("Bergamot", "Cinnamon")
+    assert normalize_note_list(["Bergamotte"], aliases={}) == ("Bergamotte",)
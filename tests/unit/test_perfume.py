@@ -1,6 +1,7 @@
 import sys
 from datetime import datetime
 from pathlib import Path
+import pickle
 
 import pytest
 
@@ -34,6 +35,38 @@ def test_perfume_schema_normalizes_and_builds_notes_all() -> None:
     )
 
 
+def test_perfume_caches_notes_all_and_casefolded_views() -> None:
+    perfume = Perfume(
+        perfume_id="amber-night",
+        name="Amber Night",
+        url="https://example.com/products/amber-night",
+        notes_top=("Rose",),
+        notes_base=("rose", "Vanilla"),
+        scent_families=("Warm", "Woody"),
+    )
+
+    assert perfume.notes_all is perfume.notes_all
+    assert perfume.note_keys == frozenset({"rose", "vanilla"})
+    assert dict(perfume.note_map) == {"rose": "Rose", "vanilla": "Vanilla"}
+    assert perfume.family_keys == frozenset({"warm", "woody"})
+    assert perfume.family_map["woody"] == "Woody"
+
+
+def test_perfume_cached_views_are_not_pickled() -> None:
+    perfume = Perfume(
+        perfume_id="amber-night",
+        name="Amber Night",
+        url="https://example.com/products/amber-night",
+        notes_base=("Vanilla",),
+    )
+    assert perfume.note_keys == frozenset({"vanilla"})
+
+    restored = pickle.loads(pickle.dumps(perfume))
+
+    assert restored == perfume
+    assert restored.note_keys == frozenset({"vanilla"})
+
+
 def test_perfume_requires_identity_fields() -> None:
     with pytest.raises(ValueError, match="perfume_id"):
         Perfume(perfume_id="", name="A", url="https://example.com")
@@ -0,0 +1,59 @@
+from datetime import datetime
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.domain.models.perfume import Perfume
+from app.domain.models.perfume_catalog import PerfumeCatalog
+
+
+def _sample_perfume(perfume_id: str, price_min: float | None = 59.9) -> Perfume:
+    return Perfume(
+        perfume_id=perfume_id,
+        name=f"Perfume {perfume_id}",
+        url=f"https://vicioso.example/products/{perfume_id}",
+        price_min=price_min,
+        price_max=None if price_min is None else price_min + 30.0,
+        gender_tags=("Unisex",),
+        scent_families=("".join(["Wa", "rm"]), "Woody"),
+        notes_top=("Bergamot",),
+        notes_middle=("Rose",),
+        notes_base=("Vanilla", "Musk"),
+        description="Warm floral with depth.",
+        image_urls=(f"https://img.example/{perfume_id}.jpg",),
+        last_scraped_at=datetime(2026, 2, 19, 12, 30, 0),
+    )
+
+
+def test_catalog_materializes_equal_perfume_views() -> None:
+    perfumes = (_sample_perfume("amber-night"), _sample_perfume("fresh-dawn", price_min=None))
+
+    catalog = PerfumeCatalog.from_perfumes(perfumes)
+
+    assert len(catalog) == 2
+    assert catalog.perfume_ids == ("amber-night", "fresh-dawn")
+    assert tuple(catalog) == perfumes
+    assert catalog.get("fresh-dawn") == perfumes[1]
+    assert catalog.get("fresh-dawn").price_min is None
+    assert catalog.get("missing") is None
+    assert "amber-night" in catalog
+
+
+def test_catalog_shares_interned_tag_and_note_tuples() -> None:
+    catalog = PerfumeCatalog((_sample_perfume("a"), _sample_perfume("b")))
+
+    assert catalog.scent_families_at(0) is catalog.scent_families_at(1)
+    assert catalog.scent_families_at(0)[0] is sys.intern("Warm")
+    assert catalog.notes_at(1) == ("Bergamot", "Rose", "Vanilla", "Musk")
+
+
+def test_catalog_rejects_duplicate_ids_and_unknown_lookups() -> None:
+    with pytest.raises(ValueError, match="duplicate perfume_id"):
+        PerfumeCatalog((_sample_perfume("a"), _sample_perfume("a")))
+
+    catalog = PerfumeCatalog((_sample_perfume("a"),))
+    with pytest.raises(KeyError, match="unknown perfume_id"):
+        catalog.index_of("b")
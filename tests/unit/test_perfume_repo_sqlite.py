@@ -91,3 +91,55 @@ def test_list_perfumes_returns_ordered_page() -> None:
     page = repo.list_perfumes(limit=2, offset=1)
 
     assert tuple(item.perfume_id for item in page) == ("b", "c")
+
+
+def test_iter_perfumes_pages_through_whole_catalog() -> None:
+    connection = sqlite3.connect(":memory:")
+    repo = PerfumeRepositorySqlite(connection)
+    repo.initialize_schema()
+    repo.upsert_perfumes(tuple(_sample_perfume(perfume_id) for perfume_id in ("d", "b", "a", "c", "e")))
+
+    perfume_ids = [item.perfume_id for item in repo.iter_perfumes(page_size=2)]
+
+    assert perfume_ids == ["a", "b", "c", "d", "e"]
+
+
+def test_initialize_schema_adds_vanished_at_to_existing_table() -> None:
+    connection = sqlite3.connect(":memory:")
+    connection.execute(
+        "CREATE TABLE perfumes (perfume_id TEXT PRIMARY KEY, name TEXT NOT NULL, url TEXT NOT NULL, "
+        "last_scraped_at TEXT)"
+    )
+    repo = PerfumeRepositorySqlite(connection)
+
+    repo.initialize_schema()
+
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(perfumes)").fetchall()}
+    assert "vanished_at" in columns
+
+
+def test_mark_and_clear_vanished_perfumes() -> None:
+    connection = sqlite3.connect(":memory:")
+    repo = PerfumeRepositorySqlite(connection)
+    repo.initialize_schema()
+    repo.upsert_perfume(_sample_perfume())
+    vanished_at = datetime(2026, 3, 1, 6, 0, 0)
+
+    repo.mark_vanished(("amber-night",), vanished_at)
+    (state,) = repo.list_scrape_states()
+    repo.clear_vanished(("amber-night",))
+
+    assert state.vanished_at == vanished_at
+    assert repo.list_scrape_states()[0].vanished_at is None
+
+
+def test_iter_perfumes_skips_vanished_unless_included() -> None:
+    connection = sqlite3.connect(":memory:")
+    repo = PerfumeRepositorySqlite(connection)
+    repo.initialize_schema()
+    repo.upsert_perfumes(tuple(_sample_perfume(perfume_id) for perfume_id in ("a", "b", "c")))
+
+    repo.mark_vanished(("b",), datetime(2026, 3, 1, 6, 0, 0))
+
+    assert [item.perfume_id for item in repo.iter_perfumes(page_size=1)] == ["a", "c"]
+    assert [item.perfume_id for item in repo.list_perfumes(include_vanished=True)] == ["a", "b", "c"]
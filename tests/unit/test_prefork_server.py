@@ -0,0 +1,162 @@
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.application.services.catalog_refresh_service import (
+    CatalogSnapshot,
+    build_catalog_snapshot,
+    publish_catalog_version,
+    read_catalog_version,
+)
+from app.config.logging import CATALOG_REFRESH_FAILED
+from app.domain.models.perfume import Perfume
+from app.server import PreforkServer
+
+
+def _perfumes(count: int) -> list[Perfume]:
+    return [
+        Perfume(perfume_id=f"p-{index}", name=f"P {index}", url=f"https://example.com/products/p-{index}")
+        for index in range(count)
+    ]
+
+
+def _report_and_wait(output_dir: Path) -> Callable[[CatalogSnapshot, socket.socket], None]:
+    def worker(snapshot: CatalogSnapshot, listen_socket: socket.socket) -> None:
+        path = output_dir / f"worker-{os.getpid()}"
+        path.write_text(f"{snapshot.version} {len(snapshot.catalog)} {listen_socket.fileno()}", encoding="utf-8")
+        while True:
+            time.sleep(0.05)
+
+    return worker
+
+
+def _wait_for(predicate: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def _reports(output_dir: Path, pids: tuple[int, ...]) -> list[str]:
+    paths = [output_dir / f"worker-{pid}" for pid in pids]
+    return [path.read_text(encoding="utf-8") for path in paths if path.exists() and path.stat().st_size]
+
+
+def test_prefork_workers_share_parent_snapshot_and_reload_on_publish(tmp_path: Path) -> None:
+    marker = tmp_path / "catalog.version"
+    loads: list[str] = []
+
+    def loader() -> CatalogSnapshot:
+        version = read_catalog_version(marker) or ""
+        loads.append(version)
+        return build_catalog_snapshot(_perfumes(len(loads)), version)
+
+    server = PreforkServer(
+        port=0,
+        workers=2,
+        marker_path=str(marker),
+        shutdown_seconds=2.0,
+        snapshot_loader=loader,
+        worker_target=_report_and_wait(tmp_path),
+    )
+    server.start()
+    try:
+        first = server.worker_pids
+        assert len(first) == 2
+        _wait_for(lambda: len(_reports(tmp_path, first)) == 2)
+        assert {report.rsplit(" ", 1)[0] for report in _reports(tmp_path, first)} == {" 1"}
+
+        server.poll_once()
+        assert server.worker_pids == first
+
+        publish_catalog_version(marker, "v2")
+        server.poll_once()
+
+        second = server.worker_pids
+        assert loads == ["", "v2"]
+        assert len(second) == 2 and not set(second) & set(first)
+        _wait_for(lambda: len(_reports(tmp_path, second)) == 2)
+        assert {report.rsplit(" ", 1)[0] for report in _reports(tmp_path, second)} == {"v2 2"}
+
+        def old_workers_gone() -> bool:
+            server.poll_once()
+            return not server._draining
+
+        _wait_for(old_workers_gone)
+    finally:
+        server.stop()
+
+    assert server.worker_pids == ()
+
+
+def test_prefork_server_replaces_crashed_worker(tmp_path: Path) -> None:
+    server = PreforkServer(
+        port=0,
+        workers=1,
+        marker_path=str(tmp_path / "missing.version"),
+        shutdown_seconds=2.0,
+        snapshot_loader=lambda: build_catalog_snapshot(_perfumes(1)),
+        worker_target=_report_and_wait(tmp_path),
+    )
+    server.start()
+    try:
+        (crashed,) = server.worker_pids
+        os.kill(crashed, signal.SIGKILL)
+
+        def replaced() -> bool:
+            server.poll_once()
+            return len(server.worker_pids) == 1 and server.worker_pids[0] != crashed
+
+        _wait_for(replaced)
+    finally:
+        server.stop()
+
+
+def test_failed_reload_keeps_current_snapshot_and_workers(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    marker = tmp_path / "catalog.version"
+    loads: list[str] = []
+
+    def loader() -> CatalogSnapshot:
+        version = read_catalog_version(marker) or ""
+        loads.append(version)
+        if version == "broken":
+            raise OSError("catalog database is unreadable")
+        return build_catalog_snapshot(_perfumes(1), version)
+
+    server = PreforkServer(
+        port=0,
+        workers=1,
+        marker_path=str(marker),
+        shutdown_seconds=2.0,
+        snapshot_loader=loader,
+        worker_target=_report_and_wait(tmp_path),
+    )
+    server.start()
+    try:
+        first = server.worker_pids
+        publish_catalog_version(marker, "broken")
+        with caplog.at_level(logging.INFO):
+            server.poll_once()
+
+        assert server.snapshot.version == ""
+        assert server.worker_pids == first
+        failures = [record for record in caplog.records if record.event == CATALOG_REFRESH_FAILED]
+        assert failures[0].version == "broken"
+        assert failures[0].error_type == "OSError"
+
+        publish_catalog_version(marker, "v2")
+        server.poll_once()
+        assert loads == ["", "broken", "v2"]
+        assert server.snapshot.version == "v2"
+        assert not set(server.worker_pids) & set(first)
+    finally:
+        server.stop()
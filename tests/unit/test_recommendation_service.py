@@ -0,0 +1,228 @@
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.application.services.recommendation_service import RecommendationService
+from app.config.logging import RECOMMENDATION_FALLBACK, RECOMMENDATION_SERVED
+from app.domain.models.perfume import Perfume
+from app.domain.models.user_profile import UserProfile, UserProfileConstraints
+from app.infrastructure.recommendation.scoring.hybrid_scorer import HybridScorer
+from app.infrastructure.recommendation.scoring.score_trace import ScoreTrace
+from app.infrastructure.recommendation.scoring.score_weights import ScoreWeights
+
+
+class FakeClock:
+    def __init__(self, step: float = 0.0) -> None:
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+class SlowScorer(HybridScorer):
+    def __init__(self, clock: FakeClock, seconds_per_score: float) -> None:
+        super().__init__()
+        self.clock = clock
+        self.seconds_per_score = seconds_per_score
+        self.calls = 0
+
+    def score(
+        self,
+        candidate: Perfume,
+        profile: UserProfile,
+        owned_perfumes: tuple[Perfume, ...] = (),
+        skip_owned_similarity: bool = False,
+    ) -> ScoreTrace:
+        self.clock.now += self.seconds_per_score
+        self.calls += 1
+        return super().score(candidate, profile, owned_perfumes, skip_owned_similarity)
+
+
+def _catalog(count: int = 40) -> list[Perfume]:
+    perfumes = [
+        Perfume(
+            perfume_id="amber-night",
+            name="Amber Night",
+            url="https://example.com/products/amber-night",
+            scent_families=("Warm",),
+            notes_base=("Vanilla", "Amber"),
+        ),
+        Perfume(
+            perfume_id="citrus-day",
+            name="Citrus Day",
+            url="https://example.com/products/citrus-day",
+            scent_families=("Fresh",),
+            notes_top=("Lemon",),
+        ),
+    ]
+    perfumes.extend(
+        Perfume(
+            perfume_id=f"vanilla-{index:03d}",
+            name=f"Vanilla {index}",
+            url=f"https://example.com/products/vanilla-{index:03d}",
+            notes_base=("Vanilla",),
+        )
+        for index in range(count)
+    )
+    return perfumes
+
+
+def test_recommend_serves_full_mode_and_logs_top_items(caplog: pytest.LogCaptureFixture) -> None:
+    service = RecommendationService(_catalog(3))
+    profile = UserProfile(liked_notes=("Vanilla", "Amber"), preferred_families=("Warm",))
+
+    with caplog.at_level(logging.INFO):
+        result = service.recommend(profile, top_n=2)
+
+    assert result.mode == "full"
+    assert result.candidate_count == 4
+    assert [item.perfume_id for item in result.items][0] == "amber-night"
+    assert result.items[0].trace is not None
+    served = [record for record in caplog.records if record.event == RECOMMENDATION_SERVED]
+    assert served[0].mode == "full"
+    assert served[0].top[0][0] == "amber-night"
+    assert "note_similarity" in served[0].components
+
+
+def test_recommend_penalizes_owned_and_respects_exclusions() -> None:
+    service = RecommendationService(_catalog(1))
+    profile = UserProfile(
+        owned_perfume_ids=("amber-night",),
+        liked_notes=("Vanilla",),
+        constraints=UserProfileConstraints(exclude_notes=("Lemon",)),
+    )
+
+    result = service.recommend(profile)
+
+    ids = [item.perfume_id for item in result.items]
+    assert "citrus-day" not in ids
+    assert ids[-1] == "amber-night"
+    assert result.items[-1].score < 0
+
+
+def test_recommend_cold_start_considers_whole_catalog() -> None:
+    service = RecommendationService(_catalog(2))
+
+    result = service.recommend(UserProfile(), top_n=10)
+
+    assert result.mode == "full"
+    assert result.candidate_count == 4
+
+
+def test_recommend_falls_back_to_candidates_only_when_budget_runs_out(caplog: pytest.LogCaptureFixture) -> None:
+    clock = FakeClock()
+    scorer = SlowScorer(clock, seconds_per_score=0.01)
+    service = RecommendationService(_catalog(), scorer=scorer, time_budget_ms=100.0, clock=clock)
+    profile = UserProfile(liked_notes=("Vanilla",), preferred_families=("Warm",))
+
+    with caplog.at_level(logging.INFO):
+        result = service.recommend(profile, top_n=1)
+
+    assert result.mode == "candidates_only"
+    assert result.items[0].perfume_id == "amber-night"
+    assert result.items[0].score == 1.0
+    assert result.items[0].trace is None
+    fallbacks = [record for record in caplog.records if record.event == RECOMMENDATION_FALLBACK]
+    assert [(record.skipped_mode, record.reason) for record in fallbacks] == [
+        ("full", "deadline_exceeded"),
+        ("skip_owned", "deadline_exceeded"),
+    ]
+    assert scorer.calls < result.candidate_count
+
+
+def test_candidates_only_ranking_applies_the_configured_owned_penalty() -> None:
+    scorer = HybridScorer(weights=ScoreWeights(owned_penalty=0.25))
+    service = RecommendationService(_catalog(1), scorer=scorer, time_budget_ms=0.0, clock=FakeClock(step=1.0))
+    profile = UserProfile(owned_perfume_ids=("amber-night",), liked_notes=("Vanilla",))
+
+    result = service.recommend(profile, top_n=3)
+
+    scores = {item.perfume_id: item.score for item in result.items}
+    assert result.mode == "candidates_only"
+    assert scores == {"amber-night": 0.75, "vanilla-000": 1.0}
+
+
+def test_recommend_serves_cached_ranking_when_later_request_is_over_budget() -> None:
+    clock = FakeClock()
+    scorer = SlowScorer(clock, seconds_per_score=0.0)
+    service = RecommendationService(_catalog(), scorer=scorer, time_budget_ms=100.0, clock=clock)
+    profile = UserProfile(liked_notes=("Vanilla",))
+
+    first = service.recommend(profile, top_n=3)
+    scorer.seconds_per_score = 0.01
+    second = service.recommend(profile, top_n=3)
+
+    assert first.mode == "full"
+    assert second.mode == "cached"
+    assert second.items == first.items
+
+
+def test_recommend_skips_modes_whose_measured_cost_exceeds_budget(caplog: pytest.LogCaptureFixture) -> None:
+    clock = FakeClock()
+    scorer = SlowScorer(clock, seconds_per_score=0.01)
+    service = RecommendationService(_catalog(), scorer=scorer, time_budget_ms=100.0, clock=clock)
+    service.recommend(UserProfile(liked_notes=("Vanilla",)), top_n=1)
+    caplog.clear()
+
+    with caplog.at_level(logging.INFO):
+        result = service.recommend(UserProfile(liked_notes=("Vanilla",)), top_n=2)
+
+    assert result.mode == "candidates_only"
+    fallbacks = [record for record in caplog.records if record.event == RECOMMENDATION_FALLBACK]
+    assert (fallbacks[0].skipped_mode, fallbacks[0].reason) == ("full", "estimated_over_budget")
+
+
+def test_recommend_diversifies_near_identical_top_candidates() -> None:
+    perfumes = [
+        Perfume(
+            perfume_id=perfume_id,
+            name=perfume_id.replace("-", " ").title(),
+            url=f"https://example.com/products/{perfume_id}",
+            notes_base=notes,
+        )
+        for perfume_id, notes in (
+            ("gourmand-a", ("Vanilla", "Tonka")),
+            ("gourmand-b", ("Vanilla", "Tonka")),
+            ("gourmand-c", ("Vanilla", "Tonka")),
+            ("vanilla-cedar", ("Vanilla", "Cedar", "Vetiver")),
+        )
+    ]
+    profile = UserProfile(liked_notes=("Vanilla", "Tonka"))
+
+    diverse = RecommendationService(
+        perfumes, scorer=HybridScorer(ScoreWeights(diversity=0.3))
+    ).recommend(profile, top_n=2)
+    relevance_only = RecommendationService(perfumes).recommend(profile, top_n=2)
+
+    assert [item.perfume_id for item in diverse.items] == ["gourmand-a", "vanilla-cedar"]
+    assert [item.perfume_id for item in relevance_only.items] == ["gourmand-a", "gourmand-b"]
+
+
+def test_recommend_diversity_can_be_set_per_request() -> None:
+    perfumes = [
+        Perfume(
+            perfume_id=perfume_id,
+            name=perfume_id.replace("-", " ").title(),
+            url=f"https://example.com/products/{perfume_id}",
+            notes_base=notes,
+        )
+        for perfume_id, notes in (
+            ("gourmand-a", ("Vanilla", "Tonka")),
+            ("gourmand-b", ("Vanilla", "Tonka")),
+            ("vanilla-cedar", ("Vanilla", "Cedar", "Vetiver")),
+        )
+    ]
+    service = RecommendationService(perfumes)
+    profile = UserProfile(liked_notes=("Vanilla", "Tonka"))
+
+    relevance_only = service.recommend(profile, top_n=2)
+    diverse = service.recommend(profile, top_n=2, diversity=0.3)
+
+    assert [item.perfume_id for item in relevance_only.items] == ["gourmand-a", "gourmand-b"]
+    assert [item.perfume_id for item in diverse.items] == ["gourmand-a", "vanilla-cedar"]
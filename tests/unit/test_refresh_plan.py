@@ -0,0 +1,86 @@
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.application.pipelines.refresh_plan import RefreshPolicy, plan_refresh
+from app.infrastructure.persistence.sqlite.perfume_repo_sqlite import PerfumeScrapeState
+from app.infrastructure.scraping.parsers.listing_parser import ListingProduct
+
+_NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _listed(slug: str, price: float | None = 50.0) -> tuple[str, ListingProduct]:
+    url = f"https://vicioso.example/products/{slug}"
+    return url, ListingProduct(name=slug.title(), url=url, price_min=price, price_max=price)
+
+
+def _stored(
+    slug: str, age_days: float, price: float | None = 50.0, vanished: bool = False
+) -> PerfumeScrapeState:
+    return PerfumeScrapeState(
+        perfume_id=slug,
+        url=f"https://vicioso.example/products/{slug}",
+        name=slug.title(),
+        price_min=price,
+        price_max=price,
+        last_scraped_at=_NOW - timedelta(days=age_days),
+        vanished_at=_NOW - timedelta(days=1) if vanished else None,
+    )
+
+
+def test_plan_refresh_classifies_new_changed_stale_fresh_and_vanished() -> None:
+    discovered = dict(
+        [_listed("new-one"), _listed("cheaper", price=40.0), _listed("old"), _listed("recent"), _listed("back")]
+    )
+    stored = [
+        _stored("cheaper", age_days=1),
+        _stored("old", age_days=10),
+        _stored("recent", age_days=1),
+        _stored("back", age_days=30, vanished=True),
+        _stored("gone", age_days=2),
+    ]
+
+    plan = plan_refresh(discovered, stored, _NOW, RefreshPolicy(max_age=timedelta(days=7)))
+
+    assert plan.new_urls == (
+        "https://vicioso.example/products/new-one",
+        "https://vicioso.example/products/back",
+    )
+    assert plan.changed_urls == ("https://vicioso.example/products/cheaper",)
+    assert plan.stale_urls == ("https://vicioso.example/products/old",)
+    assert plan.fresh_urls == ("https://vicioso.example/products/recent",)
+    assert plan.vanished_perfume_ids == ("gone",)
+    assert plan.reappeared_perfume_ids == ("back",)
+
+
+def test_plan_refresh_caps_stale_fetches_oldest_first() -> None:
+    discovered = dict([_listed("a"), _listed("b"), _listed("c")])
+    stored = [_stored("a", age_days=8), _stored("b", age_days=20), _stored("c", age_days=12)]
+
+    plan = plan_refresh(discovered, stored, _NOW, RefreshPolicy(max_stale_fetches=2))
+
+    assert plan.stale_urls == ("https://vicioso.example/products/b", "https://vicioso.example/products/c")
+    assert plan.fresh_urls == ("https://vicioso.example/products/a",)
+
+
+def test_plan_refresh_skips_vanish_marking_after_incomplete_listing_crawl() -> None:
+    plan = plan_refresh({}, [_stored("gone", age_days=2)], _NOW, RefreshPolicy(), listing_complete=False)
+
+    assert plan.vanished_perfume_ids == ()
+
+
+def test_plan_refresh_treats_naive_stored_timestamps_as_utc() -> None:
+    discovered = dict([_listed("old"), _listed("recent"), _listed("never")])
+    stored = [
+        replace(_stored("old", age_days=0), last_scraped_at=datetime(2026, 1, 1)),
+        replace(_stored("recent", age_days=0), last_scraped_at=datetime(2026, 2, 28, 12)),
+        replace(_stored("never", age_days=0), last_scraped_at=None),
+    ]
+
+    plan = plan_refresh(discovered, stored, _NOW, RefreshPolicy())
+
+    assert plan.stale_urls == ("https://vicioso.example/products/never", "https://vicioso.example/products/old")
+    assert plan.fresh_urls == ("https://vicioso.example/products/recent",)
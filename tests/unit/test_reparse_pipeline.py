@@ -0,0 +1,114 @@
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+from pathlib import Path
+import sqlite3
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.application.pipelines.reparse_pipeline import ReparsePipeline
+from app.domain.models.perfume import Perfume
+from app.infrastructure.persistence.sqlite.html_snapshot_store import HtmlSnapshotStore
+from app.infrastructure.persistence.sqlite.perfume_repo_sqlite import PerfumeRepositorySqlite
+
+_AMBER_HTML = """
+    <meta name="description" content="Warm floral profile." />
+    <div>Top Notes: Bergamot</div>
+    <div>Base Notes: Vanilla</div>
+    <div>Duftfamilie: Blumig</div>
+"""
+
+
+def _repo_with(*perfumes: Perfume) -> PerfumeRepositorySqlite:
+    repo = PerfumeRepositorySqlite(sqlite3.connect(":memory:"))
+    repo.initialize_schema()
+    repo.upsert_perfumes(perfumes)
+    return repo
+
+
+def _perfume(perfume_id: str, **kwargs: object) -> Perfume:
+    return Perfume(
+        perfume_id=perfume_id,
+        name=perfume_id.title(),
+        url=f"https://vicioso.example/products/{perfume_id}",
+        price_min=59.9,
+        **kwargs,
+    )
+
+
+def test_reparse_directory_updates_changed_perfumes_and_reports_diff(tmp_path: Path) -> None:
+    (tmp_path / "amber-night.html").write_text(_AMBER_HTML, encoding="utf-8")
+    (tmp_path / "fresh-dawn.html.gz").write_bytes(gzip.compress(b"<div>Top Notes: Lemon</div>"))
+    (tmp_path / "unknown.html").write_text("<div>Top Notes: Oud</div>", encoding="utf-8")
+    repo = _repo_with(
+        _perfume("amber-night", notes_top=("Mandarin",)),
+        _perfume("fresh-dawn", notes_top=("Lemon",)),
+    )
+    pipeline = ReparsePipeline(
+        repo,
+        base_url="https://vicioso.example",
+        max_workers=2,
+        chunk_size=2,
+        executor_factory=ThreadPoolExecutor,
+    )
+
+    result = pipeline.run_directory(tmp_path)
+
+    assert result.parsed_count == 3
+    assert [change.perfume_id for change in result.changes] == ["amber-night"]
+    assert result.changes[0].changed_fields == ("description", "notes_top", "notes_base", "scent_families")
+    assert result.unchanged_count == 1
+    assert result.skipped_perfume_ids == ("unknown",)
+    stored = repo.get_perfume("amber-night")
+    assert stored.notes_top == ("Bergamot",)
+    assert stored.scent_families == ("Floral",)
+    assert stored.price_min == 59.9
+
+
+def test_reparse_archive_uses_process_pool_and_latest_product_snapshots(tmp_path: Path) -> None:
+    connection = sqlite3.connect(":memory:")
+    repo = PerfumeRepositorySqlite(connection)
+    repo.initialize_schema()
+    repo.upsert_perfume(_perfume("amber-night"))
+    store = HtmlSnapshotStore(connection, tmp_path)
+    store.save("https://vicioso.example/collections/all", "<a href='/products/amber-night'>A</a>")
+    store.save("https://vicioso.example/products/amber-night", _AMBER_HTML)
+    store.close()
+
+    result = ReparsePipeline(repo, base_url="https://vicioso.example", max_workers=2).run_archive(store)
+
+    assert result.parsed_count == 1
+    assert result.changes[0].perfume_id == "amber-night"
+    assert repo.get_perfume("amber-night").notes_base == ("Vanilla",)
+    assert result.pages_per_second > 0
+
+
+def test_reparse_keeps_a_bounded_window_of_chunks_in_flight() -> None:
+    read_ahead: list[int] = []
+    pulled = 0
+
+    def pages() -> Iterator[tuple[str, str]]:
+        nonlocal pulled
+        for index in range(40):
+            pulled += 1
+            yield f"perfume-{index}", "<div>Top Notes: Lemon</div>"
+
+    class _Repository:
+        def get_perfumes(self, perfume_ids: tuple[str, ...]) -> dict[str, Perfume]:
+            read_ahead.append(pulled)
+            return {}
+
+    pipeline = ReparsePipeline(
+        _Repository(),
+        base_url="https://vicioso.example",
+        max_workers=2,
+        chunk_size=1,
+        executor_factory=ThreadPoolExecutor,
+    )
+
+    result = pipeline.run(pages())
+
+    assert result.parsed_count == 40
+    # Two workers keep at most four one-page chunks in flight ahead of the writer.
+    assert max(count - seen for seen, count in enumerate(read_ahead)) <= 4
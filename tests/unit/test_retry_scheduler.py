@@ -0,0 +1,64 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.infrastructure.scraping.retry_scheduler import RetryScheduler
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_retry_scheduler_orders_by_ready_time_and_waits_until_due() -> None:
+    clock = _FakeClock()
+    scheduler = RetryScheduler(time_func=clock, random_func=lambda low, high: low)
+
+    scheduler.schedule("https://a.example/slow", retry_after_seconds=10.0)
+    scheduler.schedule("https://a.example/fast")
+
+    assert len(scheduler) == 2
+    assert scheduler.pop_ready() is None
+    assert scheduler.next_ready_in() == 1.0
+
+    clock.now += 1.0
+    assert scheduler.pop_ready().url == "https://a.example/fast"
+    assert scheduler.pop_ready() is None
+
+    clock.now += 9.0
+    assert scheduler.pop_ready().url == "https://a.example/slow"
+    assert scheduler.next_ready_in() is None
+
+
+def test_retry_scheduler_uses_decorrelated_jitter_capped_at_max_delay() -> None:
+    clock = _FakeClock()
+    bounds: list[tuple[float, float]] = []
+
+    def highest(low: float, high: float) -> float:
+        bounds.append((low, high))
+        return high
+
+    scheduler = RetryScheduler(
+        max_attempts=5, base_delay_seconds=1.0, max_delay_seconds=20.0, time_func=clock, random_func=highest
+    )
+    delays = [scheduler.schedule("https://a.example/p").ready_at - clock.now for _ in range(4)]
+
+    assert delays == [3.0, 9.0, 20.0, 20.0]
+    assert bounds[:3] == [(1.0, 3.0), (1.0, 9.0), (1.0, 27.0)]
+
+
+def test_retry_scheduler_honors_retry_after_and_stops_after_max_attempts() -> None:
+    clock = _FakeClock()
+    scheduler = RetryScheduler(max_attempts=2, time_func=clock, random_func=lambda low, high: low)
+
+    first = scheduler.schedule("https://a.example/p", retry_after_seconds=30.0)
+    second = scheduler.schedule("https://a.example/p")
+
+    assert first.ready_at == 130.0
+    assert (first.attempt, second.attempt) == (1, 2)
+    assert scheduler.schedule("https://a.example/p") is None
+    assert scheduler.attempts("https://a.example/p") == 2
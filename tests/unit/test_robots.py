@@ -1,14 +1,18 @@
+import asyncio
 from pathlib import Path
 import sys
+import threading
 
 import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 from app.infrastructure.scraping.robots import (
+    AsyncTokenBucketRateLimiter,
     DomainRateLimiter,
     RobotsTxtPolicy,
     ScrapeAccessGuard,
+    TokenBucketRateLimiter,
 )
 
 
@@ -32,6 +36,36 @@ def test_robots_policy_allows_when_robots_unavailable() -> None:
     assert policy.can_fetch("https://vicioso.example/products/amber-night") is True
 
 
+def test_robots_policy_fetches_each_origin_once_without_blocking_other_origins() -> None:
+    slow_started = threading.Event()
+    release_slow = threading.Event()
+    fetched: list[str] = []
+
+    def fetcher(origin: str) -> str:
+        fetched.append(origin)
+        if origin == "https://slow.example":
+            slow_started.set()
+            assert release_slow.wait(5.0)
+        return "User-agent: *\nDisallow: /private"
+
+    policy = RobotsTxtPolicy(robots_fetcher=fetcher)
+    slow_lookups = [
+        threading.Thread(target=policy.can_fetch, args=("https://slow.example/products/a",)) for _ in range(4)
+    ]
+    for thread in slow_lookups:
+        thread.start()
+    assert slow_started.wait(5.0)
+
+    # The slow origin is still loading; another origin resolves without waiting for it.
+    assert policy.can_fetch("https://fast.example/private/a") is False
+    release_slow.set()
+    for thread in slow_lookups:
+        thread.join()
+
+    assert policy.can_fetch("https://slow.example/private/a") is False
+    assert sorted(fetched) == ["https://fast.example", "https://slow.example"]
+
+
 def test_domain_rate_limiter_waits_for_same_domain_only() -> None:
     now = {"value": 0.0}
     sleeps: list[float] = []
@@ -66,3 +100,104 @@ def test_scrape_access_guard_raises_on_robots_block() -> None:
 
     with pytest.raises(PermissionError, match="robots.txt forbids"):
         guard.enforce("https://vicioso.example/products/amber-night")
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_spaces_requests_per_domain() -> None:
+    clock = _FakeClock()
+    limiter = TokenBucketRateLimiter(rate_per_second=2.0, burst=3, time_func=clock.time, sleep_func=clock.sleep)
+
+    for _ in range(5):
+        limiter.wait_for_slot("https://vicioso.example/a")
+    limiter.wait_for_slot("https://other.example/a")
+
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_token_bucket_gives_concurrent_workers_distinct_slots() -> None:
+    limiter = TokenBucketRateLimiter(rate_per_second=10.0, burst=1, time_func=lambda: 0.0)
+    delays: list[float] = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+        delay = limiter.reserve("https://vicioso.example/p")
+        with lock:
+            delays.append(delay)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(round(delay, 6) for delay in delays) == [round(0.1 * index, 6) for index in range(8)]
+
+
+def test_token_bucket_penalize_honors_retry_after_and_recovers() -> None:
+    clock = _FakeClock()
+    limiter = TokenBucketRateLimiter(
+        rate_per_second=1.0, recovery_seconds=10.0, time_func=clock.time, sleep_func=clock.sleep
+    )
+
+    limiter.wait_for_slot("https://vicioso.example/a")
+    limiter.penalize("https://vicioso.example/a", retry_after_seconds=30.0)
+
+    assert limiter.current_rate("https://vicioso.example/a") == 0.5
+    assert limiter.reserve("https://vicioso.example/a") == 30.0
+    clock.now = 40.0
+    assert limiter.current_rate("https://vicioso.example/a") == 1.0
+
+
+def test_async_token_bucket_shares_budget_with_sync_limiter() -> None:
+    slept: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        slept.append(seconds)
+
+    limiter = TokenBucketRateLimiter(rate_per_second=4.0, time_func=lambda: 0.0)
+    async_limiter = AsyncTokenBucketRateLimiter(limiter=limiter, sleep_func=fake_sleep)
+
+    async def scenario() -> None:
+        await asyncio.gather(*(async_limiter.wait_for_slot("https://vicioso.example/a") for _ in range(3)))
+
+    asyncio.run(scenario())
+
+    assert sorted(slept) == [0.25, 0.5]
+
+
+def test_access_guard_applies_robots_crawl_delay_to_token_bucket() -> None:
+    clock = _FakeClock()
+    policy = RobotsTxtPolicy(
+        user_agent="PerfumeRecommenderBot",
+        robots_fetcher=lambda origin: "User-agent: *\nCrawl-delay: 5\nAllow: /",
+    )
+    limiter = TokenBucketRateLimiter(rate_per_second=1.0, time_func=clock.time, sleep_func=clock.sleep)
+    guard = ScrapeAccessGuard(robots_policy=policy, rate_limiter=limiter)
+
+    guard.enforce("https://vicioso.example/a")
+    guard.enforce("https://vicioso.example/b")
+
+    assert policy.crawl_delay("https://vicioso.example/a") == 5.0
+    assert clock.sleeps == [5.0]
+
+
+def test_access_guard_report_throttled_penalizes_token_bucket() -> None:
+    limiter = TokenBucketRateLimiter(rate_per_second=2.0, time_func=lambda: 0.0)
+    guard = ScrapeAccessGuard(robots_policy=RobotsTxtPolicy(robots_fetcher=lambda origin: ""), rate_limiter=limiter)
+
+    guard.report_throttled("https://vicioso.example/a", retry_after_seconds=12.0)
+
+    assert limiter.current_rate("https://vicioso.example/a") == 1.0
+    assert limiter.reserve("https://vicioso.example/a") == 12.0
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sqlite3
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.infrastructure.persistence.sqlite.robots_cache_sqlite import RobotsCacheSqlite
+from app.infrastructure.scraping.robots import RobotsFetchResult, RobotsTxtPolicy
+
+_ORIGIN = "https://vicioso.example"
+
+
+class _FakeConditionalFetcher:
+    def __init__(self, results: list[RobotsFetchResult | OSError]) -> None:
+        self.results = results
+        self.calls: list[tuple[str, str | None, str | None]] = []
+
+    def __call__(self, origin: str, etag: str | None, last_modified: str | None) -> RobotsFetchResult:
+        self.calls.append((origin, etag, last_modified))
+        result = self.results.pop(0)
+        if isinstance(result, OSError):
+            raise result
+        return result
+
+
+def _cache() -> RobotsCacheSqlite:
+    cache = RobotsCacheSqlite(sqlite3.connect(":memory:"))
+    cache.initialize_schema()
+    return cache
+
+
+def test_robots_cache_reuses_fresh_body_across_policies() -> None:
+    cache = _cache()
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    fetcher = _FakeConditionalFetcher(
+        [RobotsFetchResult(body="User-agent: *\nDisallow: /private", etag='"v1"')]
+    )
+
+    first = RobotsTxtPolicy(cache=cache, conditional_fetcher=fetcher, now_func=lambda: now)
+    second = RobotsTxtPolicy(
+        cache=cache, conditional_fetcher=fetcher, now_func=lambda: now + timedelta(hours=1)
+    )
+
+    assert first.can_fetch(f"{_ORIGIN}/private/a") is False
+    assert second.can_fetch(f"{_ORIGIN}/private/a") is False
+    assert fetcher.calls == [(_ORIGIN, None, None)]
+    assert cache.get(_ORIGIN).etag == '"v1"'
+
+
+def test_robots_cache_revalidates_expired_entry_with_validators() -> None:
+    cache = _cache()
+    fetched_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    cache.save(_ORIGIN, "User-agent: *\nDisallow: /private", '"v1"', "Thu, 01 Jan 2026 00:00:00 GMT", fetched_at)
+    fetcher = _FakeConditionalFetcher([RobotsFetchResult(body=None)])
+    later = fetched_at + timedelta(days=2)
+
+    policy = RobotsTxtPolicy(cache=cache, conditional_fetcher=fetcher, now_func=lambda: later)
+
+    assert policy.can_fetch(f"{_ORIGIN}/private/a") is False
+    assert fetcher.calls == [(_ORIGIN, '"v1"', "Thu, 01 Jan 2026 00:00:00 GMT")]
+    assert cache.get(_ORIGIN).fetched_at == later
+
+
+def test_robots_cache_keeps_stale_rules_when_refetch_fails() -> None:
+    cache = _cache()
+    fetched_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    cache.save(_ORIGIN, "User-agent: *\nDisallow: /private", None, None, fetched_at)
+    fetcher = _FakeConditionalFetcher([OSError("network unavailable")])
+
+    policy = RobotsTxtPolicy(
+        cache=cache, conditional_fetcher=fetcher, now_func=lambda: fetched_at + timedelta(days=2)
+    )
+
+    assert policy.can_fetch(f"{_ORIGIN}/private/a") is False
+    assert cache.get(_ORIGIN).fetched_at == fetched_at
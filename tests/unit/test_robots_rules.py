@@ -0,0 +1,53 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.infrastructure.scraping.robots_rules import RobotsRules, compile_robots_rules
+
+
+def test_robots_rules_longest_match_wins_regardless_of_order() -> None:
+    rules = RobotsRules([("/", False), ("/products/", True), ("/products/private", False)])
+
+    assert rules.can_fetch("https://vicioso.example/collections/all") is False
+    assert rules.can_fetch("https://vicioso.example/products/amber-night") is True
+    assert rules.can_fetch("https://vicioso.example/products/private-sale") is False
+    assert rules.can_fetch("https://vicioso.example/robots.txt") is True
+
+
+def test_robots_rules_allow_wins_tie_and_wildcards_match() -> None:
+    rules = RobotsRules(
+        [("/search", False), ("/search", True), ("/*.json$", False), ("/*?sort=", False)]
+    )
+
+    assert rules.can_fetch("https://vicioso.example/search?q=rose") is True
+    assert rules.can_fetch("https://vicioso.example/products/a.json") is False
+    assert rules.can_fetch("https://vicioso.example/products/a.json?v=1") is True
+    assert rules.can_fetch("https://vicioso.example/collections/all?sort=price") is False
+
+
+def test_compile_robots_rules_prefers_specific_user_agent_group() -> None:
+    robots_text = """
+        User-agent: *
+        Disallow: /
+
+        User-agent: OtherBot
+        User-agent: PerfumeRecommenderBot
+        Disallow: /cart
+        Crawl-delay: 2.5 # seconds
+    """
+
+    ours = compile_robots_rules(robots_text, "PerfumeRecommenderBot/1.0")
+    anyone = compile_robots_rules(robots_text, "SomeCrawler/2.0")
+
+    assert ours.can_fetch("https://vicioso.example/products/a") is True
+    assert ours.can_fetch("https://vicioso.example/cart") is False
+    assert ours.crawl_delay == 2.5
+    assert anyone.can_fetch("https://vicioso.example/products/a") is False
+
+
+def test_compile_robots_rules_reads_request_rate_and_ignores_empty_disallow() -> None:
+    rules = compile_robots_rules("User-agent: *\nDisallow:\nRequest-rate: 1/4", "PerfumeRecommenderBot")
+
+    assert rules.can_fetch("https://vicioso.example/anything") is True
+    assert rules.crawl_delay == 4.0
@@ -1,12 +1,19 @@
+from datetime import datetime, timezone
+import gzip
 from pathlib import Path
 import sys
-from urllib import error
+from urllib import error, request
 
 import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-from app.infrastructure.scraping.client import ScrapeHttpClient
+from app.config.metrics import MetricsCollector
+from app.infrastructure.scraping.client import (
+    ResponseTooLargeError,
+    ScrapeHttpClient,
+    parse_retry_after,
+)
 
 
 class _FakeResponse:
@@ -115,3 +122,147 @@ def test_fetch_retries_and_raises_after_max_retries(monkeypatch: pytest.MonkeyPa
 
     assert calls["count"] == 3
     assert slept == [1.0, 2.0]
+
+
+def test_fetch_without_retry_raises_the_first_transient_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = {"count": 0}
+    slept: list[float] = []
+
+    def fake_urlopen(req: request.Request, timeout: float) -> _FakeResponse:
+        calls["count"] += 1
+        raise error.HTTPError(req.full_url, 503, "Service Unavailable", hdrs=None, fp=None)
+
+    monkeypatch.setattr("urllib.request.urlopen", fake_urlopen)
+    client = ScrapeHttpClient(max_retries=2, sleep_func=slept.append)
+
+    with pytest.raises(error.HTTPError):
+        client.fetch("https://example.com/unavailable", retry=False)
+
+    assert calls["count"] == 1
+    assert slept == []
+
+
+class _StreamingFakeResponse(_FakeResponse):
+    def __init__(self, url: str, body: bytes, headers: dict[str, str]) -> None:
+        super().__init__(url=url, body="")
+        self._body = body
+        self.headers = headers
+        self.read_sizes: list[int] = []
+
+    def read(self, size: int = -1) -> bytes:
+        self.read_sizes.append(size)
+        chunk, self._body = self._body[:size], self._body[size:]
+        return chunk
+
+
+def test_streaming_fetch_decodes_gzip_and_split_utf8_sequences(monkeypatch: pytest.MonkeyPatch) -> None:
+    body = gzip.compress("<html>Süß Vanille</html>".encode("utf-8"))
+    responses: list[_StreamingFakeResponse] = []
+
+    def fake_urlopen(req, timeout):  # noqa: ANN001
+        assert req.headers["Accept-encoding"] == "gzip, deflate"
+        response = _StreamingFakeResponse(req.full_url, body, {"Content-Encoding": "gzip"})
+        responses.append(response)
+        return response
+
+    monkeypatch.setattr("urllib.request.urlopen", fake_urlopen)
+    client = ScrapeHttpClient(stream=True, accept_compressed=True, read_chunk_size=3)
+
+    response = client.fetch("https://example.com/products/sweet")
+
+    assert response.text == "<html>Süß Vanille</html>"
+    assert set(responses[0].read_sizes) == {3}
+
+
+def test_streaming_fetch_enforces_max_body_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_urlopen(req, timeout):  # noqa: ANN001
+        return _StreamingFakeResponse(req.full_url, b"x" * 100, {})
+
+    monkeypatch.setattr("urllib.request.urlopen", fake_urlopen)
+    client = ScrapeHttpClient(stream=True, max_body_bytes=64, read_chunk_size=16)
+
+    with pytest.raises(ResponseTooLargeError, match="64 bytes"):
+        client.fetch("https://example.com/huge")
+
+
+def test_streaming_fetch_rejects_declared_oversized_body_before_reading(monkeypatch: pytest.MonkeyPatch) -> None:
+    responses: list[_StreamingFakeResponse] = []
+
+    def fake_urlopen(req, timeout):  # noqa: ANN001
+        response = _StreamingFakeResponse(req.full_url, b"x" * 10, {"Content-Length": "5000"})
+        responses.append(response)
+        return response
+
+    monkeypatch.setattr("urllib.request.urlopen", fake_urlopen)
+    client = ScrapeHttpClient(stream=True, max_body_bytes=1000)
+
+    with pytest.raises(ResponseTooLargeError):
+        client.fetch("https://example.com/declared-huge")
+
+    assert responses[0].read_sizes == []
+
+
+def test_parse_retry_after_supports_seconds_and_http_dates() -> None:
+    now = datetime(2026, 2, 19, 12, 0, 0, tzinfo=timezone.utc)
+
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Thu, 19 Feb 2026 12:00:30 GMT", now=now) == 30.0
+    assert parse_retry_after("Thu, 19 Feb 2026 11:00:00 GMT", now=now) == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_fetch_records_requests_retries_and_bytes_in_metrics(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = {"count": 0}
+
+    def fake_urlopen(req, timeout):  # noqa: ANN001
+        calls["count"] += 1
+        if calls["count"] == 1:
+            raise error.URLError("temporary failure")
+        return _FakeResponse(url=req.full_url, body="<html>ok</html>")
+
+    monkeypatch.setattr("urllib.request.urlopen", fake_urlopen)
+    metrics = MetricsCollector()
+    client = ScrapeHttpClient(sleep_func=lambda seconds: None, metrics=metrics)
+
+    client.fetch("https://example.com/products")
+    summary = metrics.summary()
+
+    assert summary.counters == {"http_requests": 2, "http_retries": 1, "http_bytes_received": 15}
+    assert summary.histograms["http_request"].count == 2
+
+
+class _RecordingLimiter:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str, float | None]] = []
+
+    def wait_for_slot(self, url: str) -> None:
+        self.calls.append(("wait", url, None))
+
+    def penalize(self, url: str, retry_after_seconds: float | None = None) -> None:
+        self.calls.append(("penalize", url, retry_after_seconds))
+
+
+def test_fetch_takes_a_rate_limit_slot_before_each_retry(monkeypatch: pytest.MonkeyPatch) -> None:
+    failures = [
+        error.HTTPError("https://example.com/p", 503, "Service Unavailable", hdrs={"Retry-After": "7"}, fp=None),
+        error.URLError("temporary failure"),
+    ]
+
+    def fake_urlopen(req: request.Request, timeout: float) -> _FakeResponse:
+        if failures:
+            raise failures.pop(0)
+        return _FakeResponse(url=req.full_url, body="done")
+
+    monkeypatch.setattr("urllib.request.urlopen", fake_urlopen)
+    limiter = _RecordingLimiter()
+    client = ScrapeHttpClient(max_retries=3, sleep_func=lambda seconds: None, rate_limiter=limiter)
+
+    response = client.fetch("https://example.com/p")
+
+    assert response.text == "done"
+    assert limiter.calls == [
+        ("penalize", "https://example.com/p", 7.0),
+        ("wait", "https://example.com/p", None),
+        ("wait", "https://example.com/p", None),
+    ]
@@ -1,11 +1,22 @@
 from pathlib import Path
+from datetime import datetime, timezone
+from email.message import Message
+import sqlite3
 import sys
+from urllib import error
+
+import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 from app.application.pipelines.scrape_pipeline import ScrapePipeline
+from app.config.metrics import MetricsCollector
 from app.domain.models.perfume import Perfume
+from app.infrastructure.persistence.sqlite.crawl_frontier_sqlite import CrawlFrontierSqlite
+from app.infrastructure.persistence.sqlite.html_snapshot_store import HtmlSnapshotStore
 from app.infrastructure.scraping.client import ScrapeHttpResponse
+from app.infrastructure.scraping.retry_scheduler import RetryScheduler
+from app.infrastructure.scraping.robots import RobotsTxtPolicy, ScrapeAccessGuard, TokenBucketRateLimiter
 
 
 class _FakeHttpClient:
@@ -13,7 +24,7 @@ class _FakeHttpClient:
         self.pages = pages
         self.failing_urls = failing_urls or set()
 
-    def fetch(self, url: str) -> ScrapeHttpResponse:
+    def fetch(self, url: str, retry: bool = True) -> ScrapeHttpResponse:
         if url in self.failing_urls:
             raise RuntimeError("fetch failed")
         return ScrapeHttpResponse(url=url, status_code=200, text=self.pages[url], headers={})
@@ -137,3 +148,352 @@ def test_scrape_pipeline_respects_access_guard_forbidden_url() -> None:
     assert result.scraped_count == 0
     assert result.failed_product_urls == ("https://vicioso.example/products/amber-night",)
     assert pipeline.perfume_repository.saved == []
+
+
+def test_scrape_pipeline_archives_html_and_reparses_offline(tmp_path: Path) -> None:
+    pages = {
+        "https://vicioso.example/collections/all": """
+            <article><a href=\"/products/amber-night\">Amber Night</a><span>€59,90</span></article>
+        """,
+        "https://vicioso.example/products/amber-night": """
+            <div>Top Notes: Bergamot</div>
+            <div>Duftfamilie: Blumig</div>
+        """,
+    }
+    store = HtmlSnapshotStore(sqlite3.connect(":memory:"), tmp_path / "raw_html")
+    store.initialize_schema()
+    online = ScrapePipeline(
+        http_client=_FakeHttpClient(pages),
+        access_guard=_FakeAccessGuard(),
+        perfume_repository=_FakePerfumeRepo(),
+        base_url="https://vicioso.example",
+        snapshot_store=store,
+    )
+    online.run(seed_listing_urls=("/collections/all",))
+
+    guard = _FakeAccessGuard()
+    offline = ScrapePipeline(
+        http_client=_FakeHttpClient({}, failing_urls=set(pages)),
+        access_guard=guard,
+        perfume_repository=_FakePerfumeRepo(),
+        base_url="https://vicioso.example",
+        snapshot_store=store,
+    )
+    result = offline.run(seed_listing_urls=("/collections/all",), offline=True)
+
+    assert result.scraped_count == 1
+    assert guard.checked_urls == []
+    assert offline.perfume_repository.saved[0].notes_top == ("Bergamot",)
+    assert offline.perfume_repository.saved[0].price_min == 59.9
+
+
+def test_offline_reparse_keeps_the_snapshot_fetch_time_as_last_scraped_at(tmp_path: Path) -> None:
+    fetched_at = datetime(2026, 1, 5, 12, 0, tzinfo=timezone.utc)
+    store = HtmlSnapshotStore(sqlite3.connect(":memory:"), tmp_path / "raw_html")
+    store.initialize_schema()
+    store.save(
+        "https://vicioso.example/collections/all",
+        '<article><a href="/products/amber-night">Amber Night</a></article>',
+        fetched_at=fetched_at,
+    )
+    store.save("https://vicioso.example/products/amber-night", "<div>Top Notes: Bergamot</div>", fetched_at=fetched_at)
+    store.flush()
+    pipeline = ScrapePipeline(
+        http_client=_FakeHttpClient({}),
+        access_guard=_FakeAccessGuard(),
+        perfume_repository=_FakePerfumeRepo(),
+        base_url="https://vicioso.example",
+        snapshot_store=store,
+    )
+
+    pipeline.run(seed_listing_urls=("/collections/all",), offline=True)
+
+    assert pipeline.perfume_repository.saved[0].last_scraped_at == fetched_at
+
+
+def test_scrape_pipeline_offline_mode_requires_snapshot_store() -> None:
+    pipeline = ScrapePipeline(
+        http_client=_FakeHttpClient({}),
+        access_guard=_FakeAccessGuard(),
+        perfume_repository=_FakePerfumeRepo(),
+        base_url="https://vicioso.example",
+    )
+
+    with pytest.raises(ValueError, match="snapshot_store"):
+        pipeline.run(seed_listing_urls=("/collections/all",), offline=True)
+
+
+def test_scrape_pipeline_reports_throttled_responses_to_access_guard() -> None:
+    class _ThrottledHttpClient(_FakeHttpClient):
+        def fetch(self, url: str, retry: bool = True) -> ScrapeHttpResponse:
+            if "/products/" in url:
+                headers = Message()
+                headers["Retry-After"] = "30"
+                raise error.HTTPError(url, 429, "Too Many Requests", hdrs=headers, fp=None)
+            return super().fetch(url)
+
+    class _ThrottleAwareGuard(_FakeAccessGuard):
+        def __init__(self) -> None:
+            super().__init__()
+            self.throttled: list[tuple[str, float | None]] = []
+
+        def report_throttled(self, url: str, retry_after_seconds: float | None = None) -> None:
+            self.throttled.append((url, retry_after_seconds))
+
+    pages = {
+        "https://vicioso.example/collections/all": """
+            <article><a href=\"/products/amber-night\">Amber Night</a></article>
+        """,
+    }
+    guard = _ThrottleAwareGuard()
+    pipeline = ScrapePipeline(
+        http_client=_ThrottledHttpClient(pages),
+        access_guard=guard,
+        perfume_repository=_FakePerfumeRepo(),
+        base_url="https://vicioso.example",
+    )
+
+    result = pipeline.run(seed_listing_urls=("/collections/all",))
+
+    assert result.failed_product_urls == ("https://vicioso.example/products/amber-night",)
+    assert guard.throttled == [("https://vicioso.example/products/amber-night", 30.0)]
+
+
+def test_scrape_pipeline_requeues_transient_failures_without_blocking_other_urls() -> None:
+    class _FlakyHttpClient(_FakeHttpClient):
+        def __init__(self, pages: dict[str, str]) -> None:
+            super().__init__(pages)
+            self.fetched: list[str] = []
+            self.inline_retries: dict[str, set[bool]] = {}
+            self.remaining_failures = {
+                "https://vicioso.example/products/amber-night": 1,
+                "https://vicioso.example/products/gone": 5,
+            }
+
+        def fetch(self, url: str, retry: bool = True) -> ScrapeHttpResponse:
+            self.fetched.append(url)
+            self.inline_retries.setdefault(url, set()).add(retry)
+            if self.remaining_failures.get(url, 0) > 0:
+                self.remaining_failures[url] -= 1
+                headers = Message()
+                headers["Retry-After"] = "2"
+                raise error.HTTPError(url, 503, "Service Unavailable", hdrs=headers, fp=None)
+            return super().fetch(url)
+
+    class _Clock:
+        now = 0.0
+
+    clock = _Clock()
+    slept: list[float] = []
+
+    def fake_sleep(seconds: float) -> None:
+        slept.append(seconds)
+        clock.now += seconds
+
+    pages = {
+        "https://vicioso.example/collections/all": """
+            <article><a href=\"/products/amber-night\">Amber Night</a></article>
+            <article><a href=\"/products/gone\">Gone</a></article>
+            <article><a href=\"/products/fresh-dawn\">Fresh Dawn</a></article>
+        """,
+        "https://vicioso.example/products/amber-night": "<div>Top Notes: Bergamot</div>",
+        "https://vicioso.example/products/fresh-dawn": "<div>Top Notes: Lemon</div>",
+    }
+    http_client = _FlakyHttpClient(pages)
+    pipeline = ScrapePipeline(
+        http_client=http_client,
+        access_guard=_FakeAccessGuard(),
+        perfume_repository=_FakePerfumeRepo(),
+        base_url="https://vicioso.example",
+        retry_scheduler=RetryScheduler(
+            max_attempts=2, time_func=lambda: clock.now, random_func=lambda low, high: low
+        ),
+        sleep_func=fake_sleep,
+    )
+
+    result = pipeline.run(seed_listing_urls=("/collections/all",))
+
+    assert http_client.fetched[1:4] == [
+        "https://vicioso.example/products/amber-night",
+        "https://vicioso.example/products/gone",
+        "https://vicioso.example/products/fresh-dawn",
+    ]
+    assert result.scraped_count == 2
+    assert result.retried_count == 3
+    assert result.permanently_failed_count == 1
+    assert result.failed_product_urls == ("https://vicioso.example/products/gone",)
+    assert slept and all(seconds > 0 for seconds in slept)
+    assert http_client.inline_retries.pop("https://vicioso.example/collections/all") == {True}
+    assert set().union(*http_client.inline_retries.values()) == {False}
+
+
+def test_scrape_pipeline_resumes_interrupted_crawl_from_frontier() -> None:
+    class _Interrupted(BaseException):
+        pass
+
+    class _CrashingRepo(_FakePerfumeRepo):
+        def upsert_perfume(self, perfume: Perfume) -> None:
+            if perfume.perfume_id == "fresh-dawn":
+                raise _Interrupted()
+            super().upsert_perfume(perfume)
+
+    class _RecordingHttpClient(_FakeHttpClient):
+        def __init__(self, pages: dict[str, str]) -> None:
+            super().__init__(pages)
+            self.fetched: list[str] = []
+
+        def fetch(self, url: str, retry: bool = True) -> ScrapeHttpResponse:
+            self.fetched.append(url)
+            return super().fetch(url)
+
+    pages = {
+        "https://vicioso.example/collections/all": """
+            <article><a href=\"/products/amber-night\">Amber Night</a><span>€59,90</span></article>
+            <a href=\"/collections/all?page=2\">Next</a>
+        """,
+        "https://vicioso.example/collections/all?page=2": """
+            <article><a href=\"/products/fresh-dawn\">Fresh Dawn</a></article>
+        """,
+        "https://vicioso.example/products/amber-night": "<div>Top Notes: Bergamot</div>",
+        "https://vicioso.example/products/fresh-dawn": "<div>Top Notes: Lemon</div>",
+    }
+    connection = sqlite3.connect(":memory:")
+    frontier = CrawlFrontierSqlite(connection, checkpoint_every=1)
+    frontier.initialize_schema()
+
+    with pytest.raises(_Interrupted):
+        ScrapePipeline(
+            http_client=_FakeHttpClient(pages),
+            access_guard=_FakeAccessGuard(),
+            perfume_repository=_CrashingRepo(),
+            base_url="https://vicioso.example",
+            frontier=frontier,
+        ).run(seed_listing_urls=("/collections/all",))
+
+    http_client = _RecordingHttpClient(pages)
+    repo = _FakePerfumeRepo()
+    result = ScrapePipeline(
+        http_client=http_client,
+        access_guard=_FakeAccessGuard(),
+        perfume_repository=repo,
+        base_url="https://vicioso.example",
+        frontier=CrawlFrontierSqlite(connection),
+    ).resume()
+
+    assert http_client.fetched == ["https://vicioso.example/products/fresh-dawn"]
+    assert [perfume.perfume_id for perfume in repo.saved] == ["fresh-dawn"]
+    assert result.scraped_count == 2
+    assert result.discovered_product_urls == (
+        "https://vicioso.example/products/amber-night",
+        "https://vicioso.example/products/fresh-dawn",
+    )
+    assert {entry.status for entry in frontier.entries()} == {"done"}
+
+
+def test_scrape_pipeline_offline_run_leaves_frontier_checkpoint_alone(tmp_path: Path) -> None:
+    pages = {
+        "https://vicioso.example/collections/all": """
+            <article><a href=\"/products/amber-night\">Amber Night</a></article>
+            <article><a href=\"/products/fresh-dawn\">Fresh Dawn</a></article>
+        """,
+        "https://vicioso.example/products/amber-night": "<div>Top Notes: Bergamot</div>",
+        "https://vicioso.example/products/fresh-dawn": "<div>Top Notes: Lemon</div>",
+    }
+    store = HtmlSnapshotStore(sqlite3.connect(":memory:"), tmp_path / "raw_html")
+    store.initialize_schema()
+    ScrapePipeline(
+        http_client=_FakeHttpClient(pages),
+        access_guard=_FakeAccessGuard(),
+        perfume_repository=_FakePerfumeRepo(),
+        base_url="https://vicioso.example",
+        snapshot_store=store,
+    ).run(seed_listing_urls=("/collections/all",))
+    frontier = CrawlFrontierSqlite(sqlite3.connect(":memory:"))
+    frontier.initialize_schema()
+    frontier.reset(["https://vicioso.example/collections/all"])
+    frontier.add("https://vicioso.example/collections/sale", "listing")
+    frontier.checkpoint()
+    checkpoint = frontier.entries()
+
+    result = ScrapePipeline(
+        http_client=_FakeHttpClient({}, failing_urls=set(pages)),
+        access_guard=_FakeAccessGuard(),
+        perfume_repository=_FakePerfumeRepo(),
+        base_url="https://vicioso.example",
+        snapshot_store=store,
+        frontier=frontier,
+    ).run(seed_listing_urls=("/collections/all",), offline=True)
+
+    assert result.scraped_count == 2
+    assert frontier.entries() == checkpoint
+
+
+def test_scrape_pipeline_resume_requires_frontier() -> None:
+    pipeline = ScrapePipeline(
+        http_client=_FakeHttpClient({}),
+        access_guard=_FakeAccessGuard(),
+        perfume_repository=_FakePerfumeRepo(),
+        base_url="https://vicioso.example",
+    )
+
+    with pytest.raises(ValueError):
+        pipeline.resume()
+
+
+def test_scrape_pipeline_attaches_stage_metrics_to_result() -> None:
+    pages = {
+        "https://vicioso.example/collections/all": """
+            <article><a href=\"/products/amber-night\">Amber Night</a></article>
+        """,
+        "https://vicioso.example/products/amber-night": "<div>Top Notes: Bergamot</div>",
+    }
+    metrics = MetricsCollector()
+    guard = ScrapeAccessGuard(
+        robots_policy=RobotsTxtPolicy(robots_fetcher=lambda origin: ""),
+        rate_limiter=TokenBucketRateLimiter(rate_per_second=1000.0, burst=10),
+        metrics=metrics,
+    )
+    pipeline = ScrapePipeline(
+        http_client=_FakeHttpClient(pages),
+        access_guard=guard,
+        perfume_repository=_FakePerfumeRepo(),
+        base_url="https://vicioso.example",
+        metrics=metrics,
+    )
+
+    result = pipeline.run(seed_listing_urls=("/collections/all",))
+
+    assert result.metrics.counters["pages_fetched"] == 2
+    assert result.metrics.gauges["pages_per_second"] > 0
+    assert {name: summary.count for name, summary in result.metrics.histograms.items()} == {
+        "robots_check": 2,
+        "rate_limit_wait": 2,
+        "fetch": 2,
+        "parse": 2,
+        "upsert": 1,
+    }
+
+
+def test_scrape_pipeline_publishes_catalog_only_when_something_was_scraped() -> None:
+    pages = {
+        "https://vicioso.example/collections/all": """
+            <article><a href=\"/products/amber-night\">Amber Night</a></article>
+        """,
+        "https://vicioso.example/products/amber-night": "<div>Top Notes: Bergamot</div>",
+    }
+    published: list[str] = []
+
+    def build(failing_urls: set[str]) -> ScrapePipeline:
+        return ScrapePipeline(
+            http_client=_FakeHttpClient(pages, failing_urls=failing_urls),
+            access_guard=_FakeAccessGuard(),
+            perfume_repository=_FakePerfumeRepo(),
+            base_url="https://vicioso.example",
+            catalog_publisher=lambda: published.append("published"),
+        )
+
+    build({"https://vicioso.example/products/amber-night"}).run(seed_listing_urls=("/collections/all",))
+    assert published == []
+
+    build(set()).run(seed_listing_urls=("/collections/all",))
+    assert published == ["published"]
@@ -21,7 +21,7 @@ class _FakeHttpClient:
         self.pages = pages
         self.failing_urls = failing_urls or set()
 
-    def fetch(self, url: str) -> ScrapeHttpResponse:
+    def fetch(self, url: str, retry: bool = True) -> ScrapeHttpResponse:
         if url in self.failing_urls:
             raise RuntimeError("fetch failed")
         return ScrapeHttpResponse(url=url, status_code=200, text=self.pages[url], headers={})
@@ -0,0 +1,165 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import sqlite3
+import sys
+import threading
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.application.pipelines.staged_scrape_pipeline import StagedScrapePipeline
+from app.domain.models.perfume import Perfume
+from app.infrastructure.persistence.sqlite.html_snapshot_store import HtmlSnapshotStore
+from app.infrastructure.persistence.sqlite.robots_cache_sqlite import RobotsCacheSqlite
+from app.infrastructure.scraping.client import ScrapeHttpResponse
+from app.infrastructure.scraping.robots import RobotsTxtPolicy, ScrapeAccessGuard, TokenBucketRateLimiter
+
+_PAGES = {
+    "https://vicioso.example/collections/all": """
+        <article><a href=\"/products/amber-night\">Amber Night</a><span>€59,90</span></article>
+        <a href=\"/collections/all?page=2\">Next</a>
+    """,
+    "https://vicioso.example/collections/all?page=2": """
+        <article><a href=\"/products/fresh-dawn\">Fresh Dawn</a></article>
+        <article><a href=\"/products/broken\">Broken</a></article>
+    """,
+    "https://vicioso.example/products/amber-night": "<div>Top Notes: Bergamot</div>",
+    "https://vicioso.example/products/fresh-dawn": "<div>Top Notes: Lemon</div>",
+}
+
+
+class _GatedHttpClient:
+    """Holds back listing page 2 until the first product page has been fetched."""
+
+    def __init__(self) -> None:
+        self.first_product_fetched = threading.Event()
+        self.page_two_waited_for_product = False
+
+    def fetch(self, url: str, retry: bool = True) -> ScrapeHttpResponse:
+        if url.endswith("?page=2"):
+            self.page_two_waited_for_product = self.first_product_fetched.wait(timeout=5.0)
+        if url not in _PAGES:
+            raise RuntimeError("fetch failed")
+        if "/products/" in url:
+            self.first_product_fetched.set()
+        return ScrapeHttpResponse(url=url, status_code=200, text=_PAGES[url], headers={})
+
+
+class _StaticHttpClient:
+    def __init__(self, pages: dict[str, str]) -> None:
+        self.pages = pages
+
+    def fetch(self, url: str, retry: bool = True) -> ScrapeHttpResponse:
+        return ScrapeHttpResponse(url=url, status_code=200, text=self.pages[url], headers={})
+
+
+class _AllowAllGuard:
+    def enforce(self, url: str) -> None:
+        return None
+
+
+class _FakePerfumeRepo:
+    def __init__(self) -> None:
+        self.batches: list[tuple[Perfume, ...]] = []
+        self.writer_threads: set[str] = set()
+
+    def upsert_perfumes(self, perfumes: tuple[Perfume, ...]) -> None:
+        self.writer_threads.add(threading.current_thread().name)
+        self.batches.append(perfumes)
+
+
+def test_staged_pipeline_scrapes_products_while_listings_are_still_crawled() -> None:
+    http_client = _GatedHttpClient()
+    repo = _FakePerfumeRepo()
+    pipeline = StagedScrapePipeline(
+        http_client=http_client,
+        access_guard=_AllowAllGuard(),
+        perfume_repository=repo,
+        base_url="https://vicioso.example",
+        fetch_workers=2,
+        queue_size=1,
+        write_batch_size=10,
+    )
+
+    result = pipeline.run(seed_listing_urls=("/collections/all",))
+
+    assert http_client.page_two_waited_for_product is True
+    assert result.scraped_count == 2
+    assert result.failed_product_urls == ("https://vicioso.example/products/broken",)
+    assert sorted(perfume.perfume_id for batch in repo.batches for perfume in batch) == [
+        "amber-night",
+        "fresh-dawn",
+    ]
+    assert repo.writer_threads == {threading.current_thread().name}
+
+
+def test_staged_pipeline_parses_on_executor_and_archives_on_caller_thread(tmp_path: Path) -> None:
+    store = HtmlSnapshotStore(sqlite3.connect(":memory:"), tmp_path / "raw_html")
+    store.initialize_schema()
+    repo = _FakePerfumeRepo()
+
+    with ThreadPoolExecutor(max_workers=2) as parse_executor:
+        result = StagedScrapePipeline(
+            http_client=_GatedHttpClient(),
+            access_guard=_AllowAllGuard(),
+            perfume_repository=repo,
+            base_url="https://vicioso.example",
+            snapshot_store=store,
+            write_batch_size=1,
+            parse_executor=parse_executor,
+        ).run(seed_listing_urls=("/collections/all",))
+
+    assert result.scraped_count == 2
+    assert len(repo.batches) == 2
+    assert store.load_latest_html("https://vicioso.example/products/fresh-dawn") == _PAGES[
+        "https://vicioso.example/products/fresh-dawn"
+    ]
+
+
+def test_staged_pipeline_resolves_robots_cache_on_caller_thread() -> None:
+    pages = {
+        "https://vicioso.example/collections/all": """
+            <article><a href=\"/products/amber-night\">Amber Night</a></article>
+            <article><a href=\"https://shop.example/products/fresh-dawn\">Fresh Dawn</a></article>
+        """,
+        "https://vicioso.example/products/amber-night": "<div>Top Notes: Bergamot</div>",
+        "https://shop.example/products/fresh-dawn": "<div>Top Notes: Lemon</div>",
+    }
+    cache = RobotsCacheSqlite(sqlite3.connect(":memory:"))
+    cache.initialize_schema()
+    robots_threads: list[str] = []
+
+    def robots_fetcher(origin: str) -> str:
+        robots_threads.append(threading.current_thread().name)
+        return "User-agent: *\nDisallow: /private"
+
+    guard = ScrapeAccessGuard(
+        robots_policy=RobotsTxtPolicy(robots_fetcher=robots_fetcher, cache=cache),
+        rate_limiter=TokenBucketRateLimiter(rate_per_second=1000.0, burst=100),
+    )
+    result = StagedScrapePipeline(
+        http_client=_StaticHttpClient(pages),
+        access_guard=guard,
+        perfume_repository=_FakePerfumeRepo(),
+        base_url="https://vicioso.example",
+        fetch_workers=2,
+    ).run(seed_listing_urls=("/collections/all",))
+
+    assert result.scraped_count == 2
+    assert robots_threads == [threading.current_thread().name] * 2
+    assert cache.get("https://shop.example") is not None
+
+
+def test_staged_writer_stops_waiting_when_fetchers_die_without_signalling() -> None:
+    class _DyingFetchers(StagedScrapePipeline):
+        def _fetch_products(self, product_queue: object, write_queue: object, stop: object) -> None:
+            return None
+
+    result = _DyingFetchers(
+        http_client=_StaticHttpClient(_PAGES),
+        access_guard=_AllowAllGuard(),
+        perfume_repository=_FakePerfumeRepo(),
+        base_url="https://vicioso.example",
+        fetch_workers=2,
+    ).run(seed_listing_urls=("/collections/all",))
+
+    assert result.scraped_count == 0
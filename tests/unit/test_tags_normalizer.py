@@ -5,8 +5,10 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 from app.infrastructure.scraping.normalizers.tags_normalizer import (
     normalize_family_list,
+    normalize_family_lists,
     normalize_tag,
     normalize_tag_list,
+    normalize_tag_lists,
     normalize_tag_sections,
     split_tag_tokens,
 )
@@ -79,3 +81,17 @@ def test_normalize_tag_sections_filters_noise_from_each_section() -> None:
         "scent_families": ("Floral", "Fresh"),
         "molecule_tags": ("Ambroxan",),
     }
+
+
+def test_batch_tag_and_family_normalization_matches_single_list_results() -> None:
+    tag_batch = [["Gender: Unisex", "unisex"], ["k.a."], ["Iso E Super + Ambroxan"]]
+    family_batch = [["Duftfamilie: Blumig, Floral"], ["Holzig und Warm"]]
+
+    assert normalize_tag_lists(tag_batch) == tuple(normalize_tag_list(tags) for tags in tag_batch)
+    assert normalize_family_lists(family_batch) == (("Floral",), ("Woody", "Warm"))
+
+
+def test_normalize_family_list_accepts_extra_aliases() -> None:
+    normalized = normalize_family_list(["Aromatisch", "Aromatic", "Blumig"], aliases={"aromatisch": "Aromatic"})
+
+    assert normalized == ("Aromatic", "Floral")
@@ -0,0 +1,39 @@
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.domain.models.user_affinity import UserAffinity
+
+_START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_decay_halves_scores_per_half_life_and_never_runs_backwards() -> None:
+    affinity = UserAffinity("u1", _START).with_event(_START, 1.0, {"vanilla"}, {"warm"}, 30.0, 8)
+
+    later = affinity.decayed(_START + timedelta(days=30), half_life_days=30.0)
+
+    assert later.note_scores["vanilla"] == 0.5
+    assert later.family_scores["warm"] == 0.5
+    assert affinity.decayed(_START - timedelta(days=5), half_life_days=30.0) is affinity
+
+
+def test_with_event_accumulates_signed_weights_and_prunes_weakest_tokens() -> None:
+    affinity = UserAffinity("u1", _START)
+    affinity = affinity.with_event(_START, 1.0, {"vanilla", "musk"}, set(), 30.0, 2)
+    affinity = affinity.with_event(_START, 1.0, {"vanilla"}, set(), 30.0, 2)
+    affinity = affinity.with_event(_START, -0.25, {"lemon"}, set(), 30.0, 2)
+
+    assert dict(affinity.note_scores) == {"vanilla": 2.0, "musk": 1.0}
+    assert affinity.event_count == 3
+    assert affinity.top_notes(1) == ("vanilla",)
+
+
+def test_late_event_is_discounted_to_current_as_of() -> None:
+    affinity = UserAffinity("u1", _START).with_event(_START + timedelta(days=30), 1.0, {"rose"}, set(), 30.0, 8)
+    affinity = affinity.with_event(_START, -1.0, {"cedar"}, set(), 30.0, 8)
+
+    assert affinity.as_of == _START + timedelta(days=30)
+    assert affinity.note_scores["cedar"] == -0.5
+    assert affinity.top_notes(5, positive=False) == ("cedar",)
@@ -0,0 +1,130 @@
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.application.services.user_affinity_service import UserAffinityService
+from app.domain.models.feedback_event import FeedbackEvent
+from app.domain.models.perfume import Perfume
+from app.domain.models.user_profile import UserProfile, UserProfileConstraints
+from app.infrastructure.persistence.sqlite.feedback_repo_sqlite import FeedbackRepositorySqlite
+from app.infrastructure.persistence.sqlite.user_affinity_repo_sqlite import UserAffinityRepositorySqlite
+
+_NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _catalog() -> dict[str, Perfume]:
+    specs = [
+        ("amber-night", ("Warm",), ("Vanilla", "Amber")),
+        ("citrus-day", ("Fresh",), ("Lemon", "Bergamot")),
+    ]
+    return {
+        perfume_id: Perfume(
+            perfume_id=perfume_id,
+            name=perfume_id.replace("-", " ").title(),
+            url=f"https://example.com/products/{perfume_id}",
+            scent_families=families,
+            notes_base=notes,
+        )
+        for perfume_id, families, notes in specs
+    }
+
+
+def _service(connection: sqlite3.Connection, cache_size: int = 16) -> UserAffinityService:
+    repository = UserAffinityRepositorySqlite(connection)
+    repository.initialize_schema()
+    return UserAffinityService(
+        repository, _catalog().get, half_life_days=30.0, cache_size=cache_size, now_func=lambda: _NOW
+    )
+
+
+def _event(perfume_id: str, event_type: str, days_ago: float = 0.0) -> FeedbackEvent:
+    return FeedbackEvent("u1", perfume_id, event_type, _NOW - timedelta(days=days_ago))
+
+
+def test_flushed_feedback_updates_persisted_affinity_incrementally() -> None:
+    connection = sqlite3.connect(":memory:")
+    service = _service(connection)
+    feedback = FeedbackRepositorySqlite(connection, flush_every=2, on_flushed=service.apply_events)
+    feedback.initialize_schema()
+
+    feedback.append(_event("amber-night", "like", days_ago=30))
+    feedback.append(_event("citrus-day", "dislike"))
+    feedback.append(_event("unknown", "like"))
+    feedback.flush()
+
+    stored = _service(connection, cache_size=0).affinity("u1")
+    assert stored.event_count == 2
+    assert stored.note_scores["vanilla"] == 0.5
+    assert stored.note_scores["lemon"] == -1.0
+    assert stored.family_scores["fresh"] == -1.0
+
+
+def test_overlapping_batches_for_one_user_do_not_lose_updates() -> None:
+    service = _service(sqlite3.connect(":memory:", check_same_thread=False))
+    catalog = _catalog()
+
+    def slow_lookup(perfume_id: str) -> Perfume | None:
+        time.sleep(0.01)
+        return catalog.get(perfume_id)
+
+    service.perfume_lookup = slow_lookup
+    threads = [
+        threading.Thread(target=service.apply_events, args=([_event("amber-night", "like")],)) for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert service.affinity("u1").event_count == 4
+
+
+def test_affinity_decays_lazily_at_read_time() -> None:
+    service = _service(sqlite3.connect(":memory:"))
+    service.apply_events([_event("amber-night", "purchase")])
+
+    assert service.affinity("u1", now=_NOW + timedelta(days=30)).note_scores["amber"] == 1.0
+    assert service.affinity("u1").note_scores["amber"] == 2.0
+    assert service.affinity("missing") is None
+
+
+def test_personalize_adds_weighted_learned_tokens_without_touching_explicit_choices() -> None:
+    service = _service(sqlite3.connect(":memory:"))
+    service.apply_events([_event("amber-night", "like"), _event("citrus-day", "dislike")])
+    profile = UserProfile(
+        liked_notes=("Rose",),
+        disliked_notes=("Bergamot",),
+        preferred_families=("Floral",),
+        constraints=UserProfileConstraints(exclude_notes=("Amber",)),
+    )
+
+    personalized = service.personalize(profile, "u1")
+
+    assert personalized.liked_notes == ("Rose",)
+    assert personalized.disliked_notes == ("Bergamot",)
+    assert personalized.preferred_families == ("Floral",)
+    assert personalized.learned_notes == (("vanilla", 1.0), ("lemon", -1.0))
+    assert personalized.learned_families == (("warm", 1.0), ("fresh", -1.0))
+    assert service.personalize(profile, None) is profile
+    assert service.personalize(profile, "missing") is profile
+
+
+def test_cached_affinity_expires_so_other_writers_become_visible() -> None:
+    connection = sqlite3.connect(":memory:")
+    now = [0.0]
+    reader = _service(connection)
+    reader.clock = lambda: now[0]
+    reader.cache_ttl_seconds = 10.0
+    writer = _service(connection, cache_size=0)
+
+    assert reader.affinity("u1") is None
+    writer.apply_events([_event("amber-night", "like")])
+    assert reader.affinity("u1") is None
+
+    now[0] = 11.0
+    assert reader.affinity("u1").event_count == 1
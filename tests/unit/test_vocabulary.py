@@ -0,0 +1,205 @@
+import logging
+from pathlib import Path
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.application.services.catalog_refresh_service import load_catalog_snapshot
+from app.config.logging import CATALOG_VOCABULARY_MISSING
+from app.domain.models.perfume import Perfume
+from app.domain.models.perfume_catalog import PerfumeCatalog
+from app.domain.models.vocabulary import TokenVocabulary
+from app.infrastructure.persistence.sqlite.perfume_repo_sqlite import PerfumeRepositorySqlite
+from app.infrastructure.scraping.normalizers.notes_normalizer import normalize_note_list
+from app.infrastructure.scraping.normalizers.tags_normalizer import normalize_tag_sections
+
+
+def test_vocabulary_assigns_dense_casefolded_ids_per_kind() -> None:
+    vocabulary = TokenVocabulary()
+
+    assert vocabulary.add("note", " Vanilla ") == 0
+    assert vocabulary.add("note", "vanilla") == 0
+    assert vocabulary.add("note", "Rose") == 1
+    assert vocabulary.add("family", "Warm") == 0
+    assert vocabulary.id_of("note", "ROSE") == 1
+    assert vocabulary.id_of("note", "Oud") is None
+    assert vocabulary.token_of("note", 0) == "vanilla"
+    assert list(vocabulary.encode("note", ("Rose", "Oud", "vanilla", "rose"))) == [0, 1]
+    assert vocabulary.size("note") == 2
+
+
+def test_vocabulary_rejects_unknown_kind() -> None:
+    with pytest.raises(ValueError, match="unknown token kind"):
+        TokenVocabulary().add("mood", "Calm")
+
+
+def test_normalizers_extend_vocabulary() -> None:
+    vocabulary = TokenVocabulary()
+
+    normalize_note_list(["Bergamot, Rose"], vocabulary)
+    normalize_tag_sections(["Unisex"], ["Blumig"], ["Iso E Super"], vocabulary)
+
+    assert vocabulary.id_of("note", "bergamot") == 0
+    assert vocabulary.id_of("family", "floral") == 0
+    assert vocabulary.id_of("gender", "unisex") == 0
+    assert vocabulary.id_of("molecule", "iso e super") == 0
+
+
+def test_vocabulary_round_trips_through_repository() -> None:
+    connection = sqlite3.connect(":memory:")
+    repo = PerfumeRepositorySqlite(connection)
+    repo.initialize_schema()
+    vocabulary = TokenVocabulary()
+    vocabulary.add_many("note", ("Bergamot", "Rose"))
+    vocabulary.add("family", "Warm")
+
+    repo.save_vocabulary(vocabulary)
+    repo.save_vocabulary(vocabulary)
+    loaded = repo.load_vocabulary()
+
+    assert tuple(loaded.entries()) == tuple(vocabulary.entries())
+
+
+def test_saving_a_vocabulary_that_disagrees_with_stored_ids_fails() -> None:
+    repo = PerfumeRepositorySqlite(sqlite3.connect(":memory:"))
+    repo.initialize_schema()
+    stored = TokenVocabulary()
+    stored.add_many("note", ("Bergamot", "Rose"))
+    repo.save_vocabulary(stored)
+    unrelated = TokenVocabulary()
+    unrelated.add_many("note", ("Rose", "Vanilla"))
+    fresh = TokenVocabulary()
+    fresh.add_many("note", ("Bergamot", "Rose", "Vanilla"))
+    fresh.add("note", "Amber")
+    other = TokenVocabulary()
+    other.add_many("note", ("Bergamot", "Rose", "Musk"))
+
+    with pytest.raises(ValueError, match="rose"):
+        repo.save_vocabulary(unrelated)
+    repo.save_vocabulary(fresh)
+    with pytest.raises(ValueError, match="id 2"):
+        repo.save_vocabulary(other)
+
+    assert tuple(repo.load_vocabulary().entries()) == tuple(fresh.entries())
+
+
+def test_catalogs_built_from_the_database_share_stored_token_ids(tmp_path: Path) -> None:
+    db_path = tmp_path / "catalog.db"
+    repo = PerfumeRepositorySqlite(sqlite3.connect(db_path))
+    repo.initialize_schema()
+    repo.upsert_perfumes(
+        (Perfume(perfume_id="amber-night", name="Amber Night", url="https://example.com/a", notes_base=("Vanilla",)),)
+    )
+    first = load_catalog_snapshot(str(db_path)).catalog
+    repo.upsert_perfumes(
+        (Perfume(perfume_id="aaa-rose", name="Rose", url="https://example.com/b", notes_base=("Rose", "Vanilla")),)
+    )
+
+    second = load_catalog_snapshot(str(db_path)).catalog
+
+    assert second.vocabulary.id_of("note", "vanilla") == first.vocabulary.id_of("note", "vanilla") == 0
+    assert second.vocabulary.id_of("note", "rose") == 1
+    assert tuple(repo.load_vocabulary().entries()) == tuple(second.vocabulary.entries())
+
+
+def test_upserts_store_the_perfumes_tokens() -> None:
+    repo = PerfumeRepositorySqlite(sqlite3.connect(":memory:"))
+    repo.initialize_schema()
+
+    repo.upsert_perfume(
+        Perfume(perfume_id="amber-night", name="Amber Night", url="https://example.com/a", notes_base=("Vanilla",))
+    )
+    repo.upsert_perfumes(
+        (
+            Perfume(
+                perfume_id="aaa-rose",
+                name="Rose",
+                url="https://example.com/b",
+                notes_base=("Rose", "Vanilla"),
+                scent_families=("Floral",),
+            ),
+        )
+    )
+
+    vocabulary = repo.load_vocabulary()
+    assert vocabulary.id_of("note", "vanilla") == 0
+    assert vocabulary.id_of("note", "rose") == 1
+    assert vocabulary.id_of("family", "floral") == 0
+
+
+def test_loading_a_snapshot_only_reads_the_vocabulary(tmp_path: Path) -> None:
+    db_path = tmp_path / "catalog.db"
+    repo = PerfumeRepositorySqlite(sqlite3.connect(db_path))
+    repo.initialize_schema()
+    repo.upsert_perfume(Perfume(perfume_id="zzz-rose", name="Rose", url="https://example.com/z", notes_base=("Rose",)))
+    repo.upsert_perfume(
+        Perfume(perfume_id="amber-night", name="Amber Night", url="https://example.com/a", notes_base=("Vanilla",))
+    )
+    writer = sqlite3.connect(db_path)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        catalog = load_catalog_snapshot(str(db_path)).catalog
+    finally:
+        writer.rollback()
+        writer.close()
+
+    # The stored ids, not ones assigned in catalog order.
+    assert catalog.vocabulary.id_of("note", "rose") == 0
+    assert catalog.vocabulary.id_of("note", "vanilla") == 1
+
+
+def test_loading_a_snapshot_without_a_vocabulary_table_logs_the_fallback(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    db_path = tmp_path / "catalog.db"
+    repo = PerfumeRepositorySqlite(sqlite3.connect(db_path))
+    repo.initialize_schema()
+    repo.upsert_perfumes(
+        (Perfume(perfume_id="amber-night", name="Amber Night", url="https://example.com/a", notes_base=("Vanilla",)),)
+    )
+    repo.connection.execute("DROP TABLE token_vocabulary")
+    repo.connection.commit()
+
+    with caplog.at_level(logging.WARNING):
+        catalog = load_catalog_snapshot(str(db_path)).catalog
+
+    assert catalog.vocabulary.id_of("note", "vanilla") == 0
+    assert CATALOG_VOCABULARY_MISSING in caplog.text
+
+
+def test_catalog_encodes_notes_and_families_as_token_ids() -> None:
+    perfume = Perfume(
+        perfume_id="amber-night",
+        name="Amber Night",
+        url="https://example.com/products/amber-night",
+        scent_families=("Warm",),
+        notes_top=("Rose",),
+        notes_base=("Vanilla", "rose"),
+    )
+
+    catalog = PerfumeCatalog((perfume,))
+
+    vocabulary = catalog.vocabulary
+    note_ids = catalog.note_ids_at(0)
+    assert sorted(vocabulary.token_of("note", token_id) for token_id in note_ids) == ["rose", "vanilla"]
+    assert list(catalog.family_ids_at(0)) == [vocabulary.id_of("family", "warm")]
+
+
+def test_catalog_token_ids_stay_per_perfume() -> None:
+    perfumes = (
+        Perfume(perfume_id="a", name="A", url="https://example.com/a", notes_base=("Rose", "Vanilla")),
+        Perfume(perfume_id="b", name="B", url="https://example.com/b"),
+        Perfume(perfume_id="c", name="C", url="https://example.com/c", notes_top=("Oud",), scent_families=("Woody",)),
+    )
+
+    catalog = PerfumeCatalog(perfumes)
+
+    vocabulary = catalog.vocabulary
+    assert [vocabulary.token_of("note", token_id) for token_id in catalog.note_ids_at(0)] == ["rose", "vanilla"]
+    assert list(catalog.note_ids_at(1)) == []
+    assert list(catalog.family_ids_at(1)) == []
+    assert [vocabulary.token_of("note", token_id) for token_id in catalog.note_ids_at(2)] == ["oud"]
+    assert [vocabulary.token_of("family", token_id) for token_id in catalog.family_ids_at(2)] == ["woody"]